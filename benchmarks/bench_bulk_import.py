@@ -0,0 +1,60 @@
+"""Benchmark for the bulk NDJSON import throughput of every storage.
+
+Imports `--collections` collections and then `--backups` backups spread over them, as NDJSON
+read from memory like a request body, into an in-memory CollectionManager, one with
+ColumnarDataCollections, one persisted with an OperationLog, and a SqliteCollectionManager. Reports records per second.
+
+Typical usage example:
+    python benchmarks/bench_bulk_import.py --collections 100000 --backups 1000000
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from bulk_import import import_collections, import_backups, iter_lines
+from collection_manager import CollectionManager
+from columnar_collection import ColumnarDataCollection
+from operation_log import OperationLog
+from sqlite_store import SqliteCollectionManager
+
+def make_ndjson(collections : int, backups : int) -> tuple[bytes, bytes]:
+    """Returns the NDJSON bodies of the collections and of the backups"""
+    collection_lines = (json.dumps({"name": f"Collection {i}", "description": "Imported"}) for i in range(collections))
+    backup_lines = (json.dumps({"collection_name": f"Collection {i % collections}", "backup_name": f"Backup {i}",
+                                "backup_location": f"/mnt/backups/{i}.tar.gz", "backup_date": "2024-01-01 12:00:00"}) for i in range(backups))
+    return "\n".join(collection_lines).encode(), "\n".join(backup_lines).encode()
+
+def run(name : str, manager, collections_body : bytes, backups_body : bytes) -> None:
+    for kind, body, import_function in [("collections", collections_body, import_collections), ("backups", backups_body, import_backups)]:
+        start = time.perf_counter()
+        result = import_function(manager, iter_lines(io.BytesIO(body)))
+        seconds = time.perf_counter() - start
+        print(f"{name:>14} {kind:>11}: {result.imported:>8} imported, {result.failed} failed, {seconds:6.2f}s, {result.imported / seconds:9.0f} records/s")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collections", type=int, default=100_000, help="Amount of collections (default 100000)")
+    parser.add_argument("--backups", type=int, default=1_000_000, help="Amount of backups (default 1000000)")
+    arguments = parser.parse_args()
+
+    collections_body, backups_body = make_ndjson(arguments.collections, arguments.backups)
+    run("memory", CollectionManager(), collections_body, backups_body)
+    run("columnar", CollectionManager(ColumnarDataCollection), collections_body, backups_body)
+
+    with tempfile.TemporaryDirectory() as directory:
+        manager = CollectionManager()
+        operation_log = OperationLog(os.path.join(directory, "log"))
+        operation_log.recover(manager)
+        run("operation log", manager, collections_body, backups_body)
+        operation_log.close()
+
+        run("sqlite", SqliteCollectionManager(os.path.join(directory, "bench.db")), collections_body, backups_body)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark for the memory used per BackupEntry, before and after slotting and interning.
+
+Creates `--entries` BackupEntries with repetitive locations, the way a collection of daily
+backups looks, and reports the bytes allocated per entry measured with tracemalloc:
+- "dict entries": Entries of a plain class with a per-instance `__dict__`, like BackupEntry used to be
+- "slotted entries": BackupEntries, with `__slots__` and interned location directories
+- "collection": A DataCollection holding the BackupEntries, including its name and date indexes
+- "columnar": A ColumnarDataCollection holding the same BackupEntries in columns
+
+Every name and location is a separate string, like the ones decoded from a request body.
+
+Typical usage example:
+    python benchmarks/bench_entry_memory.py --entries 1000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from backup_entry import BackupEntry
+from columnar_collection import ColumnarDataCollection
+from data_collection import DataCollection
+
+DIRECTORIES = 10
+
+class DictBackupEntry:
+    """BackupEntry with a per-instance `__dict__` and its own copy of the whole location"""
+    def __init__(self, backup_name : str, backup_location : str, backup_date : int) -> None:
+        self.name = backup_name
+        self.location = backup_location
+        self.date = backup_date
+
+def entry_values(amount : int):
+    """Yields (name, date, location) of `amount` backups"""
+    for i in range(amount):
+        yield f"Backup {i}", 1704110400 + i * 3600, f"/mnt/backups/collection-{i % DIRECTORIES}/daily/backup-{i}.tar.gz"
+
+def measure(build) -> tuple[int, float, object]:
+    """Returns the bytes still allocated after `build()`, the seconds it took, and its result"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, seconds, result
+
+def build_collection(collection_class : type[DataCollection], amount : int) -> DataCollection:
+    collection = collection_class("Collection", "", 0, 0, True)
+    for name, date, location in entry_values(amount):
+        collection.add_backup(name, date, location)
+    return collection
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000, help="Amount of BackupEntries (default 1000000)")
+    arguments = parser.parse_args()
+
+    modes = {
+        "dict entries":    lambda: [DictBackupEntry(name, location, date) for name, date, location in entry_values(arguments.entries)],
+        "slotted entries": lambda: [BackupEntry(name, location, date) for name, date, location in entry_values(arguments.entries)],
+        "collection":      lambda: build_collection(DataCollection, arguments.entries),
+        "columnar":        lambda: build_collection(ColumnarDataCollection, arguments.entries)
+    }
+    for mode, build in modes.items():
+        size, seconds, result = measure(build)
+        del result
+        print(f"{arguments.entries:>8} {mode:>15}: {size / arguments.entries:6.1f} bytes per entry, {size / 2**20:7.1f} MiB, {seconds:6.2f}s")
+
+if __name__ == "__main__":
+    main()
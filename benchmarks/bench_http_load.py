@@ -0,0 +1,316 @@
+"""End-to-end HTTP load test replaying the traffic of the web UI.
+
+Starts the app locally (the Flask server, gunicorn like the production image, or uvicorn serving
+the ASGI entry point asgi.py like the prod-asgi image), seeds it with
+`--collections` collections through /api/BulkCollections, then runs `--concurrency` clients for
+`--seconds` seconds. Each client repeatedly picks one of the actions of main.js and info.js,
+weighted by `ACTIONS`:
+- "overview": Polls the first page of GET /api/Overview, like the main page
+- "list": Polls the first page of GET /api/List, like the detailed overview
+- "search": Types a search term one character at a time, sending GET /api/Search after each one
+- "info": Opens the info page of a collection: GET /api/Info, then GET /api/ListBackups
+- "backup": POST /api/Backup to add a BackupEntry to a collection
+- "edit": POST /api/Edit with every field of the info page
+
+Two more kinds of clients compare how the servers handle many connections:
+- `--slow-clients` clients repeatedly stream every collection from GET /api/List as ndjson, reading
+  `SLOW_READ_SIZE` bytes every `SLOW_READ_DELAY` seconds, like clients on a slow network
+- `--idle-connections` keep-alive connections send one request before the load and one after it,
+  staying idle in between, like browser tabs left open. The report counts how many of them the
+  server kept open, and the latency of their last request. gunicorn and uvicorn are started with
+  a keep-alive timeout of `KEEP_ALIVE_TIMEOUT` seconds, so keep `--seconds` below it
+
+Reports the throughput and the p50/p95/p99 latency of every endpoint, and saves them as json with
+`--output`. The clients are threads of this process, so at high concurrency the client itself
+can become the bottleneck. `--url` runs the load against an already running server instead.
+
+Typical usage example:
+    python benchmarks/bench_http_load.py --collections 10000 --concurrency 8 --seconds 30
+    python benchmarks/bench_http_load.py --server gunicorn --storage sqlite --workers 4
+    python benchmarks/bench_http_load.py --server gunicorn --threads 8
+    python benchmarks/bench_http_load.py --server uvicorn --threads 16 --slow-clients 50 --idle-connections 2000
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+WORDS = ["home", "backup", "photos", "server", "nas", "db", "postgres", "mail", "work", "music", "video", "docs", "laptop", "phone", "archive"]
+PAGE_SIZE = 200        # Like index.js
+SUGGESTION_LIMIT = 20  # Like main.js
+SEED_BATCH = 5000
+ACTIONS = {"overview": 20, "list": 10, "search": 25, "info": 35, "backup": 7, "edit": 3}
+SLOW_READ_SIZE = 16384
+KEEP_ALIVE_TIMEOUT = 75 # Seconds gunicorn and uvicorn keep an idle connection open, like the prod-asgi image
+SLOW_READ_DELAY = 0.01
+
+def collection_name(i : int) -> str:
+    return f"{WORDS[i % len(WORDS)]}-{WORDS[i // len(WORDS) % len(WORDS)]}-{i}"
+
+class Client:
+    """Sends requests over one keep-alive connection, recording the latency of each per endpoint"""
+
+    def __init__(self, host : str, port : int, latencies : dict[str, list[float]], errors : dict[str, int]) -> None:
+        self.connection = http.client.HTTPConnection(host, port, timeout=60)
+        self.latencies = latencies
+        self.errors = errors
+
+    def request(self, method : str, path : str, body : dict | None = None) -> None:
+        """Sends one request and reads the whole response. `path` is recorded without its query string"""
+        endpoint = f"{method} {path.split('?')[0]}"
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, path, None if body is None else json.dumps(body), headers)
+            response = self.connection.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            self.connection.close() # Reopened by the next request
+            ok = False
+        self.latencies.setdefault(endpoint, []).append(time.perf_counter() - start)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def read_slowly(self, path : str, headers : dict[str, str], endpoint : str) -> None:
+        """Sends a GET request, then reads the response `SLOW_READ_SIZE` bytes at a time, waiting `SLOW_READ_DELAY` seconds in between"""
+        start = time.perf_counter()
+        try:
+            self.connection.request("GET", path, headers=headers)
+            response = self.connection.getresponse()
+            while response.read(SLOW_READ_SIZE):
+                time.sleep(SLOW_READ_DELAY)
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            ok = False
+        self.latencies.setdefault(endpoint, []).append(time.perf_counter() - start)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+def run_action(client : Client, action : str, generator : random.Random, collections : int, counter : int) -> None:
+    name = urllib.parse.quote(collection_name(generator.randrange(collections)))
+    if action == "overview":
+        client.request("GET", f"/api/Overview?limit={PAGE_SIZE}")
+    elif action == "list":
+        client.request("GET", f"/api/List?limit={PAGE_SIZE}")
+    elif action == "search":
+        term = f"{generator.choice(WORDS)}-{generator.choice(WORDS)}"
+        for length in range(1, len(term) + 1):
+            client.request("GET", f"/api/Search?case_sensitive=false&limit={SUGGESTION_LIMIT}&name={urllib.parse.quote(term[:length])}")
+    elif action == "info":
+        client.request("GET", f"/api/Info?name={name}")
+        client.request("GET", f"/api/ListBackups?order=desc&name={name}&limit={PAGE_SIZE}")
+    elif action == "backup":
+        client.request("POST", "/api/Backup", {"collection_name": urllib.parse.unquote(name), "backup_name": f"Load {threading.get_ident()}-{counter}",
+                                               "backup_location": f"/mnt/backups/load/{counter}.tar.gz"})
+    elif action == "edit":
+        client.request("POST", "/api/Edit", {"collection_name": urllib.parse.unquote(name), "name": urllib.parse.unquote(name),
+                                             "description": f"Edited {counter}", "creation_date": "2024-01-01 12:00:00",
+                                             "modification_date": "2025-01-01 12:00:00", "updated": True})
+
+def client_loop(host : str, port : int, collections : int, deadline : float, seed : int, results : list) -> None:
+    latencies: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    client = Client(host, port, latencies, errors)
+    generator = random.Random(seed)
+    actions, weights = list(ACTIONS), list(ACTIONS.values())
+    counter = 0
+    while time.perf_counter() < deadline:
+        run_action(client, generator.choices(actions, weights)[0], generator, collections, counter)
+        counter += 1
+    client.connection.close()
+    results.append((latencies, errors))
+
+def slow_client_loop(host : str, port : int, deadline : float, results : list) -> None:
+    latencies: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    client = Client(host, port, latencies, errors)
+    while time.perf_counter() < deadline:
+        client.read_slowly("/api/List", {"Accept": "application/x-ndjson"}, "GET /api/List (slow ndjson)")
+    client.connection.close()
+    results.append((latencies, errors))
+
+def open_idle_connections(host : str, port : int, count : int) -> list[http.client.HTTPConnection]:
+    """Opens `count` connections, sending one request on each"""
+    connections = []
+    for _ in range(count):
+        connection = http.client.HTTPConnection(host, port, timeout=60)
+        connection.request("GET", "/api/Overview?limit=1")
+        connection.getresponse().read()
+        connections.append(connection)
+    return connections
+
+def check_idle_connections(connections : list[http.client.HTTPConnection]) -> dict:
+    """Sends one more request on each connection, printing and returning how many were still open and the latency
+    of the requests. http.client reopens the connections the server closed"""
+    latencies: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    kept = 0
+    for connection in connections:
+        sock = connection.sock
+        attempt: tuple[dict, dict] = ({}, {})
+        client = Client(connection.host, connection.port, *attempt)
+        client.connection = connection
+        if sock is not None:
+            # Fails if the server closed the connection while idle, which http.client can't tell beforehand
+            client.request("GET", "/api/Overview?limit=1")
+        if sock is None or connection.sock is not sock:
+            attempt = ({}, {})
+            client.latencies, client.errors = attempt
+            client.request("GET", "/api/Overview?limit=1") # Over a new connection
+        else:
+            kept += 1
+        connection.close()
+        for endpoint, values in attempt[0].items():
+            latencies.setdefault(endpoint, []).extend(values)
+        for endpoint, count in attempt[1].items():
+            errors[endpoint] = errors.get(endpoint, 0) + count
+    values = latencies["GET /api/Overview"]
+    percentiles = statistics.quantiles(values, n=100, method="inclusive") if len(values) > 1 else values * 99
+    stats = {"connections": len(connections), "kept": kept, "errors": sum(errors.values()),
+             "p50_ms": percentiles[49] * 1000, "p99_ms": percentiles[98] * 1000}
+    print(f"{'idle connections':>22}: {kept} of {len(connections)} kept open, {stats['errors']:>5} errors, "
+          f"p50 {stats['p50_ms']:7.1f} ms, p99 {stats['p99_ms']:7.1f} ms")
+    return stats
+
+def seed(host : str, port : int, collections : int, backups : int) -> None:
+    """Adds `collections` collections with `backups` BackupEntries each, in batches of `SEED_BATCH` lines"""
+    connection = http.client.HTTPConnection(host, port, timeout=600)
+    for batch_start in range(0, collections, SEED_BATCH):
+        lines = []
+        for i in range(batch_start, min(batch_start + SEED_BATCH, collections)):
+            entries = [{"backup_name": f"Backup {j}", "backup_date": f"2024-01-{j % 28 + 1:02} 12:00:00",
+                        "backup_location": f"/mnt/backups/{i}/{j}.tar.gz"} for j in range(backups)]
+            lines.append(json.dumps({"name": collection_name(i), "description": "Seeded", "backup_entries": entries}))
+        connection.request("POST", "/api/BulkCollections", "\n".join(lines).encode(), {"Content-Type": "application/x-ndjson"})
+        response = connection.getresponse()
+        result = json.loads(response.read())
+        if response.status != 200 or result["failed"]:
+            raise RuntimeError(f"Seeding failed: {result}")
+    connection.close()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(server : str, storage : str, workers : int, threads : int, port : int, data_dir : str) -> subprocess.Popen:
+    """Starts the app on `port`, returning once it answers requests"""
+    environment = {**os.environ, "BACKUPORGANIZER_STORAGE": storage, "BACKUPORGANIZER_SQLITE_PATH": os.path.join(data_dir, "load.db")}
+    environment.pop("BACKUPORGANIZER_DATA_DIR", None)
+    if server == "gunicorn":
+        command = [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}", "-w", str(workers), "--threads", str(threads),
+                   "--keep-alive", str(KEEP_ALIVE_TIMEOUT), "restinterface:app"]
+    elif server == "uvicorn":
+        environment["BACKUPORGANIZER_ASGI_THREADS"] = str(threads)
+        command = [sys.executable, "-m", "uvicorn", "asgi:app", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+                   "--timeout-keep-alive", str(KEEP_ALIVE_TIMEOUT), "--no-access-log"]
+    else:
+        command = [sys.executable, "-m", "flask", "--app", "restinterface.py", "run", "--port", str(port)]
+    process = subprocess.Popen(command, cwd=SRC_DIR, env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The {server} server exited with status {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/Overview?limit=1")
+            connection.getresponse().read()
+            connection.close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"The {server} server didn't start within 30 seconds")
+
+def report(results : list, seconds : float) -> dict:
+    """Prints and returns the throughput and latency percentiles of every endpoint"""
+    latencies: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    for client_latencies, client_errors in results:
+        for endpoint, values in client_latencies.items():
+            latencies.setdefault(endpoint, []).extend(values)
+        for endpoint, count in client_errors.items():
+            errors[endpoint] = errors.get(endpoint, 0) + count
+
+    endpoints = {}
+    for endpoint, values in sorted(latencies.items()):
+        percentiles = statistics.quantiles(values, n=100, method="inclusive") if len(values) > 1 else values * 99
+        endpoints[endpoint] = {"requests": len(values), "errors": errors.get(endpoint, 0), "requests_per_sec": len(values) / seconds,
+                               "p50_ms": percentiles[49] * 1000, "p95_ms": percentiles[94] * 1000, "p99_ms": percentiles[98] * 1000}
+        stats = endpoints[endpoint]
+        print(f"{endpoint:>22}: {stats['requests']:>7} requests, {stats['errors']:>5} errors, {stats['requests_per_sec']:8.1f}/s, "
+              f"p50 {stats['p50_ms']:7.1f} ms, p95 {stats['p95_ms']:7.1f} ms, p99 {stats['p99_ms']:7.1f} ms")
+    total = sum(stats["requests"] for stats in endpoints.values())
+    print(f"{'total':>22}: {total:>7} requests, {sum(errors.values()):>5} errors, {total / seconds:8.1f}/s")
+    return {"seconds": seconds, "requests": total, "requests_per_sec": total / seconds, "endpoints": endpoints}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=["flask", "gunicorn", "uvicorn"], default="flask", help="Server to start (default flask)")
+    parser.add_argument("--storage", choices=["memory", "columnar", "sqlite"], default="memory", help="BACKUPORGANIZER_STORAGE of the server (default memory)")
+    parser.add_argument("--workers", type=int, default=1, help="Amount of gunicorn or uvicorn workers, more than 1 needs --storage sqlite (default 1)")
+    parser.add_argument("--threads", type=int, default=1, help="Amount of threads per gunicorn worker, or BACKUPORGANIZER_ASGI_THREADS with uvicorn (default 1)")
+    parser.add_argument("--url", help="Base url of a running server to load instead of starting one, like http://localhost:5000")
+    parser.add_argument("--collections", type=int, default=10_000, help="Amount of collections to seed (default 10000)")
+    parser.add_argument("--backups", type=int, default=10, help="Amount of BackupEntries per seeded collection (default 10)")
+    parser.add_argument("--no-seed", action="store_true", help="Don't seed, the collections already exist (with --url)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Amount of concurrent clients (default 8)")
+    parser.add_argument("--slow-clients", type=int, default=0, help="Amount of clients slowly streaming GET /api/List (default 0)")
+    parser.add_argument("--idle-connections", type=int, default=0, help="Amount of keep-alive connections staying idle during the load (default 0)")
+    parser.add_argument("--seconds", type=float, default=30, help="Duration of the load in seconds (default 30)")
+    parser.add_argument("--output", help="Path of a json file to save the results to")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        process = None
+        if arguments.url is None:
+            host, port = "127.0.0.1", free_port()
+            process = start_server(arguments.server, arguments.storage, arguments.workers, arguments.threads, port, data_dir)
+        else:
+            url = urllib.parse.urlsplit(arguments.url)
+            host, port = url.hostname or "localhost", url.port or 80
+        try:
+            if not arguments.no_seed:
+                start = time.perf_counter()
+                seed(host, port, arguments.collections, arguments.backups)
+                print(f"Seeded {arguments.collections} collections with {arguments.backups} BackupEntries each in {time.perf_counter() - start:.1f}s")
+
+            idle_connections = open_idle_connections(host, port, arguments.idle_connections)
+            results: list = []
+            deadline = time.perf_counter() + arguments.seconds
+            threads = [threading.Thread(target=client_loop, args=(host, port, arguments.collections, deadline, i, results))
+                       for i in range(arguments.concurrency)]
+            threads += [threading.Thread(target=slow_client_loop, args=(host, port, deadline, results)) for _ in range(arguments.slow_clients)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            summary = report(results, time.perf_counter() - start)
+            if idle_connections:
+                summary["idle_connections"] = check_idle_connections(idle_connections)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    if arguments.output is not None:
+        summary["arguments"] = vars(arguments)
+        with open(arguments.output, "w") as file:
+            json.dump(summary, file, indent=2)
+
+if __name__ == "__main__":
+    main()
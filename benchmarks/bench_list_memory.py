@@ -0,0 +1,62 @@
+"""Benchmark for the peak memory of one GET /api/List, with and without streaming, and of GET /api/Export.
+
+Fills the app's CollectionManager with `--collections` collections, then sends GET /api/List
+through the Flask test client in each mode, reading the response chunk by chunk and dropping
+it like a network client would. The memory allocated while handling the request is measured
+with tracemalloc, so the dataset itself isn't counted. The timings include the overhead of
+tracemalloc, which is larger for the streamed modes since they make more small allocations.
+
+Typical usage example:
+    python benchmarks/bench_list_memory.py --collections 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ["BACKUPORGANIZER_STORAGE"] = "memory"
+os.environ.pop("BACKUPORGANIZER_DATA_DIR", None)
+import restinterface
+
+MODES = {
+    "full":   ("/api/List", {}),
+    "stream": ("/api/List?stream=true", {}),
+    "ndjson": ("/api/List", {"Accept": "application/x-ndjson"}),
+    "export": ("/api/Export", {}),
+    "export gzip": ("/api/Export?gzip=true", {})
+}
+
+def measure(client, url : str, headers : dict) -> tuple[int, float, int]:
+    """Returns the peak memory in bytes, the seconds and the amount of bytes of one request"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    size = 0
+    for chunk in response.iter_encoded():
+        size += len(chunk)
+    response.close()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, seconds, size
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collections", type=int, nargs="+", default=[10_000, 100_000], help="Amounts of collections (default 10000 100000)")
+    arguments = parser.parse_args()
+
+    manager = restinterface.collection_manager
+    client = restinterface.app.test_client()
+    for amount in sorted(arguments.collections):
+        for i in range(len(manager.data_collections), amount):
+            collection = manager.add_collection(f"Collection {i}", "A description of the collection", 1704110400, 1704110400, True)
+            collection.add_backup("Backup", 1704110400, f"/mnt/backups/{i}.tar.gz")
+        for mode, (url, headers) in MODES.items():
+            peak, seconds, size = measure(client, url, headers)
+            print(f"{amount:>8} collections {mode:>11}: peak {peak / 2**20:8.1f} MiB, {seconds:6.2f}s, response {size / 2**20:7.1f} MiB")
+
+if __name__ == "__main__":
+    main()
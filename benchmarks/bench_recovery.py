@@ -0,0 +1,95 @@
+"""Benchmark for the OperationLog write throughput and cold-start recovery time.
+
+Writes `--collections` x `--entries` BackupEntries (1M by default) through an OperationLog,
+then measures how long it takes to recover the state into a new CollectionManager, both by
+replaying the whole log and by loading a snapshot. Also compares the write throughput of a
+few amounts of concurrent writers, which share their fsyncs (group commit).
+
+Typical usage example:
+    python benchmarks/bench_recovery.py --collections 1000 --entries 1000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from collection_manager import CollectionManager
+from operation_log import OperationLog
+
+def write_collections(manager : CollectionManager, first : int, collections : int, entries : int) -> None:
+    for i in range(first, first + collections):
+        collection = manager.add_collection(f"Collection {i}", "Benchmark collection", 1735689600, 1735689600, True)
+        for j in range(entries):
+            collection.add_backup(f"Backup {j}", 1735689600, f"/mnt/backups/collection_{i}/backup_{j}.tar.gz")
+
+def write_records(directory : str, collections : int, entries : int, writers : int = 1, one_transaction : bool = False) -> tuple[CollectionManager, float]:
+    """Writes `collections` collections with `entries` BackupEntries each, returning the manager and the elapsed seconds
+
+    Args:
+        `writers`: Amount of threads writing at once, each writing `collections / writers` collections
+        `one_transaction`: Holds the write lock during the whole write, so every record is fsynced once at the end
+    """
+    manager = CollectionManager()
+    operation_log = OperationLog(directory, snapshot_interval=sys.maxsize)
+    operation_log.recover(manager)
+    start = time.perf_counter()
+    if one_transaction:
+        with manager.lock.write:
+            write_collections(manager, 0, collections, entries)
+    else:
+        share = collections // writers
+        threads = [threading.Thread(target=write_collections, args=(manager, i * share, share, entries)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    operation_log.close()
+    return manager, time.perf_counter() - start
+
+def recover(directory : str) -> tuple[CollectionManager, float]:
+    """Recovers the state stored in `directory`, returning the manager and the elapsed seconds"""
+    start = time.perf_counter()
+    manager = CollectionManager()
+    operation_log = OperationLog(directory, snapshot_interval=sys.maxsize)
+    operation_log.recover(manager)
+    elapsed = time.perf_counter() - start
+    operation_log.close()
+    return manager, elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collections", type=int, default=1000, help="Amount of collections (default 1000)")
+    parser.add_argument("--entries", type=int, default=1000, help="Amount of BackupEntries per collection (default 1000)")
+    arguments = parser.parse_args()
+    records = arguments.collections * (arguments.entries + 1)
+
+    print("Write throughput per amount of concurrent writers (6400 records):")
+    for writers in [1, 4, 16, 64]:
+        with tempfile.TemporaryDirectory() as directory:
+            _, elapsed = write_records(directory, 64, 99, writers)
+            print(f"  {writers:>2} writers: {6400 / elapsed:>10.0f} records/s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        _, elapsed = write_records(directory, arguments.collections, arguments.entries, one_transaction=True)
+        log_size = os.path.getsize(os.path.join(directory, "operations.log"))
+        print(f"Wrote {records} records ({log_size / 2**20:.1f} MiB) in {elapsed:.2f}s ({records / elapsed:.0f} records/s)")
+
+        manager, elapsed = recover(directory)
+        print(f"Cold-start recovery from log:      {elapsed:.2f}s ({len(manager.data_collections)} collections)")
+
+        operation_log = OperationLog(directory)
+        operation_log.recover(CollectionManager())
+        start = time.perf_counter()
+        operation_log.snapshot()
+        print(f"Snapshot compaction:               {time.perf_counter() - start:.2f}s")
+        operation_log.close()
+
+        manager, elapsed = recover(directory)
+        print(f"Cold-start recovery from snapshot: {elapsed:.2f}s ({len(manager.data_collections)} collections)")
+
+if __name__ == "__main__":
+    main()
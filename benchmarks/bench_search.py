@@ -0,0 +1,46 @@
+"""Benchmark for CollectionManager.search latency with the trigram index.
+
+Fills a CollectionManager with `--collections` collections named from a small vocabulary
+(like "photos-server-123"), then reports the latency of a few selective and unselective
+searches, both case sensitive and case insensitive.
+
+Typical usage example:
+    python benchmarks/bench_search.py --collections 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from collection_manager import CollectionManager
+
+WORDS = ["home", "backup", "photos", "server", "nas", "db", "postgres", "mail", "work", "music", "video", "docs", "laptop", "phone", "archive"]
+SEARCHES = ["server-db-99", "PHOTOS-nas-1", "12345", "mail-work", "photo", "ba"]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collections", type=int, default=1_000_000, help="Amount of collections (default 1000000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Amount of times each search is repeated (default 5)")
+    arguments = parser.parse_args()
+
+    generator = random.Random(0)
+    manager = CollectionManager()
+    start = time.perf_counter()
+    for i in range(arguments.collections):
+        manager.add_collection(f"{generator.choice(WORDS)}-{generator.choice(WORDS)}-{i}", "", 0, 0, True)
+    print(f"Added {arguments.collections} collections in {time.perf_counter() - start:.2f}s")
+
+    for search_string in SEARCHES:
+        for case_sensitive in [True, False]:
+            timings = []
+            for _ in range(arguments.repeat):
+                start = time.perf_counter()
+                result = manager.search(search_string, case_sensitive=case_sensitive)
+                timings.append(time.perf_counter() - start)
+            print(f"{search_string!r:>16} case_sensitive={case_sensitive!s:<5}: {len(result):>7} results, {min(timings) * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark for how the throughput of the SQLite storage scales with the amount of worker processes.
+
+Seeds a database with `--collections` collections, then starts 1, 2, 4, ... `--max-workers`
+processes against the same database file, like gunicorn workers. Each process runs a mix of
+90% reads (get + get_backups_json) and 10% writes (add_backup) for `--seconds` seconds.
+
+Typical usage example:
+    python benchmarks/bench_sqlite_workers.py --max-workers 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from sqlite_store import SqliteCollectionManager
+
+def seed(path : str, collections : int) -> None:
+    manager = SqliteCollectionManager(path)
+    for i in range(collections):
+        collection = manager.add_collection(f"Collection {i}", "Benchmark collection", 1735689600, 1735689600, True)
+        for j in range(10):
+            collection.add_backup(f"Backup {j}", 1735689600, f"/mnt/backups/collection_{i}/backup_{j}.tar.gz")
+
+def worker(path : str, collections : int, seconds : float, worker_name : str, results) -> None:
+    """Runs the read/write mix until `seconds` have passed, and puts the amount of operations in `results`"""
+    manager = SqliteCollectionManager(path)
+    generator = random.Random(worker_name)
+    operations = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        collection = manager.get(f"Collection {generator.randrange(collections)}")
+        if generator.random() < 0.1:
+            collection.add_backup(f"{worker_name} Backup {operations}", 1735689600, "/mnt/backups/new.tar.gz")
+        else:
+            collection.get_backups_json()
+        operations += 1
+    results.put(operations)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collections", type=int, default=10_000, help="Amount of collections to seed (default 10000)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="Max amount of worker processes (default cpu count)")
+    parser.add_argument("--seconds", type=float, default=5, help="Duration of each run in seconds (default 5)")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        seed(path, arguments.collections)
+        workers = 1
+        while workers <= arguments.max_workers:
+            results = multiprocessing.Queue()
+            processes = [multiprocessing.Process(target=worker, args=(path, arguments.collections, arguments.seconds, f"Run {workers} Worker {i}", results))
+                         for i in range(workers)]
+            for process in processes:
+                process.start()
+            operations = sum(results.get() for _ in processes)
+            for process in processes:
+                process.join()
+            print(f"{workers:>3} workers: {operations / arguments.seconds:>10.0f} ops/s")
+            workers *= 2
+
+if __name__ == "__main__":
+    main()
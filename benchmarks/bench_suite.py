@@ -0,0 +1,193 @@
+"""Micro-benchmark suite for the core model and manager, with results that can be saved and compared.
+
+Runs every case at every scale (amount of collections or BackupEntries, 1k to 1M by default):
+- "add_collection": CollectionManager.add_collection() into an empty manager, `scale` times
+- "add_backup": DataCollection.add_backup() into an empty collection, `scale` times
+- "add_backup_columnar": The same with a ColumnarDataCollection
+- "search": CollectionManager.search() over `scale` collections, for a mix of selective and unselective strings
+- "json_overview": CollectionManager.json_overview() of `scale` collections (ops are collections serialized)
+- "overview": CollectionManager.overview() of `scale` collections (ops are collections serialized)
+- "get_backups_json": DataCollection.get_backups_json() of `scale` BackupEntries (ops are entries serialized)
+- "get_backups_range": DataCollection.get_backups_range() of 100 BackupEntries in a collection of `scale`
+
+Every case builds its data first, which isn't measured. The operations are timed until they
+took `--min-time` seconds in total, keeping the best rate in ops/sec, then run once more with
+tracemalloc to get the peak memory they allocate. The data is rebuilt before every run of the
+cases in `MUTATING_CASES`, and reused by the others.
+
+`--output` saves the results as json, and `--baseline` compares them with a saved file,
+exiting with status 1 if a case got slower or used more memory by more than `--threshold`.
+
+Typical usage example:
+    python benchmarks/bench_suite.py --scales 1000 10000 --output baseline.json
+    python benchmarks/bench_suite.py --scales 1000 10000 --baseline baseline.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from collection_manager import CollectionManager
+from columnar_collection import ColumnarDataCollection
+from data_collection import DataCollection
+
+WORDS = ["home", "backup", "photos", "server", "nas", "db", "postgres", "mail", "work", "music", "video", "docs", "laptop", "phone", "archive"]
+SEARCHES = [("server-db-99", True), ("PHOTOS-nas-1", False), ("12345", True), ("mail-work", True), ("photo", False), ("ba", True)]
+RANGE_LIMIT = 100
+
+# A case takes the scale, builds its data, and returns the operation to measure with its amount of ops
+Case = Callable[[int], tuple[Callable[[], object], int]]
+
+def filled_manager(scale : int) -> CollectionManager:
+    """Returns a manager with `scale` collections named from `WORDS`, each with one BackupEntry"""
+    generator = random.Random(0)
+    manager = CollectionManager()
+    for i in range(scale):
+        collection = manager.add_collection(f"{generator.choice(WORDS)}-{generator.choice(WORDS)}-{i}", "A description", 1704110400, 1704110400, True)
+        collection.add_backup("Backup", 1704110400 + i, f"/mnt/backups/{i}.tar.gz")
+    return manager
+
+def filled_collection(scale : int) -> DataCollection:
+    """Returns a collection with `scale` hourly BackupEntries"""
+    collection = DataCollection("Collection", "", 0, 0, True)
+    for i in range(scale):
+        collection.add_backup(f"Backup {i}", 1704110400 + i * 3600, f"/mnt/backups/hourly/{i}.tar.gz")
+    return collection
+
+def case_add_collection(scale : int):
+    manager = CollectionManager()
+    names = [f"{WORDS[i % len(WORDS)]}-collection-{i}" for i in range(scale)]
+    def run():
+        for name in names:
+            manager.add_collection(name, "A description", 1704110400, 1704110400, True)
+    return run, scale
+
+def add_backup_case(collection_class : type[DataCollection]) -> Case:
+    def case(scale : int):
+        collection = collection_class("Collection", "", 0, 0, True)
+        values = [(f"Backup {i}", 1704110400 + i * 3600, f"/mnt/backups/hourly/{i}.tar.gz") for i in range(scale)]
+        def run():
+            for name, date, location in values:
+                collection.add_backup(name, date, location)
+        return run, scale
+    return case
+
+def case_search(scale : int):
+    manager = filled_manager(scale)
+    def run():
+        for search_string, case_sensitive in SEARCHES:
+            manager.search(search_string, case_sensitive)
+    return run, len(SEARCHES)
+
+def case_json_overview(scale : int):
+    return filled_manager(scale).json_overview, scale
+
+def case_overview(scale : int):
+    return filled_manager(scale).overview, scale
+
+def case_get_backups_json(scale : int):
+    return filled_collection(scale).get_backups_json, scale
+
+def case_get_backups_range(scale : int):
+    collection = filled_collection(scale)
+    middle = 1704110400 + scale // 2 * 3600
+    return lambda: collection.get_backups_range(since=middle, limit=RANGE_LIMIT), 1
+
+CASES: dict[str, Case] = {
+    "add_collection": case_add_collection,
+    "add_backup": add_backup_case(DataCollection),
+    "add_backup_columnar": add_backup_case(ColumnarDataCollection),
+    "search": case_search,
+    "json_overview": case_json_overview,
+    "overview": case_overview,
+    "get_backups_json": case_get_backups_json,
+    "get_backups_range": case_get_backups_range
+}
+MUTATING_CASES = {"add_collection", "add_backup", "add_backup_columnar"}
+
+def measure(case : Case, scale : int, min_time : float, rebuild : bool) -> dict:
+    """Returns the best ops/sec of `case` at `scale`, and the peak bytes allocated by one run
+
+    Args:
+        `rebuild`: Build the data of the case again before every run, for cases that change it
+    """
+    best = 0.0
+    total = 0.0
+    run, ops = case(scale)
+    while total < min_time:
+        if rebuild and total > 0:
+            run, ops = case(scale)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+        total += seconds
+        best = max(best, ops / seconds if seconds > 0 else float("inf"))
+
+    if rebuild:
+        run, ops = case(scale)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ops_per_sec": best, "peak_bytes": peak}
+
+def compare(results : list[dict], baseline : dict, threshold : float) -> list[str]:
+    """Prints the change of every result found in `baseline`, returning the names of the regressed cases"""
+    baseline_results = {(result["case"], result["scale"]): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = baseline_results.get((result["case"], result["scale"]))
+        if old is None:
+            continue
+        speed = result["ops_per_sec"] / old["ops_per_sec"] - 1
+        memory = result["peak_bytes"] / old["peak_bytes"] - 1 if old["peak_bytes"] else 0.0
+        regressed = speed < -threshold or memory > threshold
+        if regressed:
+            regressions.append(f"{result['case']}@{result['scale']}")
+        print(f"{result['case']:>20} {result['scale']:>8}: ops/sec {speed:+7.1%}, peak memory {memory:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000], help="Scales to run every case at (default 1000 10000 100000 1000000)")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="Cases to run (default all)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to repeat each case for (default 0.5)")
+    parser.add_argument("--output", help="Path of a json file to save the results to")
+    parser.add_argument("--baseline", help="Path of a saved results file to compare the results with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown or memory growth reported as a regression (default 0.2)")
+    arguments = parser.parse_args()
+
+    results = []
+    for scale in sorted(arguments.scales):
+        for name in arguments.cases:
+            result = {"case": name, "scale": scale, **measure(CASES[name], scale, arguments.min_time, name in MUTATING_CASES)}
+            results.append(result)
+            print(f"{name:>20} {scale:>8}: {result['ops_per_sec']:14.1f} ops/sec, peak {result['peak_bytes'] / 2**20:8.2f} MiB")
+
+    if arguments.output is not None:
+        metadata = {"python": platform.python_version(), "platform": platform.platform(), "date": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        with open(arguments.output, "w") as file:
+            json.dump({"metadata": metadata, "results": results}, file, indent=2)
+
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        print(f"Compared with {arguments.baseline} ({baseline['metadata']['date']}, Python {baseline['metadata']['python']}):")
+        regressions = compare(results, baseline, arguments.threshold)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
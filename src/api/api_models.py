@@ -12,6 +12,10 @@ Each of the following functions corresponds to an endpoint.
 `get_unbackup_models`
 `get_delete_models`
 `get_listbackups_models`
+`get_bulkcollections_models`
+`get_bulkbackups_models`
+`get_batchedit_models`
+`get_stale_models`
 
 """
 
@@ -21,8 +25,8 @@ def get_collection_models(api) -> dict[str, object]:
     collection_input_model = api.model("AddCollection", {
         "name":              fields.String(required=True, description="The unique name of the collection", default="Unique Name"),
         "description":       fields.String(required=True, description="The description of the collection", default="The description of the collection"),
-        "creation_date":     fields.String(required=False, description="Optional creation date. Set to current time if not set", default="1960-06-01 15:31:10"),
-        "modification_date": fields.String(required=False, description="Optional modification date. Set to current time if not set", default="1960-06-01 15:31:10"),
+        "creation_date":     fields.String(required=False, description="Optional ISO 8601 creation date, UTC unless an offset is given. Set to current time if not set", default="1960-06-01 15:31:10"),
+        "modification_date": fields.String(required=False, description="Optional ISO 8601 modification date, UTC unless an offset is given. Set to current time if not set", default="1960-06-01 15:31:10"),
         "updated":           fields.Boolean(required=False, description="Optional mark if the collection is up to date or not. Default to true", default=True)
     }, strict=True) #This makes flask_restx automatically input validate to enforce only these parameters
     
@@ -46,13 +50,17 @@ def get_overview_models(api) -> dict[str, object]:
     overview_success_model = api.model("OverviewSuccess", {
         "errors":   fields.Nested(api.model("NoError", {})),
         "message":  fields.String(default="Successfully Fetched Overview"),
-        "overview": fields.Raw(   default='["DataCollection1 | 2009-05-12 10:11:12 | Updated: True","DataCollection2 | 2025-02-04 08:15:49 | Updated: False"]')
+        "overview": fields.Raw(   default='["DataCollection1 | 2009-05-12 10:11:12 | Updated: True | Backups: 3","DataCollection2 | Never | Updated: False | Backups: 0"]'),
+        "next_cursor": fields.String(default=None, description="Cursor of the next page. Only set when 'limit' was given and there are more items"),
+        "generation": fields.Integer(default=0, description="Generation of the data, which the 'generation' parameter reads again")
     })
     
     overview_failure_model = api.model("OverviewFailure", {
         "errors":   fields.Raw(   default='{"ErrorType": "ErrorMessage"}'),
         "message":  fields.String(default="Action aborted. Exception raised"),
-        "overview": fields.Raw(   default="[]")
+        "overview": fields.Raw(   default="[]"),
+        "next_cursor": fields.String(default=None),
+        "generation": fields.Integer(default=None)
     })
 
     return {
@@ -67,21 +75,31 @@ def get_list_models(api) -> dict[str, object]:
         "overview": fields.Raw(   default={
             "DataCollection1": {
                 "description": "The best Collection", 
-                "creation_date": "Today", 
-                "modification_date": "13:58", 
-                "updated": True
+                "creation_date": "2009-05-12 10:11:12", 
+                "modification_date": "2025-02-04 08:15:49", 
+                "updated": True,
+                "last_backup_date": "2025-02-04 08:15:49",
+                "last_backup_location": "/home/user/backup.bak",
+                "backup_count": 3
             },"DataCollection2": {
                 "description": "The next best collection", 
-                "creation_date": "1960", 
-                "modification_date": "2080 1 January", 
-                "updated": False
-            }})
+                "creation_date": "1960-06-01 15:31:10", 
+                "modification_date": "2080-01-01 00:00:00", 
+                "updated": False,
+                "last_backup_date": None,
+                "last_backup_location": None,
+                "backup_count": 0
+            }}),
+        "next_cursor": fields.String(default=None, description="Cursor of the next page. Only set when 'limit' was given and there are more items"),
+        "generation": fields.Integer(default=0, description="Generation of the data, which the 'generation' parameter reads again")
     })
 
     list_failure_model = api.model("ListFailure", {
         "errors":   fields.Raw(   default='{"ErrorType": "ErrorMessage"}'),
         "message":  fields.String(default="Action aborted. Exception raised"),
-        "overview": fields.Raw(   default="{}")
+        "overview": fields.Raw(   default="{}"),
+        "next_cursor": fields.String(default=None),
+        "generation": fields.Integer(default=None)
     })
 
     return {
@@ -96,9 +114,12 @@ def get_info_models(api) -> dict[str, object]:
         "info": fields.Raw(       default={
             "name": "DataCollection1", 
             "description": "The best Collection", 
-            "creation_date": "Today", 
-            "modification_date": "13:58", 
-            "updated": True})
+            "creation_date": "2009-05-12 10:11:12", 
+            "modification_date": "2025-02-04 08:15:49", 
+            "updated": True,
+            "last_backup_date": "2025-02-04 08:15:49",
+            "last_backup_location": "/home/user/backup.bak",
+            "backup_count": 3})
     })
 
     info_failure_model = api.model("InfoFailure", {
@@ -117,7 +138,7 @@ def get_backup_models(api) -> dict[str, object]:
         "collection_name": fields.String(required=True, description="The unique name of the collection which the backup will be added to", default="Unique Name"),
         "backup_name":     fields.String(required=True, description="The unique name of the backup to be created", default="Unique Name"),
         "backup_location": fields.String(required=True, description="Location where the backup is stored", default="/home/user/backup.bak"),
-        "backup_date":     fields.String(required=False, description="Optional backup date. Set to current time if not set", default="1960-06-01 15:31:10")
+        "backup_date":     fields.String(required=False, description="Optional ISO 8601 backup date, UTC unless an offset is given. Set to current time if not set", default="1960-06-01 15:31:10")
     }, strict=True)
 
     backup_success_model = api.model("AddBackupSuccess", {
@@ -143,15 +164,20 @@ def get_search_models(api) -> dict[str, object]:
         "search": fields.Raw(     default={
             "DataCollection1": {
                 "description": "The best Collection", 
-                "creation_date": "Today", 
-                "modification_date": "13:58", 
-                "updated": True}})
+                "creation_date": "2009-05-12 10:11:12", 
+                "modification_date": "2025-02-04 08:15:49", 
+                "updated": True,
+                "last_backup_date": "2025-02-04 08:15:49",
+                "last_backup_location": "/home/user/backup.bak",
+                "backup_count": 3}}),
+        "next_cursor": fields.String(default=None, description="Cursor of the next page. Only set when 'limit' was given and there are more items")
     })
 
     search_failure_model = api.model("SearchFailure", {
         "errors":   fields.Raw(   default='{"MissingParameter": "Parameter \"name\" is required"}'),
         "message":  fields.String(default="Action aborted. Exception raised"),
-        "search": fields.Raw(   default="{}")
+        "search": fields.Raw(   default="{}"),
+        "next_cursor": fields.String(default=None)
     })
 
     return {
@@ -164,8 +190,8 @@ def get_edit_models(api) -> dict[str, object]:
         "collection_name":       fields.String(required=True, description="The unique name of the collection to be edited", default="Unique Name"),
         "name":                  fields.String(required=False, description="The new unique name of the collection", default="New Unique Name"),
         "description":           fields.String(required=False, description="The new description of the collection", default="New Description"),
-        "creation_date":         fields.String(required=False, description="The new creation date of the collection", default="New Date"),
-        "modification_date":     fields.String(required=False, description="The new modification date of the collection", default="New Date"),
+        "creation_date":         fields.String(required=False, description="The new ISO 8601 creation date of the collection", default="1960-06-01 15:31:10"),
+        "modification_date":     fields.String(required=False, description="The new ISO 8601 modification date of the collection", default="1960-06-01 15:31:10"),
         "updated":               fields.Boolean(required=False, description="Whether or not the collection is up to date", default=True)
     }, strict=True)
 
@@ -229,22 +255,129 @@ def get_listbackups_models(api) -> dict[str, object]:
         "message":        fields.String(default="Successfully Fetched a List of BackupEntries"),
         "backup_entries": fields.Raw(   default={
             "BackupEntry1": {
-                "date": "1960", 
+                "date": "1960-06-01 15:31:10", 
                 "location": "/home/user/backup.bak"
             }, "BackupEntry2": {
-                "date": "2015", 
+                "date": "2015-02-04 08:15:49", 
                 "location": "On top of the really big shelf"
             }
-        })
+        }),
+        "next_cursor": fields.String(default=None, description="Cursor of the next page. Only set when 'limit' was given and there are more items")
     })
 
     listbackups_failure_model = api.model("ListBackupsFailure", {
         "errors":         fields.Raw(   default='{"MissingParameter": "Parameter \"name\" is required"}'),
         "message":        fields.String(default="Action aborted. Exception raised"),
-        "backup_entries": fields.Raw(   default="{}")
+        "backup_entries": fields.Raw(   default="{}"),
+        "next_cursor": fields.String(default=None)
     })
 
     return {
         "success": listbackups_success_model,
         "failure": listbackups_failure_model
     }
+
+def get_bulkcollections_models(api) -> dict[str, object]:
+    bulkcollections_success_model = api.model("BulkCollectionsSuccess", {
+        "errors":      fields.Nested(api.model("NoError", {})),
+        "message":     fields.String(default="Bulk Import Finished"),
+        "imported":    fields.Integer(default=2, description="Amount of collections created"),
+        "failed":      fields.Integer(default=1, description="Amount of lines that were invalid or rejected"),
+        "rejected_backup_entries": fields.Integer(default=1, description="Amount of items of 'backup_entries' rejected in created collections"),
+        "line_errors": fields.Raw(default=[{"line": 3, "errors": {"CollectionAlreadyExistsError": "Collection with name 'name' already exists"}},
+                                           {"line": 4, "backup_entry": 1, "errors": {"BackupAlreadyExistsError": "Backup with name 'name' already exists"}}],
+                                  description="The errors of the first 1000 failed lines and rejected backup entries. The errors of a rejected "
+                                              "backup entry hold its index in 'backup_entries', the collection of its line was still created")
+    })
+
+    bulkcollections_failure_model = api.model("BulkCollectionsFailure", {
+        "errors":      fields.Raw(   default='{"ErrorType": "ErrorMessage"}'),
+        "message":     fields.String(default="Action aborted. Exception raised"),
+        "imported":    fields.Integer(default=0),
+        "failed":      fields.Integer(default=0),
+        "rejected_backup_entries": fields.Integer(default=0),
+        "line_errors": fields.Raw(   default="[]")
+    })
+
+    return {
+        "success": bulkcollections_success_model,
+        "failure": bulkcollections_failure_model
+    }
+
+def get_bulkbackups_models(api) -> dict[str, object]:
+    bulkbackups_success_model = api.model("BulkBackupsSuccess", {
+        "errors":      fields.Nested(api.model("NoError", {})),
+        "message":     fields.String(default="Bulk Import Finished"),
+        "imported":    fields.Integer(default=2, description="Amount of backups created"),
+        "failed":      fields.Integer(default=1, description="Amount of lines that were invalid or rejected"),
+        "line_errors": fields.Raw(default=[{"line": 3, "errors": {"CollectionNotFoundError": "Collection with name 'name' not found"}}],
+                                  description="The errors of the first 1000 failed lines")
+    })
+
+    bulkbackups_failure_model = api.model("BulkBackupsFailure", {
+        "errors":      fields.Raw(   default='{"ErrorType": "ErrorMessage"}'),
+        "message":     fields.String(default="Action aborted. Exception raised"),
+        "imported":    fields.Integer(default=0),
+        "failed":      fields.Integer(default=0),
+        "line_errors": fields.Raw(   default="[]")
+    })
+
+    return {
+        "success": bulkbackups_success_model,
+        "failure": bulkbackups_failure_model
+    }
+
+def get_batchedit_models(api) -> dict[str, object]:
+    batchedit_item_model = api.model("BatchEditItem", {
+        "collection_name":       fields.String(required=True, description="The unique name of the collection to be edited", default="Unique Name"),
+        "name":                  fields.String(required=False, description="The new unique name of the collection", default="New Unique Name"),
+        "description":           fields.String(required=False, description="The new description of the collection", default="New Description"),
+        "creation_date":         fields.String(required=False, description="The new ISO 8601 creation date of the collection", default="1960-06-01 15:31:10"),
+        "modification_date":     fields.String(required=False, description="The new ISO 8601 modification date of the collection", default="1960-06-01 15:31:10"),
+        "updated":               fields.Boolean(required=False, description="Whether or not the collection is up to date", default=True)
+    }, strict=True)
+
+    batchedit_input_model = api.model("BatchEdit", {
+        "edits": fields.List(fields.Nested(batchedit_item_model), required=True, description="The edits, applied in order. Either all or none are applied")
+    }, strict=True)
+
+    batchedit_success_model = api.model("BatchEditSuccess", {
+        "errors":  fields.Nested(api.model("NoError", {})),
+        "message": fields.String(default="Edits Were Successfull"),
+        "edited":  fields.Integer(default=2, description="Amount of edits applied")
+    })
+
+    batchedit_failure_model = api.model("BatchEditFailure", {
+        "errors":  fields.Raw(   default='{"CollectionNotFoundError": "Edit 1: Collection with name \'name\' not found"}'),
+        "message": fields.String(default="No Edit Was Made"),
+        "edited":  fields.Integer(default=0)
+    })
+
+    return {
+        "input": batchedit_input_model,
+        "success": batchedit_success_model,
+        "failure": batchedit_failure_model
+    }
+
+def get_stale_models(api) -> dict[str, object]:
+    stale_success_model = api.model("StaleSuccess", {
+        "errors":  fields.Nested(api.model("NoError", {})),
+        "message": fields.String(default="Successfully Fetched Stale Collections"),
+        "cutoff":  fields.String(default="2025-02-04 08:15:49", description="Collections last backed up before this date are stale"),
+        "stale":   fields.Raw(   default={
+            "DataCollection1": None,
+            "DataCollection2": "2009-05-12 10:11:12"
+        }, description="Date of the latest BackupEntry of every stale collection, least recently backed up first. null if it has none")
+    })
+
+    stale_failure_model = api.model("StaleFailure", {
+        "errors":  fields.Raw(   default='{"InvalidParameter": "Parameter \"days\" must be a number between 0 and 1000000"}'),
+        "message": fields.String(default="Action aborted. Exception raised"),
+        "cutoff":  fields.String(default=None),
+        "stale":   fields.Raw(   default="{}")
+    })
+
+    return {
+        "success": stale_success_model,
+        "failure": stale_failure_model
+    }
@@ -1,6 +1,7 @@
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.instrumentation import timed
 import utility
 
 models = api_models.get_backup_models(api)
@@ -14,10 +15,11 @@ class Backup(Resource):
     @api.expect(models["input"])
     @api.marshal_with(models["success"], code=200)                        # type: ignore
     @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
+    @timed
     def post(self):
         try:
-            args = api.payload
-            args.setdefault("backup_date", utility.get_current_datestring())
+            args = utility.parse_dates(api.payload)
+            args.setdefault("backup_date", utility.get_current_timestamp())
 
             data_collection = self.collection_manager.get(args["collection_name"])
             data_collection.add_backup(args["backup_name"], args["backup_date"], args["backup_location"])
@@ -0,0 +1,33 @@
+from flask_restx import Resource, abort
+from api import main_namespace as api
+from api import api_models
+from api.instrumentation import timed
+import utility
+from custom_exceptions import InvalidDateError
+
+models = api_models.get_batchedit_models(api)
+
+class BatchEdit(Resource):
+    """Class for the POST /BatchEdit endpoint."""
+    def __init__(self, api, *args, **kwargs):
+        super().__init__(api, args, kwargs)
+        self.collection_manager = kwargs["collection_manager"]
+
+    @api.expect(models["input"])
+    @api.marshal_with(models["success"], code=200)                        # type: ignore
+    @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
+    @timed
+    def post(self):
+        try:
+            edits = []
+            for index, edit in enumerate(api.payload["edits"]):
+                try:
+                    edit = utility.parse_dates(edit)
+                except InvalidDateError as e:
+                    raise InvalidDateError(f"Edit {index}: {e}") from e # Numbered like the errors of edit_collections()
+                updated_json = {key: value for key, value in edit.items() if key != "collection_name"}
+                edits.append({"collection_name": edit["collection_name"], "updated_json": updated_json})
+            self.collection_manager.edit_collections(edits)
+            return {"errors": {}, "message": "Edits Were Successfull", "edited": len(edits)}, 200
+        except Exception as e:
+            abort(400, errors={type(e).__name__: str(e)}, message="No Edit Was Made") # type: ignore
@@ -0,0 +1,37 @@
+from flask import request
+from flask_restx import Resource, abort
+from api import main_namespace as api
+from api import api_models
+from api.instrumentation import timed
+from bulk_import import decode_body, iter_lines, import_collections
+
+models = api_models.get_bulkcollections_models(api)
+
+class BulkCollections(Resource):
+    """Class for the POST /BulkCollections endpoint."""
+    def __init__(self, api, *args, **kwargs):
+        super().__init__(api, args, kwargs)
+        self.collection_manager = kwargs["collection_manager"]
+
+    @api.marshal_with(models["success"], code=200)                        # type: ignore
+    @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
+    @api.doc(description="Creates one collection per line of an NDJSON request body (Content-Type: application/x-ndjson), "
+                         "optionally gzip compressed (Content-Encoding: gzip). "
+                         "Each line has the same keys as the POST /Collection body, plus an optional 'backup_entries' list "
+                         "like in the output of GET /Export. Invalid lines are reported and skipped. "
+                         "If the body can't be read to its end (like a corrupted gzip body), the lines read before are still imported, "
+                         "and the 400 response holds their counts.")
+    @timed
+    def post(self):
+        try:
+            # Read line by line while the body is being received, so it's never held in memory
+            result = import_collections(self.collection_manager, iter_lines(decode_body(request.stream, request.content_encoding)))
+        except Exception as e:
+            abort(400, errors={type(e).__name__: str(e)}, message="Action aborted. Exception raised") # type: ignore
+        counts = {"imported": result.imported, "failed": result.failed,
+                  "rejected_backup_entries": result.rejected_backup_entries, "line_errors": result.line_errors}
+        if result.stream_error is not None:
+            # The lines read before the error were imported, so the counts tell the client what was applied
+            error = result.stream_error
+            abort(400, errors={type(error).__name__: str(error)}, message="Bulk Import Stopped By An Error Reading The Body", **counts) # type: ignore
+        return {"errors": {}, "message": "Bulk Import Finished", **counts}, 200
@@ -0,0 +1,41 @@
+"""Serves GET responses from the ResponseCache of the app.
+
+The serialized body of a successful response is cached under the path and query string of the
+request, tagged with the generation of the CollectionManager. A cache hit skips both building
+the payload and `marshal_with`. Responses carry an "X-Cache: HIT" or "X-Cache: MISS" header.
+
+Typical usage example:
+    @conditional(store_etag)
+    @cached
+    @api.marshal_with(...)
+    def get(self):
+        ...
+"""
+
+import functools
+from collections.abc import Callable
+from flask import Response, request
+
+def cached(method : Callable) -> Callable:
+    """Decorator for Resource.get methods of resources with a `response_cache` attribute.
+
+    Must be applied above `marshal_with`, and below `conditional` so a 304 doesn't count as a miss.
+    Only for endpoints whose response depends on nothing but the query string and the whole store.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.response_cache
+        if cache is None or cache.max_bytes == 0:
+            return method(self, *args, **kwargs)
+        key = request.full_path
+        # Read before the payload is built, so a mutation while building makes the entry stale instead of wrong
+        generation = self.collection_manager.generation
+        body = cache.get(key, generation)
+        if body is not None:
+            return Response(body, mimetype="application/json", headers={"X-Cache": "HIT"})
+
+        # Serialized the same way flask_restx would, so hits and misses send the same bytes
+        response = self.api.make_response(method(self, *args, **kwargs), 200, {"X-Cache": "MISS"})
+        cache.put(key, generation, response.get_data())
+        return response
+    return wrapper
@@ -1,6 +1,7 @@
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.instrumentation import timed
 import utility
 
 models = api_models.get_collection_models(api)
@@ -14,12 +15,13 @@ class Collection(Resource):
     @api.expect(models["input"])
     @api.marshal_with(models["success"], code=200)                        # type: ignore
     @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
+    @timed
     def post(self):
         try:
-            args = api.payload
+            args = utility.parse_dates(api.payload)
             
-            args.setdefault("creation_date", utility.get_current_datestring())
-            args.setdefault("modification_date", utility.get_current_datestring())
+            args.setdefault("creation_date", utility.get_current_timestamp())
+            args.setdefault("modification_date", utility.get_current_timestamp())
             args.setdefault("updated", True)
         
             self.collection_manager.add_collection(
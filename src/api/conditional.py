@@ -0,0 +1,88 @@
+"""Conditional GET support (ETag / If-None-Match) for the read endpoints.
+
+ETags are built from the generation counters of the CollectionManager, which are incremented
+after every mutation. Checking if a client is up to date is therefore a counter lookup, and a
+304 Not Modified response is sent without building the payload at all.
+
+Endpoints listing every collection use the generation of the whole store, while endpoints for
+a single collection (selected with the `name` GET parameter) use the generation of that collection,
+so they stay cacheable while other collections change.
+
+Typical usage example:
+    @conditional(store_etag)
+    @api.marshal_with(...)
+    def get(self):
+        ...
+"""
+
+import functools
+from collections.abc import Callable
+from flask import Response, request
+from werkzeug.http import quote_etag
+from api import main_namespace as api
+
+def make_etag(manager, generation : int, variant : str = "") -> str:
+    """Returns the ETag of `generation` in `manager`. `variant` tells apart other representations of the same data"""
+    return f"{manager.store_id}.{generation}{variant}"
+
+def store_etag(resource) -> str:
+    """Returns the ETag of the current generation of the whole store"""
+    manager = resource.collection_manager
+    return make_etag(manager, manager.generation)
+
+def snapshot_etag(resource) -> str:
+    """Returns the ETag of the generation pinned by the `generation` GET parameter, or of the current generation of the whole store"""
+    generation = request.args.get("generation")
+    if generation is None or not generation.isdigit():
+        return store_etag(resource) # The endpoint reports an invalid generation
+    return make_etag(resource.collection_manager, int(generation))
+
+def collection_etag(resource) -> str | None:
+    """Returns the ETag of the collection named by the `name` GET parameter, or None if there is no such collection"""
+    name = request.args.get("name")
+    if name is None:
+        return None
+    try:
+        collection = resource.collection_manager.snapshot().get(name)
+    except Exception:
+        return None # The endpoint reports the error
+    return make_etag(resource.collection_manager, collection.generation)
+
+def is_not_modified(etag : str) -> bool:
+    """Returns True if the If-None-Match header of the request matches `etag`"""
+    return request.if_none_match.contains_weak(etag)
+
+def etag_headers(etag : str) -> dict[str, str]:
+    """Returns the headers sent with every response that has an ETag"""
+    # no-cache makes clients revalidate every time instead of guessing how long the data stays fresh
+    return {"ETag": quote_etag(etag, weak=True), "Cache-Control": "no-cache"}
+
+def not_modified(etag : str) -> Response:
+    """Returns a 304 Not Modified response for `etag`"""
+    return Response(status=304, headers=etag_headers(etag))
+
+def conditional(get_etag : Callable[[object], str | None]) -> Callable:
+    """Decorator for Resource.get methods adding an ETag to successful responses.
+
+    Must be applied above `marshal_with`, so a 304 response skips it.
+
+    Args:
+        `get_etag`: Called with the Resource to get the ETag of the current data, or None to skip the ETag
+    """
+    def decorator(method : Callable) -> Callable:
+        @api.response(304, "Not Modified. The data still matches the ETag sent in If-None-Match")
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # The ETag is read before the payload is built, so it's never newer than the payload
+            etag = get_etag(self)
+            if etag is None:
+                return method(self, *args, **kwargs)
+            if is_not_modified(etag):
+                return not_modified(etag)
+            response = method(self, *args, **kwargs)
+            if isinstance(response, Response): # Already serialized, like a cached response
+                response.headers.update(etag_headers(etag))
+                return response
+            return response, 200, etag_headers(etag)
+        return wrapper
+    return decorator
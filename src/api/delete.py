@@ -2,6 +2,7 @@ from flask import request
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.instrumentation import timed
 
 models = api_models.get_delete_models(api)
 
@@ -20,6 +21,7 @@ class Delete(Resource):
             "required": True
         }
     })
+    @timed
     def delete(self):
         name = request.args.get("name", type=str)
         if name is None:
@@ -1,6 +1,8 @@
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.instrumentation import timed
+import utility
 
 models = api_models.get_edit_models(api)
 
@@ -13,15 +15,14 @@ class Edit(Resource):
     @api.expect(models["input"])
     @api.marshal_with(models["success"], code=200)                        # type: ignore
     @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
+    @timed
     def post(self):
         try:
-            args = api.payload
-            for key, value in args.items():
-                if key != "collection_name":
-                    self.collection_manager.edit_collection(args["collection_name"], {key: value})
-                
-                if key == "name": #So we don't lose track of the name when changing it
-                    args["collection_name"] = value
+            args = utility.parse_dates(api.payload)
+            updated_json = {key: value for key, value in args.items() if key != "collection_name"}
+            # Applies every key or none of them
+            self.collection_manager.edit_collections([{"collection_name": args["collection_name"], "updated_json": updated_json}])
             return {"errors": {}, "message": "Edit Was Successfull"}, 200
         except Exception as e:
-            abort(400, errors={type(e).__name__: str(e)}, message="No Edit Was Made") # type: ignore
+            error = e.__cause__ or e # Without the "Edit 0: " prefix of edit_collections()
+            abort(400, errors={type(error).__name__: str(error)}, message="No Edit Was Made") # type: ignore
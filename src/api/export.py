@@ -0,0 +1,42 @@
+import json
+from flask import Response, request
+from flask_restx import Resource, abort
+from api import main_namespace as api
+from api.conditional import conditional, snapshot_etag
+from api.streaming import NDJSON_MIMETYPE, buffered_chunks, gzip_chunks, iterate_pages
+from api.snapshots import GENERATION_HEADER, GENERATION_PARAMS, get_snapshot
+from api.instrumentation import timed
+from bulk_import import export_record
+
+class Export(Resource):
+    """Class for the GET /Export endpoint."""
+    def __init__(self, api, *args, **kwargs):
+        super().__init__(api, args, kwargs)
+        self.collection_manager = kwargs["collection_manager"]
+
+    @conditional(snapshot_etag)
+    @api.response(200, "NDJSON with one collection per line, including its BackupEntries in 'backup_entries'")
+    @api.doc(params={"gzip": {
+        "description": "Optional. If true, the NDJSON is sent gzip compressed as a .ndjson.gz file",
+        "type": "boolean",
+        "required": False
+    }, **GENERATION_PARAMS})
+    @timed
+    def get(self):
+        compress = request.args.get("gzip", "false").lower()
+        if compress not in ["true", "false"]:
+            abort(400, errors={"InvalidParameter": "Parameter \"gzip\" is not a valid value. Only (true/false) is valid input"}, message="Action aborted. Exception raised") # type: ignore
+            return
+
+        # Generated lazily one page of collections at a time, so the dump is never held in memory.
+        # The pages come from one snapshot, so the dump is consistent without holding the lock of the manager
+        snapshot = get_snapshot(self.collection_manager)
+        generation = str(snapshot.generation)
+        lines = ((json.dumps(export_record(collection)) + "\n").encode()
+                 for page in iterate_pages(snapshot) for collection in page)
+        chunks = buffered_chunks(lines)
+        if compress == "true":
+            return Response(gzip_chunks(chunks), mimetype="application/gzip",
+                            headers={"Content-Disposition": "attachment; filename=backuporganizer-export.ndjson.gz", GENERATION_HEADER: generation})
+        return Response(chunks, mimetype=NDJSON_MIMETYPE,
+                        headers={"Content-Disposition": "attachment; filename=backuporganizer-export.ndjson", GENERATION_HEADER: generation})
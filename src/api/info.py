@@ -2,6 +2,8 @@ from flask import request
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.conditional import conditional, collection_etag
+from api.instrumentation import timed
 
 models = api_models.get_info_models(api)
 
@@ -11,6 +13,7 @@ class Info(Resource):
         super().__init__(api, args, kwargs)
         self.collection_manager = kwargs["collection_manager"]
     
+    @conditional(collection_etag)
     @api.marshal_with(models["success"], code=200)                        # type: ignore
     @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
     #This is for declaring GET parameters in swagger:
@@ -19,13 +22,15 @@ class Info(Resource):
         "default": "Unique Name",
         "required": True
     }})
+    @timed
     def get(self):
         name = request.args.get("name")
         if name is None:
             abort(400, errors={"MissingParameter": "Parameter \"name\" is required"}, message="Action aborted. Exception raised") # type: ignore
             return
         try:
-            data_collection = self.collection_manager.get(name)
+            # Read from the snapshot, so the request never waits for the manager lock behind writers
+            data_collection = self.collection_manager.snapshot().get(name)
             info = data_collection.full_json()
             return {"errors":{}, "message": "Successfully Fetched Info", "info": info}
         except Exception as e:
@@ -0,0 +1,80 @@
+"""Records the metrics of every request to the resources of the API. See metrics.py.
+
+`instrumented()` returns a decorator for the view functions of the resources, meant for
+`Api.decorators`. It times the whole request, including the serialization of the response, and
+records it with its status code and the types of its errors.
+
+The `timed` decorator marks when the handler of a Resource method starts and ends, which splits
+the latency into the validation, manager and marshalling stages. It also takes the error types
+from the "errors" of an `abort()` in the handler, which are the names of the exceptions caught.
+Requests whose handler doesn't run (like 304 responses, cache hits and payloads failing the
+validation of flask-restx) are only recorded with their total latency. The body of a streamed
+response is generated after the request is recorded, so it isn't included.
+
+Typical usage example:
+    @conditional(store_etag)
+    @api.marshal_with(...)
+    @timed
+    def get(self):
+        ...
+"""
+
+import functools
+import time
+from collections.abc import Callable
+from flask import g, request
+from werkzeug.exceptions import HTTPException
+from metrics import Metrics
+
+def timed(method : Callable) -> Callable:
+    """Decorator for Resource methods marking the start and end of the handler. Must be the innermost decorator"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        g.metrics_handler_start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except HTTPException as e:
+            errors = (getattr(e, "data", None) or {}).get("errors")
+            if errors:
+                g.metrics_error_types = list(errors)
+            raise
+        finally:
+            g.metrics_handler_end = time.perf_counter()
+    return wrapper
+
+def instrumented(metrics : Metrics) -> Callable:
+    """Returns a decorator for the view functions of resources, recording their requests in `metrics`"""
+    def decorator(view : Callable) -> Callable:
+        endpoint = view.view_class.__name__ # type: ignore
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            g.metrics_handler_start = None
+            g.metrics_error_types = None
+            start = time.perf_counter()
+            try:
+                response = view(*args, **kwargs)
+            except Exception as e:
+                status = e.code if isinstance(e, HTTPException) and e.code is not None else 500
+                error_types = g.metrics_error_types or [type(e).__name__]
+                metrics.record(endpoint, request.method, status, stage_durations(start, time.perf_counter(), False), error_types)
+                raise
+            metrics.record(endpoint, request.method, response.status_code, stage_durations(start, time.perf_counter(), True))
+            return response
+        return wrapper
+    return decorator
+
+def stage_durations(start : float, end : float, succeeded : bool) -> dict[str, float]:
+    """Returns the seconds taken by each stage of the current request, from the marks set by `timed`
+
+    Args:
+        `succeeded`: Whether a response was built. Failed requests have no marshalling stage
+    """
+    durations = {"total": end - start}
+    handler_start = g.metrics_handler_start
+    if handler_start is not None:
+        durations["validation"] = handler_start - start
+        durations["manager"] = g.metrics_handler_end - handler_start
+        if succeeded:
+            durations["marshalling"] = end - g.metrics_handler_end
+    return durations
@@ -1,6 +1,13 @@
+from flask import request
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.caching import cached
+from api.conditional import conditional, snapshot_etag, make_etag, is_not_modified, not_modified, etag_headers
+from api.pagination import PAGINATION_PARAMS, get_pagination_args, encode_next_cursor
+from api.streaming import STREAMING_PARAMS, get_stream_format, iterate_pages, json_chunks, ndjson_chunks, stream_response
+from api.snapshots import GENERATION_HEADER, GENERATION_PARAMS, get_snapshot
+from api.instrumentation import timed
 
 models = api_models.get_list_models(api)
 
@@ -9,12 +16,58 @@ class List(Resource):
     def __init__(self, api, *args, **kwargs):
         super().__init__(api, args, kwargs)
         self.collection_manager = kwargs["collection_manager"]
-    
+        self.response_cache = kwargs.get("response_cache")
+
+    def dispatch_request(self, *args, **kwargs):
+        """Streams the response when negotiated, bypassing `marshal_with` which needs the whole dict in memory"""
+        if request.method == "GET":
+            stream_format = get_stream_format()
+            after, limit = get_pagination_args()
+            if stream_format is not None and limit is None:
+                return self.stream(stream_format, after)
+        return super().dispatch_request(*args, **kwargs)
+
+    def stream(self, stream_format : str, after : int):
+        """Returns a chunked response with every collection after `after` in a snapshot, serialized one page at a time"""
+        snapshot = get_snapshot(self.collection_manager)
+        generation = snapshot.generation
+        etag = make_etag(self.collection_manager, generation, "-ndjson" if stream_format == "ndjson" else "")
+        if is_not_modified(etag):
+            return not_modified(etag)
+        pages = iterate_pages(snapshot, after)
+        if stream_format == "ndjson":
+            chunks = ndjson_chunks([collection.full_json() for collection in page] for page in pages)
+        else:
+            head = {"errors": {}, "message": "Successfully Fetched a Detailed Overview", "next_cursor": None, "generation": generation}
+            chunks = json_chunks(head, "overview", ([split_name(collection.full_json()) for collection in page] for page in pages))
+        response = stream_response(chunks, stream_format)
+        response.headers.update(etag_headers(etag))
+        response.headers[GENERATION_HEADER] = str(generation)
+        return response
+
+    @conditional(snapshot_etag)
+    @cached
     @api.marshal_with(models["success"], code=200)                        # type: ignore
     @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
+    @api.doc(params={**PAGINATION_PARAMS, **STREAMING_PARAMS, **GENERATION_PARAMS})
+    @timed
     def get(self):
+        after, limit = get_pagination_args()
+        snapshot = get_snapshot(self.collection_manager)
+        generation = snapshot.generation # Read before the payload, like the ETag
         try:
-            overview = self.collection_manager.json_overview()
-            return {"errors":{}, "message": "Successfully Fetched a Detailed Overview", "overview": overview}
+            if after == 0 and limit is None:
+                overview = snapshot.json_overview()
+                next_cursor = None
+            else:
+                collections, next_cursor = snapshot.page(after, limit)
+                overview = dict(split_name(collection.full_json()) for collection in collections)
+            return {"errors":{}, "message": "Successfully Fetched a Detailed Overview", "overview": overview, "next_cursor": encode_next_cursor(next_cursor),
+                    "generation": generation}
         except Exception as e:
             abort(400, errors= {type(e).__name__: str(e)}, message= "Action aborted. Exception raised") # type: ignore
+
+def split_name(json : dict) -> tuple[str, dict]:
+    """Splits the name out of the `full_json()` of a collection, as in `json_overview()`"""
+    name = json.pop("name")
+    return name, json
@@ -2,15 +2,22 @@ from flask import request
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.conditional import conditional, collection_etag
+from api.pagination import PAGINATION_PARAMS, get_pagination_args, get_limit_arg, encode_next_cursor
+from api.instrumentation import timed
+import utility
 
 models = api_models.get_listbackups_models(api)
 
+ORDERS = {"asc": False, "desc": True} # `order` -> descending
+
 class ListBackups(Resource):
     """Class for the GET /ListBackups endpoint."""
     def __init__(self, api, *args, **kwargs):
         super().__init__(api, args, kwargs)
         self.collection_manager = kwargs["collection_manager"]
     
+    @conditional(collection_etag)
     @api.marshal_with(models["success"], code=200)                        # type: ignore
     @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
     @api.doc(params={
@@ -18,15 +25,56 @@ class ListBackups(Resource):
             "description": "The name of the DataCollection to get the BackupEntries from",
             "default": "Unique Name",
             "required": True
-    }})
+        },
+        "since": {
+            "description": "Optional ISO 8601 date. Only BackupEntries dated at or after it are returned, in date order",
+            "required": False
+        },
+        "until": {
+            "description": "Optional ISO 8601 date. Only BackupEntries dated before it are returned, in date order",
+            "required": False
+        },
+        "order": {
+            "description": "Optional date order of the BackupEntries: 'asc' (oldest first) or 'desc' (newest first). Insertion order if neither this, 'since' nor 'until' is set",
+            "enum": list(ORDERS),
+            "required": False
+        },
+        **PAGINATION_PARAMS
+    })
+    @timed
     def get(self):
         name = request.args.get("name")
         if name is None:
             abort(400, errors={"MissingParameter": "Parameter \"name\" is required"}, message="Action aborted. Exception raised") # type: ignore
             return
+        if any(key in request.args for key in ("since", "until", "order")):
+            return self.get_range(name)
+        after, limit = get_pagination_args()
+        try:
+            if after == 0 and limit is None:
+                # Read from the snapshot, so the request never waits for the manager lock behind writers
+                backup_entries = self.collection_manager.snapshot().get(name).get_backups_json()
+                next_cursor = None
+            else:
+                # The cursors are insertion numbers of the live collection, which the snapshot doesn't keep
+                backup_entries, next_cursor = self.collection_manager.get(name).get_backups_page(after, limit)
+            return {"errors":{}, "message": "Successfully Fetched a List of BackupEntries", "backup_entries": backup_entries, "next_cursor": encode_next_cursor(next_cursor)}
+        except Exception as e:
+            abort(400, errors= {type(e).__name__: str(e)}, message= "Action aborted. Exception raised") # type: ignore
+
+    def get_range(self, name : str) -> dict:
+        """Returns the BackupEntries of collection `name` dated in the range of the GET parameters, in date order"""
+        order = request.args.get("order", "asc")
+        if order not in ORDERS:
+            abort(400, errors={"InvalidParameter": "Parameter \"order\" must be 'asc' or 'desc'"}, message="Action aborted. Exception raised") # type: ignore
+        limit = get_limit_arg()
         try:
-            data_collection = self.collection_manager.get(name)
-            backup_entries = data_collection.get_backups_json()
-            return {"errors":{}, "message": "Successfully Fetched a List of BackupEntries", "backup_entries": backup_entries}
+            since = None if "since" not in request.args else utility.parse_timestamp(request.args["since"])
+            until = None if "until" not in request.args else utility.parse_timestamp(request.args["until"])
+            after = None if "cursor" not in request.args else utility.decode_date_cursor(request.args["cursor"])
+            data_collection = self.collection_manager.get(name) # The date index of the live collection isn't in the snapshot
+            backup_entries, next_key = data_collection.get_backups_range(since, until, limit, ORDERS[order], after)
+            next_cursor = None if next_key is None else utility.encode_date_cursor(next_key)
+            return {"errors":{}, "message": "Successfully Fetched a List of BackupEntries", "backup_entries": backup_entries, "next_cursor": next_cursor}
         except Exception as e:
             abort(400, errors= {type(e).__name__: str(e)}, message= "Action aborted. Exception raised") # type: ignore
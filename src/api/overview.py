@@ -1,6 +1,11 @@
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.caching import cached
+from api.conditional import conditional, snapshot_etag
+from api.pagination import PAGINATION_PARAMS, get_pagination_args, encode_next_cursor
+from api.snapshots import GENERATION_PARAMS, get_snapshot
+from api.instrumentation import timed
 
 models = api_models.get_overview_models(api)
 
@@ -9,12 +14,26 @@ class Overview(Resource):
     def __init__(self, api, *args, **kwargs):
         super().__init__(api, args, kwargs)
         self.collection_manager = kwargs["collection_manager"]
+        self.response_cache = kwargs.get("response_cache")
     
+    @conditional(snapshot_etag)
+    @cached
     @api.marshal_with(models["success"], code=200)                        # type: ignore
     @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
+    @api.doc(params={**PAGINATION_PARAMS, **GENERATION_PARAMS})
+    @timed
     def get(self):
+        after, limit = get_pagination_args()
+        snapshot = get_snapshot(self.collection_manager)
+        generation = snapshot.generation # Read before the payload, like the ETag
         try:
-            overview = self.collection_manager.overview()
-            return {"errors":{}, "message": "Successfully Fetched Overview", "overview": overview}
+            if after == 0 and limit is None:
+                overview = snapshot.overview()
+                next_cursor = None
+            else:
+                collections, next_cursor = snapshot.page(after, limit)
+                overview = [collection.brief_str() for collection in collections]
+            return {"errors":{}, "message": "Successfully Fetched Overview", "overview": overview, "next_cursor": encode_next_cursor(next_cursor),
+                    "generation": generation}
         except Exception as e:
             abort(400, errors= {type(e).__name__: str(e)}, message= "Action aborted. Exception raised") # type: ignore
@@ -0,0 +1,54 @@
+"""Helpers for the `limit` and `cursor` GET parameters of the paginated endpoints.
+
+Paginated endpoints return every item when `limit` isn't set. Otherwise they return at most
+`limit` items, plus a `next_cursor` to pass as `cursor` to get the next page. Cursors are
+opaque strings, and stay valid while items are added and removed.
+"""
+
+from flask import request
+from flask_restx import abort
+import utility
+
+MAX_LIMIT = 10000
+
+PAGINATION_PARAMS = {
+    "limit": {
+        "description": f"Optional max amount of items to return (1-{MAX_LIMIT}). Everything is returned if not set",
+        "type": "integer",
+        "required": False
+    },
+    "cursor": {
+        "description": "Optional cursor from the 'next_cursor' of the previous page",
+        "required": False
+    }
+}
+
+def get_pagination_args() -> tuple[int, int | None]:
+    """Reads the `cursor` and `limit` GET parameters, aborting with 400 if they are invalid.
+
+    Returns:
+        The position to continue after (0 for the first page), and the limit (None if not set)
+    """
+    limit = get_limit_arg()
+    cursor = request.args.get("cursor")
+    if cursor is None:
+        return 0, limit
+    try:
+        return utility.decode_cursor(cursor), limit
+    except Exception as e:
+        abort(400, errors={type(e).__name__: str(e)}, message="Action aborted. Exception raised") # type: ignore
+
+def get_limit_arg() -> int | None:
+    """Reads the `limit` GET parameter, aborting with 400 if it is invalid. Returns None if it's not set"""
+    limit = request.args.get("limit")
+    if limit is None:
+        return None
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_LIMIT:
+        abort(400, errors={"InvalidParameter": f"Parameter \"limit\" must be a number between 1 and {MAX_LIMIT}"}, message="Action aborted. Exception raised") # type: ignore
+    return int(limit)
+
+def encode_next_cursor(next_cursor : int | None) -> str | None:
+    """Returns the opaque `next_cursor` to send to the client"""
+    if next_cursor is None:
+        return None
+    return utility.encode_cursor(next_cursor)
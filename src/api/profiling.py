@@ -0,0 +1,38 @@
+"""Profiles requests to the resources of the API. See request_profiler.py.
+
+`profiled()` returns a decorator for the view functions of the resources, meant for
+`Api.decorators`. The whole request is profiled, from the validation of the payload to the
+serialization of the response, so the profile covers both the CollectionManager calls and the
+marshalling. Profiled responses carry an "X-Profile-Id" header naming their profile, which is the
+file `<endpoint>/<id>.prof` in the profile directory. Only the id is sent, so clients never see
+paths of the server.
+
+Typical usage example:
+    api = Api(app, decorators=[profiled(RequestProfiler("/data/profiles"))])
+"""
+
+import functools
+import os
+from collections.abc import Callable
+from flask import request
+from request_profiler import PROFILE_SUFFIX, RequestProfiler
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+def profiled(profiler : RequestProfiler) -> Callable:
+    """Returns a decorator for the view functions of resources, profiling the requests chosen by `profiler`"""
+    def decorator(view : Callable) -> Callable:
+        endpoint = view.view_class.__name__ # type: ignore
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not profiler.should_profile(request.headers.get(PROFILE_HEADER, "").lower() == "true"):
+                return view(*args, **kwargs)
+            with profiler.profile(endpoint) as path:
+                response = view(*args, **kwargs)
+            if path is not None:
+                response.headers[PROFILE_ID_HEADER] = os.path.basename(path).removesuffix(PROFILE_SUFFIX)
+            return response
+        return wrapper
+    return decorator
@@ -2,6 +2,10 @@ from flask import request
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.caching import cached
+from api.conditional import conditional, store_etag
+from api.pagination import PAGINATION_PARAMS, get_pagination_args, encode_next_cursor
+from api.instrumentation import timed
 
 models = api_models.get_search_models(api)
 
@@ -10,7 +14,10 @@ class Search(Resource):
     def __init__(self, api, *args, **kwargs):
         super().__init__(api, args, kwargs)
         self.collection_manager = kwargs["collection_manager"]
+        self.response_cache = kwargs.get("response_cache")
     
+    @conditional(store_etag)
+    @cached
     @api.marshal_with(models["success"], code=200)                        # type: ignore
     @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
     @api.doc(params={
@@ -23,8 +30,10 @@ class Search(Resource):
             "description": "Whether or not 'name' is case sensitive when searching. Default is true",
             "default": True,
             "required": False
-        }
+        },
+        **PAGINATION_PARAMS
     })
+    @timed
     def get(self):
         name = request.args.get("name", type=str)
         case_sensitive = request.args.get("case_sensitive")
@@ -42,8 +51,10 @@ class Search(Resource):
             else:
                 abort(400, errors={"InvalidParameter": "Parameter \"case_sensitive\" is not a valid value. Only (true/false) is valid input"}, message="Action aborted. Exception raised") # type: ignore
                 return
+        after, limit = get_pagination_args()
         try:
-            search_result = self.collection_manager.search(name, case_sensitive=case_sensitive)
+            # Holds the manager lock, unlike the snapshot reads: the trigram index only exists for the live manager
+            search_result, next_cursor = self.collection_manager.search_page(name, case_sensitive, after, limit)
             output = {}
             for collection in search_result:
                 json = collection.full_json()
@@ -51,6 +62,6 @@ class Search(Resource):
                 del json["name"]
                 output[name] = json
 
-            return {"errors":{}, "message": "Successfully Fetched Search Results", "search": output}
+            return {"errors":{}, "message": "Successfully Fetched Search Results", "search": output, "next_cursor": encode_next_cursor(next_cursor)}
         except Exception as e:
             abort(400, errors= {type(e).__name__: str(e)}, message= "Action aborted. Exception raised") # type: ignore
@@ -0,0 +1,41 @@
+"""Helpers for the `generation` GET parameter of the endpoints listing every collection.
+
+These endpoints read an immutable Snapshot of the CollectionManager instead of the manager itself,
+so a long response like a streamed listing or an export never holds its lock, and they return the
+generation they read. Sending that generation back in `generation` reads the same snapshot again,
+so the pages of a listing or export fetched with many requests are all consistent, as long as the
+manager still keeps the snapshot (see BACKUPORGANIZER_GENERATION_HISTORY).
+"""
+
+from flask import request
+from flask_restx import abort
+from custom_exceptions import SnapshotNotFoundError
+
+GENERATION_HEADER = "X-Generation"
+
+GENERATION_PARAMS = {
+    "generation": {
+        "description": "Optional generation returned by an earlier response, to read every collection as it was then. "
+                       "Fails once that generation isn't kept anymore",
+        "type": "integer",
+        "required": False
+    }
+}
+
+def get_generation_arg() -> int | None:
+    """Reads the `generation` GET parameter, aborting with 400 if it is invalid. Returns None if it's not set"""
+    generation = request.args.get("generation")
+    if generation is None:
+        return None
+    if not generation.isdigit():
+        abort(400, errors={"InvalidParameter": "Parameter \"generation\" must be a number"}, message="Action aborted. Exception raised") # type: ignore
+    return int(generation)
+
+def get_snapshot(manager):
+    """Returns the snapshot of `manager` at the generation in the `generation` GET parameter, or at the current
+    generation if it's not set. Aborts with 400 if the parameter is invalid or the snapshot isn't kept anymore."""
+    generation = get_generation_arg()
+    try:
+        return manager.snapshot(generation)
+    except SnapshotNotFoundError as e:
+        abort(400, errors={type(e).__name__: str(e)}, message="Action aborted. Exception raised") # type: ignore
@@ -0,0 +1,62 @@
+import math
+from flask import request
+from flask_restx import Resource, abort
+from api import main_namespace as api
+from api import api_models
+from api.pagination import MAX_LIMIT, get_limit_arg
+from api.instrumentation import timed
+import utility
+
+models = api_models.get_stale_models(api)
+
+SECONDS_PER_DAY = 86400
+MAX_DAYS = 1_000_000
+
+class Stale(Resource):
+    """Class for the GET /Stale endpoint."""
+    def __init__(self, api, *args, **kwargs):
+        super().__init__(api, args, kwargs)
+        self.collection_manager = kwargs["collection_manager"]
+
+    # Not cached, since the result changes as time passes even when the data doesn't
+    @api.marshal_with(models["success"], code=200)                        # type: ignore
+    @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
+    @api.doc(params={
+        "days": {
+            "description": "Collections without a BackupEntry dated in the last `days` days are stale. Can be a fraction",
+            "default": "7",
+            "required": True
+        },
+        "limit": {
+            "description": f"Optional max amount of collections to return (1-{MAX_LIMIT}). Every stale collection is returned if not set",
+            "type": "integer",
+            "required": False
+        }
+    })
+    @timed
+    def get(self):
+        days = get_days_arg()
+        limit = get_limit_arg()
+        try:
+            # Clamped, since MAX_DAYS reaches back before year 1, which format_timestamp() cannot render
+            cutoff = max(utility.get_current_timestamp() - int(days * SECONDS_PER_DAY), utility.MIN_TIMESTAMP)
+            stale = {}
+            for collection in self.collection_manager.stale(cutoff, limit):
+                last_backup_date = collection.last_backup_date
+                stale[collection.name] = None if last_backup_date is None else utility.format_timestamp(last_backup_date)
+            return {"errors":{}, "message": "Successfully Fetched Stale Collections", "cutoff": utility.format_timestamp(cutoff), "stale": stale}
+        except Exception as e:
+            abort(400, errors= {type(e).__name__: str(e)}, message= "Action aborted. Exception raised") # type: ignore
+
+def get_days_arg() -> float:
+    """Reads the `days` GET parameter, aborting with 400 if it is missing or invalid"""
+    days = request.args.get("days")
+    if days is None:
+        abort(400, errors={"MissingParameter": "Parameter \"days\" is required"}, message="Action aborted. Exception raised") # type: ignore
+    try:
+        value = float(days)
+    except ValueError:
+        value = math.nan
+    if not 0 <= value <= MAX_DAYS: # Also false for nan
+        abort(400, errors={"InvalidParameter": f"Parameter \"days\" must be a number between 0 and {MAX_DAYS}"}, message="Action aborted. Exception raised") # type: ignore
+    return value
@@ -0,0 +1,98 @@
+"""Helpers for streaming large listings instead of building them in memory.
+
+A streamed response is produced by a generator, so Flask sends it with chunked transfer encoding
+while it's being serialized. Collections are fetched one page of `STREAM_PAGE_SIZE` at a time
+through the keyset pagination of the CollectionManager, so only one page is held in memory.
+The endpoints page through a Snapshot of the manager, so the response holds the collections of
+one generation while collections are added, edited and deleted meanwhile.
+
+Two streamed formats are supported:
+    `json`: The same document as the non streamed endpoint, written collection by collection
+    `ndjson`: One json object per line, chosen with the "Accept: application/x-ndjson" header
+"""
+
+import json
+import zlib
+from collections.abc import Iterable, Iterator
+from flask import Response, request
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_PAGE_SIZE = 1000
+CHUNK_SIZE = 1 << 16
+
+STREAMING_PARAMS = {
+    "stream": {
+        "description": "Optional. If true, the response is streamed collection by collection. "
+                       "Also enabled by the 'Accept: application/x-ndjson' header, which streams one json object per line",
+        "type": "boolean",
+        "required": False
+    }
+}
+
+def get_stream_format() -> str | None:
+    """Returns the streamed format negotiated by the request ("json" or "ndjson"), or None if it isn't streamed"""
+    if request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return "ndjson"
+    if request.args.get("stream", "").lower() in ["true", "1"]:
+        return "json"
+    return None
+
+def iterate_pages(manager, after : int = 0) -> Iterator[list]:
+    """Yields every page of collections in `manager` (or in a Snapshot of it) with an insertion number above `after`"""
+    while after is not None:
+        page, after = manager.page(after, STREAM_PAGE_SIZE)
+        if page:
+            yield page
+
+def json_chunks(head : dict, key : str, pages : Iterable[list[tuple[str, object]]]) -> Iterator[str]:
+    """Yields the json document `head`, with `key` set to an object holding every (name, value) pair in `pages`.
+
+    Each page is serialized into one chunk, so a page is the most that's ever held in memory.
+
+    Args:
+        `head`: The other keys of the document, like "errors" and "message"
+        `key`: The key of the streamed object
+        `pages`: Lists of (name, value) pairs
+    """
+    separator = ""
+    yield json.dumps(head)[:-1] + (", " if head else "") + f"{json.dumps(key)}: {{"
+    for page in pages:
+        parts = []
+        for name, value in page:
+            parts.append(f"{separator}{json.dumps(name)}: {json.dumps(value)}")
+            separator = ", "
+        yield "".join(parts)
+    yield "}}\n"
+
+def ndjson_chunks(pages : Iterable[list[dict]]) -> Iterator[str]:
+    """Yields every object in `pages` as one json line, one chunk per page"""
+    for page in pages:
+        yield "".join(json.dumps(item) + "\n" for item in page)
+
+def buffered_chunks(chunks : Iterable[bytes], size : int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Joins small `chunks` into chunks of at least `size` bytes (except the last one)"""
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
+
+def gzip_chunks(chunks : Iterable[bytes]) -> Iterator[bytes]:
+    """Compresses `chunks` on the fly into a gzip file"""
+    compressor = zlib.compressobj(wbits=31) # 31 writes a gzip header and trailer
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def stream_response(chunks : Iterator[str], stream_format : str) -> Response:
+    """Returns a chunked Response sending `chunks` as they are generated"""
+    mimetype = NDJSON_MIMETYPE if stream_format == "ndjson" else "application/json"
+    return Response(chunks, mimetype=mimetype)
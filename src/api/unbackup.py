@@ -1,6 +1,7 @@
 from flask_restx import Resource, abort
 from api import main_namespace as api
 from api import api_models
+from api.instrumentation import timed
 
 models = api_models.get_unbackup_models(api)
 
@@ -13,6 +14,7 @@ class Unbackup(Resource):
     @api.expect(models["input"])
     @api.marshal_with(models["success"], code=200)                        # type: ignore
     @api.marshal_with(models["failure"], code=400, description="Failure") # type: ignore
+    @timed
     def post(self):
         try:
             args = api.payload
@@ -0,0 +1,10 @@
+"""ASGI entry point of the REST API, serving the Flask app of restinterface.py through an AsgiAdapter.
+
+Typical usage example:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+
+from asgi_adapter import AsgiAdapter
+from restinterface import app as wsgi_app, config
+
+app = AsgiAdapter(wsgi_app, config.asgi_threads)
@@ -0,0 +1,240 @@
+"""Serves a WSGI app (like the Flask app of restinterface.py) as an ASGI app.
+
+An ASGI server like uvicorn keeps every connection in an event loop, so thousands of idle
+keep-alive connections and slow clients only cost memory. The WSGI app itself is synchronous,
+so every request is handed to a thread pool: the app is called in a pool thread, and so is each
+step of the response iterable. Building and serializing a payload therefore never blocks the
+event loop. A response with a Content-Length is complete after its first chunk, so it takes a
+single pool task, while a streamed response is only generated as fast as the client reads it,
+one chunk per pool task, without holding a thread while the client is slow.
+
+The request body is read from the event loop while the app reads `wsgi.input`, so a bulk import
+is still parsed while it's being received. Once the app has returned, the adapter watches for
+the client disconnecting, and stops generating a streamed response when it does.
+
+Typical usage example:
+    app = AsgiAdapter(flask_app, threads=16)
+    # uvicorn module:app
+"""
+
+import asyncio
+import contextvars
+import io
+import sys
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+# Headers that WSGI passes without the HTTP_ prefix
+UNPREFIXED_HEADERS = {"content-type": "CONTENT_TYPE", "content-length": "CONTENT_LENGTH"}
+
+class RequestBody(io.RawIOBase):
+    """The `wsgi.input` of a request, receiving the body from the event loop as the app reads it.
+
+    Only read from the pool thread running the app, which waits while the event loop receives the next part.
+    """
+
+    def __init__(self, receive : Callable, loop : asyncio.AbstractEventLoop) -> None:
+        """Initializes the stream
+
+        Args:
+            `receive`: The ASGI receive callable of the request
+            `loop`: The event loop running the ASGI app
+        """
+        super().__init__()
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b""
+        self._offset = 0
+        self.complete: bool = False   # The whole body was received
+        self.disconnected: bool = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int: # type: ignore
+        """Copies up to `len(buffer)` bytes of the body into `buffer`, returning 0 at the end of the body
+
+        Raises:
+            `OSError`: When the client disconnected before sending the whole body
+        """
+        while self._offset == len(self._buffer):
+            if self.complete:
+                return 0
+            message = asyncio.run_coroutine_threadsafe(self.receive_message(), self._loop).result()
+            if message["type"] == "http.disconnect":
+                raise OSError("The client disconnected while sending the request body")
+        size = min(len(buffer), len(self._buffer) - self._offset)
+        buffer[:size] = self._buffer[self._offset:self._offset + size]
+        self._offset += size
+        return size
+
+    async def receive_message(self) -> dict:
+        """Receives the next message of the request, buffering its body"""
+        message = await self._receive()
+        if message["type"] == "http.request":
+            self._buffer = message.get("body", b"")
+            self._offset = 0
+            self.complete = not message.get("more_body", False)
+        elif message["type"] == "http.disconnect":
+            self.disconnected = True
+            self.complete = True
+        return message
+
+    async def wait_for_disconnect(self) -> None:
+        """Returns once the client disconnects, skipping the rest of the body if the app didn't read it"""
+        while not self.disconnected:
+            await self.receive_message()
+
+class AsgiAdapter:
+    """ASGI app calling a WSGI app in a thread pool. See the module docstring.
+
+    Attributes:
+        `wsgi_app`: The WSGI app serving the requests
+        `executor`: The thread pool the WSGI app is called in
+    """
+
+    def __init__(self, wsgi_app : Callable, threads : int = 16) -> None:
+        """Initializes the adapter
+
+        Args:
+            `wsgi_app`: The WSGI app serving the requests
+            `threads`: Amount of threads calling the WSGI app, the most requests handled at once. (Default: 16)
+
+        Raises:
+            `ValueError`: When `threads` is below 1
+        """
+        if threads < 1:
+            raise ValueError(f"threads must be at least 1, not {threads}")
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix="asgi")
+
+    async def __call__(self, scope : dict, receive : Callable, send : Callable) -> None:
+        if scope["type"] == "http":
+            await self.handle_request(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self.handle_lifespan(receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type '{scope["type"]}'")
+
+    async def handle_lifespan(self, receive : Callable, send : Callable) -> None:
+        """Answers the startup and shutdown events of the server, waiting for the pool threads on shutdown"""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def handle_request(self, scope : dict, receive : Callable, send : Callable) -> None:
+        """Calls the WSGI app in the thread pool, then sends its response one chunk at a time"""
+        loop = asyncio.get_running_loop()
+        body = RequestBody(receive, loop)
+        response = WsgiResponse(self.wsgi_app, build_environ(scope, body))
+        chunk = await loop.run_in_executor(self.executor, response.context.run, response.start)
+        watcher = asyncio.create_task(body.wait_for_disconnect())
+        try:
+            await send({"type": "http.response.start", "status": response.status, "headers": response.headers})
+            while chunk is not None:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                if body.disconnected:
+                    break
+                chunk = await loop.run_in_executor(self.executor, response.context.run, response.next_chunk)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            watcher.cancel()
+            if not response.closed:
+                await loop.run_in_executor(self.executor, response.context.run, response.close)
+
+class WsgiResponse:
+    """Calls a WSGI app and iterates its response. Every method runs in a pool thread, within `context`.
+
+    Attributes:
+        `context`: The context variables of the request. The steps of the response run in different pool threads,
+            so they share this context to keep what the app set, like the request context of `flask.stream_with_context()`
+        `status`: The status code, once `start()` returned
+        `headers`: The headers as ASGI expects them, lower case latin-1 bytes, once `start()` returned
+        `closed`: True once the response iterable was closed
+    """
+
+    def __init__(self, wsgi_app : Callable, environ : dict) -> None:
+        """Initializes the instance without calling `wsgi_app` yet"""
+        self._wsgi_app = wsgi_app
+        self._environ = environ
+        self._chunks = None
+        self._iterator = None
+        self._started = False # The headers were returned to the event loop, which sends them
+        self.status: int = 500
+        self.headers: list[tuple[bytes, bytes]] = []
+        self.closed: bool = False
+        self.context = contextvars.Context()
+
+    def start_response(self, status : str, headers : list[tuple[str, str]], exc_info = None) -> None:
+        if exc_info is not None and self._started:
+            raise exc_info[1].with_traceback(exc_info[2]) # Too late to change the status, like any WSGI server
+        self.status = int(status.split(" ", 1)[0])
+        self.headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+    def start(self) -> bytes | None:
+        """Calls the app and returns the first chunk of the response, or None if it's empty.
+
+        Closes the response right away if the first chunk is all of it, as told by its Content-Length,
+        so a response that isn't streamed takes a single pool task.
+        """
+        self._chunks = self._wsgi_app(self._environ, self.start_response)
+        self._iterator = iter(self._chunks) # type: ignore
+        chunk = self.next_chunk() # A lazy app may only call start_response now, so the headers are read after
+        if chunk is not None and (b"content-length", str(len(chunk)).encode()) in self.headers:
+            self.close()
+        self._started = True
+        return chunk
+
+    def next_chunk(self) -> bytes | None:
+        """Returns the next non empty chunk of the response, or None once it's done, after closing it"""
+        if not self.closed:
+            for chunk in self._iterator: # type: ignore
+                if chunk:
+                    return chunk
+            self.close()
+        return None
+
+    def close(self) -> None:
+        """Closes the response iterable, which WSGI requires even if it wasn't read to the end"""
+        self.closed = True
+        if hasattr(self._chunks, "close"):
+            self._chunks.close() # type: ignore
+
+def build_environ(scope : dict, body : RequestBody) -> dict:
+    """Returns the WSGI environ of the ASGI http `scope`, reading the body from `body`"""
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        # WSGI strings hold the raw bytes as latin-1, while ASGI paths are decoded utf-8
+        "SCRIPT_NAME": root_path.encode().decode("latin-1"),
+        "PATH_INFO": path.encode().decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server_name),
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get("http_version", "1.1")}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.input_terminated": True, # The body ends where the ASGI messages end, even if chunked
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"], environ["REMOTE_PORT"] = scope["client"][0], str(scope["client"][1])
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").lower()
+        key = UNPREFIXED_HEADERS.get(name) or "HTTP_" + name.upper().replace("-", "_")
+        value = value.decode("latin-1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
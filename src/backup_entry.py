@@ -1,23 +1,39 @@
+import sys
 
 class BackupEntry:
-    """Storage class for backup locations. 
-    
+    """Storage class for backup locations.
+
     Note: Only stores the backup-path. Does not store any actual files.
 
+    Uses `__slots__` instead of a per-instance `__dict__`, since there can be millions of BackupEntries.
+    The location is stored split after its last path separator, with the directory part interned, so
+    the BackupEntries of the same directory share one copy of it.
+
     Attributes:
         `name`: The unique name of the backup as a string.
         `location`: The path to the location where the backup is stored as a string.
-        `date`: The date when the backup was created as a string.
+        `date`: The date when the backup was created as a timestamp (seconds since 1970-01-01 00:00:00 UTC).
     """
+    __slots__ = ("name", "_directory", "_file", "date")
 
-    def __init__(self, backup_name : str, backup_location : str, backup_date : str) -> None:
+    def __init__(self, backup_name : str, backup_location : str, backup_date : int) -> None:
         """Initializes the instance with specified data assigned to the attributes.
 
         Args:
             `backup_name`: The name of the BackupEntry
             `backup_location`: The path to the location where the backup is stored
-            `backup_date`: The date when the BackupEntry was created
+            `backup_date`: The timestamp of when the BackupEntry was created
         """
         self.name = backup_name
         self.location = backup_location
         self.date = backup_date
+
+    @property
+    def location(self) -> str:
+        return self._directory + self._file
+
+    @location.setter
+    def location(self, backup_location : str) -> None:
+        split = max(backup_location.rfind("/"), backup_location.rfind("\\")) + 1
+        self._directory = sys.intern(backup_location[:split])
+        self._file = backup_location[split:]
@@ -9,7 +9,7 @@ class BackupManager():
 
     BackupManager.add_backup() -> DataCollection.add_backup()
     """
-    def add_backup(self, collection_object : DataCollection, backup_name : str, backup_date : str, backup_location : str) -> BackupEntry:
+    def add_backup(self, collection_object : DataCollection, backup_name : str, backup_date : int, backup_location : str) -> BackupEntry:
         """ARCHIVED! This method is no longer in use or actively maintained.
         
         Adds a BackupEntry to the `collection_object`
@@ -17,7 +17,7 @@ class BackupManager():
         Args:
             `collection_object`: The DataCollection we want to add the new BackupEntry to
             `backup_name`: The name of the new BackupEntry
-            `backup_date`: The date of the BackupEntry as a string
+            `backup_date`: The timestamp of the BackupEntry
             `backup_location`: The path where the backup is stored
         
         Raises:
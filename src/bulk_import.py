@@ -0,0 +1,265 @@
+"""Bulk import and export of DataCollections and BackupEntries as NDJSON (one json object per line).
+
+Lines are read one at a time, so the input can be a request body being received. Valid records
+are gathered into batches of `BATCH_SIZE`, and each batch is added with one call to
+CollectionManager.add_collections() or add_backups() (one transaction per batch in the sqlite
+storage). Invalid lines and rejected records are reported by line number, without stopping the import.
+An error reading the input itself (like a corrupted gzip body) stops the import instead, but the
+batches added before it stay added: the complete lines read up to the error are still imported,
+and the error is kept in `ImportResult.stream_error` next to the counts, so the caller can report
+what was applied. Nothing is buffered, so an import of any size is never held in memory.
+
+Collection records have the same keys as the POST /api/Collection body, and backup records the
+same keys as the POST /api/Backup body. Dates are ISO 8601 strings, like in the API, and optional
+dates default to the time of the import.
+A collection record can also hold its BackupEntries in a "backup_entries" list, which is the
+format written by `export_record()`, so an export can be imported again as it is. Once its
+collection is added, a record counts as imported even if some of its BackupEntries are rejected
+(like duplicates), which are reported separately.
+
+Typical usage example:
+    with open("collections.ndjson", "rb") as file:
+        result = import_collections(manager, iter_lines(file))
+    print(result.imported, result.failed)
+"""
+
+import gzip
+import json
+from collections.abc import Callable, Iterable, Iterator
+from typing import BinaryIO
+from custom_exceptions import InvalidDateError, InvalidImportRecordError
+import utility
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+READ_SIZE = 1 << 16
+
+# Key -> (type, required)
+COLLECTION_FIELDS = {
+    "name":              (str, True),
+    "description":       (str, True),
+    "creation_date":     (str, False),
+    "modification_date": (str, False),
+    "updated":           (bool, False),
+    "backup_entries":    (list, False)
+}
+BACKUP_ENTRY_FIELDS = {
+    "backup_name":     (str, True),
+    "backup_location": (str, True),
+    "backup_date":     (str, False)
+}
+BACKUP_FIELDS = {
+    "collection_name": (str, True),
+    "backup_name":     (str, True),
+    "backup_location": (str, True),
+    "backup_date":     (str, False)
+}
+
+class ImportResult:
+    """Outcome of a bulk import.
+
+    Attributes:
+        `imported`: Amount of records added
+        `failed`: Amount of lines that were invalid or rejected
+        `rejected_backup_entries`: Amount of items of "backup_entries" rejected, in records that were added
+        `line_errors`: The first `MAX_REPORTED_ERRORS` errors, as `{"line": number, "errors": {"ErrorType": "ErrorMessage"}}`.
+            The errors of rejected BackupEntries also hold their index in "backup_entries", as `"backup_entry": index`
+        `stream_error`: The error reading the lines that stopped the import, or None if every line was read
+    """
+
+    def __init__(self) -> None:
+        self.imported: int = 0
+        self.failed: int = 0
+        self.rejected_backup_entries: int = 0
+        self.line_errors: list[dict] = []
+        self.stream_error: Exception | None = None
+
+    def add_error(self, line_number : int, error : Exception) -> None:
+        """Counts a failed line, keeping its error if less than `MAX_REPORTED_ERRORS` are kept"""
+        self.failed += 1
+        if len(self.line_errors) < MAX_REPORTED_ERRORS:
+            self.line_errors.append({"line": line_number, "errors": {type(error).__name__: str(error)}})
+
+    def add_backup_entry_error(self, line_number : int, index : int, error : Exception) -> None:
+        """Counts a rejected item of "backup_entries" in an added record, keeping its error if less than `MAX_REPORTED_ERRORS` are kept"""
+        self.rejected_backup_entries += 1
+        if len(self.line_errors) < MAX_REPORTED_ERRORS:
+            self.line_errors.append({"line": line_number, "backup_entry": index, "errors": {type(error).__name__: str(error)}})
+
+    def add_results(self, line_numbers : list[int], errors : list[Exception | None]) -> None:
+        """Counts the records of a batch, read from `line_numbers`, as imported or failed by their error in `errors`"""
+        for line_number, error in zip(line_numbers, errors):
+            if error is None:
+                self.imported += 1
+            else:
+                self.add_error(line_number, error)
+
+def iter_lines(stream : BinaryIO, read_size : int = READ_SIZE) -> Iterator[bytes]:
+    """Yields the lines of `stream`, reading it in blocks of `read_size` bytes.
+
+    Much faster than iterating a request stream directly, which reads it line by line.
+    The last line is yielded even if it doesn't end with a newline.
+    """
+    rest = b""
+    while True:
+        block = stream.read(read_size)
+        if not block:
+            break
+        lines = (rest + block).split(b"\n")
+        rest = lines.pop()
+        yield from lines
+    if rest:
+        yield rest
+
+def decode_body(stream : BinaryIO, content_encoding : str | None) -> BinaryIO:
+    """Returns `stream` decompressed on the fly according to the Content-Encoding of the request
+
+    Raises:
+        `ValueError`: When `content_encoding` is neither gzip nor identity
+    """
+    if content_encoding in [None, "", "identity"]:
+        return stream
+    if content_encoding == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    raise ValueError(f"Content-Encoding '{content_encoding}' is not supported. Only gzip is supported")
+
+def parse_record(line : bytes | str, fields : dict[str, tuple[type, bool]]) -> dict:
+    """Decodes one NDJSON line and validates its keys and value types against `fields`
+
+    Raises:
+        `InvalidImportRecordError`: When the line is not a json object with valid keys
+    """
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise InvalidImportRecordError(f"Line is not valid json: {e}")
+    validate_record(record, fields)
+    return record
+
+def validate_record(record : object, fields : dict[str, tuple[type, bool]]) -> None:
+    """Validates the keys and value types of a decoded record against `fields`
+
+    Raises:
+        `InvalidImportRecordError`: When `record` is not a dict with valid keys
+    """
+    if not isinstance(record, dict):
+        raise InvalidImportRecordError("Line is not a json object")
+    for key, value in record.items():
+        if key not in fields:
+            raise InvalidImportRecordError(f"Key '{key}' is not a valid key")
+        if not isinstance(value, fields[key][0]):
+            raise InvalidImportRecordError(f"Key '{key}' must be of type {fields[key][0].__name__}")
+    for key, (_, required) in fields.items():
+        if required and key not in record:
+            raise InvalidImportRecordError(f"Key '{key}' is required")
+
+def _read_lines(lines : Iterable[bytes | str], result : ImportResult) -> Iterator[bytes | str]:
+    """Yields `lines`, stopping at the first error reading them, which is kept in `result.stream_error`"""
+    iterator = iter(lines)
+    while True:
+        try:
+            line = next(iterator)
+        except StopIteration:
+            return
+        except Exception as e: # Like a corrupted gzip body, or a client disconnecting mid-upload
+            result.stream_error = e
+            return
+        yield line
+
+def _import(lines : Iterable[bytes | str], parse : Callable[[bytes | str, int], dict],
+            add_batch : Callable[[list[dict], list[int], ImportResult], None]) -> ImportResult:
+    """Parses `lines` with `parse(line, now)`, passing the valid records to `add_batch(records, line_numbers, result)`
+    in batches of `BATCH_SIZE`, which adds them and reports the outcome to `result`.
+    An error reading `lines` stops the import after adding the records read before it."""
+    result = ImportResult()
+    batch: list[dict] = []
+    line_numbers: list[int] = []
+
+    def flush() -> None:
+        add_batch(batch, line_numbers, result)
+        batch.clear()
+        line_numbers.clear()
+
+    now = utility.get_current_timestamp()
+    for line_number, line in enumerate(_read_lines(lines, result), 1):
+        if not line.strip():
+            continue
+        try:
+            record = parse(line, now)
+        except (InvalidImportRecordError, InvalidDateError) as e:
+            result.add_error(line_number, e)
+            continue
+        batch.append(record)
+        line_numbers.append(line_number)
+        if len(batch) >= BATCH_SIZE:
+            flush()
+            now = utility.get_current_timestamp()
+    if batch:
+        flush()
+    return result
+
+def _parse_collection(line : bytes | str, now : int) -> dict:
+    record = utility.parse_dates(parse_record(line, COLLECTION_FIELDS))
+    record.setdefault("creation_date", now)
+    record.setdefault("modification_date", now)
+    record.setdefault("updated", True)
+    backup_entries = []
+    for backup_entry in record.get("backup_entries", []):
+        try:
+            validate_record(backup_entry, BACKUP_ENTRY_FIELDS)
+            backup_entry = utility.parse_dates(backup_entry)
+        except (InvalidImportRecordError, InvalidDateError) as e:
+            raise InvalidImportRecordError(f"Invalid item in 'backup_entries': {e}")
+        backup_entry.setdefault("backup_date", now)
+        backup_entries.append(backup_entry)
+    if backup_entries:
+        record["backup_entries"] = backup_entries
+    return record
+
+def _parse_backup(line : bytes | str, now : int) -> dict:
+    record = utility.parse_dates(parse_record(line, BACKUP_FIELDS))
+    record.setdefault("backup_date", now)
+    return record
+
+def _add_collections_with_backups(manager, records : list[dict], line_numbers : list[int], result : ImportResult) -> None:
+    """Adds a batch of collection records, then the "backup_entries" of the ones that were added.
+    The rejected BackupEntries are reported on their own, since their collection was added anyway."""
+    backup_entries = [record.pop("backup_entries", []) for record in records]
+    errors = manager.add_collections(records)
+    result.add_results(line_numbers, errors)
+    backups = []
+    owners = [] # (line number, index in "backup_entries") of every backup
+    for record, entries, line_number, error in zip(records, backup_entries, line_numbers, errors):
+        if error is None:
+            backups += [{"collection_name": record["name"], **entry} for entry in entries]
+            owners += [(line_number, index) for index in range(len(entries))]
+    if backups:
+        for (line_number, index), error in zip(owners, manager.add_backups(backups)):
+            if error is not None:
+                result.add_backup_entry_error(line_number, index, error)
+
+def export_record(collection) -> dict:
+    """Returns the collection record of `collection` with all of its BackupEntries, which `import_collections()` can read back"""
+    # Without the summary fields, which are derived from the BackupEntries
+    record = {key: value for key, value in collection.full_json().items() if key in COLLECTION_FIELDS}
+    record["backup_entries"] = [{"backup_name": entry.name, "backup_date": utility.format_timestamp(entry.date), "backup_location": entry.location}
+                                for entry in collection.backup_entries]
+    return record
+
+def import_collections(manager, lines : Iterable[bytes | str]) -> ImportResult:
+    """Adds a DataCollection to `manager` for every NDJSON line in `lines`, with the BackupEntries in its "backup_entries"
+
+    Args:
+        `manager`: The CollectionManager (or SqliteCollectionManager) to add the collections to
+        `lines`: NDJSON lines, like a file opened in binary mode. Empty lines are skipped
+    """
+    return _import(lines, _parse_collection, lambda records, line_numbers, result: _add_collections_with_backups(manager, records, line_numbers, result))
+
+def import_backups(manager, lines : Iterable[bytes | str]) -> ImportResult:
+    """Adds a BackupEntry to the DataCollection named by its "collection_name" for every NDJSON line in `lines`
+
+    Args:
+        `manager`: The CollectionManager (or SqliteCollectionManager) holding the collections
+        `lines`: NDJSON lines, like a file opened in binary mode. Empty lines are skipped
+    """
+    return _import(lines, _parse_backup, lambda records, line_numbers, result: result.add_results(line_numbers, manager.add_backups(records)))
@@ -1,25 +1,134 @@
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
 from data_collection import DataCollection
-from custom_exceptions import CollectionAlreadyExistsError, CollectionNotFoundError, InvalidCollectionEditError
+from trigram_index import TrigramIndex
+from insertion_order import InsertionOrder
+from staleness_index import StalenessIndex
+from snapshot import CollectionSnapshot, Snapshot
+from rwlock import ReadWriteLock, reads, writes
+from custom_exceptions import (BackupAlreadyExistsError, CollectionAlreadyExistsError, CollectionNotFoundError,
+                               InvalidCollectionEditError, InvalidOperationError, SnapshotNotFoundError)
+
+# Key -> type of every field that can be edited
+EDITABLE_FIELDS = {"name": str, "description": str, "creation_date": int, "modification_date": int, "updated": bool}
+
+def is_valid_edit(key : str, value : object) -> bool:
+    """Returns True if `key` is an editable field and `value` has its type. Exact types, since True is also an int"""
+    return key in EDITABLE_FIELDS and type(value) is EDITABLE_FIELDS[key]
 
 class CollectionManager:
-    """Manager class holding a list of DataCollection objects, and managing them.
+    """Manager class holding DataCollection objects, and managing them.
+
+    The collections are indexed by name so lookups, inserts and deletes don't need to scan
+    every collection. An InsertionOrder keeps track of the order they were added in, so listings
+    keep that order even after a rename, and can be paginated with a stable cursor. Names are also
+    kept in a TrigramIndex, so searches only look at collections that can match, and the date of
+    the latest BackupEntry of every collection is kept in a StalenessIndex, so `stale()` only
+    looks at the collections it returns.
+
+    Every mutation (including adding/removing BackupEntries in a managed DataCollection) is
+    reported to the listeners registered with `add_listener()` as an `(operation, arguments)` pair.
+    The same pair can be passed to `apply_operation()` to redo the mutation, which is what
+    the OperationLog uses for persistence.
+
+    Every mutation also increments `generation`, and sets the `generation` of the changed
+    DataCollection to the new value, so the API can tell if anything changed since a client
+    last fetched it (see the ETag handling in api/conditional.py).
+
+    The manager and its DataCollections share one ReadWriteLock, so the methods can be called from
+    many threads at once (like gunicorn workers with the gthread worker class). Methods reading
+    hold it for reading, so reads run in parallel, and mutations hold it for writing, so they run
+    one at a time and never while a read is in progress. Listeners are called while the write lock
+    is held, so they see the mutations in the order they happened. The DataCollections returned by
+    the manager stay usable while other threads mutate it, but the attributes of a collection read
+    outside a locked method can belong to different mutations, so consistent reads of many fields
+    go through `lock.read`, like `json_overview()` does.
+
+    Long reads can use `snapshot()` instead, which returns an immutable Snapshot of every collection
+    at the current generation without holding the lock while it's read. Snapshots are built lazily:
+    mutations only note which collections changed, and the first `snapshot()` after them builds the
+    new Snapshot from the previous one, so writers barely pay for them. The latest `generation_history`
+    snapshots are kept, so related reads (like the pages of an export) can all read one generation.
 
     Attributes:
-        `data_collections`: The list of DataCollection objects.
+        `data_collections`: A list of all DataCollection objects in insertion order (read only).
+        `generation`: Incremented after every mutation
+        `store_id`: Random id of this instance, so generations of another instance (like before a restart) never match
+        `lock`: The ReadWriteLock guarding the manager and its DataCollections
+        `generation_history`: Amount of snapshots kept for `snapshot()` of a past generation
     """
 
-    def __init__(self) -> None:
-        """Initializes the instance with self.data_collections as an empty list of DataCollection Objects"""
-        self.data_collections: list[DataCollection] = []
+    def __init__(self, collection_class : type[DataCollection] = DataCollection, generation_history : int = 64) -> None:
+        """Initializes the instance without any DataCollection objects
+
+        Args:
+            `collection_class`: The class of the DataCollections to create, like ColumnarDataCollection for
+                collections with millions of BackupEntries. (Default: DataCollection)
+            `generation_history`: Amount of snapshots kept for `snapshot()` of a past generation. (Default: 64)
+
+        Raises:
+            `ValueError`: When `generation_history` is below 1
+        """
+        if generation_history < 1:
+            raise ValueError(f"generation_history must be at least 1, not {generation_history}")
+        self._collection_class = collection_class
+        self._collections_by_name: dict[str, DataCollection] = {}
+        self._collections_in_order = InsertionOrder()
+        self._search_index = TrigramIndex()
+        self._staleness_index = StalenessIndex()
+        self._listeners: list[Callable[[str, dict], None]] = []
+        self.generation: int = 0
+        self.store_id: str = uuid.uuid4().hex[:16]
+        self.lock = ReadWriteLock()
+        self.generation_history: int = generation_history
+        self._snapshot_mutex = threading.Lock() # Taken after `lock`, so only one thread builds a snapshot
+        self._snapshots: OrderedDict[int, Snapshot] = OrderedDict() # Generation -> snapshot, least recently used first
+        self._latest_snapshot: Snapshot | None = None
+        self._changed_since_snapshot: dict[int, DataCollection | None] = {} # Insertion number -> changed collection, None if deleted
+
+    @writes
+    def add_listener(self, listener : Callable[[str, dict], None]) -> None:
+        """Registers `listener` to be called as `listener(operation, arguments)` after every mutation.
+
+        Args:
+            `listener`: The callable to register
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, operation : str, arguments : dict, *collections : DataCollection) -> None:
+        """Increments the generation of the manager and of every collection in `collections`, updates
+        their entries in the StalenessIndex, then calls every registered listener with `operation` and `arguments`"""
+        # Only done after the mutation, so a generation is never paired with data older than it
+        self.generation += 1
+        for collection in collections:
+            collection.generation = self.generation
+            self._staleness_index.update(collection, collection.last_backup_date)
+            if self._latest_snapshot is not None:
+                self._changed_since_snapshot[self._collections_in_order.number(collection)] = collection
+        for listener in self._listeners:
+            listener(operation, arguments)
+
+    def _collection_changed(self, collection : DataCollection, operation : str, arguments : dict) -> None:
+        """Callback for DataCollection.on_change. Forwards the change to the listeners."""
+        self._notify(operation, {"collection_name": collection.name, **arguments}, collection)
+
+    @property
+    @reads
+    def data_collections(self) -> list[DataCollection]:
+        """A list of all DataCollection objects in the order they were added"""
+        return list(self._collections_in_order)
     
-    def add_collection(self, name : str, description : str, creation_date : str, modification_date : str, updated : bool) -> DataCollection:
-        """Adds a new DataCollection object to the data_collections list.
+    @writes
+    def add_collection(self, name : str, description : str, creation_date : int, modification_date : int, updated : bool) -> DataCollection:
+        """Adds a new DataCollection object to the manager.
 
         Args:
             `name`: The name of the DataCollection
             `description`: The description of the DataCollection
-            `creation_date`: The creation date of the DataCollection
-            `modification_date`: The modification date of the DataCollection
+            `creation_date`: The creation timestamp of the DataCollection
+            `modification_date`: The modification timestamp of the DataCollection
             `updated`: Whether or not the DataCollection is up to date
         
         Returns:
@@ -28,14 +137,82 @@ class CollectionManager:
         Raises:
             `CollectionAlreadyExistsError`: Collection with name '`name`' already exists
         """
-        for collection in self.data_collections:
-            if collection.name == name:
-                raise CollectionAlreadyExistsError(f"Collection with name '{name}' already exists")
+        data_collection = self._insert_collection(name, description, creation_date, modification_date, updated)
+        self._notify("add_collection", {
+            "name": name, "description": description, "creation_date": creation_date,
+            "modification_date": modification_date, "updated": updated}, data_collection)
+        return data_collection
+
+    def _insert_collection(self, name : str, description : str, creation_date : int, modification_date : int, updated : bool) -> DataCollection:
+        """Adds a new DataCollection without notifying the listeners. See `add_collection()`"""
+        if name in self._collections_by_name:
+            raise CollectionAlreadyExistsError(f"Collection with name '{name}' already exists")
 
-        data_collection = DataCollection(name, description, creation_date, modification_date, updated)
-        self.data_collections.append(data_collection)
+        data_collection = self._collection_class(name, description, creation_date, modification_date, updated)
+        self._collections_by_name[name] = data_collection
+        self._collections_in_order.add(data_collection)
+        self._search_index.add(data_collection, name)
+        data_collection.on_change = self._collection_changed
+        data_collection.lock = self.lock
         return data_collection
     
+    @writes
+    def add_collections(self, collections : list[dict]) -> list[Exception | None]:
+        """Adds many DataCollections, continuing past the ones that can't be added. Used by bulk imports.
+
+        The collections that were added are reported to the listeners as one "add_collections"
+        operation, so the OperationLog writes (and fsyncs) a whole batch at once.
+
+        Args:
+            `collections`: Dicts with the arguments of `add_collection()` as keys
+
+        Returns:
+            For each item in `collections`, None if it was added, or the exception that prevented it
+        """
+        results: list[Exception | None] = []
+        added: list[dict] = []
+        added_collections: list[DataCollection] = []
+        for collection in collections:
+            try:
+                added_collections.append(self._insert_collection(collection["name"], collection["description"], collection["creation_date"],
+                                                                 collection["modification_date"], collection["updated"]))
+                added.append(collection)
+                results.append(None)
+            except CollectionAlreadyExistsError as e:
+                results.append(e)
+        if added:
+            self._notify("add_collections", {"collections": added}, *added_collections)
+        return results
+
+    @writes
+    def add_backups(self, backups : list[dict]) -> list[Exception | None]:
+        """Adds many BackupEntries, each to the DataCollection named by its "collection_name". Used by bulk imports.
+
+        The BackupEntries that were added are reported to the listeners as one "add_backups" operation.
+
+        Args:
+            `backups`: Dicts with "collection_name", "backup_name", "backup_date" (a timestamp) and "backup_location" keys
+
+        Returns:
+            For each item in `backups`, None if it was added, or the exception that prevented it
+        """
+        results: list[Exception | None] = []
+        added: list[dict] = []
+        changed_collections: dict[str, DataCollection] = {}
+        for backup in backups:
+            try:
+                collection = self._get(backup["collection_name"])
+                collection._insert_backup(backup["backup_name"], backup["backup_date"], backup["backup_location"])
+                changed_collections[collection.name] = collection
+                added.append(backup)
+                results.append(None)
+            except (CollectionNotFoundError, BackupAlreadyExistsError) as e:
+                results.append(e)
+        if added:
+            self._notify("add_backups", {"backups": added}, *changed_collections.values())
+        return results
+
+    @writes
     def edit_collection(self, collection_name : str, updated_json : dict) -> None:
         """Edits fields inside the DataCollection with a case-sensitive matching name to `collection_name`.
 
@@ -44,8 +221,8 @@ class CollectionManager:
         {
             "name": "New Name",
             "description": "New Description",
-            "modification_date": "New Modification Date",
-            "creation_date": "New Creation Date",
+            "modification_date": 1738656949,
+            "creation_date": 1242123072,
             "updated": True
         }
         ```
@@ -66,37 +243,109 @@ class CollectionManager:
             `CollectionNotFoundError`: Collection with name '`collection_name`' not found
             `CollectionAlreadyExistsError`: Collection with name '`name`' already exists
         """
-        collection = self.get(collection_name)
+        collection = self._get(collection_name)
+        applied_edits = {}
+        try:
+            self._edit_fields(collection, updated_json, applied_edits)
+        finally:
+            #Report the keys that were applied, even if a later key raised
+            if applied_edits:
+                self._notify("edit_collection", {"collection_name": collection_name, "updated_json": applied_edits}, collection)
+
+    @writes
+    def edit_collections(self, edits : list[dict]) -> None:
+        """Applies many edits, possibly to many DataCollections, with all-or-nothing semantics.
+
+        Every edit is validated before any is applied, looking each collection up once. Edits are
+        applied in order, so an edit can refer to a collection by the name an earlier edit gave it.
+        The whole batch is reported to the listeners as one "edit_collections" operation.
+
+        Args:
+            `edits`: Dicts with a "collection_name" and an "updated_json" like in `edit_collection()`
+
+        Raises:
+            `InvalidCollectionEditError`: Edit `index`: Key '`key`' and associated value is not a valid edit
+            `CollectionNotFoundError`: Edit `index`: Collection with name '`collection_name`' not found
+            `CollectionAlreadyExistsError`: Edit `index`: Collection with name '`name`' already exists
+        """
+        renamed: dict[str, DataCollection | None] = {} # Name -> collection, as it will be after the edits validated so far
+        new_names: dict[DataCollection, str] = {}
+        plan: list[tuple[DataCollection, dict]] = []
+
+        def lookup(name : str) -> DataCollection | None:
+            return renamed[name] if name in renamed else self._collections_by_name.get(name)
+
+        for index, edit in enumerate(edits):
+            try:
+                collection = lookup(edit["collection_name"])
+                if collection is None:
+                    raise CollectionNotFoundError(f"Collection with name '{edit["collection_name"]}' not found")
+                for key, value in edit["updated_json"].items():
+                    if not is_valid_edit(key, value):
+                        raise InvalidCollectionEditError(f"Key '{key}' and associated value is not a valid edit")
+                current_name = new_names.get(collection, collection.name)
+                new_name = edit["updated_json"].get("name", current_name)
+                if new_name != current_name:
+                    if lookup(new_name) is not None:
+                        raise CollectionAlreadyExistsError(f"Collection with name '{new_name}' already exists")
+                    renamed[current_name] = None
+                    renamed[new_name] = collection
+                    new_names[collection] = new_name
+                plan.append((collection, edit["updated_json"]))
+            except (InvalidCollectionEditError, CollectionNotFoundError, CollectionAlreadyExistsError) as e:
+                raise type(e)(f"Edit {index}: {e}") from e
+
+        # Nothing below can fail, since every edit was validated against the state it will be applied to
+        for collection, updated_json in plan:
+            self._edit_fields(collection, updated_json, {})
+        if plan:
+            reported = [{"collection_name": edit["collection_name"], "updated_json": dict(edit["updated_json"])} for edit in edits]
+            self._notify("edit_collections", {"edits": reported}, *{collection for collection, _ in plan})
+
+    def _edit_fields(self, collection : DataCollection, updated_json : dict, applied_edits : dict) -> None:
+        """Applies the edits in `updated_json` to `collection` one key at a time, adding each applied key to `applied_edits`"""
         for key in updated_json:
             if key == "name" and isinstance(updated_json["name"], str): 
                 #Throws if name already exists preventing naming duplicates and overwriting
-                if collection_name != updated_json["name"]:
-                    try:
-                        self.get(updated_json["name"])
+                if collection.name != updated_json["name"]:
+                    if updated_json["name"] in self._collections_by_name:
                         raise CollectionAlreadyExistsError(f"Collection with name '{updated_json["name"]}' already exists")
-                    except CollectionNotFoundError:
-                        pass
+                    #Move the collection to its new key so the name index stays correct
+                    del self._collections_by_name[collection.name]
+                    self._collections_by_name[updated_json["name"]] = collection
+                    self._search_index.remove(collection)
+                    self._search_index.add(collection, updated_json["name"])
                 collection.name = updated_json["name"]
             elif key == "description" and isinstance(updated_json["description"], str):
                 collection.description = updated_json["description"]
-            elif key == "creation_date" and isinstance(updated_json["creation_date"], str):
+            elif key == "creation_date" and is_valid_edit(key, updated_json["creation_date"]):
                 collection.creation_date = updated_json["creation_date"]
-            elif key == "modification_date" and isinstance(updated_json["modification_date"], str):
+            elif key == "modification_date" and is_valid_edit(key, updated_json["modification_date"]):
                 collection.modification_date = updated_json["modification_date"]
             elif key == "updated" and isinstance(updated_json["updated"], bool):
                 collection.updated = updated_json["updated"]
             else:
                 raise InvalidCollectionEditError(f"Key '{key}' and associated value is not a valid edit")
+            applied_edits[key] = updated_json[key]
 
+    @writes
     def delete_collection(self, collection_name : str) -> None:
         """Deletes the DataCollection with case-sensitive matching name to `collection_name` from self.data_collections
         
         Raises:
             `CollectionNotFoundError`: Collection with name '`collection_name`' not found
         """
-        collection = self.get(collection_name)
-        self.data_collections.remove(collection)
+        collection = self._get(collection_name)
+        del self._collections_by_name[collection_name]
+        if self._latest_snapshot is not None:
+            self._changed_since_snapshot[self._collections_in_order.number(collection)] = None
+        self._collections_in_order.remove(collection)
+        self._search_index.remove(collection)
+        self._staleness_index.remove(collection)
+        collection.on_change = None
+        self._notify("delete_collection", {"collection_name": collection_name})
 
+    @reads
     def overview(self) -> list[str]:
         """Returns a list of strings containing a small overview for each of the DataCollection objects
         in self.data_collections.
@@ -106,16 +355,17 @@ class CollectionManager:
             DataCollection.brief_str(). Example return value:
             ```python
             [
-                "DataCollection1 | 2009-05-12 10:11:12 | Updated: True",
-                "DataCollection2 | 2025-02-04 08:15:49 | Updated: False"
+                "DataCollection1 | 2009-05-12 10:11:12 | Updated: True | Backups: 3",
+                "DataCollection2 | Never | Updated: False | Backups: 0"
             ]
             ```
         """
         output = []
-        for collection in self.data_collections:
+        for collection in self._collections_in_order:
             output.append(collection.brief_str())
         return output
 
+    @reads
     def detailed_overview(self) -> list[list[str]]:
         """Returns a detailed list with the output of DataCollection.full_str() for each DataCollection
         in self.data_collections.
@@ -124,17 +374,18 @@ class CollectionManager:
             Example return value:
             ```python
             [
-                ["DataCollection1", "The best collection", "Today", "13:58", "True"],
-                ["DataCollection2", "The next best collection", "1960", "2080 1 January", "False"]
+                ["DataCollection1", "The best collection", "2009-05-12 10:11:12", "2025-02-04 08:15:49", "True"],
+                ["DataCollection2", "The next best collection", "1960-06-01 15:31:10", "2080-01-01 00:00:00", "False"]
                 ...
             ]
             ```
         """
         output = []
-        for collection in self.data_collections:
+        for collection in self._collections_in_order:
             output.append(collection.full_str())
         return output
     
+    @reads
     def json_overview(self) -> dict[str,dict[str,object]]:
         """Returns a dictionary DataCollection.full_json() output for each DataCollection in self.data_collections
         
@@ -142,19 +393,22 @@ class CollectionManager:
             Example return value:
             ```python
             {
-                "DataCollection1": {"description": "The best Collection", "creation_date": "Today", "modification_date": "13:58", "updated": True},
-                "DataCollection2": {"description": "The next best collection", "creation_date": "1960", "modification_date": "2080 1 January", "updated": False}
+                "DataCollection1": {"description": "The best Collection", "creation_date": "2009-05-12 10:11:12", "modification_date": "2025-02-04 08:15:49", "updated": True,
+                                    "last_backup_date": "2025-02-04 08:15:49", "last_backup_location": "/home/user/backup.bak", "backup_count": 3},
+                "DataCollection2": {"description": "The next best collection", "creation_date": "1960-06-01 15:31:10", "modification_date": "2080-01-01 00:00:00", "updated": False,
+                                    "last_backup_date": None, "last_backup_location": None, "backup_count": 0}
             }
             ```
         """
         output = {}
-        for collection in self.data_collections:
+        for collection in self._collections_in_order:
             json = collection.full_json()
             name = json["name"]
             del json["name"]
             output[name] = json
         return output
 
+    @reads
     def info(self, collection_name : str) -> list[str]:
         """Returns DataCollection.full_str() return value for the DataCollection with a case-senstive 
         matching name to `collection_name`.
@@ -166,17 +420,14 @@ class CollectionManager:
             A list of strings formatted according to the output of DataCollection.full_str().
             Example return value:
             ```python
-                ["DataCollection1", "The best collection", "Today", "13:58", "True"]
+                ["DataCollection1", "The best collection", "2009-05-12 10:11:12", "2025-02-04 08:15:49", "True"]
             ```
         Raises:
             `CollectionNotFoundError`: Collection with name '`collection_name`' not found
         """
-        for collection in self.data_collections:
-            if collection.name == collection_name:
-                return collection.full_str()
-
-        raise CollectionNotFoundError(f"Collection with name '{collection_name}' not found")
+        return self._get(collection_name).full_str()
 
+    @reads
     def get(self, collection_name : str) -> DataCollection:
         """Returns the DataCollection with a case-sensitive matching name to `collection_name`.
 
@@ -189,11 +440,36 @@ class CollectionManager:
         Raises:
             `CollectionNotFoundError`: Collection with name '`collection_name`' not found
         """
-        for collection in self.data_collections:
-            if collection.name == collection_name:
-                return collection
-        raise CollectionNotFoundError(f"Collection with name '{collection_name}' not found")
+        return self._get(collection_name)
+
+    def _get(self, collection_name : str) -> DataCollection:
+        """Returns the DataCollection named `collection_name` without taking the lock. See `get()`"""
+        collection = self._collections_by_name.get(collection_name)
+        if collection is None:
+            raise CollectionNotFoundError(f"Collection with name '{collection_name}' not found")
+        return collection
+
+    @reads
+    def page(self, after : int = 0, limit : int | None = None, collections : list[DataCollection] | None = None) -> tuple[list[DataCollection], int | None]:
+        """Returns a page of DataCollections in insertion order, using keyset pagination.
+
+        The cursor of a collection never changes, so paging through stays consistent while
+        collections are added (they show up at the end) or deleted (they are left out).
+
+        Args:
+            `after`: The cursor returned with the previous page, or 0 for the first page
+            `limit`: Max amount of DataCollections in the page. All remaining if None
+            `collections`: Only page through these collections, like the output of `search()`, which must all still be in
+                the manager. All if None. Use `search_page()` to page through a search result while writers delete collections
+
+        Returns:
+            The DataCollections in the page, and the cursor of the next page (None if there are no more)
+        """
+        if collections is None:
+            return self._collections_in_order.page(after, limit)
+        return self._collections_in_order.page_of(collections, after, limit)
 
+    @reads
     def search(self, search_string : str, case_sensitive : bool = True) -> list[DataCollection]:
         """Returns a list of DataCollection objects with `search_string` in their name. CASE SENSITIVE by default
         
@@ -204,13 +480,131 @@ class CollectionManager:
         Returns:
             Array with `DataCollection` objects matching the search_string
         """
-        output = []
-        for collection in self.data_collections:
-            name = collection.name
-            if not case_sensitive:
-                name = collection.name.lower()
-                search_string = search_string.lower()
-
-            if search_string in name:
-                output.append(collection)
+        if search_string == "":
+            return self.data_collections
+
+        # The index matches casefolded names, so both kinds of matches are a subset of its result
+        output = self._search_index.search(search_string)
+        if case_sensitive:
+            output = [collection for collection in output if search_string in collection.name]
+        else:
+            search_string = search_string.lower()
+            output = [collection for collection in output if search_string in collection.name.lower()]
+        output.sort(key=self._collections_in_order.number)
         return output
+
+    @reads
+    def search_page(self, search_string : str, case_sensitive : bool = True, after : int = 0,
+                    limit : int | None = None) -> tuple[list[DataCollection], int | None]:
+        """Returns a page of the DataCollections with `search_string` in their name. See `search()` and `page()`
+
+        Searches and pages within one read lock, so no collection of the search result can be deleted in between.
+
+        Args:
+            `search_string`: The substring that needs to be included in DataCollection.name
+            `case_sensitive`: Whether or not the search_string should be case sensitive. (Default: True)
+            `after`: The cursor returned with the previous page, or 0 for the first page
+            `limit`: Max amount of DataCollections in the page. All remaining if None
+
+        Returns:
+            The DataCollections in the page, and the cursor of the next page (None if there are no more)
+        """
+        return self.page(after, limit, self.search(search_string, case_sensitive))
+
+    @reads
+    def stale(self, before : int, limit : int | None = None) -> list[DataCollection]:
+        """Returns the DataCollections without any BackupEntry, or whose latest BackupEntry is dated before `before`.
+
+        Takes time proportional to the amount of DataCollections returned, not to the amount of DataCollections.
+
+        Args:
+            `before`: The cutoff timestamp
+            `limit`: Max amount of DataCollections to return. All if None
+
+        Returns:
+            The DataCollections without BackupEntries in insertion order, then the others from the least recently backed up
+        """
+        return self._staleness_index.stale(before, limit)
+
+    def snapshot(self, generation : int | None = None) -> Snapshot:
+        """Returns an immutable Snapshot of every DataCollection, which can be read without holding the lock.
+
+        The snapshot of the current generation is built on the first call after a mutation, from the previous
+        snapshot and the collections changed since. Later calls return the same snapshot without taking the lock.
+
+        Args:
+            `generation`: Return the snapshot of this generation, returned by an earlier call. The current generation if None
+
+        Returns:
+            The Snapshot, whose `generation` is the generation it was taken at
+
+        Raises:
+            `SnapshotNotFoundError`: Snapshot of generation `generation` is not available
+        """
+        latest = self._latest_snapshot
+        # A mutation in progress only increments the generation once it's done, so a matching snapshot is never outdated
+        if latest is not None and latest.generation == self.generation and generation in (None, latest.generation):
+            return latest
+        if generation is None or generation == self.generation:
+            return self._publish_snapshot()
+        with self._snapshot_mutex:
+            snapshot = self._snapshots.get(generation)
+            if snapshot is None:
+                raise SnapshotNotFoundError(f"Snapshot of generation {generation} is not available")
+            self._snapshots.move_to_end(generation)
+            return snapshot
+
+    @reads
+    def _publish_snapshot(self) -> Snapshot:
+        """Builds the snapshot of the current generation (unless another thread just did) and keeps it in the history"""
+        with self._snapshot_mutex:
+            latest = self._latest_snapshot
+            if latest is not None and latest.generation == self.generation:
+                return latest
+            if latest is None:
+                latest, changed = Snapshot(), self._collections_in_order.numbered()
+            else:
+                changed = self._changed_since_snapshot.items()
+            snapshot = latest.updated(self.generation, ((number, None if collection is None else CollectionSnapshot(collection))
+                                                        for number, collection in changed))
+            self._changed_since_snapshot.clear()
+            self._latest_snapshot = snapshot
+            self._snapshots[snapshot.generation] = snapshot
+            while len(self._snapshots) > self.generation_history:
+                self._snapshots.popitem(last=False)
+            return snapshot
+
+    @writes
+    def apply_operation(self, operation : str, arguments : dict) -> None:
+        """Redoes a mutation reported to the listeners. Used to replay an OperationLog.
+
+        Args:
+            `operation`: One of "add_collection", "add_collections", "edit_collection", "edit_collections", "delete_collection",
+                "add_backup", "add_backups" or "remove_backup"
+            `arguments`: The arguments reported together with the operation
+
+        Raises:
+            `InvalidOperationError`: Operation '`operation`' is not a valid operation
+            Any exception the corresponding mutation raises
+        """
+        if operation == "add_collection":
+            self.add_collection(arguments["name"], arguments["description"], arguments["creation_date"],
+                                arguments["modification_date"], arguments["updated"])
+        elif operation == "add_collections":
+            self.add_collections(arguments["collections"])
+        elif operation == "edit_collection":
+            self.edit_collection(arguments["collection_name"], arguments["updated_json"])
+        elif operation == "edit_collections":
+            self.edit_collections(arguments["edits"])
+        elif operation == "delete_collection":
+            self.delete_collection(arguments["collection_name"])
+        elif operation == "add_backup":
+            collection = self._get(arguments["collection_name"])
+            collection.add_backup(arguments["backup_name"], arguments["backup_date"], arguments["backup_location"])
+        elif operation == "add_backups":
+            self.add_backups(arguments["backups"])
+        elif operation == "remove_backup":
+            collection = self._get(arguments["collection_name"])
+            collection.remove_backup(collection.get_backup(arguments["backup_name"]))
+        else:
+            raise InvalidOperationError(f"Operation '{operation}' is not a valid operation")
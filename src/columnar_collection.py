@@ -0,0 +1,307 @@
+"""DataCollection storing its BackupEntries column-wise, for collections with millions of entries.
+
+Instead of one BackupEntry object per entry, every field of the entries is kept in a column:
+- dates and insertion numbers in arrays of 64 bit integers
+- names in a StringColumn: the utf-8 bytes of all names in one bytearray, plus an array of end offsets
+- locations split like in BackupEntry: the directory as an index into a list of the distinct
+  directories, and the rest in a StringColumn
+
+BackupEntry objects are only created when an entry is returned, by `get_backup()`,
+`backup_entries` and the methods building the output of the API.
+
+Names are found through an open addressing hash table of row numbers, and a permutation of the
+rows sorted by (date, insertion number) answers date ranges with binary searches, like the
+DateOrder of a DataCollection. Removed rows are only flagged until more than half of the rows
+are removed, then every column is rebuilt without them.
+
+Typical usage example:
+    manager = CollectionManager(collection_class=ColumnarDataCollection)
+    collection = manager.add_collection("Hourly", "", 0, 0, True)
+    collection.add_backup("Backup 1", 1749167340, "/mnt/backups/hourly/1.tar")
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from backup_entry import BackupEntry
+from custom_exceptions import BackupAlreadyExistsError, BackupNotFoundError
+from data_collection import DataCollection
+from date_order import window
+from rwlock import reads, writes
+from utility import format_timestamp
+
+EMPTY = -1   # Hash table slot that was never used
+DELETED = -2 # Hash table slot of a removed row, which lookups probe past
+MIN_TABLE_SIZE = 8
+
+class StringColumn:
+    """Strings stored as utf-8 in one bytearray, with an array of the offset where each one ends"""
+    __slots__ = ("_data", "_ends")
+
+    def __init__(self) -> None:
+        """Initializes an empty column"""
+        self._data = bytearray()
+        self._ends = array("q")
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def append(self, value : str) -> None:
+        """Adds `value` at the end of the column"""
+        self._data += value.encode()
+        self._ends.append(len(self._data))
+
+    def get_bytes(self, row : int) -> bytearray:
+        """Returns the utf-8 bytes of the string at `row`"""
+        return self._data[self._ends[row - 1] if row else 0:self._ends[row]]
+
+    def __getitem__(self, row : int) -> str:
+        return self._data[self._ends[row - 1] if row else 0:self._ends[row]].decode()
+
+class ColumnarEntries:
+    """Immutable view of the BackupEntries of a ColumnarDataCollection at one point in time.
+
+    Rows are only ever appended to the columns, and compacting replaces the columns with new ones,
+    so the view shares the columns of the collection and only copies the flags of the removed rows.
+    """
+    __slots__ = ("_names", "_dates", "_directories", "_location_directories", "_location_files", "_live", "_count", "_removed")
+
+    def __init__(self, collection : "ColumnarDataCollection") -> None:
+        """Initializes the view with the rows `collection` holds now"""
+        self._names = collection._names
+        self._dates = collection._dates
+        self._directories = collection._directories
+        self._location_directories = collection._location_directories
+        self._location_files = collection._location_files
+        self._live = bytes(collection._live)
+        self._count: int = collection.backup_count
+        self._removed: int = collection._removed
+
+    def __len__(self) -> int:
+        return self._count
+
+    def matches(self, collection : "ColumnarDataCollection") -> bool:
+        """Returns True if `collection` holds the same rows as when the view was taken"""
+        return self._names is collection._names and len(self._live) == len(collection._live) and self._removed == collection._removed
+
+    def __iter__(self):
+        """Yields the BackupEntries in insertion order"""
+        for row, live in enumerate(self._live):
+            if live:
+                location = self._directories[self._location_directories[row]] + self._location_files[row]
+                yield BackupEntry(self._names[row], location, self._dates[row])
+
+class ColumnarDataCollection(DataCollection):
+    """DataCollection whose BackupEntries are stored in columns. See the module docstring.
+
+    Has the same methods as DataCollection, with two differences: `remove_backup()` removes the
+    BackupEntry with the same name as the one given (like SqliteDataCollection), and every call
+    returning BackupEntries creates new BackupEntry objects.
+    """
+    __slots__ = ("_dates", "_numbers", "_names", "_directories", "_directory_ids", "_location_directories",
+                 "_location_files", "_live", "_removed", "_table", "_table_used", "_by_date", "_next_number")
+
+    def __init__(self, name : str, description : str, creation_date : int, modification_date : int, updated : bool) -> None:
+        """Initializes the instance without BackupEntries. See DataCollection.__init__()"""
+        super().__init__(name, description, creation_date, modification_date, updated)
+        self._next_number: int = 1
+        self._clear()
+
+    def _clear(self) -> None:
+        """Empties every column"""
+        self._dates = array("q")
+        self._numbers = array("q")         # Insertion number of every row, in increasing order
+        self._names = StringColumn()
+        self._directories: list[str] = []
+        self._directory_ids: dict[str, int] = {}
+        self._location_directories = array("l")
+        self._location_files = StringColumn()
+        self._live = bytearray()           # 0 for removed rows
+        self._removed: int = 0
+        self._table = array("q", [EMPTY]) * MIN_TABLE_SIZE
+        self._table_used: int = 0          # Slots that aren't EMPTY
+        self._by_date = array("q")         # Rows of the entries, sorted by `_date_key()`
+
+    def _date_key(self, row : int) -> tuple[int, int]:
+        return (self._dates[row], self._numbers[row])
+
+    def _entry(self, row : int) -> BackupEntry:
+        return BackupEntry(self._names[row], self._location(row), self._dates[row])
+
+    def _location(self, row : int) -> str:
+        return self._directories[self._location_directories[row]] + self._location_files[row]
+
+    def _rows(self, start : int = 0):
+        """Yields the rows that weren't removed, from `start` on, in insertion order"""
+        live = self._live
+        for row in range(start, len(live)):
+            if live[row]:
+                yield row
+
+    def _find_slot(self, name : str) -> int:
+        """Returns the hash table slot holding the row of the entry named `name`, or -1 if there is none"""
+        encoded = name.encode()
+        table = self._table
+        mask = len(table) - 1
+        slot = hash(name) & mask
+        while (row := table[slot]) != EMPTY:
+            if row != DELETED and self._names.get_bytes(row) == encoded:
+                return slot
+            slot = (slot + 1) & mask
+        return -1
+
+    def _add_to_table(self, name : str, row : int) -> None:
+        """Stores `row` under `name` in the hash table, which is kept at most half full"""
+        if 2 * (self._table_used + 1) > len(self._table):
+            self._rebuild_table()
+        table = self._table
+        mask = len(table) - 1
+        slot = hash(name) & mask
+        while table[slot] >= 0:
+            slot = (slot + 1) & mask
+        if table[slot] == EMPTY:
+            self._table_used += 1
+        table[slot] = row
+
+    def _rebuild_table(self) -> None:
+        """Rehashes every live row into a table with room for as many more, dropping the DELETED slots"""
+        size = MIN_TABLE_SIZE
+        while size < 4 * (len(self._live) - self._removed + 1):
+            size *= 2
+        self._table = array("q", [EMPTY]) * size
+        self._table_used = 0
+        mask = size - 1
+        for row in self._rows():
+            slot = hash(self._names[row]) & mask # The same hash as the str given to _add_to_table()
+            while self._table[slot] != EMPTY:
+                slot = (slot + 1) & mask
+            self._table[slot] = row
+            self._table_used += 1
+
+    def _append(self, backup_name : str, backup_date : int, backup_location : str, number : int) -> int:
+        """Adds a row to every column except `_by_date`, returning its row number"""
+        row = len(self._live)
+        self._add_to_table(backup_name, row) # First, since growing the table rehashes the rows in `_live`
+        self._dates.append(backup_date)
+        self._numbers.append(number)
+        self._names.append(backup_name)
+        split = max(backup_location.rfind("/"), backup_location.rfind("\\")) + 1
+        directory = backup_location[:split]
+        directory_id = self._directory_ids.get(directory)
+        if directory_id is None:
+            directory_id = self._directory_ids[directory] = len(self._directories)
+            self._directories.append(directory)
+        self._location_directories.append(directory_id)
+        self._location_files.append(backup_location[split:])
+        self._live.append(1)
+        return row
+
+    @property
+    @reads
+    def backup_entries(self) -> list[BackupEntry]:
+        """A list of all BackupEntries in the order they were added"""
+        return [self._entry(row) for row in self._rows()]
+
+    def _insert_backup(self, backup_name : str, backup_date : int, backup_location : str) -> BackupEntry:
+        """Adds a BackupEntry without incrementing `generation` or calling `on_change`. See DataCollection._insert_backup()
+
+        Raises:
+            `BackupAlreadyExistsError`: BackupEntry with name '`backup_name`' already exists
+        """
+        if self._find_slot(backup_name) != -1:
+            raise BackupAlreadyExistsError(f"BackupEntry with name '{backup_name}' already exists")
+
+        row = self._append(backup_name, backup_date, backup_location, self._next_number)
+        self._next_number += 1
+        if not self._by_date or self._date_key(self._by_date[-1]) < self._date_key(row):
+            self._by_date.append(row) # Usual case of backups added in date order
+        else:
+            insort(self._by_date, row, key=self._date_key)
+        self.backup_count += 1
+        if self.last_backup_date is None or backup_date > self.last_backup_date:
+            self.last_backup_date = backup_date
+            self.last_backup_location = backup_location
+        return BackupEntry(backup_name, backup_location, backup_date)
+
+    @writes
+    def remove_backup(self, backup_entry : BackupEntry) -> None:
+        """Removes the BackupEntry with the same name as `backup_entry`
+
+        Raises:
+            `BackupNotFoundError`: BackupEntry with name `backup_entry.name` not found in `backup_entries`
+        """
+        slot = self._find_slot(backup_entry.name)
+        if slot == -1:
+            raise BackupNotFoundError(f"BackupEntry {backup_entry.name} not found in `backup_entries`")
+        row = self._table[slot]
+        self._table[slot] = DELETED
+        self._live[row] = 0
+        self._removed += 1
+        del self._by_date[bisect_left(self._by_date, self._date_key(row), key=self._date_key)]
+        self.backup_count -= 1
+        if self._dates[row] == self.last_backup_date:
+            if self._by_date:
+                # The first added of the BackupEntries with the latest date
+                latest = self._by_date[bisect_left(self._by_date, (self._dates[self._by_date[-1]],), key=self._date_key)]
+                self.last_backup_date, self.last_backup_location = self._dates[latest], self._location(latest)
+            else:
+                self.last_backup_date, self.last_backup_location = None, None
+        if self._removed > len(self._live) // 2 + 32:
+            self._compact()
+        self.generation += 1
+        if self.on_change is not None:
+            self.on_change(self, "remove_backup", {"backup_name": backup_entry.name})
+
+    def _compact(self) -> None:
+        """Rebuilds every column without the removed rows. Insertion numbers are kept, so cursors stay valid"""
+        rows = [(self._names[row], self._dates[row], self._location(row), self._numbers[row]) for row in self._rows()]
+        self._clear()
+        for backup_name, backup_date, backup_location, number in rows:
+            self._append(backup_name, backup_date, backup_location, number)
+        self._by_date = array("q", sorted(range(len(rows)), key=self._date_key))
+
+    def _snapshot_entries(self) -> ColumnarEntries: # type: ignore
+        """Returns a ColumnarEntries view of the BackupEntries. See DataCollection._snapshot_entries().
+        The view of the previous call is returned again while no BackupEntry was added or removed."""
+        if self._entries_snapshot is None or not self._entries_snapshot[0].matches(self): # type: ignore
+            self._entries_snapshot = (ColumnarEntries(self), 0)
+        return self._entries_snapshot[0] # type: ignore
+
+    @reads
+    def get_backup(self, backup_name : str) -> BackupEntry:
+        """Returns a BackupEntry with the values of the one with a matching case-sensitive name. See DataCollection.get_backup()
+
+        Raises:
+            `BackupNotFoundError`: BackupEntry with name `backup_name` not found in `backup_entries`
+        """
+        slot = self._find_slot(backup_name)
+        if slot == -1:
+            raise BackupNotFoundError(f"BackupEntry with name '{backup_name}' not found in `backup_entries`")
+        return self._entry(self._table[slot])
+
+    def _json(self, rows) -> dict[str, dict[str,str]]:
+        return {self._names[row]: {"date": format_timestamp(self._dates[row]), "location": self._location(row)} for row in rows}
+
+    @reads
+    def get_backups_json(self) -> dict[str, dict[str,str]]:
+        """Returns all BackupEntries as a json-object. See DataCollection.get_backups_json()"""
+        return self._json(self._rows())
+
+    @reads
+    def get_backups_page(self, after : int = 0, limit : int | None = None) -> tuple[dict[str, dict[str,str]], int | None]:
+        """Returns a page of BackupEntries in insertion order. See DataCollection.get_backups_page()"""
+        rows = []
+        for row in self._rows(bisect_right(self._numbers, after)):
+            if limit is not None and len(rows) == limit:
+                return self._json(rows), self._numbers[rows[-1]]
+            rows.append(row)
+        return self._json(rows), None
+
+    @reads
+    def get_backups_range(self, since : int | None = None, until : int | None = None, limit : int | None = None, descending : bool = False,
+                          after : tuple[int, int] | None = None) -> tuple[dict[str, dict[str,str]], tuple[int, int] | None]:
+        """Returns BackupEntries in date order. See DataCollection.get_backups_range()"""
+        start, end, more = window(self._by_date, since, until, limit, descending, after, key=self._date_key)
+        rows = self._by_date[start:end]
+        if descending:
+            rows.reverse()
+        return self._json(rows), self._date_key(rows[-1]) if more else None
@@ -0,0 +1,56 @@
+"""Application settings read from environment variables.
+
+Typical usage example:
+    config = Config()
+    if config.data_dir is not None:
+        ...
+"""
+
+import os
+from collections.abc import Mapping
+
+class Config:
+    """Holds the application settings. Every setting can be set with an environment variable.
+
+    Attributes:
+        `storage`: Storage backend, "memory", "columnar" (in memory, with the BackupEntries stored column-wise) or "sqlite"
+            (BACKUPORGANIZER_STORAGE, default "memory")
+        `data_dir`: Directory where the data is persisted (BACKUPORGANIZER_DATA_DIR). Nothing is persisted if unset
+        `fsync_batch_size`: Amount of pending log records fsynced without waiting for more writers (BACKUPORGANIZER_FSYNC_BATCH_SIZE, default 1)
+        `fsync_interval`: Max seconds a log record waits for more writers before its fsync (BACKUPORGANIZER_FSYNC_INTERVAL, default 0.05)
+        `snapshot_interval`: Amount of log records between snapshots (BACKUPORGANIZER_SNAPSHOT_INTERVAL, default 100000)
+        `sqlite_path`: Database file used by the "sqlite" storage (BACKUPORGANIZER_SQLITE_PATH, default `data_dir`/backuporganizer.db)
+        `response_cache_bytes`: Max size of the cached API responses, 0 disables the cache (BACKUPORGANIZER_RESPONSE_CACHE_BYTES, default 64 MiB)
+        `profile_dir`: Directory where profiles of requests are written (BACKUPORGANIZER_PROFILE_DIR). Profiling is disabled if unset
+        `profile_sample_rate`: Fraction of the requests profiled, besides the ones sending "X-Profile: true"
+            (BACKUPORGANIZER_PROFILE_SAMPLE_RATE, default 0)
+        `profile_max_files`: Amount of profiles kept per endpoint (BACKUPORGANIZER_PROFILE_MAX_FILES, default 100)
+        `generation_history`: Amount of past generations kept for reads pinned with the `generation` GET parameter
+            (BACKUPORGANIZER_GENERATION_HISTORY, default 64)
+        `metrics_dir`: Directory shared by the gunicorn workers to add up their metrics on /metrics (BACKUPORGANIZER_METRICS_DIR).
+            Each worker only reports its own if unset
+        `asgi_threads`: Amount of threads calling the app when served with ASGI, see asgi.py (BACKUPORGANIZER_ASGI_THREADS, default 16)
+    """
+
+    def __init__(self, environ : Mapping[str, str] = os.environ) -> None:
+        """Initializes the instance with the settings found in `environ`
+
+        Args:
+            `environ`: The environment variables to read the settings from. (Default: os.environ)
+        """
+        self.storage: str = environ.get("BACKUPORGANIZER_STORAGE", "memory")
+        self.data_dir: str | None = environ.get("BACKUPORGANIZER_DATA_DIR") or None
+        self.fsync_batch_size: int = int(environ.get("BACKUPORGANIZER_FSYNC_BATCH_SIZE", "1"))
+        self.fsync_interval: float = float(environ.get("BACKUPORGANIZER_FSYNC_INTERVAL", "0.05"))
+        self.snapshot_interval: int = int(environ.get("BACKUPORGANIZER_SNAPSHOT_INTERVAL", "100000"))
+        self.sqlite_path: str = environ.get("BACKUPORGANIZER_SQLITE_PATH") or os.path.join(self.data_dir or ".", "backuporganizer.db")
+        self.response_cache_bytes: int = int(environ.get("BACKUPORGANIZER_RESPONSE_CACHE_BYTES", str(64 * 2**20)))
+        self.profile_dir: str | None = environ.get("BACKUPORGANIZER_PROFILE_DIR") or None
+        self.profile_sample_rate: float = float(environ.get("BACKUPORGANIZER_PROFILE_SAMPLE_RATE", "0"))
+        self.profile_max_files: int = int(environ.get("BACKUPORGANIZER_PROFILE_MAX_FILES", "100"))
+        self.generation_history: int = int(environ.get("BACKUPORGANIZER_GENERATION_HISTORY", "64"))
+        self.metrics_dir: str | None = environ.get("BACKUPORGANIZER_METRICS_DIR") or None
+        self.asgi_threads: int = int(environ.get("BACKUPORGANIZER_ASGI_THREADS", "16"))
+
+        if self.storage not in ["memory", "columnar", "sqlite"]:
+            raise ValueError(f"BACKUPORGANIZER_STORAGE must be 'memory', 'columnar' or 'sqlite', not '{self.storage}'")
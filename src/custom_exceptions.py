@@ -12,3 +12,22 @@ class BackupAlreadyExistsError(Exception):
 
 class InvalidCollectionEditError(Exception):
     """Raised when trying to modify a DataCollection with a wrong key, value or type"""
+
+
+class InvalidOperationError(Exception):
+    """Raised when trying to apply an unknown operation to a CollectionManager"""
+
+class OperationLogCorruptedError(Exception):
+    """Raised when an OperationLog or its snapshot can't be read back"""
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor can't be decoded"""
+
+class InvalidImportRecordError(Exception):
+    """Raised when a line of a bulk import is not a valid record"""
+
+class InvalidDateError(Exception):
+    """Raised when a date is not a valid ISO 8601 date"""
+
+class SnapshotNotFoundError(Exception):
+    """Raised when the snapshot of a generation isn't kept anymore, or never existed"""
\ No newline at end of file
@@ -1,42 +1,96 @@
+from collections.abc import Callable
 from custom_exceptions import BackupAlreadyExistsError, BackupNotFoundError
 from backup_entry import BackupEntry
+from date_order import DateOrder
+from insertion_order import InsertionOrder
+from persistent_map import PersistentIntMap
+from rwlock import ReadWriteLock, reads, writes
+from utility import format_timestamp
+
+# Shared by the DataCollections not owned by a CollectionManager
+UNMANAGED_LOCK = ReadWriteLock()
+# Most BackupEntries a snapshot copies into a tuple instead of a PersistentIntMap
+SMALL_SNAPSHOT_SIZE = 32
 
 class DataCollection:
-    """Storage class that holds a list of BackupEntries. 
+    """Storage class that holds BackupEntries. 
     
     Each collection's BackupEntry needs to have a unique name since its the identifier for the BackupEntry.
+    The entries are stored in a dictionary keyed by name, which keeps them in insertion order while
+    making adding, getting and removing a BackupEntry constant time. An InsertionOrder is used to
+    paginate through them, and a DateOrder to find the BackupEntries dated in a range.
+
+    Dates are stored as timestamps (whole seconds since 1970-01-01 00:00:00 UTC), and only
+    formatted as date strings by the methods building the output of the API.
+
+    Adding and removing BackupEntries holds `lock` for writing, and the methods reading the
+    BackupEntries hold it for reading, so they can be called from many threads at once.
+    `brief_str()`, `full_str()` and `full_json()` only read attributes and don't take the lock,
+    so the CollectionManager can call them for every collection while holding it just once.
 
     Attributes:
         `name`: The name of the DataCollection
         `description`: The description of the DataCollection
-        `creation_date`: The date this DataCollection was created
-        `modification_date`: The date this Datacollection was last modified.
+        `creation_date`: The timestamp of when this DataCollection was created
+        `modification_date`: The timestamp of when this Datacollection was last modified.
         `updated`: Flag indicating if this DataCollection is up to date
-        `backup_entries`: List containing all BackupEntries
+        `backup_entries`: List containing all BackupEntries in insertion order (read only)
+        `last_backup_date`: The latest date of the BackupEntries, or None if there are none
+        `last_backup_location`: The location of the BackupEntry with the latest date, or None if there are none
+        `backup_count`: The amount of BackupEntries
+            These three summary fields are kept up to date when BackupEntries are added or removed,
+            so they are never computed from all BackupEntries on read.
+        `on_change`: Optional callback called as `on_change(collection, operation, arguments)` after
+            a BackupEntry is added or removed. Set by the CollectionManager owning the collection.
+        `generation`: Incremented after a BackupEntry is added or removed. The CollectionManager owning
+            the collection sets it to its own generation after every change instead, so it's unique across collections.
+        `lock`: The ReadWriteLock guarding the BackupEntries. Set to the lock of the CollectionManager owning
+            the collection, so the collection and the manager change together.
     """
-    def __init__(self, name : str, description : str, creation_date : str, modification_date : str, updated : bool) -> None:
+    __slots__ = ("name", "description", "creation_date", "modification_date", "updated", "_backup_entries", "_entry_order", "_date_order",
+                 "last_backup_date", "last_backup_location", "backup_count", "on_change", "generation", "lock",
+                 "_entries_snapshot", "_removed_since_snapshot")
+
+    def __init__(self, name : str, description : str, creation_date : int, modification_date : int, updated : bool) -> None:
         """Initializes the instance with the arguments provided assigned to their corresponding attributes.
         
         Args:
             `name`: The name of the DataCollection.
             `description`: The description of the DataCollection.
-            `creation_date`: The datestring containing the date of creation
-            `modification_date`: The datestring containing the date of the latest modification
+            `creation_date`: The timestamp of the creation
+            `modification_date`: The timestamp of the latest modification
             `updated`: If the DataCollection is updated
         """
         self.name: str = name
         self.description: str = description
-        self.creation_date: str = creation_date
-        self.modification_date: str = modification_date
+        self.creation_date: int = creation_date
+        self.modification_date: int = modification_date
         self.updated: bool = updated
-        self.backup_entries: list[BackupEntry] = []
+        self._backup_entries: dict[str, BackupEntry] = {}
+        self._entry_order = InsertionOrder()
+        self._date_order = DateOrder()
+        self.last_backup_date: int | None = None
+        self.last_backup_location: str | None = None
+        self.backup_count: int = 0
+        self.on_change: Callable[[DataCollection, str, dict], None] | None = None
+        self.generation: int = 0
+        self.lock: ReadWriteLock = UNMANAGED_LOCK
+        self._entries_snapshot: tuple[object, int] | None = None # The last `_snapshot_entries()`, and the last insertion number in it
+        self._removed_since_snapshot: list[int] | None = None    # Insertion numbers removed since, once there is a snapshot
 
-    def add_backup(self, backup_name : str, backup_date : str, backup_location : str) -> BackupEntry:
-        """Creates and adds a BackupEntry to the end of self.backup_entries
+    @property
+    @reads
+    def backup_entries(self) -> list[BackupEntry]:
+        """A list of all BackupEntries in the order they were added"""
+        return list(self._backup_entries.values())
+
+    @writes
+    def add_backup(self, backup_name : str, backup_date : int, backup_location : str) -> BackupEntry:
+        """Creates and adds a BackupEntry to the end of the backup entries
 
         Args:
             `backup_name`: The name of the new BackupEntry
-            `backup_date`: The date of the BackupEntry as a string
+            `backup_date`: The timestamp of the BackupEntry
             `backup_location`: The path where the backup is stored
         
         Returns:
@@ -45,14 +99,33 @@ class DataCollection:
         Raises:
             `BackupAlreadyExistsError`: BackupEntry with name '`backup_name`' already exists
         """
-        for backup_entry in self.backup_entries:
-            if backup_entry.name == backup_name:
-                raise BackupAlreadyExistsError(f"BackupEntry with name '{backup_name}' already exists")
+        backup_entry = self._insert_backup(backup_name, backup_date, backup_location)
+        self.generation += 1
+        if self.on_change is not None:
+            self.on_change(self, "add_backup", {"backup_name": backup_name, "backup_date": backup_date, "backup_location": backup_location})
+        return backup_entry
+
+    def _insert_backup(self, backup_name : str, backup_date : int, backup_location : str) -> BackupEntry:
+        """Adds a BackupEntry without incrementing `generation` or calling `on_change`.
+        Also used by CollectionManager.add_backups(), which reports a whole batch at once.
+
+        Raises:
+            `BackupAlreadyExistsError`: BackupEntry with name '`backup_name`' already exists
+        """
+        if backup_name in self._backup_entries:
+            raise BackupAlreadyExistsError(f"BackupEntry with name '{backup_name}' already exists")
 
         backup_entry = BackupEntry(backup_name, backup_location, backup_date)
-        self.backup_entries.append(backup_entry)
+        self._backup_entries[backup_name] = backup_entry
+        self._entry_order.add(backup_entry)
+        self._date_order.add(backup_entry, backup_date)
+        self.backup_count += 1
+        if self.last_backup_date is None or backup_date > self.last_backup_date:
+            self.last_backup_date = backup_date
+            self.last_backup_location = backup_location
         return backup_entry
     
+    @writes
     def remove_backup(self, backup_entry : BackupEntry) -> None:
         """Removes `backup_entry` from `backup_entries`
 
@@ -62,13 +135,52 @@ class DataCollection:
         Raises:
             `BackupNotFoundError`: BackupEntry with name `backup_entry.name` not found in `backup_entries`
         """
-        if backup_entry not in self.backup_entries:
+        if self._backup_entries.get(backup_entry.name) is not backup_entry:
             raise BackupNotFoundError(f"BackupEntry {backup_entry.name} not found in `backup_entries`")
         else:
-            self.backup_entries.remove(backup_entry)
+            del self._backup_entries[backup_entry.name]
+            if self._removed_since_snapshot is not None:
+                self._removed_since_snapshot.append(self._entry_order.number(backup_entry))
+            self._entry_order.remove(backup_entry)
+            self._date_order.remove(backup_entry)
+            self.backup_count -= 1
+            if backup_entry.date == self.last_backup_date:
+                latest = self._date_order.latest()
+                self.last_backup_date = None if latest is None else latest.date
+                self.last_backup_location = None if latest is None else latest.location
+            self.generation += 1
+            if self.on_change is not None:
+                self.on_change(self, "remove_backup", {"backup_name": backup_entry.name})
     
+    def _snapshot_entries(self) -> tuple[BackupEntry, ...] | PersistentIntMap:
+        """Returns the BackupEntries in insertion order, in an immutable container that later changes don't affect.
+        Used by CollectionManager.snapshot(), which holds the lock for reading and only builds one snapshot at a time.
+
+        Returns:
+            A tuple of the BackupEntries when there are few, which is as cheap to copy as a path of a PersistentIntMap.
+            Otherwise a PersistentIntMap from insertion number to BackupEntry, updated from the map of the previous call
+            with the BackupEntries added and removed since, so it takes time proportional to the changes and the maps
+            share everything else. The previous container is returned again while no BackupEntry was added or removed.
+        """
+        last_number = self._entry_order.last_number
+        previous = self._entries_snapshot
+        removed = self._removed_since_snapshot
+        if previous is not None and previous[1] == last_number and not removed:
+            return previous[0]
+        if self.backup_count <= SMALL_SNAPSHOT_SIZE:
+            entries = tuple(self._backup_entries.values())
+        elif previous is not None and isinstance(previous[0], PersistentIntMap):
+            changes = [(number, None) for number in removed] + list(self._entry_order.numbered(previous[1])) # type: ignore
+            entries = previous[0].update(changes)
+        else:
+            entries = PersistentIntMap().update(self._entry_order.numbered())
+        self._entries_snapshot = (entries, last_number)
+        self._removed_since_snapshot = []
+        return entries
+
+    @reads
     def get_backup(self, backup_name : str) -> BackupEntry:
-        """Returns the first BackupEntry with a matching case-sensitive name
+        """Returns the BackupEntry with a matching case-sensitive name
 
         Args:
             `backup_name`: The case-sensitive name to match
@@ -79,11 +191,12 @@ class DataCollection:
         Raises:
             `BackupNotFoundError`: BackupEntry with name `backup_name` not found in `backup_entries`
         """
-        for backup in self.backup_entries:
-            if backup.name == backup_name:
-                return backup
-        raise BackupNotFoundError(f"BackupEntry with name '{backup_name}' not found in `backup_entries`")
+        backup = self._backup_entries.get(backup_name)
+        if backup is None:
+            raise BackupNotFoundError(f"BackupEntry with name '{backup_name}' not found in `backup_entries`")
+        return backup
 
+    @reads
     def get_backups_json(self) -> dict[str, dict[str,str]]:
         """Returns all BackupEntries as a json-object (using dicts in python) in the following format:
 
@@ -91,36 +204,78 @@ class DataCollection:
             Example Return Value:
             ```python
             {
-                "BackupEntry1": {"date": "1960", "location": "/home/user/backup.bak"},
-                "BackupEntry2": {"date": "2015", "location": "/home/user/backup2.bak"}
+                "BackupEntry1": {"date": "1960-06-01 15:31:10", "location": "/home/user/backup.bak"},
+                "BackupEntry2": {"date": "2015-02-04 08:15:49", "location": "/home/user/backup2.bak"}
             }
             ```
         """
         output = {}
-        for entry in self.backup_entries:
-            output[entry.name] = {"date": entry.date, "location": entry.location}
+        for entry in self._backup_entries.values():
+            output[entry.name] = {"date": format_timestamp(entry.date), "location": entry.location}
         return output
 
+    @reads
+    def get_backups_page(self, after : int = 0, limit : int | None = None) -> tuple[dict[str, dict[str,str]], int | None]:
+        """Returns a page of BackupEntries in insertion order, formatted like `get_backups_json()`
+
+        Args:
+            `after`: The cursor returned with the previous page, or 0 for the first page
+            `limit`: Max amount of BackupEntries in the page. All remaining if None
+
+        Returns:
+            The BackupEntries in the page, and the cursor of the next page (None if there are no more)
+        """
+        entries, next_cursor = self._entry_order.page(after, limit)
+        output = {}
+        for entry in entries:
+            output[entry.name] = {"date": format_timestamp(entry.date), "location": entry.location}
+        return output, next_cursor
+
+    @reads
+    def get_backups_range(self, since : int | None = None, until : int | None = None, limit : int | None = None, descending : bool = False,
+                          after : tuple[int, int] | None = None) -> tuple[dict[str, dict[str,str]], tuple[int, int] | None]:
+        """Returns the BackupEntries dated from `since` up to, but not including, `until`, in date order, formatted like `get_backups_json()`
+
+        BackupEntries with the same date are in the order they were added (reversed if `descending`).
+
+        Args:
+            `since`: The earliest timestamp to include. No lower bound if None
+            `until`: The timestamp to stop before. No upper bound if None
+            `limit`: Max amount of BackupEntries to return. All in the range if None
+            `descending`: Return the latest BackupEntries first
+            `after`: The cursor returned with the previous page, or None for the first page
+
+        Returns:
+            The BackupEntries, and the cursor of the next page (None if there are no more)
+        """
+        entries, next_cursor = self._date_order.range(since, until, limit, descending, after)
+        output = {}
+        for entry in entries:
+            output[entry.name] = {"date": format_timestamp(entry.date), "location": entry.location}
+        return output, next_cursor
+
     def brief_str(self) -> str:
         """Returns a string containing the following attributes:
         * `name`
-        * `modification_date`
+        * `last_backup_date` ("Never" if there are no BackupEntries)
         * `updated`
+        * `backup_count`
 
         Returns:
             Formatted like this:
                 ```python
-                "{name} | {modification_date} | Updated: {updated}"
+                "{name} | {last_backup_date} | Updated: {updated} | Backups: {backup_count}"
                 ```
             Example return value:
                 ```python
-                "DataCollection1 | 1960 4 October | Updated: True"
+                "DataCollection1 | 1960-10-04 12:00:00 | Updated: True | Backups: 3"
                 ```
         """
         string = ""
         string += self.name + " | "
-        string += self.modification_date + " | "
-        string += "Updated: " + str(self.updated)
+        string += ("Never" if self.last_backup_date is None else format_timestamp(self.last_backup_date)) + " | "
+        string += "Updated: " + str(self.updated) + " | "
+        string += "Backups: " + str(self.backup_count)
         return string
 
     def full_str(self) -> list[str]:
@@ -139,14 +294,14 @@ class DataCollection:
             ```
             Example return value:
                 ```python
-                ["DataCollection1", "The best collection", "Today", "13:58", "True"]
+                ["DataCollection1", "The best collection", "2009-05-12 10:11:12", "2025-02-04 08:15:49", "True"]
                 ```
         """
         string_list = []
         string_list.append(self.name)
         string_list.append(self.description)
-        string_list.append(self.creation_date)
-        string_list.append(self.modification_date)
+        string_list.append(format_timestamp(self.creation_date))
+        string_list.append(format_timestamp(self.modification_date))
         string_list.append(str(self.updated))
 
         return string_list
@@ -161,19 +316,27 @@ class DataCollection:
                 "description": "{description}",
                 "creation_date": "{creation_date}",
                 "modification_date": "{modification_date}",
-                "updated": {updated}
+                "updated": {updated},
+                "last_backup_date": "{last_backup_date}",
+                "last_backup_location": "{last_backup_location}",
+                "backup_count": {backup_count}
             }
             ```
 
             Example return value:
             ```python
-            {"name": "DataCollection1", "description": "The best Collection", "creation_date": "Today", "modification_date": "13:58", "updated": True}
+            {"name": "DataCollection1", "description": "The best Collection", "creation_date": "2009-05-12 10:11:12", "modification_date": "2025-02-04 08:15:49",
+             "updated": True, "last_backup_date": "2025-02-04 08:15:49", "last_backup_location": "/home/user/backup.bak", "backup_count": 3}
             ```
+            `last_backup_date` and `last_backup_location` are None if there are no BackupEntries.
         """
         data = {}
         data["name"] = self.name
         data["description"] = self.description
-        data["creation_date"] = self.creation_date
-        data["modification_date"] = self.modification_date
+        data["creation_date"] = format_timestamp(self.creation_date)
+        data["modification_date"] = format_timestamp(self.modification_date)
         data["updated"] = self.updated
+        data["last_backup_date"] = None if self.last_backup_date is None else format_timestamp(self.last_backup_date)
+        data["last_backup_location"] = self.last_backup_location
+        data["backup_count"] = self.backup_count
         return data
@@ -0,0 +1,106 @@
+"""Items ordered by date, for range queries over the BackupEntries of a DataCollection.
+
+Every item is stored under the key (date, number), where the number is given in insertion
+order, in a sorted list. The items dated in a range are a slice of the list, found with two
+binary searches. The key of the last item of a window is also the cursor of the next one,
+since a key stays correct while other items are added and removed.
+
+Typical usage example:
+    order = DateOrder()
+    order.add(entry, entry.date)
+    window, next_key = order.range(since=start, until=end, limit=100, descending=True)
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Hashable, Sequence
+
+class DateOrder:
+    """Holds items sorted by date, with O(log n + k) range queries for k results.
+
+    Items with the same date are ordered by when they were added.
+    Adding an item dated after every other item is O(log n); other adds and removes move the
+    keys after the item in the sorted list.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty instance"""
+        self._keys: dict[Hashable, tuple[int, int]] = {}
+        self._sorted_keys: list[tuple[int, int]] = []
+        self._items: dict[tuple[int, int], Hashable] = {}
+        self._next_number: int = 1
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, item : Hashable) -> bool:
+        return item in self._keys
+
+    def add(self, item : Hashable, date : int) -> tuple[int, int]:
+        """Adds `item` under `date`, returning its key"""
+        key = (date, self._next_number)
+        self._next_number += 1
+        self._keys[item] = key
+        self._items[key] = item
+        insort(self._sorted_keys, key)
+        return key
+
+    def remove(self, item : Hashable) -> None:
+        """Removes `item`
+
+        Raises:
+            `KeyError`: When `item` was never added or already removed
+        """
+        key = self._keys.pop(item)
+        del self._items[key]
+        del self._sorted_keys[bisect_left(self._sorted_keys, key)]
+
+    def latest(self) -> Hashable | None:
+        """Returns the first added of the items with the latest date, or None if there are no items"""
+        if not self._sorted_keys:
+            return None
+        return self._items[self._sorted_keys[bisect_left(self._sorted_keys, (self._sorted_keys[-1][0],))]]
+
+    def range(self, since : int | None = None, until : int | None = None, limit : int | None = None,
+              descending : bool = False, after : tuple[int, int] | None = None) -> tuple[list[Hashable], tuple[int, int] | None]:
+        """Returns up to `limit` items dated from `since` up to, but not including, `until`.
+
+        Args:
+            `since`: The earliest date to include. No lower bound if None
+            `until`: The date to stop before. No upper bound if None
+            `limit`: Max amount of items to return. All items in the range if None
+            `descending`: Return the latest items first instead of the earliest
+            `after`: The key returned with the previous window, or None for the first window
+
+        Returns:
+            The items, and the key to pass as `after` to get the next window (None if there are no more items)
+        """
+        start, end, more = window(self._sorted_keys, since, until, limit, descending, after)
+        keys = self._sorted_keys[start:end]
+        if descending:
+            keys.reverse()
+        return [self._items[key] for key in keys], keys[-1] if more else None
+
+def window(sorted_items : Sequence, since : int | None, until : int | None, limit : int | None, descending : bool,
+           after : tuple[int, int] | None, key : Callable[..., tuple[int, int]] | None = None) -> tuple[int, int, bool]:
+    """Finds the window of `sorted_items` described by the arguments of `DateOrder.range()` with binary searches
+
+    Args:
+        `sorted_items`: (date, number) keys in sorted order, or items sorted by `key` if given
+        `key`: Returns the (date, number) key of an item. The items themselves are the keys if None
+
+    Returns:
+        The start and end index of the window, and whether `limit` left out items of the range
+    """
+    # (date,) sorts before every (date, number)
+    start = 0 if since is None else bisect_left(sorted_items, (since,), key=key)
+    end = len(sorted_items) if until is None else bisect_left(sorted_items, (until,), key=key)
+    if after is not None:
+        if descending:
+            end = min(end, bisect_left(sorted_items, after, key=key))
+        else:
+            start = max(start, bisect_right(sorted_items, after, key=key))
+    if limit is None or end - start <= limit:
+        return start, end, False
+    if descending:
+        return end - limit, end, True
+    return start, start + limit, True
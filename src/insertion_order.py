@@ -0,0 +1,106 @@
+"""Insertion ordered collection of items with a stable insertion number per item.
+
+Each added item gets the next insertion number. Numbers are never reused, so they can be
+used as keyset pagination cursors: the page after cursor `n` holds the items with a
+number above `n`, which stays correct while other items are added and removed.
+
+Typical usage example:
+    order = InsertionOrder()
+    order.add(collection)
+    page, next_cursor = order.page(after=0, limit=100)
+"""
+
+from bisect import bisect_right
+from collections.abc import Hashable, Iterator
+
+class InsertionOrder:
+    """Holds items in insertion order, with O(1) add/remove and O(log n + page size) pagination.
+
+    Removed items leave their number in a sorted list used for seeking, which is compacted
+    once more than half of it belongs to removed items.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty instance"""
+        self._numbers: dict[Hashable, int] = {}
+        self._items: dict[int, Hashable] = {} # Ordered by number, since numbers only grow
+        self._sorted_numbers: list[int] = []
+        self._next_number: int = 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._items.values())
+
+    def __contains__(self, item : Hashable) -> bool:
+        return item in self._numbers
+
+    @property
+    def last_number(self) -> int:
+        """The insertion number of the last added item, even if it was removed since. 0 if nothing was added"""
+        return self._next_number - 1
+
+    def add(self, item : Hashable) -> int:
+        """Adds `item` at the end, returning its insertion number"""
+        number = self._next_number
+        self._next_number += 1
+        self._numbers[item] = number
+        self._items[number] = item
+        self._sorted_numbers.append(number)
+        return number
+
+    def remove(self, item : Hashable) -> None:
+        """Removes `item`
+
+        Raises:
+            `KeyError`: When `item` was never added or already removed
+        """
+        del self._items[self._numbers.pop(item)]
+        if len(self._sorted_numbers) > 2 * len(self._items) + 64:
+            self._sorted_numbers = list(self._items)
+
+    def number(self, item : Hashable) -> int:
+        """Returns the insertion number of `item`
+
+        Raises:
+            `KeyError`: When `item` was never added or already removed
+        """
+        return self._numbers[item]
+
+    def page(self, after : int = 0, limit : int | None = None) -> tuple[list[Hashable], int | None]:
+        """Returns up to `limit` items with an insertion number above `after`, in insertion order.
+
+        Args:
+            `after`: The cursor returned with the previous page, or 0 for the first page
+            `limit`: Max amount of items to return. All remaining items if None
+
+        Returns:
+            The items, and the cursor of the next page (None if there are no more items)
+        """
+        output = []
+        index = bisect_right(self._sorted_numbers, after)
+        while index < len(self._sorted_numbers):
+            item = self._items.get(self._sorted_numbers[index])
+            index += 1
+            if item is None:
+                continue # Removed item
+            if limit is not None and len(output) == limit:
+                return output, self._numbers[output[-1]]
+            output.append(item)
+        return output, None
+
+    def numbered(self, after : int = 0) -> Iterator[tuple[int, Hashable]]:
+        """Yields the (insertion number, item) pairs of the items with a number above `after`, in insertion order"""
+        for number in self._sorted_numbers[bisect_right(self._sorted_numbers, after):]:
+            item = self._items.get(number)
+            if item is not None:
+                yield number, item
+
+    def page_of(self, items : list[Hashable], after : int = 0, limit : int | None = None) -> tuple[list[Hashable], int | None]:
+        """Like `page()`, but only for `items`, which must be a list of added items in insertion order (like a search result)"""
+        start = bisect_right(items, after, key=self._numbers.__getitem__)
+        if limit is None or start + limit >= len(items):
+            return items[start:], None
+        output = items[start:start + limit]
+        return output, self._numbers[output[-1]]
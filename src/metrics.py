@@ -0,0 +1,241 @@
+"""Request metrics of the API, rendered in the Prometheus text exposition format.
+
+Every request to a resource is counted by endpoint, method and status code, and failed requests
+also by the type of their error. Latencies go into histograms with fixed buckets, so recording a
+request takes one lock acquisition and a binary search per stage, and the memory used doesn't
+grow with the amount of requests. Each latency is recorded per stage of the request:
+- "validation": From the start of the request until its handler runs
+- "manager": The handler, doing the CollectionManager calls and building the payload
+- "marshalling": From the end of the handler until the response is built
+- "total": The whole request
+
+Counters kept by other components, like the hits of the ResponseCache, are rendered along with
+them once registered with `add_counter()`.
+
+The metrics are kept per process. With several gunicorn workers, give every worker the same
+`directory`: each one then writes its metrics to `metrics-<pid>.json` in it every `write_interval`
+seconds (and when it exits), and `render()` adds up the files of every worker, so a scrape sees every worker whichever
+one answers it (like the multiprocess mode of the Prometheus client). The files of workers that
+exited are kept, so the counters never go down, and the directory must be emptied whenever the
+server starts.
+
+Typical usage example:
+    metrics = Metrics("/tmp/backuporganizer-metrics")
+    metrics.record("Info", "GET", 200, {"validation": 0.0001, "manager": 0.0008, "marshalling": 0.0003, "total": 0.0012})
+    text = metrics.render()
+"""
+
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+# Upper bounds in seconds, from a cache hit to a bulk import
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGES = ("validation", "manager", "marshalling", "total")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "backuporganizer_"
+
+class Histogram:
+    """Amount of observed values per bucket, plus their sum"""
+    __slots__ = ("counts", "sum")
+
+    def __init__(self) -> None:
+        """Initializes the instance without values"""
+        self.counts: list[int] = [0] * (len(BUCKETS) + 1) # The last one counts the values above every bucket
+        self.sum: float = 0.0
+
+    def observe(self, value : float) -> None:
+        """Adds `value` to the first bucket whose upper bound is at least `value`"""
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list[int]:
+        """Returns the amount of values less than or equal to each bucket bound, followed by the total amount"""
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+class Metrics:
+    """Thread-safe counters and latency histograms of the requests to the API. See the module docstring.
+
+    Attributes:
+        `directory`: The directory shared by the workers to add up their metrics. None if they're only rendered for this process
+        `requests`: Amount of requests of this process, keyed by (endpoint, method, status code)
+        `errors`: Amount of errors of this process, keyed by (endpoint, method, error type)
+        `latencies`: Histograms of the latencies in seconds of this process, keyed by (endpoint, method, stage)
+    """
+
+    def __init__(self, directory : str | None = None, write_interval : float | None = 1.0) -> None:
+        """Initializes the instance without recorded requests, creating `directory` if it doesn't exist
+
+        Args:
+            `directory`: The directory shared by the workers to add up their metrics. Only this process is rendered if None
+            `write_interval`: Seconds between two writes of the metrics of this process to `directory`, starting with the first
+                recorded request. Only written by `write_state()` if None. (Default: 1.0)
+        """
+        self.directory: str | None = directory
+        self.write_interval: float | None = write_interval
+        self.requests: dict[tuple[str, str, int], int] = {}
+        self.errors: dict[tuple[str, str, str], int] = {}
+        self.latencies: dict[tuple[str, str, str], Histogram] = {}
+        self._counters: dict[str, tuple[str, Callable[[], int]]] = {}
+        self._lock = threading.Lock()
+        self._writer_pid: int | None = None # The process whose writer thread was started, since workers fork
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def add_counter(self, name : str, description : str, read : Callable[[], int]) -> None:
+        """Registers a counter kept by another component, rendered as `PREFIX` + `name` with the value returned by `read()`
+
+        Args:
+            `name`: The name of the counter without `PREFIX`, ending with "_total"
+            `description`: The help text of the counter
+            `read`: Returns the current value of the counter
+        """
+        self._counters[name] = (description, read)
+
+    def record(self, endpoint : str, method : str, status : int, durations : dict[str, float], error_types : Iterable[str] = ()) -> None:
+        """Records one request to `endpoint`
+
+        Args:
+            `status`: The status code of the response
+            `durations`: Seconds taken by the stages of the request, keyed by their name in `STAGES`
+            `error_types`: Types of the errors that made the request fail
+
+        Raises:
+            `ValueError`: When a key of `durations` isn't one of `STAGES`
+        """
+        for stage in durations:
+            if stage not in STAGES:
+                raise ValueError(f"Unknown stage '{stage}', must be one of {', '.join(STAGES)}")
+        with self._lock:
+            key = (endpoint, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            for error_type in error_types:
+                key = (endpoint, method, error_type)
+                self.errors[key] = self.errors.get(key, 0) + 1
+            for stage, seconds in durations.items():
+                key = (endpoint, method, stage)
+                histogram = self.latencies.get(key)
+                if histogram is None:
+                    histogram = self.latencies[key] = Histogram()
+                histogram.observe(seconds)
+            start_writer = self.directory is not None and self.write_interval is not None and self._writer_pid != os.getpid()
+            if start_writer:
+                self._writer_pid = os.getpid()
+        if start_writer:
+            threading.Thread(target=self._write_periodically, daemon=True).start()
+            atexit.register(self._write_last_state)
+
+    def state(self) -> dict:
+        """Returns the metrics of this process as a json serializable dict, which `merge_states()` can add up"""
+        with self._lock:
+            state = {"requests": [[*key, count] for key, count in self.requests.items()],
+                     "errors": [[*key, count] for key, count in self.errors.items()],
+                     "latencies": [[*key, histogram.counts, histogram.sum] for key, histogram in self.latencies.items()]}
+        state["counters"] = {name: read() for name, (_, read) in self._counters.items()}
+        return state
+
+    def write_state(self) -> None:
+        """Writes the metrics of this process to its file in `directory`, replacing the previous ones at once"""
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json") # type: ignore
+        with open(path + ".tmp", "w") as file:
+            json.dump(self.state(), file, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+    def _write_periodically(self) -> None:
+        while True:
+            time.sleep(self.write_interval) # type: ignore
+            self._write_last_state()
+
+    def _write_last_state(self) -> None:
+        try:
+            self.write_state()
+        except OSError:
+            pass # The directory was emptied by a restarting server, which drops the metrics of this process anyway
+
+    def _worker_states(self) -> list[dict]:
+        """Returns the metrics of this process, and the last ones written by every other worker to `directory`"""
+        states = [self.state()]
+        if self.directory is not None:
+            own_file = f"metrics-{os.getpid()}.json"
+            for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+                if os.path.basename(path) == own_file:
+                    continue
+                try:
+                    with open(path) as file:
+                        states.append(json.load(file))
+                except (OSError, ValueError):
+                    continue # Deleted meanwhile, or not written by a worker
+        return states
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format (version 0.0.4), added up over every worker writing to `directory`"""
+        merged = merge_states(self._worker_states())
+        requests = sorted(merged["requests"].items())
+        errors = sorted(merged["errors"].items())
+        latencies = sorted((key, histogram.cumulative_counts(), histogram.sum) for key, histogram in merged["latencies"].items())
+
+        lines = [f"# HELP {PREFIX}requests_total Requests handled, by endpoint, method and status code",
+                 f"# TYPE {PREFIX}requests_total counter"]
+        for (endpoint, method, status), count in requests:
+            lines.append(f"{PREFIX}requests_total{labels(endpoint=endpoint, method=method, status=str(status))} {count}")
+
+        lines += [f"# HELP {PREFIX}request_errors_total Failed requests, by endpoint, method and error type",
+                  f"# TYPE {PREFIX}request_errors_total counter"]
+        for (endpoint, method, error_type), count in errors:
+            lines.append(f"{PREFIX}request_errors_total{labels(endpoint=endpoint, method=method, type=error_type)} {count}")
+
+        lines += [f"# HELP {PREFIX}request_duration_seconds Latency of the stages of requests, by endpoint and method",
+                  f"# TYPE {PREFIX}request_duration_seconds histogram"]
+        for (endpoint, method, stage), cumulative, total in latencies:
+            for bound, count in zip([*map(str, BUCKETS), "+Inf"], cumulative):
+                lines.append(f"{PREFIX}request_duration_seconds_bucket{labels(endpoint=endpoint, method=method, stage=stage, le=bound)} {count}")
+            lines.append(f"{PREFIX}request_duration_seconds_sum{labels(endpoint=endpoint, method=method, stage=stage)} {total!r}")
+            lines.append(f"{PREFIX}request_duration_seconds_count{labels(endpoint=endpoint, method=method, stage=stage)} {cumulative[-1]}")
+
+        for name, (description, _) in sorted(self._counters.items()):
+            lines += [f"# HELP {PREFIX}{name} {description}", f"# TYPE {PREFIX}{name} counter", f"{PREFIX}{name} {merged['counters'].get(name, 0)}"]
+        return "\n".join(lines) + "\n"
+
+def merge_states(states : Iterable[dict]) -> dict:
+    """Adds up the metrics returned by `Metrics.state()` in several processes
+
+    Returns:
+        A dict with "requests" and "errors" keyed like Metrics.requests and Metrics.errors, "latencies" holding Histograms
+        keyed like Metrics.latencies, and "counters" holding the value of every counter by name
+    """
+    requests: dict[tuple, int] = {}
+    errors: dict[tuple, int] = {}
+    latencies: dict[tuple, Histogram] = {}
+    counters: dict[str, int] = {}
+    for state in states:
+        for *key, count in state["requests"]:
+            requests[tuple(key)] = requests.get(tuple(key), 0) + count
+        for *key, count in state["errors"]:
+            errors[tuple(key)] = errors.get(tuple(key), 0) + count
+        for endpoint, method, stage, counts, total in state["latencies"]:
+            histogram = latencies.get((endpoint, method, stage))
+            if histogram is None:
+                histogram = latencies[(endpoint, method, stage)] = Histogram()
+            histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+            histogram.sum += total
+        for name, value in state["counters"].items():
+            counters[name] = counters.get(name, 0) + value
+    return {"requests": requests, "errors": errors, "latencies": latencies, "counters": counters}
+
+def labels(**values : str) -> str:
+    """Returns `values` as a Prometheus label set, escaping backslashes, double quotes and newlines"""
+    pairs = []
+    for name, value in values.items():
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
@@ -0,0 +1,356 @@
+"""Durable append-only operation log (write-ahead log) for a CollectionManager.
+
+Every mutation reported by the CollectionManager is appended to `operations.log` as one json
+line while the manager is locked for writing. Once the writer released the manager lock, it waits
+until its record is fsynced before returning, so a mutation is durable when it's acknowledged.
+The writers waiting at the same time share one fsync (group commit): the first one to find no
+fsync running becomes the leader and fsyncs every record appended so far, then wakes up every
+writer it covered. A leader fsyncs right away once `fsync_batch_size` records are pending, and
+otherwise waits up to `fsync_interval` seconds for more writers to join the group.
+
+To keep the replay at startup bounded, a snapshot of the whole state is written to
+`snapshot.log` every `snapshot_interval` records. Once a writer crossing the interval released
+the manager lock, the log is rotated to `operations.log.<lsn>` and a copy-on-write view of the
+manager (`CollectionManager.snapshot()`) is taken, which only briefly holds the manager lock for reading.
+A background thread then writes and fsyncs the snapshot from that view, so reads and writes
+never wait for it, and deletes the rotated log it covers.
+The snapshot holds one json line per collection, including all of its BackupEntries.
+Each record carries a log sequence number (lsn), and the snapshot stores the last lsn it
+contains. A crash before the snapshot is done leaves the rotated log, which is replayed before
+`operations.log`, and records already included in the snapshot are skipped.
+
+Dates are written as timestamps. Logs and snapshots written while dates were free form strings
+are still read, converting their dates with `utility.legacy_timestamp()`.
+
+Typical usage example:
+    manager = CollectionManager()
+    operation_log = OperationLog("/app/data", fsync_batch_size=64, fsync_interval=0.05)
+    operation_log.recover(manager)
+    ...
+    operation_log.close()
+"""
+
+import json
+import os
+import threading
+import time
+from collection_manager import CollectionManager
+from custom_exceptions import OperationLogCorruptedError
+from snapshot import Snapshot
+from utility import DATE_KEYS, legacy_timestamp
+
+LOG_FILENAME = "operations.log"
+SNAPSHOT_FILENAME = "snapshot.log"
+
+def upgrade_dates(arguments : object) -> object:
+    """Returns the arguments of a logged operation with every date converted by `legacy_timestamp()`, at any depth"""
+    if isinstance(arguments, dict):
+        return {key: legacy_timestamp(value) if key in DATE_KEYS else upgrade_dates(value) for key, value in arguments.items()}
+    if isinstance(arguments, list):
+        return [upgrade_dates(item) for item in arguments]
+    return arguments
+
+class OperationLog:
+    """Append-only log of CollectionManager operations, with group-commit fsync and snapshot compaction.
+
+    Attributes:
+        `directory`: The directory holding the log and snapshot files
+        `fsync_batch_size`: Amount of pending records that are fsynced right away. 1 means no writer waits for others
+        `fsync_interval`: Max amount of seconds a record can stay pending before it is fsynced
+        `snapshot_interval`: Amount of records after which a snapshot is written and the log truncated
+        `lsn`: The log sequence number of the latest record
+        `durable_lsn`: The log sequence number of the latest fsynced record
+    """
+
+    def __init__(self, directory : str, fsync_batch_size : int = 1, fsync_interval : float = 0.05, snapshot_interval : int = 100_000) -> None:
+        """Initializes the instance and creates `directory` if it does not exist.
+
+        Args:
+            `directory`: The directory holding the log and snapshot files
+            `fsync_batch_size`: Amount of pending records that are fsynced right away
+            `fsync_interval`: Max amount of seconds a record can stay pending before it is fsynced
+            `snapshot_interval`: Amount of records after which a snapshot is written and the log truncated
+        """
+        self.directory: str = directory
+        self.fsync_batch_size: int = max(1, fsync_batch_size)
+        self.fsync_interval: float = fsync_interval
+        self.snapshot_interval: int = snapshot_interval
+        self.lsn: int = 0
+        self.durable_lsn: int = 0
+
+        self._manager: CollectionManager | None = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock) # Notified when a fsync ends
+        self._syncing: bool = False   # A leader is running a fsync without holding `_lock`
+        self._local = threading.local() # `lsn`: The latest record appended by the current thread, not yet waited for
+        self._pending: int = 0        # Records not covered by a started fsync
+        self._oldest_pending: float = 0.0
+        self._records_since_snapshot: int = 0
+        self._snapshot_due: bool = False   # `snapshot_interval` was crossed, and no snapshot was started since
+        self._snapshotting: bool = False   # A snapshot is being written from a rotated log
+        self._snapshot_done = threading.Condition(self._lock)
+        self._closed = threading.Event()
+        self._flusher: threading.Thread | None = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.directory, LOG_FILENAME)
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, SNAPSHOT_FILENAME)
+
+    def _rotated_logs(self) -> list[tuple[int, str]]:
+        """Returns the lsn of the last record and the path of every rotated log not yet covered by a snapshot, in lsn order"""
+        prefix = LOG_FILENAME + "."
+        return sorted((int(filename[len(prefix):]), os.path.join(self.directory, filename)) for filename in os.listdir(self.directory)
+                      if filename.startswith(prefix) and filename[len(prefix):].isdigit())
+
+    def recover(self, manager : CollectionManager) -> None:
+        """Loads the snapshot and replays the log into `manager`, then starts logging its mutations.
+
+        `manager` should be empty, since the whole persisted state is added to it.
+
+        Args:
+            `manager`: The CollectionManager to restore and log
+
+        Raises:
+            `OperationLogCorruptedError`: When a record in the middle of the log or snapshot can't be decoded
+        """
+        with manager.lock.write: # Nothing reads a partly recovered state, and the replayed mutations take the lock reentrantly
+            snapshot_lsn = self._load_snapshot(manager)
+            self.lsn = snapshot_lsn
+            valid_length = self._replay_log(manager, snapshot_lsn)
+
+            self._file = open(self.log_path, "ab")
+            self._file.truncate(valid_length) # Drops a torn record left by a crash mid-write
+            self.durable_lsn = self.lsn
+            self._manager = manager
+            manager.add_listener(self.record)
+            manager.lock.add_release_callback(self.wait_for_durability)
+            manager.lock.add_release_callback(self._snapshot_if_due)
+
+        if self.fsync_batch_size > 1 and self.fsync_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+    def _load_snapshot(self, manager : CollectionManager) -> int:
+        """Adds every collection in the snapshot to `manager`, returning the lsn stored in the snapshot"""
+        if not os.path.exists(self.snapshot_path):
+            return 0
+        with open(self.snapshot_path, "rb") as file:
+            try:
+                header = json.loads(file.readline())
+                for line in file:
+                    record = json.loads(line)
+                    arguments = record["collection"]
+                    collection = manager.add_collection(arguments["name"], arguments["description"], legacy_timestamp(arguments["creation_date"]),
+                                                        legacy_timestamp(arguments["modification_date"]), arguments["updated"])
+                    for backup_name, backup_date, backup_location in record["backup_entries"]:
+                        collection.add_backup(backup_name, legacy_timestamp(backup_date), backup_location)
+            except (ValueError, KeyError) as e:
+                raise OperationLogCorruptedError(f"Snapshot '{self.snapshot_path}' is corrupted: {e}") from e
+        return header["lsn"]
+
+    def _replay_log(self, manager : CollectionManager, snapshot_lsn : int) -> int:
+        """Applies every operation with a lsn above `snapshot_lsn` to `manager`, from the rotated logs and then the log.
+
+        Returns:
+            The length in bytes of the valid part of the log
+        """
+        for _, path in self._rotated_logs():
+            self._replay_file(manager, path, snapshot_lsn)
+        if not os.path.exists(self.log_path):
+            return 0
+        return self._replay_file(manager, self.log_path, snapshot_lsn)
+
+    def _replay_file(self, manager : CollectionManager, path : str, snapshot_lsn : int) -> int:
+        """Applies every operation in the log file at `path` with a lsn above `snapshot_lsn` to `manager`, returning the length of its valid part"""
+        valid_length = 0
+        with open(path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break # The last record was only partially written before a crash
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise OperationLogCorruptedError(f"Log '{path}' is corrupted at byte {valid_length}: {e}") from e
+                valid_length += len(line)
+                if record["lsn"] <= snapshot_lsn:
+                    continue
+                manager.apply_operation(record["op"], upgrade_dates(record["args"]))
+                self.lsn = record["lsn"]
+                self._records_since_snapshot += 1
+        return valid_length
+
+    def record(self, operation : str, arguments : dict) -> None:
+        """Appends an operation to the log without waiting for its fsync. Registered as a CollectionManager listener by `recover()`.
+
+        The mutating thread waits for the fsync in `wait_for_durability()`, once it released the manager lock.
+
+        Args:
+            `operation`: The operation reported by the CollectionManager
+            `arguments`: The arguments of the operation
+        """
+        with self._lock:
+            self.lsn += 1
+            line = json.dumps({"lsn": self.lsn, "op": operation, "args": arguments}, separators=(",", ":"))
+            self._file.write(line.encode() + b"\n")
+            if self._pending == 0:
+                self._oldest_pending = time.monotonic()
+            self._pending += 1
+            self._records_since_snapshot += 1
+            self._local.lsn = self.lsn
+            if self._records_since_snapshot >= self.snapshot_interval:
+                self._snapshot_due = True # Started by `_snapshot_if_due()`, once the manager lock is released
+
+    def wait_for_durability(self) -> None:
+        """Waits until every record appended by the current thread is fsynced, leading the fsync of the group if none is running.
+        Registered by `recover()` to run after every write to the manager."""
+        lsn = getattr(self._local, "lsn", 0)
+        if lsn > self.durable_lsn:
+            with self._lock:
+                self._wait_for(lsn, force=False)
+        self._local.lsn = 0
+
+    def sync(self) -> None:
+        """Flushes and fsyncs every pending record"""
+        with self._lock:
+            self._wait_for(self.lsn, force=True)
+
+    def _wait_for(self, lsn : int, force : bool) -> None:
+        """Waits until `durable_lsn` reaches `lsn`. Must hold `_lock`, which is released while waiting or fsyncing.
+
+        Args:
+            `lsn`: The log sequence number to wait for
+            `force`: Fsync right away instead of waiting for `fsync_batch_size` records or `fsync_interval` seconds
+        """
+        while self.durable_lsn < lsn and self._file is not None:
+            if self._syncing:
+                self._synced.wait()
+                continue
+            remaining = self._oldest_pending + self.fsync_interval - time.monotonic()
+            if force or self._pending >= self.fsync_batch_size or remaining <= 0:
+                self._lead_sync()
+            else:
+                self._synced.wait(remaining) # For more writers to join the group, or another leader
+
+    def _lead_sync(self) -> None:
+        """Fsyncs every record appended so far without holding `_lock`, so more records can be appended meanwhile,
+        then wakes up the waiting writers. Must hold `_lock`."""
+        self._syncing = True
+        target = self.lsn
+        self._pending = 0
+        try:
+            self._file.flush()
+            self._lock.release()
+            try:
+                os.fsync(self._file.fileno())
+            finally:
+                self._lock.acquire()
+            self.durable_lsn = max(self.durable_lsn, target)
+        finally:
+            self._syncing = False
+            self._synced.notify_all()
+
+    def _sync(self) -> None:
+        """Fsyncs every record appended so far while holding `_lock`"""
+        while self._syncing: # Its file descriptor must stay open, and its fsync doesn't cover the records appended since
+            self._synced.wait()
+        if self.durable_lsn == self.lsn:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self.durable_lsn = self.lsn
+        self._synced.notify_all()
+
+    def snapshot(self) -> None:
+        """Writes a snapshot of the current state and truncates the log, waiting until it's done"""
+        # The manager lock first, like when `record()` is called by a mutation, so the two locks are always taken in the same order
+        with self._manager.lock.read, self._lock:
+            while self._snapshotting:
+                self._snapshot_done.wait()
+            snapshot, lsn = self._rotate()
+        self._write_snapshot(snapshot, lsn)
+
+    def _snapshot_if_due(self) -> None:
+        """Rotates the log and starts writing a snapshot in the background if `snapshot_interval` was crossed.
+        Registered by `recover()` to run after every write to the manager."""
+        if not self._snapshot_due:
+            return
+        with self._manager.lock.read, self._lock:
+            if not self._snapshot_due or self._snapshotting or self._file is None:
+                return # Another writer started it, or the previous snapshot is still running and the next writer retries
+            snapshot, lsn = self._rotate()
+            threading.Thread(target=self._write_snapshot, args=(snapshot, lsn), daemon=True).start()
+
+    def _rotate(self) -> tuple[Snapshot, int]:
+        """Renames the log to `operations.log.<lsn>` and starts a new one, returning a view of the manager holding exactly the records
+        up to `lsn`. Must hold the manager lock for reading, so no mutation is in progress, and `_lock`."""
+        self._sync()
+        if self._file.tell() > 0: # Otherwise it would replace a rotated log of the same lsn, whose snapshot may have failed
+            self._file.close()
+            os.replace(self.log_path, os.path.join(self.directory, f"{LOG_FILENAME}.{self.lsn}"))
+            self._file = open(self.log_path, "ab")
+            self._fsync_directory()
+        self._records_since_snapshot = 0
+        self._snapshot_due = False
+        self._snapshotting = True
+        return self._manager.snapshot(), self.lsn
+
+    def _write_snapshot(self, snapshot : Snapshot, lsn : int) -> None:
+        """Writes `snapshot` holding the records up to `lsn` to the snapshot file, then deletes the rotated logs it covers.
+        Holds no lock, so the manager can be read and written meanwhile."""
+        try:
+            temporary_path = self.snapshot_path + ".tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(json.dumps({"lsn": lsn}).encode() + b"\n")
+                # One line per collection, holding all of its BackupEntries, keeps the snapshot compact and fast to load
+                for collection in snapshot:
+                    backup_entries = [[entry.name, entry.date, entry.location] for entry in collection.backup_entries]
+                    record = {"collection": {"name": collection.name, "description": collection.description, "creation_date": collection.creation_date,
+                                             "modification_date": collection.modification_date, "updated": collection.updated},
+                              "backup_entries": backup_entries}
+                    file.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.snapshot_path)
+            self._fsync_directory()
+            for rotated_lsn, path in self._rotated_logs():
+                if rotated_lsn <= lsn:
+                    os.remove(path)
+        finally:
+            with self._lock:
+                self._snapshotting = False
+                self._snapshot_done.notify_all()
+
+    def _fsync_directory(self) -> None:
+        """Makes the rename of the snapshot file durable"""
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def _flush_periodically(self) -> None:
+        """Background loop leading the fsync of the records pending longer than `fsync_interval`, if no waiting writer did"""
+        while not self._closed.wait(self.fsync_interval):
+            with self._lock:
+                if self._pending and not self._syncing and time.monotonic() - self._oldest_pending >= self.fsync_interval:
+                    self._lead_sync()
+
+    def close(self) -> None:
+        """Fsyncs every pending record and closes the log"""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            while self._snapshotting:
+                self._snapshot_done.wait()
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
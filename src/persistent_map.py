@@ -0,0 +1,176 @@
+"""Persistent map from non-negative integers to values, sharing structure between versions.
+
+The map is a radix trie with 32 children per node, indexed by 5 bits of the key per level.
+It's never changed in place: `update()` returns a new map, copying only the nodes on the paths
+of the changed keys (one node per level, so log32(n) nodes per key) and sharing every other
+node with the old map. Keeping many versions therefore only costs what changed between them,
+and a version can be read from any thread while newer versions are being built.
+
+Items are iterated in key order, so the map suits insertion numbers like the ones of an
+InsertionOrder, and can be paginated with the same cursors.
+
+Typical usage example:
+    first = PersistentIntMap().update([(1, "a"), (2, "b")])
+    second = first.update([(1, None), (3, "c")]) # None removes the key
+    list(first.items())   # [(1, "a"), (2, "b")]
+    list(second.items())  # [(2, "b"), (3, "c")]
+"""
+
+from collections.abc import Iterable, Iterator
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+class PersistentIntMap:
+    """Immutable map from non-negative integers to values other than None. See the module docstring."""
+    __slots__ = ("_root", "_shift", "_count")
+
+    def __init__(self) -> None:
+        """Initializes an empty map"""
+        self._root: list | None = None
+        self._shift: int = 0 # Bits of the key below the root level
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, key : int, default : object = None) -> object:
+        """Returns the value of `key`, or `default` if it isn't in the map"""
+        if key < 0 or key >> (self._shift + BITS):
+            return default
+        node = self._root
+        shift = self._shift
+        while node is not None and shift:
+            node = node[(key >> shift) & MASK]
+            shift -= BITS
+        if node is None or node[key & MASK] is None:
+            return default
+        return node[key & MASK]
+
+    def update(self, changes : Iterable[tuple[int, object]]) -> "PersistentIntMap":
+        """Returns a new map with the changes applied in order. This map stays unchanged.
+
+        Nodes copied by one update are changed in place for its later changes, so a batch of
+        changes to nearby keys (like appended insertion numbers) copies every node at most once.
+
+        Args:
+            `changes`: (key, value) pairs. The value is set for the key, or the key is removed if the value is None
+
+        Raises:
+            `ValueError`: When a key is negative
+        """
+        root, shift, count = self._root, self._shift, self._count
+        fresh: set[int] = set() # Ids of the nodes created by this update. The old nodes are kept alive by `self`, so ids can't collide
+        leaf, leaf_prefix = None, -1 # The last leaf set, which the next key often falls in
+        for key, value in changes:
+            if key < 0:
+                raise ValueError(f"Keys must be non-negative, not {key}")
+            if value is None:
+                if root is None or key >> (shift + BITS):
+                    continue
+                root, removed = _remove(root, shift, key, fresh)
+                count -= removed
+                if count == 0:
+                    root, shift = None, 0
+                leaf, leaf_prefix = None, -1 # Might have been pruned
+                continue
+            if key >> BITS == leaf_prefix:
+                count += leaf[key & MASK] is None # type: ignore
+                leaf[key & MASK] = value # type: ignore
+                continue
+            if root is None:
+                root = _new_node(fresh)
+            while key >> (shift + BITS):
+                grown = _new_node(fresh)
+                grown[0] = root
+                root = grown
+                shift += BITS
+            if id(root) not in fresh:
+                root = _copy_node(root, fresh)
+            node = root
+            level = shift
+            while level:
+                index = (key >> level) & MASK
+                child = node[index]
+                if child is None:
+                    child = _new_node(fresh)
+                elif id(child) not in fresh:
+                    child = _copy_node(child, fresh)
+                node[index] = child
+                node = child
+                level -= BITS
+            count += node[key & MASK] is None
+            node[key & MASK] = value
+            leaf, leaf_prefix = node, key >> BITS
+
+        output = PersistentIntMap()
+        output._root, output._shift, output._count = root, shift, count
+        return output
+
+    def items(self, start : int = 0) -> Iterator[tuple[int, object]]:
+        """Yields the (key, value) pairs with a key of at least `start`, in key order"""
+        if self._root is None or start >> (self._shift + BITS):
+            return iter(())
+        return _items(self._root, self._shift, 0, max(start, 0))
+
+    def values(self, start : int = 0) -> Iterator[object]:
+        """Yields the values with a key of at least `start`, in key order"""
+        return (value for _, value in self.items(start))
+
+def _new_node(fresh : set[int]) -> list:
+    node = [None] * WIDTH
+    fresh.add(id(node))
+    return node
+
+def _copy_node(node : list, fresh : set[int]) -> list:
+    node = node.copy()
+    fresh.add(id(node))
+    return node
+
+def _remove(root : list, shift : int, key : int, fresh : set[int]) -> tuple[list, int]:
+    """Removes `key` below `root`, returning the new root and 1 if the key was there (0 otherwise).
+    Nodes left empty are removed from their parent, except the root."""
+    path = []
+    node = root
+    level = shift
+    while level:
+        node = node[(key >> level) & MASK]
+        if node is None:
+            return root, 0
+        path.append(node)
+        level -= BITS
+    if node[key & MASK] is None:
+        return root, 0
+
+    # Copy the path from the root down, then clear the key and prune the empty nodes from the bottom up
+    nodes = [root if id(root) in fresh else _copy_node(root, fresh)]
+    level = shift
+    for child in path:
+        if id(child) not in fresh:
+            child = _copy_node(child, fresh)
+        nodes[-1][(key >> level) & MASK] = child
+        nodes.append(child)
+        level -= BITS
+    nodes[-1][key & MASK] = None
+    level = 0
+    for depth in range(len(nodes) - 1, 0, -1):
+        if nodes[depth].count(None) != WIDTH:
+            break
+        level += BITS
+        nodes[depth - 1][(key >> level) & MASK] = None
+    return nodes[0], 1
+
+def _items(node : list, shift : int, base : int, start : int) -> Iterator[tuple[int, object]]:
+    """Yields the items below `node`, whose keys start at `base`, with a key of at least `start`"""
+    first = (start - base) >> shift if start > base else 0
+    if shift == 0:
+        for index in range(first, WIDTH):
+            value = node[index]
+            if value is not None:
+                yield base + index, value
+        return
+    for index in range(first, WIDTH):
+        child = node[index]
+        if child is not None:
+            yield from _items(child, shift - BITS, base + (index << shift), start)
@@ -0,0 +1,98 @@
+"""Command merging the request profiles written by RequestProfiler into a hotspot report.
+
+For every endpoint (a directory of .prof files), the profiles are merged with pstats and the
+functions taking the most time are listed, first overall, then in each of `GROUPS`:
+- "manager": The CollectionManager, DataCollections and their indexes and storages
+- "marshalling": flask-restx marshalling and the json serialization of the response
+
+Typical usage example:
+    python profile_report.py /data/profiles --endpoint Overview Search --limit 15
+"""
+
+import argparse
+import os
+import pstats
+from request_profiler import PROFILE_SUFFIX
+
+# Files whose functions make up each group, matched against the end of their path
+GROUPS = {
+    "manager": ("collection_manager.py", "data_collection.py", "columnar_collection.py", "sqlite_store.py", "backup_entry.py",
+                "date_order.py", "insertion_order.py", "staleness_index.py", "trigram_index.py", "operation_log.py"),
+    "marshalling": ("flask_restx/marshalling.py", "flask_restx/fields.py", "flask_restx/representations.py",
+                    "json/encoder.py", "json/__init__.py")
+}
+SORT_KEYS = {"tottime": 2, "cumtime": 3} # Index in the values of `pstats.Stats.stats`
+
+# (path, line number, function name)
+FunctionKey = tuple[str, int, str]
+
+def load(directory : str, endpoints : list[str] | None = None) -> dict[str, tuple[pstats.Stats, int]]:
+    """Returns the merged profiles of every endpoint found in `directory` with the amount of profiles merged
+
+    Args:
+        `endpoints`: Names of the endpoints to load. All endpoints if None
+    """
+    merged = {}
+    for endpoint in sorted(os.listdir(directory)):
+        endpoint_directory = os.path.join(directory, endpoint)
+        if not os.path.isdir(endpoint_directory) or (endpoints is not None and endpoint not in endpoints):
+            continue
+        paths = sorted(os.path.join(endpoint_directory, name) for name in os.listdir(endpoint_directory) if name.endswith(PROFILE_SUFFIX))
+        if paths:
+            merged[endpoint] = (pstats.Stats(*paths), len(paths))
+    return merged
+
+def hotspots(stats : pstats.Stats, limit : int, sort : str = "tottime", group : str | None = None) -> list[tuple[FunctionKey, int, float, float]]:
+    """Returns the `limit` functions of `stats` taking the most time, as (key, calls, tottime, cumtime)
+
+    Args:
+        `sort`: "tottime" (time in the function itself) or "cumtime" (including the functions it calls)
+        `group`: Only include the functions of this group of `GROUPS`. All functions if None
+    """
+    suffixes = None if group is None else tuple(os.path.normpath(suffix) for suffix in GROUPS[group])
+    rows = []
+    for key, values in stats.stats.items(): # type: ignore
+        if suffixes is not None and not os.path.normpath(key[0]).endswith(suffixes):
+            continue
+        rows.append((key, values[1], values[2], values[3]))
+    rows.sort(key=lambda row: row[SORT_KEYS[sort]], reverse=True)
+    return rows[:limit]
+
+def format_function(key : FunctionKey) -> str:
+    """Returns "file:line(function)" with the file shortened to its last two path components"""
+    path, line, function = key
+    if path == "~": # Built-in functions
+        return function
+    return f"{os.path.join(*path.split(os.sep)[-2:])}:{line}({function})"
+
+def report(merged : dict[str, tuple[pstats.Stats, int]], limit : int, sort : str = "tottime") -> str:
+    """Returns the hotspot report of the merged profiles returned by `load()`"""
+    lines = []
+    for endpoint, (stats, amount) in merged.items():
+        lines.append(f"{endpoint}: {amount} profiles, {stats.total_tt:.3f}s total") # type: ignore
+        for group in [None, *GROUPS]:
+            rows = hotspots(stats, limit, sort, group)
+            if group is not None and not rows:
+                continue
+            lines.append(f"  {group or 'all'}:")
+            lines.append(f"    {'calls':>10} {'tottime':>10} {'cumtime':>10}  function")
+            for key, calls, tottime, cumtime in rows:
+                lines.append(f"    {calls:>10} {tottime:10.4f} {cumtime:10.4f}  {format_function(key)}")
+        lines.append("")
+    return "\n".join(lines)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="The BACKUPORGANIZER_PROFILE_DIR the profiles were written to")
+    parser.add_argument("--endpoint", nargs="+", help="Endpoints to report on (default all)")
+    parser.add_argument("--limit", type=int, default=20, help="Amount of functions listed per section (default 20)")
+    parser.add_argument("--sort", choices=list(SORT_KEYS), default="tottime", help="Time to sort the functions by (default tottime)")
+    arguments = parser.parse_args()
+
+    merged = load(arguments.directory, arguments.endpoint)
+    if not merged:
+        parser.exit(1, f"No profiles found in {arguments.directory}\n")
+    print(report(merged, arguments.limit, arguments.sort))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Opt-in profiling of sampled API requests with cProfile.
+
+A request is profiled when it sends the "X-Profile: true" header, or when it's picked by the
+sample rate. Its profile is written to `directory`/<endpoint>/<time in ns>-<pid>.prof, and only
+the newest `max_files` profiles of every endpoint are kept. The files can be merged into a
+hotspot report with profile_report.py, or opened with any tool reading pstats files.
+
+cProfile can only run once at a time per process, so a request arriving while another one is
+being profiled isn't profiled. On a threaded server, the calls made by other threads during a
+profile are included in it.
+
+Typical usage example:
+    profiler = RequestProfiler("/data/profiles", sample_rate=0.01)
+    if profiler.should_profile(requested=False):
+        with profiler.profile("Overview") as path:
+            handle_request()
+"""
+
+import cProfile
+import contextlib
+import os
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+PROFILE_SUFFIX = ".prof"
+
+class RequestProfiler:
+    """Profiles requests and writes their profiles to a rotating directory per endpoint.
+
+    Attributes:
+        `directory`: Directory holding a directory of profiles per endpoint
+        `sample_rate`: Fraction of the requests profiled without asking for it, from 0 to 1
+        `max_files`: Amount of profiles kept per endpoint, the oldest ones are deleted
+    """
+
+    def __init__(self, directory : str, sample_rate : float = 0.0, max_files : int = 100,
+                 sample : Callable[[], float] = random.random) -> None:
+        """Initializes the instance
+
+        Args:
+            `sample`: Returns a random number in [0, 1) to pick the sampled requests with. (Default: random.random)
+
+        Raises:
+            `ValueError`: When `sample_rate` isn't between 0 and 1, or `max_files` is below 1
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be between 0 and 1, not {sample_rate}")
+        if max_files < 1:
+            raise ValueError(f"max_files must be at least 1, not {max_files}")
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self._sample = sample
+        self._lock = threading.Lock() # Held while a profile is running
+
+    def should_profile(self, requested : bool) -> bool:
+        """Returns True if a request should be profiled
+
+        Args:
+            `requested`: Whether the request asked to be profiled
+        """
+        return requested or (self.sample_rate > 0 and self._sample() < self.sample_rate)
+
+    @contextlib.contextmanager
+    def profile(self, endpoint : str) -> Iterator[str | None]:
+        """Profiles the body of the with statement, then writes the profile to a new file of `endpoint`
+
+        The profile is also written when the body raises an exception.
+
+        Yields:
+            The path of the profile file relative to `directory`, or None when another request is already being profiled
+        """
+        if not self._lock.acquire(blocking=False):
+            yield None
+            return
+        path = os.path.join(endpoint, f"{time.time_ns()}-{os.getpid()}{PROFILE_SUFFIX}")
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            yield path
+        finally:
+            profile.disable()
+            self._lock.release()
+            self._write(profile, path)
+
+    def _write(self, profile : cProfile.Profile, path : str) -> None:
+        """Writes `profile` to `path` in `directory`, then deletes the oldest profiles of the endpoint above `max_files`"""
+        endpoint_directory = os.path.join(self.directory, os.path.dirname(path))
+        os.makedirs(endpoint_directory, exist_ok=True)
+        profile.dump_stats(os.path.join(self.directory, path))
+        # The names start with the time, so they sort from oldest to newest
+        files = sorted(name for name in os.listdir(endpoint_directory) if name.endswith(PROFILE_SUFFIX))
+        for name in files[:-self.max_files]:
+            with contextlib.suppress(FileNotFoundError): # Another worker may have rotated it first
+                os.remove(os.path.join(endpoint_directory, name))
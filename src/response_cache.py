@@ -0,0 +1,120 @@
+"""In-process cache of serialized API responses, invalidated by the CollectionManager generation.
+
+Every entry is stored together with the generation of the CollectionManager it was built from.
+Since the generation is incremented after every mutation, an entry is only ever served while
+the data it was built from is unchanged, and the first access after a mutation drops every entry.
+The invalidation is global: adding a single BackupEntry also drops the cached searches and listings
+that don't show it. That keeps the check a single integer comparison, so the cache pays off for
+read-heavy traffic, while under a steady stream of writes most lookups miss.
+This also holds with several worker processes sharing the sqlite storage, since every worker reads
+the same generation from the database.
+
+The size of the cached bodies is capped at `max_bytes`, evicting the least recently used entries,
+so parameterized responses (like searches) can't grow it without bound.
+
+Typical usage example:
+    cache = ResponseCache(max_bytes=64 * 2**20)
+    body = cache.get("/api/Overview", manager.generation)
+    if body is None:
+        body = build_body()
+        cache.put("/api/Overview", generation, body)
+"""
+
+import threading
+from collections import OrderedDict
+
+class ResponseCache:
+    """LRU cache of response bodies, tagged with the generation they were built from.
+
+    Attributes:
+        `max_bytes`: Max total size of the cached bodies. 0 disables the cache
+        `hits`: Amount of lookups that found a valid entry
+        `misses`: Amount of lookups that didn't
+        `evictions`: Amount of entries dropped to stay under `max_bytes`
+        `invalidations`: Amount of times every entry was dropped because the generation changed
+    """
+
+    def __init__(self, max_bytes : int) -> None:
+        """Initializes an empty cache
+
+        Args:
+            `max_bytes`: Max total size of the cached bodies. 0 disables the cache
+        """
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict() # Least recently used first
+        self._generation: int | None = None
+        self._size: int = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """The total size in bytes of the cached bodies"""
+        return self._size
+
+    def get(self, key : str, generation : int) -> bytes | None:
+        """Returns the body cached under `key`, or None if there is none for `generation`
+
+        Args:
+            `key`: The key of the response, like the path and query string
+            `generation`: The current generation of the CollectionManager
+        """
+        with self._lock:
+            if self._generation is None or generation > self._generation:
+                self._invalidate(generation)
+            body = self._entries.get(key) if generation == self._generation else None
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key : str, generation : int, body : bytes) -> None:
+        """Caches `body` under `key`, evicting the least recently used entries if needed
+
+        Args:
+            `key`: The key of the response, like the path and query string
+            `generation`: The generation read before `body` was built
+            `body`: The serialized response
+        """
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if self._generation is not None and generation < self._generation:
+                return # Built from data that has changed since
+            if generation != self._generation:
+                self._invalidate(generation)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drops every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _invalidate(self, generation : int) -> None:
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._size = 0
+        self._generation = generation
+
+    def stats(self) -> dict[str, int]:
+        """Returns the counters and the current size of the cache"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "invalidations": self.invalidations,
+                "entries": len(self._entries), "bytes": self._size, "max_bytes": self.max_bytes}
@@ -1,9 +1,20 @@
-from flask import Flask
+import atexit
+from flask import Flask, Response
 from flask_restx import Api
 
 from collection_manager import CollectionManager
+from columnar_collection import ColumnarDataCollection
+from config import Config
+from data_collection import DataCollection
+from metrics import Metrics, CONTENT_TYPE
+from operation_log import OperationLog
+from request_profiler import RequestProfiler
+from response_cache import ResponseCache
+from sqlite_store import SqliteCollectionManager
 
 from api import main_namespace
+from api.instrumentation import instrumented
+from api.profiling import profiled
 from api.collection import Collection
 from api.overview import Overview
 from api.list import List
@@ -14,17 +25,31 @@ from api.edit import Edit
 from api.unbackup import Unbackup
 from api.delete import Delete
 from api.listbackups import ListBackups
+from api.bulkcollections import BulkCollections
+from api.bulkbackups import BulkBackups
+from api.export import Export
+from api.batchedit import BatchEdit
+from api.stale import Stale
 
 app = Flask(__name__,
             static_url_path="",
             static_folder="./static")
 app.config["RESTX_MASK_SWAGGER"] = False
 
+config = Config()
+metrics = Metrics(config.metrics_dir)
+
+view_decorators = [instrumented(metrics)]
+if config.profile_dir is not None:
+    # Applied first, so the profiles leave out the metrics
+    view_decorators.insert(0, profiled(RequestProfiler(config.profile_dir, config.profile_sample_rate, config.profile_max_files)))
+
 api = Api(app, 
           title="Backup Organizer REST API",
           prefix="/api",
           doc="/api",
-          validate=True)
+          validate=True,
+          decorators=view_decorators)
 
 api.add_namespace(main_namespace)
 
@@ -32,13 +57,33 @@ api.add_namespace(main_namespace)
 def main():
     return app.send_static_file("index.html")
 
-def add_resources(resource_classes, manager, api):
-    """Loops over resource_classes of type flask-restx.Resource, and adds them to the api, passing along the collectionmanager"""
+@app.route("/metrics")
+def metrics_endpoint():
+    """Returns the request metrics of every worker (or of this process if BACKUPORGANIZER_METRICS_DIR is unset) in the Prometheus text format"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+def add_resources(resource_classes, manager, response_cache, api):
+    """Loops over resource_classes of type flask-restx.Resource, and adds them to the api, passing along the collectionmanager and response cache"""
     for resource_class in resource_classes:
-        api.add_resource(resource_class, "/"+resource_class.__name__, resource_class_kwargs={"collection_manager": manager})
+        api.add_resource(resource_class, "/"+resource_class.__name__, resource_class_kwargs={"collection_manager": manager, "response_cache": response_cache})
+
+if config.storage == "sqlite":
+    collection_manager = SqliteCollectionManager(config.sqlite_path)
+else:
+    collection_manager = CollectionManager(ColumnarDataCollection if config.storage == "columnar" else DataCollection, config.generation_history)
+    if config.data_dir is not None:
+        operation_log = OperationLog(config.data_dir, config.fsync_batch_size, config.fsync_interval, config.snapshot_interval)
+        operation_log.recover(collection_manager)
+        atexit.register(operation_log.close)
+
+response_cache = ResponseCache(config.response_cache_bytes)
+metrics.add_counter("response_cache_hits_total", "Lookups of the response cache that found a valid entry", lambda: response_cache.hits)
+metrics.add_counter("response_cache_misses_total", "Lookups of the response cache that found no valid entry", lambda: response_cache.misses)
+metrics.add_counter("response_cache_invalidations_total", "Times every entry of the response cache was dropped by a mutation",
+                    lambda: response_cache.invalidations)
 
-collection_manager = CollectionManager()
-add_resources([Collection, Overview, List, Info, Backup, Search, Edit, Unbackup, Delete, ListBackups], collection_manager, api)
+add_resources([Collection, Overview, List, Info, Backup, Search, Edit, Unbackup, Delete, ListBackups,
+               BulkCollections, BulkBackups, Export, BatchEdit, Stale], collection_manager, response_cache, api)
 
 if __name__ == "__main__": # Only intended for manual development outside container
     app.run(debug=True)
@@ -0,0 +1,177 @@
+"""Reader-writer lock guarding a CollectionManager and its DataCollections.
+
+Any amount of threads can hold the lock for reading at once, while a thread holding it for
+writing excludes every other thread. Writers are preferred: once a writer waits, new readers
+wait behind it, so a steady stream of reads can't starve the writes.
+
+The lock is reentrant, so locked methods can call each other:
+- A thread holding the read lock can take it again, without waiting for writers
+- A thread holding the write lock can take the write or the read lock again
+- A thread holding only the read lock can't take the write lock, since two threads doing that
+  would wait on each other forever. It raises a RuntimeError instead.
+
+The methods of a class holding the lock in a `lock` attribute are guarded with the `reads` and
+`writes` decorators. Callbacks added with `add_release_callback()` run in a writing thread once
+it released the write lock completely, for work that must follow a write without blocking others.
+
+Typical usage example:
+    class Store:
+        def __init__(self):
+            self.lock = ReadWriteLock()
+
+        @reads
+        def get(self, key):
+            ...
+
+        @writes
+        def put(self, key, value):
+            ...
+"""
+
+import functools
+import threading
+from collections.abc import Callable
+from threading import get_ident
+
+class _ReadGuard:
+    """Context manager holding a ReadWriteLock for reading"""
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock : "ReadWriteLock") -> None:
+        self._lock = lock
+
+    def __enter__(self) -> None:
+        self._lock.acquire_read()
+
+    def __exit__(self, *exception) -> None:
+        self._lock.release_read()
+
+class _WriteGuard(_ReadGuard):
+    """Context manager holding a ReadWriteLock for writing"""
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        self._lock.acquire_write()
+
+    def __exit__(self, *exception) -> None:
+        self._lock.release_write()
+
+class ReadWriteLock:
+    """Reentrant reader-writer lock preferring writers. See the module docstring.
+
+    Attributes:
+        `read`: Context manager holding the lock for reading
+        `write`: Context manager holding the lock for writing
+    """
+
+    def __init__(self) -> None:
+        """Initializes an unlocked instance"""
+        self._mutex = threading.Lock()     # Guards the counters below
+        self._changed = threading.Condition(self._mutex)
+        self._readers: int = 0             # Threads holding the read lock
+        self._waiting_readers: int = 0
+        self._waiting_writers: int = 0
+        self._writer: int | None = None    # Thread identifier of the writer
+        self._write_depth: int = 0
+        self._local = threading.local()    # `depth`: Times the current thread took the read lock
+        self._release_callbacks: list[Callable[[], None]] = []
+        self.read = _ReadGuard(self)
+        self.write = _WriteGuard(self)
+
+    def add_release_callback(self, callback : Callable[[], None]) -> None:
+        """Registers `callback` to be called by every writing thread right after it released the write lock completely
+
+        Args:
+            `callback`: The callable to register
+        """
+        self._release_callbacks.append(callback)
+
+    def acquire_read(self) -> None:
+        """Takes the lock for reading, waiting while a writer holds it or waits for it"""
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        # Only the current thread can set `_writer` to its own identifier, so it's safe to read here
+        if depth == 0 and self._writer != get_ident():
+            with self._mutex:
+                if self._writer is not None or self._waiting_writers:
+                    self._waiting_readers += 1
+                    try:
+                        while self._writer is not None or self._waiting_writers:
+                            self._changed.wait()
+                    finally:
+                        self._waiting_readers -= 1
+                self._readers += 1
+        local.depth = depth + 1
+
+    def release_read(self) -> None:
+        """Releases one hold of the read lock
+
+        Raises:
+            `RuntimeError`: When the current thread doesn't hold the read lock
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            raise RuntimeError("Can't release a read lock that isn't held")
+        local.depth = depth - 1
+        if depth == 1 and self._writer != get_ident(): # Reads taken while writing aren't counted in `_readers`
+            with self._mutex:
+                self._readers -= 1
+                if self._readers == 0 and self._waiting_writers:
+                    self._changed.notify_all()
+
+    def acquire_write(self) -> None:
+        """Takes the lock for writing, waiting until no other thread holds it
+
+        Raises:
+            `RuntimeError`: When the current thread holds only the read lock
+        """
+        ident = get_ident()
+        if self._writer == ident:
+            self._write_depth += 1
+            return
+        if getattr(self._local, "depth", 0):
+            raise RuntimeError("Can't take the write lock while holding the read lock")
+        with self._mutex:
+            if self._writer is not None or self._readers:
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._changed.wait()
+                finally:
+                    self._waiting_writers -= 1
+            self._writer = ident
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        """Releases one hold of the write lock
+
+        Raises:
+            `RuntimeError`: When the current thread doesn't hold the write lock
+        """
+        if self._writer != get_ident():
+            raise RuntimeError("Can't release a write lock that isn't held")
+        self._write_depth -= 1
+        if self._write_depth == 0:
+            with self._mutex:
+                self._writer = None
+                if self._waiting_readers or self._waiting_writers:
+                    self._changed.notify_all()
+            for callback in self._release_callbacks:
+                callback()
+
+def reads(method : Callable) -> Callable:
+    """Decorator holding `self.lock` for reading while `method` runs"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.read:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def writes(method : Callable) -> Callable:
+    """Decorator holding `self.lock` for writing while `method` runs"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.write:
+            return method(self, *args, **kwargs)
+    return wrapper
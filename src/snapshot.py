@@ -0,0 +1,166 @@
+"""Immutable point-in-time views of a CollectionManager, for reads that shouldn't hold its lock.
+
+A Snapshot holds the fields of every DataCollection at one generation of the manager, in a
+PersistentIntMap keyed by the insertion numbers of the collections. The manager builds the
+snapshot of a new generation from the previous one, replacing only the collections that
+changed in between, so consecutive snapshots share everything else and cost little to keep.
+
+Once taken, a snapshot never changes, so a long read like streaming every collection can
+iterate it without the lock while writers keep changing the manager. Its pages use the
+same cursors as `CollectionManager.page()`. Collections are also looked up by name, in a
+second PersistentIntMap keyed by the hash of the names, updated from the changes the same way.
+
+Typical usage example:
+    snapshot = manager.snapshot()
+    collections, next_cursor = snapshot.page(0, 100)
+    same_collections, _ = manager.snapshot(snapshot.generation).page(0, 100)
+"""
+
+from collections.abc import Iterable, Iterator
+from backup_entry import BackupEntry
+from custom_exceptions import CollectionNotFoundError
+from data_collection import DataCollection
+from persistent_map import PersistentIntMap
+from utility import format_timestamp
+
+NAME_KEY_MASK = (1 << 32) - 1
+
+def name_key(name : str) -> int:
+    """Returns the key of `name` in the name map of a Snapshot. 32 bits of its hash keep the trie shallow, and
+    names sharing a key are kept together"""
+    return hash(name) & NAME_KEY_MASK
+
+class CollectionSnapshot:
+    """The fields of a DataCollection at one generation, formatted by the same methods as a DataCollection.
+
+    Attributes:
+        The same as the attributes of DataCollection, except `on_change` and `lock`
+    """
+    __slots__ = ("name", "description", "creation_date", "modification_date", "updated", "last_backup_date",
+                 "last_backup_location", "backup_count", "generation", "_entries")
+
+    def __init__(self, collection : DataCollection) -> None:
+        """Initializes the instance with the current fields and BackupEntries of `collection`, which must be locked for reading"""
+        self.name: str = collection.name
+        self.description: str = collection.description
+        self.creation_date: int = collection.creation_date
+        self.modification_date: int = collection.modification_date
+        self.updated: bool = collection.updated
+        self.last_backup_date: int | None = collection.last_backup_date
+        self.last_backup_location: str | None = collection.last_backup_location
+        self.backup_count: int = collection.backup_count
+        self.generation: int = collection.generation
+        self._entries = collection._snapshot_entries()
+
+    @property
+    def backup_entries(self) -> list[BackupEntry]:
+        """A list of all BackupEntries in the order they were added"""
+        entries = self._entries
+        return list(entries.values() if isinstance(entries, PersistentIntMap) else entries) # type: ignore
+
+    def get_backups_json(self) -> dict[str, dict[str,str]]:
+        """Returns all BackupEntries as a json-object. See DataCollection.get_backups_json()"""
+        return {entry.name: {"date": format_timestamp(entry.date), "location": entry.location} for entry in self.backup_entries}
+
+    brief_str = DataCollection.brief_str
+    full_str = DataCollection.full_str
+    full_json = DataCollection.full_json
+
+class Snapshot:
+    """Every collection of a CollectionManager at one generation. See the module docstring.
+
+    Attributes:
+        `generation`: The generation of the manager the snapshot was taken at
+        `data_collections`: A list of all CollectionSnapshots in insertion order (read only)
+    """
+    __slots__ = ("generation", "_collections", "_names")
+
+    def __init__(self, generation : int = 0, collections : PersistentIntMap | None = None, names : PersistentIntMap | None = None) -> None:
+        """Initializes the instance. Without `collections` and `names`, the snapshot is empty
+
+        Args:
+            `generation`: The generation of the manager the snapshot is taken at
+            `collections`: The CollectionSnapshots keyed by the insertion number of their DataCollection
+            `names`: Tuples of the (name, insertion number) of the collections, keyed by the `name_key()` of the names
+        """
+        self.generation = generation
+        self._collections = PersistentIntMap() if collections is None else collections
+        self._names = PersistentIntMap() if names is None else names
+
+    def updated(self, generation : int, changes : Iterable[tuple[int, CollectionSnapshot | None]]) -> "Snapshot":
+        """Returns the snapshot of `generation`, holding the collections of this snapshot with `changes` applied.
+        This snapshot stays unchanged, and shares everything the changes don't touch.
+
+        Args:
+            `generation`: The generation of the new snapshot
+            `changes`: (insertion number, CollectionSnapshot) pairs of the changed collections, with None for a deleted collection
+        """
+        changes = list(changes)
+        buckets: dict[int, tuple[tuple[str, int], ...]] = {} # name_key() -> changed (name, insertion number) tuple
+        for number, collection in changes:
+            previous = self._collections.get(number)
+            if previous is not None:
+                key = name_key(previous.name) # type: ignore
+                buckets[key] = tuple(pair for pair in buckets.get(key, self._names.get(key, ())) if pair[1] != number) # type: ignore
+            if collection is not None:
+                key = name_key(collection.name)
+                buckets[key] = buckets.get(key, self._names.get(key, ())) + ((collection.name, number),) # type: ignore
+        names = self._names.update((key, pairs or None) for key, pairs in buckets.items())
+        return Snapshot(generation, self._collections.update(changes), names)
+
+    def get(self, collection_name : str) -> CollectionSnapshot:
+        """Returns the CollectionSnapshot named `collection_name`. See CollectionManager.get()
+
+        Raises:
+            `CollectionNotFoundError`: Collection with name '`collection_name`' not found
+        """
+        for name, number in self._names.get(name_key(collection_name), ()): # type: ignore
+            if name == collection_name:
+                return self._collections.get(number) # type: ignore
+        raise CollectionNotFoundError(f"Collection with name '{collection_name}' not found")
+
+    def __len__(self) -> int:
+        return len(self._collections)
+
+    def __iter__(self) -> Iterator[CollectionSnapshot]:
+        return self._collections.values() # type: ignore
+
+    @property
+    def data_collections(self) -> list[CollectionSnapshot]:
+        """A list of all CollectionSnapshots in the order their DataCollections were added"""
+        return list(self)
+
+    def page(self, after : int = 0, limit : int | None = None) -> tuple[list[CollectionSnapshot], int | None]:
+        """Returns a page of CollectionSnapshots in insertion order. See CollectionManager.page()
+
+        Args:
+            `after`: The cursor returned with the previous page, or 0 for the first page
+            `limit`: Max amount of CollectionSnapshots in the page. All remaining if None
+
+        Returns:
+            The CollectionSnapshots in the page, and the cursor of the next page (None if there are no more)
+        """
+        output = []
+        last_number = after
+        for number, collection in self._collections.items(after + 1):
+            if limit is not None and len(output) == limit:
+                return output, last_number
+            output.append(collection)
+            last_number = number
+        return output, None
+
+    def overview(self) -> list[str]:
+        """Returns the `brief_str()` of every collection. See CollectionManager.overview()"""
+        return [collection.brief_str() for collection in self]
+
+    def detailed_overview(self) -> list[list[str]]:
+        """Returns the `full_str()` of every collection. See CollectionManager.detailed_overview()"""
+        return [collection.full_str() for collection in self]
+
+    def json_overview(self) -> dict[str,dict[str,object]]:
+        """Returns the `full_json()` of every collection, keyed by name. See CollectionManager.json_overview()"""
+        output = {}
+        for collection in self:
+            json = collection.full_json()
+            output[json.pop("name")] = json
+        return output
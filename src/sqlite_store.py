@@ -0,0 +1,614 @@
+"""SQLite storage backend with the same API as CollectionManager and DataCollection.
+
+All state lives in one SQLite database in WAL mode, so several gunicorn workers (processes)
+can serve requests against the same database file. Every thread gets its own connection
+from a per-process pool, and all SQL is kept in module level constants so sqlite3's
+statement cache hands back the prepared statement instead of compiling it again.
+
+The generation counters of CollectionManager are stored in the database too, and incremented
+in the same transaction as the change, so every worker sees the same generations.
+
+Dates are stored as INTEGER timestamps, so they can be compared and sorted by SQLite directly.
+Databases created while dates were TEXT columns are converted when they are opened. The summary
+fields of every collection (date and location of the latest BackupEntry, amount of BackupEntries)
+are kept in columns updated in the same transaction as the BackupEntries, so listings never
+aggregate the BackupEntries. The latest date is indexed, so staleness queries only read the rows they return.
+
+Typical usage example:
+    manager = SqliteCollectionManager("/app/data/backuporganizer.db")
+    collection = manager.add_collection("Name", "Description", 1738656949, 1738656949, True)
+    collection.add_backup("Backup", 1738656949, "/home/user/backup.bak")
+"""
+
+import os
+import sqlite3
+from bisect import bisect_right
+import threading
+from collections.abc import Callable
+from backup_entry import BackupEntry
+from collection_manager import EDITABLE_FIELDS, is_valid_edit
+from data_collection import DataCollection
+from utility import format_timestamp, legacy_timestamp
+from custom_exceptions import (BackupAlreadyExistsError, BackupNotFoundError, CollectionAlreadyExistsError,
+                               CollectionNotFoundError, InvalidCollectionEditError, SnapshotNotFoundError)
+
+SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS collections (
+    id                INTEGER PRIMARY KEY AUTOINCREMENT,
+    name              TEXT NOT NULL UNIQUE,
+    description       TEXT NOT NULL,
+    creation_date     INTEGER NOT NULL,
+    modification_date INTEGER NOT NULL,
+    updated           INTEGER NOT NULL,
+    generation        INTEGER NOT NULL DEFAULT 0,
+    last_backup_date     INTEGER,
+    last_backup_location TEXT,
+    backup_count         INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS backup_entries (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection_id INTEGER NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+    name          TEXT NOT NULL,
+    date          INTEGER NOT NULL,
+    location      TEXT NOT NULL,
+    UNIQUE (collection_id, name)
+);
+CREATE TABLE IF NOT EXISTS store (
+    id         INTEGER PRIMARY KEY CHECK (id = 0),
+    store_id   TEXT NOT NULL,
+    generation INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store (id, store_id, generation) VALUES (0, lower(hex(randomblob(8))), 0);
+CREATE VIRTUAL TABLE IF NOT EXISTS collection_names USING fts5(name, content='collections', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS collection_names_insert AFTER INSERT ON collections BEGIN
+    INSERT INTO collection_names(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS collection_names_delete AFTER DELETE ON collections BEGIN
+    INSERT INTO collection_names(collection_names, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS collection_names_rename AFTER UPDATE OF name ON collections BEGIN
+    INSERT INTO collection_names(collection_names, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO collection_names(rowid, name) VALUES (new.id, new.name);
+END;
+COMMIT;
+"""
+SEARCH_INDEX_EXISTS = "SELECT 1 FROM sqlite_master WHERE name = 'collection_names'"
+REBUILD_SEARCH_INDEX = "INSERT INTO collection_names(collection_names) VALUES ('rebuild')"
+COLLECTION_GENERATION_EXISTS = "SELECT 1 FROM pragma_table_info('collections') WHERE name = 'generation'"
+ADD_COLLECTION_GENERATION = "ALTER TABLE collections ADD COLUMN generation INTEGER NOT NULL DEFAULT 0"
+COLUMN_EXISTS = "SELECT 1 FROM pragma_table_info(?) WHERE name = ?"
+# Column -> type of the summary columns, in the order they were added
+SUMMARY_COLUMNS = {"last_backup_date": "INTEGER", "last_backup_location": "TEXT", "backup_count": "INTEGER NOT NULL DEFAULT 0"}
+ADD_SUMMARY_COLUMN = {column: f"ALTER TABLE collections ADD COLUMN {column} {column_type}" for column, column_type in SUMMARY_COLUMNS.items()}
+FILL_SUMMARY = """UPDATE collections SET backup_count = (SELECT count(*) FROM backup_entries WHERE collection_id = collections.id),
+    (last_backup_date, last_backup_location) = (SELECT date, location FROM backup_entries WHERE collection_id = collections.id ORDER BY date DESC, id LIMIT 1)"""
+DATE_COLUMNS = [("collections", "creation_date"), ("collections", "modification_date"), ("backup_entries", "date")]
+IS_TEXT_COLUMN = "SELECT 1 FROM pragma_table_info(?) WHERE name = ? AND type = 'TEXT'"
+# Column types can't be changed in place, so a TEXT date column is replaced by an INTEGER one holding the converted values
+CONVERT_DATE_COLUMN = {(table, column): [
+    f"ALTER TABLE {table} RENAME COLUMN {column} TO {column}_text",
+    f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0",
+    f"UPDATE {table} SET {column} = py_timestamp({column}_text)",
+    f"ALTER TABLE {table} DROP COLUMN {column}_text"
+] for table, column in DATE_COLUMNS}
+# Created after the migrations above, since a column can't be dropped while it's indexed
+INDEXES = """
+CREATE INDEX IF NOT EXISTS collections_last_backup_date ON collections(last_backup_date);
+CREATE INDEX IF NOT EXISTS backup_entries_date ON backup_entries(collection_id, date);
+"""
+
+SELECT_STORE_ID = "SELECT store_id FROM store"
+SELECT_GENERATION = "SELECT generation FROM store"
+INCREMENT_GENERATION = "UPDATE store SET generation = generation + 1 RETURNING generation"
+SET_COLLECTION_GENERATION = "UPDATE collections SET generation = ? WHERE id = ?"
+
+COLLECTION_COLUMNS = "id, name, description, creation_date, modification_date, updated, generation, last_backup_date, last_backup_location, backup_count"
+SELECT_COLLECTION = f"SELECT {COLLECTION_COLUMNS} FROM collections WHERE name = ?"
+SELECT_COLLECTIONS = f"SELECT {COLLECTION_COLUMNS} FROM collections ORDER BY id"
+SELECT_COLLECTIONS_PAGE = f"SELECT {COLLECTION_COLUMNS} FROM collections WHERE id > ? ORDER BY id LIMIT ?"
+SEARCH_COLLECTIONS = f"SELECT {COLLECTION_COLUMNS} FROM collections WHERE instr(name, ?) > 0 ORDER BY id"
+SEARCH_COLLECTIONS_CASE_INSENSITIVE = f"SELECT {COLLECTION_COLUMNS} FROM collections WHERE instr(py_lower(name), ?) > 0 ORDER BY id"
+# The trigram index is case insensitive and only narrows down the candidates, which are then verified with instr
+SEARCH_INDEXED_COLLECTIONS = f"""SELECT {COLLECTION_COLUMNS} FROM collections
+    WHERE id IN (SELECT rowid FROM collection_names WHERE collection_names MATCH ?) AND instr(name, ?) > 0 ORDER BY id"""
+SEARCH_INDEXED_COLLECTIONS_CASE_INSENSITIVE = f"""SELECT {COLLECTION_COLUMNS} FROM collections
+    WHERE id IN (SELECT rowid FROM collection_names WHERE collection_names MATCH ?) AND instr(py_lower(name), ?) > 0 ORDER BY id"""
+# An OR would scan the whole index, while both halves of the UNION are index range searches.
+# NULLs sort first, so collections without BackupEntries come first, in insertion order
+SELECT_STALE_COLLECTIONS = f"""SELECT {COLLECTION_COLUMNS} FROM collections WHERE last_backup_date IS NULL
+    UNION ALL SELECT {COLLECTION_COLUMNS} FROM collections WHERE last_backup_date < ?
+    ORDER BY last_backup_date, id LIMIT ?"""
+INSERT_COLLECTION = "INSERT INTO collections (name, description, creation_date, modification_date, updated, generation) VALUES (?, ?, ?, ?, ?, ?)"
+DELETE_COLLECTION = "DELETE FROM collections WHERE name = ?"
+# Column names can't be parameters, so there is one prepared UPDATE per editable column
+UPDATE_COLLECTION = {column: f"UPDATE collections SET {column} = ? WHERE id = ?" for column in EDITABLE_FIELDS}
+
+SELECT_BACKUP = "SELECT name, date, location FROM backup_entries WHERE collection_id = ? AND name = ?"
+SELECT_BACKUPS = "SELECT name, date, location FROM backup_entries WHERE collection_id = ? ORDER BY id"
+SELECT_BACKUPS_PAGE = "SELECT id, name, date, location FROM backup_entries WHERE collection_id = ? AND id > ? ORDER BY id LIMIT ?"
+# Both read a range of the (collection_id, date) index, which ends with the row id. (?4, ?5) is the (date, id) of the last row of the previous page
+SELECT_BACKUPS_RANGE = """SELECT id, name, date, location FROM backup_entries WHERE collection_id = ?1 AND date BETWEEN ?2 AND ?3
+    AND (date, id) > (?4, ?5) ORDER BY date, id LIMIT ?6"""
+SELECT_BACKUPS_RANGE_DESCENDING = """SELECT id, name, date, location FROM backup_entries WHERE collection_id = ?1 AND date BETWEEN ?2 AND ?3
+    AND (date, id) < (?4, ?5) ORDER BY date DESC, id DESC LIMIT ?6"""
+MIN_INTEGER = -2**63
+MAX_INTEGER = 2**63 - 1
+INSERT_BACKUP = "INSERT INTO backup_entries (collection_id, name, date, location) VALUES (?, ?, ?, ?)"
+DELETE_BACKUP = "DELETE FROM backup_entries WHERE collection_id = ? AND name = ?"
+COLLECTION_EXISTS = "SELECT 1 FROM collections WHERE id = ?"
+# Adds ?1 BackupEntries whose latest one has date ?2 and location ?3 to the summary of collection ?4. The right hand sides see the old values
+ADD_TO_SUMMARY = """UPDATE collections SET backup_count = backup_count + ?1,
+    last_backup_location = CASE WHEN last_backup_date IS NULL OR ?2 > last_backup_date THEN ?3 ELSE last_backup_location END,
+    last_backup_date = max(coalesce(last_backup_date, ?2), ?2) WHERE id = ?4"""
+# Uses the (collection_id, date) index to find the new latest BackupEntry
+REMOVE_FROM_SUMMARY = """UPDATE collections SET backup_count = backup_count - 1,
+    (last_backup_date, last_backup_location) = (SELECT date, location FROM backup_entries WHERE collection_id = ?1 ORDER BY date DESC, id LIMIT 1)
+    WHERE id = ?1 RETURNING last_backup_date, last_backup_location, backup_count"""
+SELECT_COLLECTION_ID = "SELECT id FROM collections WHERE name = ?"
+
+class ConnectionPool:
+    """Hands out one SQLite connection per thread and process.
+
+    Connections are never shared between threads, and a process created with fork (like a
+    gunicorn worker) opens its own connections instead of reusing the ones of its parent.
+
+    Attributes:
+        `path`: Path to the database file
+    """
+
+    def __init__(self, path : str) -> None:
+        """Initializes the pool, and creates the database and its tables if they don't exist
+
+        Args:
+            `path`: Path to the database file
+        """
+        self.path: str = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self.connection()
+        connection.execute("PRAGMA journal_mode = WAL") # Stored in the database file, so only needed once
+        search_index_existed = connection.execute(SEARCH_INDEX_EXISTS).fetchone() is not None
+        connection.executescript(SCHEMA)
+        if not search_index_existed: # Databases created before the search index existed need to fill it
+            with Transaction(connection):
+                connection.execute(REBUILD_SEARCH_INDEX)
+        if connection.execute(COLLECTION_GENERATION_EXISTS).fetchone() is None: # Databases created before generations existed
+            with Transaction(connection):
+                connection.execute(ADD_COLLECTION_GENERATION)
+        for table, column in DATE_COLUMNS:
+            if connection.execute(IS_TEXT_COLUMN, (table, column)).fetchone() is not None: # Databases created before dates were timestamps
+                with Transaction(connection):
+                    for sql in CONVERT_DATE_COLUMN[(table, column)]:
+                        connection.execute(sql)
+        missing_columns = [column for column in SUMMARY_COLUMNS if connection.execute(COLUMN_EXISTS, ("collections", column)).fetchone() is None]
+        if missing_columns: # Databases created before the summary columns existed
+            with Transaction(connection):
+                for column in missing_columns:
+                    connection.execute(ADD_SUMMARY_COLUMN[column])
+                connection.execute(FILL_SUMMARY)
+        connection.executescript(INDEXES)
+
+    def connection(self) -> sqlite3.Connection:
+        """Returns the connection of the calling thread, opening it on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            # isolation_level=None lets us start transactions ourselves with BEGIN IMMEDIATE
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, cached_statements=256)
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.create_function("py_lower", 1, str.lower, deterministic=True)
+            connection.create_function("py_timestamp", 1, legacy_timestamp, deterministic=True)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+class Transaction:
+    """Context manager running a block in a write transaction, committing on success and rolling back on exceptions."""
+
+    def __init__(self, connection : sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        # IMMEDIATE takes the write lock right away, so two workers never deadlock upgrading a read lock
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exception_type, exception, traceback) -> None:
+        self.connection.execute("COMMIT" if exception_type is None else "ROLLBACK")
+
+def increment_generation(connection : sqlite3.Connection, collection_id : int | None = None) -> int:
+    """Increments the generation of the store inside the current transaction, and sets the
+    generation of the collection with id `collection_id` to it if given. Returns the new generation."""
+    generation = connection.execute(INCREMENT_GENERATION).fetchone()[0]
+    if collection_id is not None:
+        connection.execute(SET_COLLECTION_GENERATION, (generation, collection_id))
+    return generation
+
+class SqliteDataCollection(DataCollection):
+    """DataCollection whose BackupEntries are stored in the database.
+
+    The collection attributes are the values of the row when the collection was fetched.
+    Changes to them must go through SqliteCollectionManager.edit_collection() to be stored.
+    """
+    __slots__ = ("collection_id", "_pool")
+
+
+    def __init__(self, pool : ConnectionPool, row : tuple) -> None:
+        """Initializes the instance from a row of the collections table
+
+        Args:
+            `pool`: The ConnectionPool of the database holding the collection
+            `row`: The collection row, with the columns in COLLECTION_COLUMNS
+        """
+        (collection_id, name, description, creation_date, modification_date, updated, generation,
+         last_backup_date, last_backup_location, backup_count) = row
+        super().__init__(name, description, creation_date, modification_date, bool(updated))
+        self.collection_id: int = collection_id
+        self.generation = generation
+        self.last_backup_date = last_backup_date
+        self.last_backup_location = last_backup_location
+        self.backup_count = backup_count
+        self._pool = pool
+
+    @property
+    def backup_entries(self) -> list[BackupEntry]:
+        """A list of all BackupEntries in the order they were added"""
+        rows = self._pool.connection().execute(SELECT_BACKUPS, (self.collection_id,))
+        return [BackupEntry(name, location, date) for name, date, location in rows]
+
+    def add_backup(self, backup_name : str, backup_date : int, backup_location : str) -> BackupEntry:
+        """Creates and stores a BackupEntry. See DataCollection.add_backup()
+
+        Raises:
+            `BackupAlreadyExistsError`: BackupEntry with name '`backup_name`' already exists
+            `CollectionNotFoundError`: Collection with name '`name`' not found
+        """
+        try:
+            with Transaction(self._pool.connection()) as connection:
+                if connection.execute(COLLECTION_EXISTS, (self.collection_id,)).fetchone() is None:
+                    raise CollectionNotFoundError(f"Collection with name '{self.name}' not found")
+                connection.execute(INSERT_BACKUP, (self.collection_id, backup_name, backup_date, backup_location))
+                connection.execute(ADD_TO_SUMMARY, (1, backup_date, backup_location, self.collection_id))
+                self.generation = increment_generation(connection, self.collection_id)
+        except sqlite3.IntegrityError:
+            raise BackupAlreadyExistsError(f"BackupEntry with name '{backup_name}' already exists")
+        self.backup_count += 1
+        if self.last_backup_date is None or backup_date > self.last_backup_date:
+            self.last_backup_date = backup_date
+            self.last_backup_location = backup_location
+        if self.on_change is not None:
+            self.on_change(self, "add_backup", {"backup_name": backup_name, "backup_date": backup_date, "backup_location": backup_location})
+        return BackupEntry(backup_name, backup_location, backup_date)
+
+    def remove_backup(self, backup_entry : BackupEntry) -> None:
+        """Removes the BackupEntry with the same name as `backup_entry`. See DataCollection.remove_backup()
+
+        Raises:
+            `BackupNotFoundError`: BackupEntry with name `backup_entry.name` not found in `backup_entries`
+        """
+        with Transaction(self._pool.connection()) as connection:
+            deleted = connection.execute(DELETE_BACKUP, (self.collection_id, backup_entry.name)).rowcount
+            if deleted:
+                self.last_backup_date, self.last_backup_location, self.backup_count = \
+                    connection.execute(REMOVE_FROM_SUMMARY, (self.collection_id,)).fetchone()
+                self.generation = increment_generation(connection, self.collection_id)
+        if deleted == 0:
+            raise BackupNotFoundError(f"BackupEntry {backup_entry.name} not found in `backup_entries`")
+        if self.on_change is not None:
+            self.on_change(self, "remove_backup", {"backup_name": backup_entry.name})
+
+    def get_backup(self, backup_name : str) -> BackupEntry:
+        """Returns the BackupEntry with a matching case-sensitive name. See DataCollection.get_backup()
+
+        Raises:
+            `BackupNotFoundError`: BackupEntry with name `backup_name` not found in `backup_entries`
+        """
+        row = self._pool.connection().execute(SELECT_BACKUP, (self.collection_id, backup_name)).fetchone()
+        if row is None:
+            raise BackupNotFoundError(f"BackupEntry with name '{backup_name}' not found in `backup_entries`")
+        name, date, location = row
+        return BackupEntry(name, location, date)
+
+    def get_backups_json(self) -> dict[str, dict[str,str]]:
+        """Returns all BackupEntries as a json-object. See DataCollection.get_backups_json()"""
+        rows = self._pool.connection().execute(SELECT_BACKUPS, (self.collection_id,))
+        return {name: {"date": format_timestamp(date), "location": location} for name, date, location in rows}
+
+    def get_backups_page(self, after : int = 0, limit : int | None = None) -> tuple[dict[str, dict[str,str]], int | None]:
+        """Returns a page of BackupEntries. See DataCollection.get_backups_page(). The cursor is the row id."""
+        # One extra row tells if there is a next page. LIMIT -1 means no limit in SQLite
+        rows = self._pool.connection().execute(SELECT_BACKUPS_PAGE, (self.collection_id, after, -1 if limit is None else limit + 1)).fetchall()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][0]
+        return {name: {"date": format_timestamp(date), "location": location} for _, name, date, location in rows}, next_cursor
+
+    def get_backups_range(self, since : int | None = None, until : int | None = None, limit : int | None = None, descending : bool = False,
+                          after : tuple[int, int] | None = None) -> tuple[dict[str, dict[str,str]], tuple[int, int] | None]:
+        """Returns BackupEntries in date order. See DataCollection.get_backups_range(). The cursor is the (date, row id) of the last row."""
+        if after is None:
+            after = (MAX_INTEGER, MAX_INTEGER) if descending else (MIN_INTEGER, MIN_INTEGER)
+        parameters = (self.collection_id, MIN_INTEGER if since is None else since, MAX_INTEGER if until is None else until - 1,
+                      *after, -1 if limit is None else limit + 1)
+        rows = self._pool.connection().execute(SELECT_BACKUPS_RANGE_DESCENDING if descending else SELECT_BACKUPS_RANGE, parameters).fetchall()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][2], rows[-1][0])
+        return {name: {"date": format_timestamp(date), "location": location} for _, name, date, location in rows}, next_cursor
+
+class SqliteCollectionManager:
+    """CollectionManager storing its DataCollections in a SQLite database.
+
+    Has the same methods as CollectionManager, and can be used in its place. Listeners
+    registered with `add_listener()` are only told about mutations made in this process.
+
+    Attributes:
+        `path`: Path to the database file
+        `data_collections`: A list of all DataCollection objects in insertion order (read only).
+        `generation`: Incremented after every mutation, by any process (read only)
+        `store_id`: Random id of the database, so generations of another database never match
+    """
+
+    def __init__(self, path : str) -> None:
+        """Initializes the instance, creating the database if it doesn't exist
+
+        Args:
+            `path`: Path to the database file
+        """
+        self.path: str = path
+        self._pool = ConnectionPool(path)
+        self._listeners: list[Callable[[str, dict], None]] = []
+        self.store_id: str = self._pool.connection().execute(SELECT_STORE_ID).fetchone()[0]
+
+    @property
+    def generation(self) -> int:
+        """The generation of the database, incremented after every mutation"""
+        return self._pool.connection().execute(SELECT_GENERATION).fetchone()[0]
+
+    def snapshot(self, generation : int | None = None) -> "SqliteCollectionManager":
+        """Stands in for CollectionManager.snapshot(). The database keeps no past versions, and readers never block
+        writers in WAL mode, so this returns the manager itself, and only accepts the current generation.
+
+        Raises:
+            `SnapshotNotFoundError`: Snapshot of generation `generation` is not available
+        """
+        if generation is not None and generation != self.generation:
+            raise SnapshotNotFoundError(f"Snapshot of generation {generation} is not available")
+        return self
+
+    def add_listener(self, listener : Callable[[str, dict], None]) -> None:
+        """Registers `listener` to be called as `listener(operation, arguments)` after every mutation in this process"""
+        self._listeners.append(listener)
+
+    def _notify(self, operation : str, arguments : dict) -> None:
+        for listener in self._listeners:
+            listener(operation, arguments)
+
+    def _collection_changed(self, collection : DataCollection, operation : str, arguments : dict) -> None:
+        self._notify(operation, {"collection_name": collection.name, **arguments})
+
+    def _collection(self, row : tuple) -> SqliteDataCollection:
+        """Creates a SqliteDataCollection from a row of the collections table"""
+        collection = SqliteDataCollection(self._pool, row)
+        collection.on_change = self._collection_changed
+        return collection
+
+    def _collections(self, sql : str, parameters : tuple = ()) -> list[SqliteDataCollection]:
+        rows = self._pool.connection().execute(sql, parameters).fetchall()
+        return [self._collection(row) for row in rows]
+
+    @property
+    def data_collections(self) -> list[DataCollection]:
+        """A list of all DataCollection objects in the order they were added"""
+        return self._collections(SELECT_COLLECTIONS)
+
+    def add_collection(self, name : str, description : str, creation_date : int, modification_date : int, updated : bool) -> DataCollection:
+        """Adds a new DataCollection to the database. See CollectionManager.add_collection()
+
+        Raises:
+            `CollectionAlreadyExistsError`: Collection with name '`name`' already exists
+        """
+        try:
+            with Transaction(self._pool.connection()) as connection:
+                generation = increment_generation(connection)
+                cursor = connection.execute(INSERT_COLLECTION, (name, description, creation_date, modification_date, updated, generation))
+        except sqlite3.IntegrityError:
+            raise CollectionAlreadyExistsError(f"Collection with name '{name}' already exists")
+        self._notify("add_collection", {
+            "name": name, "description": description, "creation_date": creation_date,
+            "modification_date": modification_date, "updated": updated})
+        return self._collection((cursor.lastrowid, name, description, creation_date, modification_date, updated, generation, None, None, 0))
+
+    def add_collections(self, collections : list[dict]) -> list[Exception | None]:
+        """Adds many DataCollections in one transaction. See CollectionManager.add_collections()"""
+        results: list[Exception | None] = []
+        added = []
+        with Transaction(self._pool.connection()) as connection:
+            generation = increment_generation(connection)
+            for collection in collections:
+                try:
+                    # A failed statement only undoes itself, not the rest of the transaction
+                    connection.execute(INSERT_COLLECTION, (collection["name"], collection["description"], collection["creation_date"],
+                                                           collection["modification_date"], collection["updated"], generation))
+                    results.append(None)
+                    added.append(collection)
+                except sqlite3.IntegrityError:
+                    results.append(CollectionAlreadyExistsError(f"Collection with name '{collection["name"]}' already exists"))
+        if added:
+            self._notify("add_collections", {"collections": added})
+        return results
+
+    def add_backups(self, backups : list[dict]) -> list[Exception | None]:
+        """Adds many BackupEntries in one transaction. See CollectionManager.add_backups()"""
+        results: list[Exception | None] = []
+        added = []
+        collection_ids: dict[str, int | None] = {}
+        with Transaction(self._pool.connection()) as connection:
+            for backup in backups:
+                collection_name = backup["collection_name"]
+                if collection_name not in collection_ids:
+                    row = connection.execute(SELECT_COLLECTION_ID, (collection_name,)).fetchone()
+                    collection_ids[collection_name] = None if row is None else row[0]
+                collection_id = collection_ids[collection_name]
+                if collection_id is None:
+                    results.append(CollectionNotFoundError(f"Collection with name '{collection_name}' not found"))
+                    continue
+                try:
+                    connection.execute(INSERT_BACKUP, (collection_id, backup["backup_name"], backup["backup_date"], backup["backup_location"]))
+                    results.append(None)
+                    added.append(backup)
+                except sqlite3.IntegrityError:
+                    results.append(BackupAlreadyExistsError(f"BackupEntry with name '{backup["backup_name"]}' already exists"))
+            if added:
+                generation = increment_generation(connection)
+                summaries: dict[int, list] = {} # Collection id -> [amount added, latest added date, its location]
+                for backup in added:
+                    summary = summaries.setdefault(collection_ids[backup["collection_name"]], [0, backup["backup_date"], backup["backup_location"]])
+                    summary[0] += 1
+                    if backup["backup_date"] > summary[1]:
+                        summary[1:] = [backup["backup_date"], backup["backup_location"]]
+                connection.executemany(ADD_TO_SUMMARY, [(*summary, collection_id) for collection_id, summary in summaries.items()])
+                connection.executemany(SET_COLLECTION_GENERATION, [(generation, collection_id) for collection_id in summaries])
+        if added:
+            self._notify("add_backups", {"backups": added})
+        return results
+
+    def edit_collection(self, collection_name : str, updated_json : dict) -> None:
+        """Edits fields of the DataCollection named `collection_name`. See CollectionManager.edit_collection()
+
+        All edits are made in one transaction, so either every key is applied or none.
+
+        Raises:
+            `InvalidCollectionEditError`: Key '`key`' and associated value is not a valid edit
+            `CollectionNotFoundError`: Collection with name '`collection_name`' not found
+            `CollectionAlreadyExistsError`: Collection with name '`name`' already exists
+        """
+        with Transaction(self._pool.connection()) as connection:
+            collection_id = self._update_collection(connection, collection_name, updated_json)
+            if updated_json:
+                increment_generation(connection, collection_id)
+        if updated_json:
+            self._notify("edit_collection", {"collection_name": collection_name, "updated_json": dict(updated_json)})
+
+    def edit_collections(self, edits : list[dict]) -> None:
+        """Applies many edits in one transaction. See CollectionManager.edit_collections()
+
+        Raises:
+            `InvalidCollectionEditError`: Edit `index`: Key '`key`' and associated value is not a valid edit
+            `CollectionNotFoundError`: Edit `index`: Collection with name '`collection_name`' not found
+            `CollectionAlreadyExistsError`: Edit `index`: Collection with name '`name`' already exists
+        """
+        changed_ids = set()
+        with Transaction(self._pool.connection()) as connection:
+            for index, edit in enumerate(edits):
+                try:
+                    changed_ids.add(self._update_collection(connection, edit["collection_name"], edit["updated_json"]))
+                except (InvalidCollectionEditError, CollectionNotFoundError, CollectionAlreadyExistsError) as e:
+                    raise type(e)(f"Edit {index}: {e}") from e
+            if changed_ids:
+                generation = increment_generation(connection)
+                connection.executemany(SET_COLLECTION_GENERATION, [(generation, collection_id) for collection_id in changed_ids])
+        if edits:
+            self._notify("edit_collections", {"edits": [{"collection_name": edit["collection_name"], "updated_json": dict(edit["updated_json"])}
+                                                        for edit in edits]})
+
+    def _update_collection(self, connection : sqlite3.Connection, collection_name : str, updated_json : dict) -> int:
+        """Applies `updated_json` to the collection named `collection_name` inside the current transaction, returning its id"""
+        row = connection.execute(SELECT_COLLECTION_ID, (collection_name,)).fetchone()
+        if row is None:
+            raise CollectionNotFoundError(f"Collection with name '{collection_name}' not found")
+        for key, value in updated_json.items():
+            if not is_valid_edit(key, value):
+                raise InvalidCollectionEditError(f"Key '{key}' and associated value is not a valid edit")
+            try:
+                connection.execute(UPDATE_COLLECTION[key], (value, row[0]))
+            except sqlite3.IntegrityError:
+                raise CollectionAlreadyExistsError(f"Collection with name '{value}' already exists")
+        return row[0]
+
+    def delete_collection(self, collection_name : str) -> None:
+        """Deletes the DataCollection named `collection_name` and all of its BackupEntries
+
+        Raises:
+            `CollectionNotFoundError`: Collection with name '`collection_name`' not found
+        """
+        with Transaction(self._pool.connection()) as connection:
+            deleted = connection.execute(DELETE_COLLECTION, (collection_name,)).rowcount
+            if deleted:
+                increment_generation(connection)
+        if deleted == 0:
+            raise CollectionNotFoundError(f"Collection with name '{collection_name}' not found")
+        self._notify("delete_collection", {"collection_name": collection_name})
+
+    def overview(self) -> list[str]:
+        """See CollectionManager.overview()"""
+        return [collection.brief_str() for collection in self.data_collections]
+
+    def detailed_overview(self) -> list[list[str]]:
+        """See CollectionManager.detailed_overview()"""
+        return [collection.full_str() for collection in self.data_collections]
+
+    def json_overview(self) -> dict[str,dict[str,object]]:
+        """See CollectionManager.json_overview()"""
+        output = {}
+        for collection in self.data_collections:
+            json = collection.full_json()
+            name = json["name"]
+            del json["name"]
+            output[name] = json
+        return output
+
+    def info(self, collection_name : str) -> list[str]:
+        """See CollectionManager.info()
+
+        Raises:
+            `CollectionNotFoundError`: Collection with name '`collection_name`' not found
+        """
+        return self.get(collection_name).full_str()
+
+    def get(self, collection_name : str) -> DataCollection:
+        """Returns the DataCollection with a case-sensitive matching name to `collection_name`.
+
+        Raises:
+            `CollectionNotFoundError`: Collection with name '`collection_name`' not found
+        """
+        row = self._pool.connection().execute(SELECT_COLLECTION, (collection_name,)).fetchone()
+        if row is None:
+            raise CollectionNotFoundError(f"Collection with name '{collection_name}' not found")
+        return self._collection(row)
+
+    def page(self, after : int = 0, limit : int | None = None, collections : list[DataCollection] | None = None) -> tuple[list[DataCollection], int | None]:
+        """Returns a page of DataCollections. See CollectionManager.page(). The cursor is the row id."""
+        if collections is None:
+            collections = self._collections(SELECT_COLLECTIONS_PAGE, (after, -1 if limit is None else limit + 1))
+            start = 0
+        else:
+            start = bisect_right(collections, after, key=lambda collection: collection.collection_id)
+        if limit is None or start + limit >= len(collections):
+            return collections[start:], None
+        output = collections[start:start + limit]
+        return output, output[-1].collection_id
+
+    def stale(self, before : int, limit : int | None = None) -> list[DataCollection]:
+        """See CollectionManager.stale(). Only reads the returned rows, using the index on `last_backup_date`."""
+        return self._collections(SELECT_STALE_COLLECTIONS, (before, -1 if limit is None else limit))
+
+    def search(self, search_string : str, case_sensitive : bool = True) -> list[DataCollection]:
+        """See CollectionManager.search(). Search strings of 3 or more characters use the trigram index."""
+        if not case_sensitive:
+            search_string = search_string.lower()
+        if len(search_string) < 3: # Too short to have a trigram
+            sql = SEARCH_COLLECTIONS if case_sensitive else SEARCH_COLLECTIONS_CASE_INSENSITIVE
+            return self._collections(sql, (search_string,))
+
+        phrase = '"' + search_string.replace('"', '""') + '"'
+        sql = SEARCH_INDEXED_COLLECTIONS if case_sensitive else SEARCH_INDEXED_COLLECTIONS_CASE_INSENSITIVE
+        return self._collections(sql, (phrase, search_string))
+
+    def search_page(self, search_string : str, case_sensitive : bool = True, after : int = 0,
+                    limit : int | None = None) -> tuple[list[DataCollection], int | None]:
+        """See CollectionManager.search_page(). The cursors are the row ids read by the search, so deletes can't break them."""
+        return self.page(after, limit, self.search(search_string, case_sensitive))
@@ -0,0 +1,95 @@
+"""Index of items ordered by the date of their latest backup, for staleness queries.
+
+Every item is stored under its latest backup timestamp in a sorted list, so the items
+backed up before a cutoff are a prefix of the list, found with one binary search. Items
+that were never backed up are kept apart in the order they were added, since they are
+stale for every cutoff.
+
+Typical usage example:
+    index = StalenessIndex()
+    index.update(collection, collection.last_backup_date)
+    stale = index.stale(before=utility.get_current_timestamp() - 7 * 86400)
+"""
+
+from bisect import bisect_left, insort
+from collections.abc import Hashable
+from itertools import islice
+
+class StalenessIndex:
+    """Orders items by their latest backup timestamp, with binary search updates and O(log n + k) queries for k results.
+
+    Items with the same timestamp are ordered by when they were first added to the index.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty index"""
+        self._keys: dict[Hashable, tuple[int, int]] = {} # item -> (timestamp, number) of items that were backed up
+        self._sorted_keys: list[tuple[int, int]] = []
+        self._items: dict[tuple[int, int], Hashable] = {}
+        self._never_backed_up: dict[Hashable, None] = {} # Used as an insertion ordered set
+        self._numbers: dict[Hashable, int] = {}
+        self._next_number: int = 1
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __contains__(self, item : Hashable) -> bool:
+        return item in self._numbers
+
+    def update(self, item : Hashable, timestamp : int | None) -> None:
+        """Stores `item` under `timestamp`, adding it if it isn't in the index yet
+
+        Args:
+            `item`: The item to store
+            `timestamp`: The timestamp of the latest backup of `item`, or None if it was never backed up
+        """
+        number = self._numbers.get(item)
+        if number is None:
+            number = self._numbers[item] = self._next_number
+            self._next_number += 1
+        else:
+            key = self._keys.get(item)
+            if (key[0] if key is not None else None) == timestamp:
+                return
+            self._unlink(item)
+
+        if timestamp is None:
+            self._never_backed_up[item] = None
+        else:
+            key = (timestamp, number)
+            self._keys[item] = key
+            self._items[key] = item
+            insort(self._sorted_keys, key)
+
+    def remove(self, item : Hashable) -> None:
+        """Removes `item` from the index
+
+        Raises:
+            `KeyError`: When `item` is not in the index
+        """
+        self._unlink(item)
+        del self._numbers[item]
+
+    def _unlink(self, item : Hashable) -> None:
+        key = self._keys.pop(item, None)
+        if key is None:
+            del self._never_backed_up[item]
+        else:
+            del self._sorted_keys[bisect_left(self._sorted_keys, key)]
+            del self._items[key]
+
+    def stale(self, before : int, limit : int | None = None) -> list[Hashable]:
+        """Returns the items never backed up or last backed up before `before`, least recently backed up first.
+
+        Items that were never backed up come first, in the order they were added.
+
+        Args:
+            `before`: The cutoff timestamp
+            `limit`: Max amount of items to return. All if None
+        """
+        output = list(islice(self._never_backed_up, limit))
+        end = bisect_left(self._sorted_keys, (before,)) # (before,) sorts before every (before, number)
+        if limit is not None:
+            end = min(end, limit - len(output))
+        output += [self._items[key] for key in self._sorted_keys[:end]]
+        return output
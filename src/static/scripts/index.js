@@ -1,3 +1,5 @@
+const PAGE_SIZE = 200;
+
 async function handleErrors(response) {
     const result = await response.json()
     document.getElementById("status").innerHTML = "";
@@ -7,3 +9,21 @@ async function handleErrors(response) {
         document.getElementById("status").appendChild(div);
     });
 }
+
+async function fetchPages(url, handlePage) {
+    /*Fetches 'url' one page at a time, calling 'handlePage' with each result as soon as it arrives*/
+    let cursor = null;
+    do {
+        let pageUrl = url + (url.includes("?") ? "&" : "?") + "limit=" + PAGE_SIZE;
+        if (cursor !== null) pageUrl += "&cursor=" + encodeURIComponent(cursor);
+
+        const response = await fetch(pageUrl);
+        if (!response.ok) {
+            await handleErrors(response);
+            return;
+        }
+        const result = await response.json();
+        handlePage(result);
+        cursor = result["next_cursor"];
+    } while (cursor !== null);
+}
@@ -22,13 +22,10 @@ async function getInfo() {
 }
 
 async function getBackups() {
-    /*Fetches all backups for the inspected Collection and populates the 'backup_table' with them*/
+    /*Fetches all backups for the inspected Collection page by page, newest first, and populates the 'backup_table' with them*/
     document.getElementById("collection_name").innerText = URL_NAME;
-    const response = await fetch("/api/ListBackups?name=" + URL_NAME);
-    if (response.ok) {
-        const result = await response.json();
-        let table = document.getElementById("backup_table");
-
+    let table = document.getElementById("backup_table");
+    await fetchPages("/api/ListBackups?order=desc&name=" + encodeURIComponent(URL_NAME), result => {
         Object.entries(result["backup_entries"]).forEach(([name, body]) => {
             let tr = document.createElement("tr");
             
@@ -54,9 +51,7 @@ async function getBackups() {
             tr.appendChild(td4);
             table.appendChild(tr);
         });
-    } else {
-        await handleErrors(response);
-    }
+    });
 }
 
 async function editCollection() {
@@ -1,4 +1,5 @@
 let DETAILED_OVERVIEW = false;
+const SUGGESTION_LIMIT = 20;
 
 /*--------------HELPER FUNCTIONS---------------*/
 
@@ -57,7 +58,7 @@ async function toggleOverviewType() {
 
 async function searchSuggestions(searchterm) {
     /*Populates the 'suggestions' table with searchresults from the /Search API*/
-    const response = await fetch("/api/Search?case_sensitive=false&name=" + searchterm);
+    const response = await fetch("/api/Search?case_sensitive=false&limit=" + SUGGESTION_LIMIT + "&name=" + encodeURIComponent(searchterm));
     if (response.ok) {
         const result = await response.json();
         Object.entries(result["search"]).forEach(([name, body]) => {
@@ -96,26 +97,18 @@ window.onload = () => { /*We need to wait for the DOM elements to load*/
 
 
 async function updateOverview() {
-    /*Load in information about all DataCollections and displays them using 'addOverviewRow()'*/
-    const response = await fetch("/api/Overview")
-    if (response.ok) {
-        const result = await response.json()
-        
+    /*Load in information about all DataCollections page by page and displays them using 'addOverviewRow()'*/
+    await fetchPages("/api/Overview", result => {
         result["overview"].forEach(element => {
             addOverviewRow([element.split(" | ")[0], element.split(" | ")[1], element.split(" | ")[2]], "overviewtd", true);
         });
-        
-    } else {
-        handleErrors(response);
-    }
+    });
 }
 
 async function updateDetailedOverview() {
-    /*Load in detailed information and displays it using 'addOverviewRow()'*/
-    const response = await fetch("/api/List")
-    if (response.ok) {
-        const result = await response.json()
-        addOverviewRow(["Name", "Description", "Creation Date", "Modification Date", "Updated"], "detailedoverviewtd", false)
+    /*Load in detailed information page by page and displays it using 'addOverviewRow()'*/
+    addOverviewRow(["Name", "Description", "Creation Date", "Modification Date", "Updated"], "detailedoverviewtd", false)
+    await fetchPages("/api/List", result => {
         Object.entries(result["overview"]).forEach(([name, body]) => {
             addOverviewRow([
                 name,
@@ -125,10 +118,7 @@ async function updateDetailedOverview() {
                 body["updated"]
             ], "detailedoverviewtd", true)
         });
-        
-    } else {
-        handleErrors(response);
-    }
+    });
 }
 
 async function addCollection() {
@@ -0,0 +1,87 @@
+"""Trigram index for case-insensitive substring search.
+
+Every indexed text is casefolded once when it's added, and split into all of its 3 character
+substrings (trigrams). Casefolding maps every character on its own, unlike `str.lower()` (which
+lowercases a final sigma differently), so a text containing a search string in any case also
+contains it after casefolding, and the index never misses an item a caller filters more strictly. A substring search only has to verify the items containing every trigram
+of the search string, instead of scanning every item.
+
+Typical usage example:
+    index = TrigramIndex()
+    index.add(collection, collection.name)
+    matches = index.search("backup")
+"""
+
+from collections.abc import Hashable
+
+def trigrams(text : str) -> set[str]:
+    """Returns the set of all 3 character substrings of `text`"""
+    return {text[i:i+3] for i in range(len(text) - 2)}
+
+class TrigramIndex:
+    """Maps trigrams of casefolded texts to the items the texts belong to.
+
+    Attributes:
+        `postings`: Dictionary with the items whose casefolded text contains each trigram
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty index"""
+        self.postings: dict[str, set[Hashable]] = {}
+        self._keys: dict[Hashable, str] = {} # item -> casefolded text
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, item : Hashable, text : str) -> None:
+        """Indexes `item` under `text`. An item can only be indexed under one text at a time.
+
+        Args:
+            `item`: The item returned by searches matching `text`
+            `text`: The text to index
+        """
+        key = text.casefold()
+        self._keys[item] = key
+        for trigram in trigrams(key):
+            self.postings.setdefault(trigram, set()).add(item)
+
+    def remove(self, item : Hashable) -> None:
+        """Removes `item` from the index
+
+        Args:
+            `item`: The item to remove
+
+        Raises:
+            `KeyError`: When `item` is not indexed
+        """
+        key = self._keys.pop(item)
+        for trigram in trigrams(key):
+            items = self.postings[trigram]
+            items.discard(item)
+            if not items:
+                del self.postings[trigram]
+
+    def search(self, search_string : str) -> list[Hashable]:
+        """Returns the items whose casefolded text contains the casefolded `search_string`. The order is undefined.
+
+        Search strings shorter than 3 characters have no trigrams, so they are checked against
+        every casefolded text instead.
+
+        Args:
+            `search_string`: The substring to look for
+        """
+        search_string = search_string.casefold()
+        search_trigrams = trigrams(search_string)
+        if not search_trigrams:
+            return [item for item, key in self._keys.items() if search_string in key]
+
+        postings = []
+        for trigram in search_trigrams:
+            items = self.postings.get(trigram)
+            if items is None:
+                return []
+            postings.append(items)
+        postings.sort(key=len) # Intersecting from the smallest set keeps every step small
+        candidates = postings[0].intersection(*postings[1:])
+        # Containing every trigram doesn't mean they are in the right order, so each candidate is verified
+        return [item for item in candidates if search_string in self._keys[item]]
@@ -1,11 +1,115 @@
-from datetime import datetime
+import base64
+import binascii
+import time
+from datetime import datetime, timedelta, timezone
+from custom_exceptions import InvalidCursorError, InvalidDateError
 
-def get_current_datestring() -> str:
-    """Returns the current datetime as a string.
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+SECOND = timedelta(seconds=1)
+# The range of timestamps `format_timestamp()` can render, 0001-01-01 00:00:00 to 9999-12-31 23:59:59 UTC
+MIN_TIMESTAMP = (datetime.min.replace(tzinfo=timezone.utc) - EPOCH) // SECOND
+MAX_TIMESTAMP = (datetime.max.replace(tzinfo=timezone.utc) - EPOCH) // SECOND
+# Keys holding a date in the json bodies of the API
+DATE_KEYS = ("creation_date", "modification_date", "backup_date")
+
+def get_current_timestamp() -> int:
+    """Returns the current time as a timestamp (whole seconds since 1970-01-01 00:00:00 UTC)"""
+    return int(time.time())
+
+def parse_timestamp(datestring : str) -> int:
+    """Returns the timestamp of an ISO 8601 date string. Dates without a UTC offset are taken as UTC.
+
+    Accepts formats like `YYYY-MM-DD`, `YYYY-MM-DD HH:MM:SS`, `YYYY-MM-DDTHH:MM:SSZ` and
+    `YYYY-MM-DDTHH:MM:SS+02:00`. Fractions of a second are dropped.
+
+    Raises:
+        `InvalidDateError`: Date '`datestring`' is not a valid ISO 8601 date
+        `InvalidDateError`: Date '`datestring`' is outside the years 1 to 9999 UTC
+    """
+    try:
+        date = datetime.fromisoformat(datestring)
+    except (TypeError, ValueError):
+        raise InvalidDateError(f"Date '{datestring}' is not a valid ISO 8601 date")
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    timestamp = (date - EPOCH) // SECOND
+    if not MIN_TIMESTAMP <= timestamp <= MAX_TIMESTAMP:
+        # Like 0001-01-01T00:00:00+05:00, which format_timestamp() could not render
+        raise InvalidDateError(f"Date '{datestring}' is outside the years 1 to 9999 UTC")
+    return timestamp
+
+def format_timestamp(timestamp : int) -> str:
+    """Returns `timestamp` as a UTC date string, the inverse of `parse_timestamp()`
 
     Returns:
-        Returns `datetime.now()` in the following format:
-            `YYYY-MM-DD HH:MM:SS`
+        Formatted as `YYYY-MM-DD HH:MM:SS`. Example return value: `"2025-06-05 23:49:00"`
+    """
+    return (EPOCH + timedelta(seconds=timestamp)).replace(tzinfo=None).isoformat(sep=" ")
+
+def parse_dates(json : dict) -> dict:
+    """Returns a copy of `json` with the date string of every key in `DATE_KEYS` replaced by its timestamp
+
+    Raises:
+        `InvalidDateError`: When a date is not an ISO 8601 date string
+    """
+    output = dict(json)
+    for key in DATE_KEYS:
+        if key in output:
+            if not isinstance(output[key], str):
+                raise InvalidDateError(f"Key '{key}' must be an ISO 8601 date string")
+            output[key] = parse_timestamp(output[key])
+    return output
+
+def legacy_timestamp(date : int | str) -> int:
+    """Returns the timestamp of a date stored before dates were timestamps, when they were free form strings.
+
+    Timestamps are returned as they are, and strings that are not ISO 8601 dates (like "Today") become 0.
+    """
+    if isinstance(date, int):
+        return date
+    try:
+        return parse_timestamp(date)
+    except InvalidDateError:
+        return 0
+
+def encode_cursor(position : int) -> str:
+    """Returns an opaque pagination cursor for `position`, a cursor returned by CollectionManager.page() or similar
+
+    Returns:
+        A url safe string. Example return value: `"MTIz"`
+    """
+    return base64.urlsafe_b64encode(str(position).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor : str) -> int:
+    """Returns the position stored in a cursor made by `encode_cursor()`
+
+    Raises:
+        `InvalidCursorError`: Cursor '`cursor`' is not a valid cursor
+    """
+    try:
+        position = int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError(f"Cursor '{cursor}' is not a valid cursor")
+    if position < 0:
+        raise InvalidCursorError(f"Cursor '{cursor}' is not a valid cursor")
+    return position
+
+def encode_date_cursor(key : tuple[int, int]) -> str:
+    """Returns an opaque pagination cursor for `key`, a (date, position) key returned by DataCollection.get_backups_range()
+
+    Returns:
+        A url safe string. Example return value: `"MTc0OTE2NzM0MC4xMg"`
+    """
+    return base64.urlsafe_b64encode(f"{key[0]}.{key[1]}".encode()).decode().rstrip("=")
+
+def decode_date_cursor(cursor : str) -> tuple[int, int]:
+    """Returns the (date, position) key stored in a cursor made by `encode_date_cursor()`
 
+    Raises:
+        `InvalidCursorError`: Cursor '`cursor`' is not a valid cursor
     """
-    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    try:
+        date, position = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(".")
+        return int(date), int(position)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError(f"Cursor '{cursor}' is not a valid cursor")
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+import pytest
+from flask import Flask, Response, request, stream_with_context
+from asgi_adapter import AsgiAdapter
+
+@pytest.fixture
+def adapter():
+    app = Flask(__name__)
+    app.closed_streams = []
+
+    @app.get("/Echo")
+    def echo():
+        return {"args": request.args.to_dict(), "agent": request.headers.get("User-Agent"), "path": request.path,
+                "thread": threading.current_thread().name}
+
+    @app.post("/Echo")
+    def echo_body():
+        return {"size": len(request.get_data()), "lines": request.get_data().count(b"\n")}
+
+    @app.get("/Stream")
+    def stream():
+        count = int(request.args.get("count", "3"))
+        def chunks():
+            try:
+                for i in range(count):
+                    yield f"{i}\n"
+            finally:
+                app.closed_streams.append(True)
+        return Response(chunks(), content_type="text/plain")
+
+    @app.get("/ContextStream")
+    def context_stream():
+        @stream_with_context
+        def chunks():
+            for _ in range(50):
+                yield request.args["name"] + "\n"
+        return Response(chunks(), content_type="text/plain")
+
+    adapter = AsgiAdapter(app, threads=2)
+    yield adapter
+    adapter.executor.shutdown()
+
+def http_scope(method, path, query=b"", headers=()):
+    return {"type": "http", "method": method, "path": path, "query_string": query, "root_path": "",
+            "headers": [(name.encode(), value.encode()) for name, value in headers], "http_version": "1.1",
+            "scheme": "http", "server": ("127.0.0.1", 5000), "client": ("127.0.0.1", 40000)}
+
+def call(adapter, scope, body_parts=(b"",), disconnect_after=None):
+    """Runs one request through `adapter`, returning the status, headers and body chunks it sent"""
+    messages = [{"type": "http.request", "body": part, "more_body": i < len(body_parts) - 1} for i, part in enumerate(body_parts)]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        while disconnect_after is None or len(sent) < disconnect_after:
+            await asyncio.sleep(0.001) # The client stays connected
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.wait_for(adapter(scope, receive, send), 10)
+
+    asyncio.run(main())
+    start, *bodies = sent
+    assert start["type"] == "http.response.start"
+    assert not bodies[-1]["more_body"]
+    return start["status"], dict(start["headers"]), [message["body"] for message in bodies if message["body"]]
+
+def test_get_json(adapter):
+    status, headers, chunks = call(adapter, http_scope("GET", "/Echo", b"name=A%20B", [("User-Agent", "Test")]))
+    assert status == 200
+    assert headers[b"content-type"] == b"application/json"
+    assert len(chunks) == 1 and headers[b"content-length"] == str(len(chunks[0])).encode()
+    document = json.loads(chunks[0])
+    assert document["args"] == {"name": "A B"}
+    assert document["agent"] == "Test"
+    assert document["path"] == "/Echo"
+    assert document["thread"].startswith("asgi")
+
+def test_post_body_in_parts(adapter):
+    parts = [b"line\n" * 1000, b"", b"line\n" * 3000]
+    scope = http_scope("POST", "/Echo", headers=[("Content-Type", "text/plain"), ("Content-Length", str(sum(map(len, parts))))])
+    status, _, chunks = call(adapter, scope, parts)
+    assert status == 200
+    assert json.loads(chunks[0]) == {"size": 20000, "lines": 4000}
+
+def test_streamed_response(adapter):
+    status, headers, chunks = call(adapter, http_scope("GET", "/Stream", b"count=3"))
+    assert status == 200
+    assert b"content-length" not in headers
+    assert chunks == [b"0\n", b"1\n", b"2\n"]
+    assert adapter.wsgi_app.closed_streams == [True]
+
+def test_streamed_response_with_request_context(adapter):
+    status, _, chunks = call(adapter, http_scope("GET", "/ContextStream", b"name=A"))
+    assert status == 200
+    assert b"".join(chunks) == b"A\n" * 50
+
+def test_disconnect_stops_stream(adapter):
+    _, _, chunks = call(adapter, http_scope("GET", "/Stream", b"count=1000000"), disconnect_after=3)
+    assert len(chunks) < 100
+    assert adapter.wsgi_app.closed_streams == [True]
+
+def test_not_found(adapter):
+    status, _, _ = call(adapter, http_scope("GET", "/Missing"))
+    assert status == 404
+
+def test_lifespan(adapter):
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(adapter({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+def test_threads_must_be_positive():
+    with pytest.raises(ValueError):
+        AsgiAdapter(Flask(__name__), threads=0)
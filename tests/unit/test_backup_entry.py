@@ -2,12 +2,23 @@ import pytest
 from src.backup_entry import BackupEntry
 
 @pytest.mark.parametrize("name, location, date", [
-    ("BackupEntry1", "/home/user/backup.bak", "2008-06-12 14:22:30"),
-    ("\"AAAAAAAA!==)\\:;M,.-|||\\", "China", "-4"),
-    ("", "", "")
+    ("BackupEntry1", "/home/user/backup.bak", 1213280550),
+    ("\"AAAAAAAA!==)\\:;M,.-|||\\", "China", -4),
+    ("", "", 0)
 ])
-def test_attributes(name : str, location : str, date : str):
+def test_attributes(name : str, location : str, date : int):
     backup = BackupEntry(name, location, date)
     assert backup.name == name
     assert backup.location == location
-    assert backup.date == date
\ No newline at end of file
+    assert backup.date == date
+
+@pytest.mark.parametrize("location", ["/mnt/backups/a.tar", "C:\\Backups\\a.zip", "/mnt/backups/", "a.tar"])
+def test_location_directory_is_shared(location : str):
+    first = BackupEntry("First", location, 0)
+    second = BackupEntry("Second", "".join(list(location)), 0) # An equal but distinct string
+    assert first.location == second.location == location
+    assert first._directory is second._directory
+
+def test_has_no_instance_dict():
+    with pytest.raises(AttributeError):
+        BackupEntry("Name", "Location", 0).unknown = 1
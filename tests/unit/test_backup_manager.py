@@ -15,8 +15,8 @@ def collection_object():
     data_collection = manager.add_collection(
         "TestCollection1",
         "Testcollection used for tests",
-        src.utility.get_current_datestring(),
-        src.utility.get_current_datestring(),
+        src.utility.get_current_timestamp(),
+        src.utility.get_current_timestamp(),
         True)
     return data_collection
 
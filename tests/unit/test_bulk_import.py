@@ -0,0 +1,128 @@
+import gzip
+import io
+import json
+import pytest
+from flask import Flask
+from flask_restx import Api
+from api.bulkcollections import BulkCollections
+from src.bulk_import import decode_body, export_record, import_collections, import_backups, iter_lines
+from src.collection_manager import CollectionManager
+
+def ndjson(*records) -> list[bytes]:
+    return [(record if isinstance(record, str) else json.dumps(record)).encode() + b"\n" for record in records]
+
+@pytest.fixture
+def manager():
+    manager = CollectionManager()
+    manager.add_collection("Existing", "Description", 1000, 2000, True)
+    return manager
+
+def test_import_collections(manager : CollectionManager):
+    result = import_collections(manager, ndjson(
+        {"name": "A", "description": "D", "creation_date": "2025-06-05T23:49:00Z", "modification_date": "2025-06-06 01:49:00+02:00", "updated": False},
+        {"name": "B", "description": "D"}))
+    assert (result.imported, result.failed, result.line_errors) == (2, 0, [])
+    assert manager.get("A").full_json() == {"name": "A", "description": "D", "creation_date": "2025-06-05 23:49:00",
+                                          "modification_date": "2025-06-05 23:49:00", "updated": False,
+                                          "last_backup_date": None, "last_backup_location": None, "backup_count": 0}
+    assert manager.get("B").updated is True
+
+@pytest.mark.parametrize("line,error", [
+    ("not json", "InvalidImportRecordError"),
+    ("[1, 2]", "InvalidImportRecordError"),
+    ({"name": "A"}, "InvalidImportRecordError"),
+    ({"name": "A", "description": "D", "unknown": 1}, "InvalidImportRecordError"),
+    ({"name": "A", "description": "D", "updated": "yes"}, "InvalidImportRecordError"),
+    ({"name": "A", "description": "D", "creation_date": "Today"}, "InvalidDateError"),
+    ({"name": "Existing", "description": "D"}, "CollectionAlreadyExistsError")
+])
+def test_import_collections_reports_line_errors(manager : CollectionManager, line, error : str):
+    result = import_collections(manager, ndjson({"name": "First", "description": ""}, line, {"name": "Last", "description": ""}))
+    assert (result.imported, result.failed) == (2, 1)
+    assert result.line_errors[0]["line"] == 2
+    assert list(result.line_errors[0]["errors"]) == [error]
+    assert [collection.name for collection in manager.data_collections] == ["Existing", "First", "Last"]
+
+def test_import_backups(manager : CollectionManager):
+    result = import_backups(manager, ndjson(
+        {"collection_name": "Existing", "backup_name": "B1", "backup_location": "L1", "backup_date": "2025-06-05"},
+        {"collection_name": "Missing", "backup_name": "B2", "backup_location": "L2"},
+        {"collection_name": "Existing", "backup_name": "B1", "backup_location": "L3"},
+        "",
+        {"collection_name": "Existing", "backup_name": "B3", "backup_location": "L3"}))
+    assert (result.imported, result.failed) == (2, 2)
+    assert [(error["line"], list(error["errors"])) for error in result.line_errors] == [
+        (2, ["CollectionNotFoundError"]), (3, ["BackupAlreadyExistsError"])]
+    assert list(manager.get("Existing").get_backups_json()) == ["B1", "B3"]
+
+def test_import_is_split_into_batches(manager : CollectionManager, monkeypatch : pytest.MonkeyPatch):
+    monkeypatch.setattr("src.bulk_import.BATCH_SIZE", 2)
+    operations = []
+    manager.add_listener(lambda operation, arguments: operations.append((operation, len(arguments["collections"]))))
+    result = import_collections(manager, ndjson(*[{"name": str(i), "description": ""} for i in range(5)]))
+    assert result.imported == 5
+    assert operations == [("add_collections", 2), ("add_collections", 2), ("add_collections", 1)]
+
+def test_reported_errors_are_capped(manager : CollectionManager, monkeypatch : pytest.MonkeyPatch):
+    monkeypatch.setattr("src.bulk_import.MAX_REPORTED_ERRORS", 3)
+    result = import_collections(manager, ndjson(*["invalid"] * 10))
+    assert result.failed == 10
+    assert len(result.line_errors) == 3
+
+@pytest.mark.parametrize("read_size", [1, 3, 1000])
+def test_iter_lines(read_size : int):
+    data = b'{"a": 1}\n\n{"b": 2}\n{"c": 3}'
+    assert list(iter_lines(io.BytesIO(data), read_size)) == [b'{"a": 1}', b"", b'{"b": 2}', b'{"c": 3}']
+
+def test_export_record_round_trips(manager : CollectionManager):
+    collection = manager.get("Existing")
+    collection.add_backup("B1", 1749167340, "L1")
+    collection.add_backup("B2", -302430530, "L2")
+    manager.add_collection("Empty", "", 0, 0, False)
+    lines = [json.dumps(export_record(collection)).encode() for collection in manager.data_collections]
+
+    imported = CollectionManager()
+    result = import_collections(imported, lines)
+    assert (result.imported, result.failed) == (2, 0)
+    assert [(collection.full_json(), collection.get_backups_json()) for collection in imported.data_collections] == \
+           [(collection.full_json(), collection.get_backups_json()) for collection in manager.data_collections]
+
+def test_import_collections_reports_invalid_backup_entries(manager : CollectionManager):
+    result = import_collections(manager, ndjson(
+        {"name": "A", "description": "", "backup_entries": [{"backup_name": "B"}]},
+        {"name": "C", "description": "", "backup_entries": [{"backup_name": "B", "backup_location": "L", "backup_date": "Today"}]},
+        {"name": "B", "description": "", "backup_entries": [{"backup_name": "B", "backup_location": "L"}] * 2}))
+    assert [list(error["errors"]) for error in result.line_errors] == [["InvalidImportRecordError"], ["InvalidImportRecordError"], ["BackupAlreadyExistsError"]]
+    assert list(manager.get("B").get_backups_json()) == ["B"]
+    # The collection of the rejected backup entry was added, so its record counts as imported
+    assert (result.imported, result.failed, result.rejected_backup_entries) == (1, 2, 1)
+    assert result.line_errors[2]["line"] == 3 and result.line_errors[2]["backup_entry"] == 1
+
+def test_decode_body():
+    data = b'{"a": 1}\n'
+    assert decode_body(io.BytesIO(gzip.compress(data)), "gzip").read() == data
+    assert decode_body(io.BytesIO(data), None).read() == data
+    with pytest.raises(ValueError):
+        decode_body(io.BytesIO(data), "br")
+
+def test_error_reading_the_body_keeps_what_was_imported(manager : CollectionManager, monkeypatch : pytest.MonkeyPatch):
+    monkeypatch.setattr("src.bulk_import.BATCH_SIZE", 2)
+    body = gzip.compress(b"".join(ndjson(*[{"name": str(i), "description": ""} for i in range(1000)])))
+    truncated = io.BytesIO(body[:len(body) // 2])
+    result = import_collections(manager, iter_lines(decode_body(truncated, "gzip"), read_size=64))
+    assert isinstance(result.stream_error, EOFError)
+    # Every complete line read before the error is imported
+    assert result.imported == len(manager.data_collections) - 1 > 0
+    assert [collection.name for collection in manager.data_collections[1:]] == [str(i) for i in range(result.imported)]
+
+def test_bulk_endpoint_reports_counts_of_interrupted_import(manager : CollectionManager):
+    app = Flask(__name__)
+    api = Api(app)
+    api.add_resource(BulkCollections, "/BulkCollections", resource_class_kwargs={"collection_manager": manager, "response_cache": None})
+    body = gzip.compress(b"".join(ndjson(*[{"name": str(i), "description": ""} for i in range(100_000)])))
+    response = app.test_client().post("/BulkCollections", data=body[:len(body) // 2],
+                                      headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"})
+    assert response.status_code == 400
+    assert list(response.json["errors"]) == ["EOFError"]
+    assert response.json["imported"] == len(manager.data_collections) - 1 > 0
+    assert response.json["failed"] == response.json["rejected_backup_entries"] == 0
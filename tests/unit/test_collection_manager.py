@@ -1,5 +1,9 @@
+import sys
+import threading
 import pytest
-from custom_exceptions import CollectionNotFoundError, CollectionAlreadyExistsError
+import timeit
+from custom_exceptions import (CollectionNotFoundError, CollectionAlreadyExistsError, InvalidCollectionEditError, InvalidOperationError,
+                               SnapshotNotFoundError)
 from src.collection_manager import CollectionManager
 import src.utility
 
@@ -12,20 +16,20 @@ def filled_manager():
     manager = CollectionManager()
     manager.add_collection(
         "Test Collection", "Yet another test", 
-        "Time1", "Time2", False)
+        1000, 2000, False)
     manager.add_collection(
         "ECOLLECTION\"", "-500",
-        "Dawn", "Morning", True)
+        3000, 4000, True)
     manager.add_collection(
         "", "",
-        "", "", True)
+        0, 0, True)
     return manager
 
 def test_add_collection_returns(empty_manager : CollectionManager):
     collection = empty_manager.add_collection(
         "Test Collection", "Yet another test", 
-        src.utility.get_current_datestring(),
-        src.utility.get_current_datestring(),
+        src.utility.get_current_timestamp(),
+        src.utility.get_current_timestamp(),
         False)
     
     assert collection is not None
@@ -33,8 +37,8 @@ def test_add_collection_returns(empty_manager : CollectionManager):
 def test_add_collection_exists(empty_manager : CollectionManager):
     collection = empty_manager.add_collection(
         "Test Collection", "Yet another test", 
-        src.utility.get_current_datestring(),
-        src.utility.get_current_datestring(),
+        src.utility.get_current_timestamp(),
+        src.utility.get_current_timestamp(),
         False)
     
     try:
@@ -45,13 +49,13 @@ def test_add_collection_exists(empty_manager : CollectionManager):
 
 @pytest.mark.parametrize("name, description, creation_date, modification_date, updated", [
     ("TestCollection5124", "Super important secret Data",
-     "The first day ever", "Yesterday", True),
+     -302430530, 1738656949, True),
      ("//4234sftr", "asdjnvmnfmngkfnh",
-     "", "-566", False),
+     0, -566, False),
      ("\"TestCollection\"", "D",
-     "C", "M", True),
+     1, 2, True),
 ])
-def test_add_collection_values(empty_manager : CollectionManager, name : str, description : str, creation_date : str, modification_date : str, updated : bool):
+def test_add_collection_values(empty_manager : CollectionManager, name : str, description : str, creation_date : int, modification_date : int, updated : bool):
     collection = empty_manager.add_collection(
         name, description, creation_date,
         modification_date, updated)
@@ -65,18 +69,17 @@ def test_add_collection_values(empty_manager : CollectionManager, name : str, de
 @pytest.mark.parametrize("name", ["Test Collection", "ECOLLECTION\"", ""])
 def test_add_collection_raises_collection_already_exists_error(filled_manager : CollectionManager, name):
     with pytest.raises(CollectionAlreadyExistsError):
-        filled_manager.add_collection(name, "B", "C", "D", True)
+        filled_manager.add_collection(name, "B", 3, 4, True)
 
 def test_overview_returns_brief_str(filled_manager : CollectionManager, monkeypatch):
     expected = []
-    # Here we use monkeypatch which overwrites a method of an object with our own.
-    # So called mocking.
+    # Here we use monkeypatch which overwrites a method with our own.
+    # So called mocking. DataCollection has __slots__, so the method is overwritten on the class
+    mocked_strings = {}
     for collection in filled_manager.data_collections:
-        mocked_string = f"MOCKED_OUTPUT_FOR: {collection.name}"
-        expected.append(mocked_string)
-        #This lambda makes sure its a value, and not a reference, being passed along
-        #which brief_str returns. Otherwise it gets removed after loop scope
-        monkeypatch.setattr(collection, "brief_str", lambda val=mocked_string: val)
+        mocked_strings[collection.name] = f"MOCKED_OUTPUT_FOR: {collection.name}"
+        expected.append(mocked_strings[collection.name])
+    monkeypatch.setattr(type(collection), "brief_str", lambda self: mocked_strings[self.name])
 
     overviews = filled_manager.overview()
     assert overviews == expected
@@ -86,10 +89,11 @@ def test_overview_returns_empty_list(empty_manager : CollectionManager):
 
 def test_detailed_overview_returns_full_str(filled_manager : CollectionManager, monkeypatch):
     expected = []
+    mocked_lists = {}
     for collection in filled_manager.data_collections:
-        mocked_list = [f"MOCKED_OUTPUT_FOR: {collection.name}", f"MOCKED_OUTPUT_FOR: {collection.description}"]
-        expected.append(mocked_list)
-        monkeypatch.setattr(collection, "full_str", lambda val=mocked_list: val)
+        mocked_lists[collection.name] = [f"MOCKED_OUTPUT_FOR: {collection.name}", f"MOCKED_OUTPUT_FOR: {collection.description}"]
+        expected.append(mocked_lists[collection.name])
+    monkeypatch.setattr(type(collection), "full_str", lambda self: mocked_lists[self.name])
 
     overviews = filled_manager.detailed_overview()
     assert overviews == expected
@@ -101,7 +105,7 @@ def test_detailed_overview_returns_empty_list(empty_manager : CollectionManager)
 def test_info_returns_full_str(filled_manager : CollectionManager, name : str, monkeypatch):
     collection = filled_manager.get(name)
     mocked_list = [f"MOCKED_OUTPUT_FOR: {collection.name}", f"MOCKED_OUTPUT_FOR: {collection.description}"]
-    monkeypatch.setattr(collection, "full_str", lambda val=mocked_list: val)
+    monkeypatch.setattr(type(collection), "full_str", lambda self: mocked_list if self is collection else [])
     assert mocked_list == filled_manager.info(name)
 
 def test_info_raises_collection_not_found_error(filled_manager : CollectionManager):
@@ -146,7 +150,7 @@ def test_search_returns_correct_names(filled_manager: CollectionManager, search
 
 def test_edit_collection_random(filled_manager: CollectionManager):
     start_values = filled_manager.get("Test Collection").full_json()
-    filled_manager.edit_collection("Test Collection", {"modification_date": "Yesterdayy"})
+    filled_manager.edit_collection("Test Collection", {"modification_date": 1738656949})
     filled_manager.edit_collection("Test Collection", {"updated": True})
     filled_manager.edit_collection("Test Collection", {"name": "Test Collection 2"})
     filled_manager.edit_collection("Test Collection 2", {"name": "AAAAAAAAAAAAAA"})
@@ -155,7 +159,7 @@ def test_edit_collection_random(filled_manager: CollectionManager):
     
     start_values["name"] = "BBB"
     start_values["description"] = "New Description"
-    start_values["modification_date"] = "Yesterdayy"
+    start_values["modification_date"] = "2025-02-04 08:15:49"
     start_values["updated"] = True
     assert start_values == filled_manager.get("BBB").full_json()
 
@@ -178,3 +182,497 @@ def test_delete_collection_correct_target(filled_manager: CollectionManager):
     filled_manager.delete_collection("ECOLLECTION\"")
     with pytest.raises(CollectionNotFoundError):
         filled_manager.get("ECOLLECTION\"")
+
+def test_edit_collection_rename_keeps_order(filled_manager: CollectionManager):
+    filled_manager.edit_collection("Test Collection", {"name": "Renamed"})
+    assert [collection.name for collection in filled_manager.data_collections] == ["Renamed", "ECOLLECTION\"", ""]
+    with pytest.raises(CollectionNotFoundError):
+        filled_manager.get("Test Collection")
+    assert filled_manager.get("Renamed").description == "Yet another test"
+
+def test_edit_collection_rename_to_existing_name_raises(filled_manager: CollectionManager):
+    with pytest.raises(CollectionAlreadyExistsError):
+        filled_manager.edit_collection("Test Collection", {"name": ""})
+    assert filled_manager.get("Test Collection").name == "Test Collection"
+    assert filled_manager.get("").name == ""
+
+def test_add_collection_after_delete_reuses_name(filled_manager: CollectionManager):
+    filled_manager.delete_collection("Test Collection")
+    filled_manager.add_collection("Test Collection", "Again", 1, 2, True)
+    assert list(filled_manager.json_overview().keys()) == ["ECOLLECTION\"", "", "Test Collection"]
+
+@pytest.mark.parametrize("search,sensitive,correct_names", [
+    ("collection", False, ["Renamed Collection", "ECOLLECTION\""]),
+    ("Collection", True, ["Renamed Collection"]),
+    ("Test", True, []),
+    ("ECOLLECTION\"", True, ["ECOLLECTION\""])
+])
+def test_search_after_rename_and_delete(filled_manager : CollectionManager, search : str, sensitive : bool, correct_names):
+    filled_manager.edit_collection("Test Collection", {"name": "Renamed Collection"})
+    filled_manager.add_collection("Deleted Collection", "", 0, 0, True)
+    filled_manager.delete_collection("Deleted Collection")
+    result = filled_manager.search(search, case_sensitive=sensitive)
+    assert [collection.name for collection in result] == correct_names
+
+@pytest.mark.parametrize("search,sensitive,correct_names", [
+    ("ΚΟΣ", True, ["ΚΟΣΜΟΣ"]), # "ΚΟΣ".lower() ends with a final sigma, but "ΚΟΣΜΟΣ".lower() has a medial one there
+    ("κοσ", False, ["ΚΟΣΜΟΣ"]),
+    ("strasse", False, []) # Only matches "Straße" when casefolded, which case insensitive searches don't do
+])
+def test_search_names_lowercased_by_context(empty_manager : CollectionManager, search : str, sensitive : bool, correct_names):
+    empty_manager.add_collection("ΚΟΣΜΟΣ", "", 0, 0, True)
+    empty_manager.add_collection("Straße", "", 0, 0, True)
+    result = empty_manager.search(search, case_sensitive=sensitive)
+    assert [collection.name for collection in result] == correct_names
+
+def test_page_through_collections(filled_manager : CollectionManager):
+    page, after = filled_manager.page(0, 2)
+    assert [collection.name for collection in page] == ["Test Collection", "ECOLLECTION\""]
+    filled_manager.delete_collection("")
+    filled_manager.add_collection("New", "", 0, 0, True)
+    page, after = filled_manager.page(after, 2)
+    assert [collection.name for collection in page] == ["New"]
+    assert after is None
+
+def test_page_through_search_result(filled_manager : CollectionManager):
+    result = filled_manager.search("collection", case_sensitive=False)
+    page, after = filled_manager.page(0, 1, result)
+    assert [collection.name for collection in page] == ["Test Collection"]
+    page, after = filled_manager.page(after, 1, result)
+    assert ([collection.name for collection in page], after) == (["ECOLLECTION\""], None)
+
+def test_search_page_after_delete(filled_manager : CollectionManager):
+    page, after = filled_manager.search_page("collection", False, 0, 1)
+    assert [collection.name for collection in page] == ["Test Collection"]
+    filled_manager.delete_collection("Test Collection")
+    page, after = filled_manager.search_page("collection", False, after, 1)
+    assert ([collection.name for collection in page], after) == (["ECOLLECTION\""], None)
+
+def test_listeners_receive_every_mutation(empty_manager : CollectionManager):
+    operations = []
+    empty_manager.add_listener(lambda operation, arguments: operations.append((operation, arguments)))
+    collection = empty_manager.add_collection("Name", "Description", 1, 2, True)
+    collection.add_backup("Backup", 3, "Location")
+    collection.remove_backup(collection.get_backup("Backup"))
+    empty_manager.edit_collection("Name", {"name": "New Name"})
+    empty_manager.delete_collection("New Name")
+    collection.add_backup("Detached Backup", 3, "Location")
+
+    assert operations == [
+        ("add_collection", {"name": "Name", "description": "Description", "creation_date": 1, "modification_date": 2, "updated": True}),
+        ("add_backup", {"collection_name": "Name", "backup_name": "Backup", "backup_date": 3, "backup_location": "Location"}),
+        ("remove_backup", {"collection_name": "Name", "backup_name": "Backup"}),
+        ("edit_collection", {"collection_name": "Name", "updated_json": {"name": "New Name"}}),
+        ("delete_collection", {"collection_name": "New Name"})
+    ]
+
+def test_listeners_receive_partially_applied_edit(filled_manager : CollectionManager):
+    operations = []
+    filled_manager.add_listener(lambda operation, arguments: operations.append((operation, arguments)))
+    with pytest.raises(InvalidCollectionEditError):
+        filled_manager.edit_collection("Test Collection", {"description": "Applied", "updated": "Not a bool"})
+    assert operations == [("edit_collection", {"collection_name": "Test Collection", "updated_json": {"description": "Applied"}})]
+
+@pytest.mark.parametrize("key", ["creation_date", "modification_date"])
+def test_bool_dates_are_rejected(filled_manager : CollectionManager, key : str):
+    with pytest.raises(InvalidCollectionEditError):
+        filled_manager.edit_collection("Test Collection", {key: True})
+    with pytest.raises(InvalidCollectionEditError):
+        filled_manager.edit_collections([{"collection_name": "Test Collection", "updated_json": {key: False}}])
+    assert type(filled_manager.get("Test Collection").full_json()[key]) is str
+
+def test_generation_increments_on_every_mutation(empty_manager : CollectionManager):
+    generations = [empty_manager.generation]
+    collection = empty_manager.add_collection("A", "", 0, 0, True)
+    generations.append(empty_manager.generation)
+    collection.add_backup("Backup", 3, "Location")
+    generations.append(empty_manager.generation)
+    collection.remove_backup(collection.get_backup("Backup"))
+    generations.append(empty_manager.generation)
+    empty_manager.edit_collection("A", {"description": "New"})
+    generations.append(empty_manager.generation)
+    empty_manager.delete_collection("A")
+    generations.append(empty_manager.generation)
+    assert generations == sorted(set(generations))
+
+def test_collection_generation_only_changes_with_collection(filled_manager : CollectionManager):
+    changed = filled_manager.get("Test Collection")
+    unchanged = filled_manager.get("")
+    before = unchanged.generation
+    changed.add_backup("Backup", 3, "Location")
+    assert changed.generation == filled_manager.generation
+    filled_manager.edit_collection("Test Collection", {"updated": True})
+    assert changed.generation == filled_manager.generation
+    assert unchanged.generation == before
+
+def test_recreated_collection_gets_new_generation(filled_manager : CollectionManager):
+    old_generation = filled_manager.get("").generation
+    filled_manager.delete_collection("")
+    assert filled_manager.add_collection("", "", 0, 0, True).generation > old_generation
+
+def test_apply_operation_replays_mutations(filled_manager : CollectionManager):
+    copy = CollectionManager()
+    filled_manager.add_listener(copy.apply_operation)
+    filled_manager.add_collection("New Collection", "Description", 1, 2, False)
+    filled_manager.get("New Collection").add_backup("Backup", 3, "Location")
+    filled_manager.get("New Collection").add_backup("Removed Backup", 3, "Location")
+    filled_manager.edit_collection("New Collection", {"name": "Renamed", "updated": True})
+    filled_manager.get("Renamed").remove_backup(filled_manager.get("Renamed").get_backup("Removed Backup"))
+    assert copy.json_overview() == {"Renamed": {"description": "Description", "creation_date": "1970-01-01 00:00:01", "modification_date": "1970-01-01 00:00:02", "updated": True,
+                                                  "last_backup_date": "1970-01-01 00:00:03", "last_backup_location": "Location", "backup_count": 1}}
+    assert copy.get("Renamed").get_backups_json() == {"Backup": {"date": "1970-01-01 00:00:03", "location": "Location"}}
+    filled_manager.delete_collection("Renamed")
+    assert copy.data_collections == []
+
+def test_add_collections_and_backups_report_one_operation(filled_manager : CollectionManager):
+    operations = []
+    filled_manager.add_listener(lambda operation, arguments: operations.append((operation, arguments)))
+    results = filled_manager.add_collections([
+        {"name": "New", "description": "", "creation_date": 0, "modification_date": 0, "updated": True},
+        {"name": "", "description": "", "creation_date": 0, "modification_date": 0, "updated": True}])
+    assert results[0] is None and isinstance(results[1], CollectionAlreadyExistsError)
+    results = filled_manager.add_backups([
+        {"collection_name": "New", "backup_name": "B", "backup_date": 4, "backup_location": "L"},
+        {"collection_name": "Missing", "backup_name": "B", "backup_date": 4, "backup_location": "L"}])
+    assert results[0] is None and isinstance(results[1], CollectionNotFoundError)
+    assert [(operation, len(list(arguments.values())[0])) for operation, arguments in operations] == [("add_collections", 1), ("add_backups", 1)]
+    assert filled_manager.get("New").generation == filled_manager.generation
+
+    replayed = CollectionManager()
+    for operation, arguments in operations:
+        replayed.apply_operation(operation, arguments)
+    assert replayed.get("New").get_backups_json() == {"B": {"date": "1970-01-01 00:00:04", "location": "L"}}
+
+def test_edit_collections_applies_in_order(filled_manager : CollectionManager):
+    filled_manager.edit_collections([
+        {"collection_name": "Test Collection", "updated_json": {"name": "Temporary"}},
+        {"collection_name": "", "updated_json": {"name": "Test Collection", "updated": False}},
+        {"collection_name": "Temporary", "updated_json": {"name": "", "description": "Swapped"}}])
+    assert [collection.name for collection in filled_manager.data_collections] == ["", "ECOLLECTION\"", "Test Collection"]
+    assert filled_manager.get("").description == "Swapped"
+    assert filled_manager.get("Test Collection").updated is False
+    assert [collection.name for collection in filled_manager.search("Temporary")] == []
+
+@pytest.mark.parametrize("edits,error", [
+    ([{"collection_name": "Test Collection", "updated_json": {"updated": True}},
+      {"collection_name": "Missing", "updated_json": {"updated": True}}], CollectionNotFoundError),
+    ([{"collection_name": "Test Collection", "updated_json": {"description": "New", "updated": "Not a bool"}}], InvalidCollectionEditError),
+    ([{"collection_name": "Test Collection", "updated_json": {"name": "New"}},
+      {"collection_name": "", "updated_json": {"name": "New"}}], CollectionAlreadyExistsError),
+    ([{"collection_name": "Test Collection", "updated_json": {"name": "New"}},
+      {"collection_name": "Test Collection", "updated_json": {"updated": True}}], CollectionNotFoundError)
+])
+def test_edit_collections_is_all_or_nothing(filled_manager : CollectionManager, edits : list[dict], error : type):
+    before = filled_manager.json_overview()
+    generation = filled_manager.generation
+    with pytest.raises(error, match=f"Edit {len(edits) - 1}: "):
+        filled_manager.edit_collections(edits)
+    assert filled_manager.json_overview() == before
+    assert filled_manager.generation == generation
+
+def test_edit_collections_reports_one_operation(filled_manager : CollectionManager):
+    operations = []
+    filled_manager.add_listener(lambda operation, arguments: operations.append((operation, arguments)))
+    edits = [{"collection_name": "Test Collection", "updated_json": {"updated": True}},
+             {"collection_name": "", "updated_json": {"updated": False}}]
+    filled_manager.edit_collections(edits)
+    assert operations == [("edit_collections", {"edits": edits})]
+    assert filled_manager.get("").generation == filled_manager.get("Test Collection").generation == filled_manager.generation
+
+def test_apply_operation_raises_invalid_operation_error(empty_manager : CollectionManager):
+    with pytest.raises(InvalidOperationError):
+        empty_manager.apply_operation("drop_everything", {})
+
+# Scaling tests. The lookup cost should stay the same no matter how many collections exist.
+# They measure wall-clock time, so they only run with `pytest -m slow`
+SCALING_SIZES = [1_000, 10_000, 100_000]
+
+@pytest.fixture(scope="module")
+def scaled_lookup_timings():
+    timings = {}
+    manager = CollectionManager()
+    added = 0
+    for size in SCALING_SIZES:
+        while added < size:
+            manager.add_collection(f"Collection {added}", "", 0, 0, True)
+            added += 1
+        timings[size] = min(timeit.repeat(lambda: lookup_operations(manager, size), number=1, repeat=3))
+    return timings
+
+def lookup_operations(manager : CollectionManager, size : int):
+    """Does 1000 lookups spread over the whole manager, plus a delete and insert"""
+    for i in range(0, size, size // 1000):
+        manager.get(f"Collection {i}")
+        manager.info(f"Collection {i}")
+    with pytest.raises(CollectionAlreadyExistsError):
+        manager.add_collection("Collection 0", "", 0, 0, True)
+    manager.delete_collection(f"Collection {size - 1}")
+    manager.add_collection(f"Collection {size - 1}", "", 0, 0, True)
+
+@pytest.mark.slow
+@pytest.mark.parametrize("size", SCALING_SIZES[1:])
+def test_lookup_cost_is_flat(scaled_lookup_timings, size : int):
+    smallest_time = scaled_lookup_timings[SCALING_SIZES[0]]
+    time = scaled_lookup_timings[size]
+    # A linear scan would be ~10-100x slower. Allow a generous margin for noise and cache misses.
+    assert time < max(smallest_time * 10, 0.01)
+
+def test_stale(filled_manager : CollectionManager):
+    filled_manager.get("Test Collection").add_backup("Old", 100, "Location")
+    filled_manager.add_backups([{"collection_name": "", "backup_name": "New", "backup_date": 300, "backup_location": "L"},
+                                {"collection_name": "", "backup_name": "Old", "backup_date": 50, "backup_location": "L"}])
+    assert [collection.name for collection in filled_manager.stale(200)] == ["ECOLLECTION\"", "Test Collection"]
+    assert [collection.name for collection in filled_manager.stale(1000, limit=2)] == ["ECOLLECTION\"", "Test Collection"]
+
+    collection = filled_manager.get("")
+    collection.remove_backup(collection.get_backup("New"))
+    filled_manager.edit_collection("ECOLLECTION\"", {"name": "Renamed"})
+    assert [collection.name for collection in filled_manager.stale(200)] == ["Renamed", "", "Test Collection"]
+    filled_manager.delete_collection("Renamed")
+    assert [collection.name for collection in filled_manager.stale(200)] == ["", "Test Collection"]
+
+def test_concurrent_readers_and_writers():
+    """Threads mutating the manager while others read it must neither lose updates nor break an iteration"""
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6) # Switch threads as often as possible
+    manager = CollectionManager()
+    shared = manager.add_collection("Shared", "", 0, 0, True)
+    errors = []
+    writers_done = threading.Event()
+    writers, backups_per_writer, churn = 4, 300, 100
+
+    def writer(number : int):
+        try:
+            for i in range(backups_per_writer):
+                shared.add_backup(f"Backup {number}-{i}", i, f"/backups/{number}/{i}")
+            for i in range(churn):
+                name = f"Churn {number}-{i}"
+                manager.add_collection(name, "", 0, 0, True)
+                manager.add_backups([{"collection_name": name, "backup_name": "A", "backup_date": i, "backup_location": "L"}])
+                manager.edit_collection(name, {"name": name + " renamed", "description": "Edited"})
+                manager.delete_collection(name + " renamed")
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            while not writers_done.is_set():
+                with manager.lock.read: # Both reads see the same state
+                    assert manager.json_overview()["Shared"]["backup_count"] == len(shared.get_backups_json())
+                    assert shared.backup_count == len(shared.backup_entries)
+                manager.overview()
+                manager.search("churn", case_sensitive=False)
+                manager.stale(1000)
+                shared.get_backups_range(since=100, limit=50, descending=True)
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        reader_threads = [threading.Thread(target=reader) for _ in range(4)]
+        writer_threads = [threading.Thread(target=writer, args=(number,)) for number in range(writers)]
+        for thread in reader_threads + writer_threads:
+            thread.start()
+        for thread in writer_threads:
+            thread.join()
+        writers_done.set()
+        for thread in reader_threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(old_interval)
+
+    assert errors == []
+    assert shared.backup_count == writers * backups_per_writer
+    assert len(shared.get_backups_json()) == writers * backups_per_writer
+    assert [collection.name for collection in manager.data_collections] == ["Shared"]
+    assert manager.search("churn", case_sensitive=False) == []
+    # One generation per mutation: the add of Shared, its backups, and four mutations per churned collection
+    assert manager.generation == 1 + writers * (backups_per_writer + 4 * churn)
+
+
+def test_snapshot_is_unchanged_by_later_mutations(filled_manager : CollectionManager):
+    filled_manager.get("Test Collection").add_backup("Backup", 100, "/backups/1")
+    snapshot = filled_manager.snapshot()
+    overview = filled_manager.overview()
+    filled_manager.edit_collection("Test Collection", {"name": "Renamed", "description": "Edited"})
+    filled_manager.get("Renamed").add_backup("Backup 2", 200, "/backups/2")
+    filled_manager.get("Renamed").remove_backup(filled_manager.get("Renamed").get_backup("Backup"))
+    filled_manager.delete_collection("")
+    filled_manager.add_collection("New", "", 0, 0, True)
+
+    assert snapshot.overview() == overview
+    assert [entry.name for entry in snapshot.data_collections[0].backup_entries] == ["Backup"]
+    latest = filled_manager.snapshot()
+    assert latest.generation == filled_manager.generation
+    assert latest.overview() == filled_manager.overview()
+    assert latest.json_overview() == filled_manager.json_overview()
+    assert latest.detailed_overview() == filled_manager.detailed_overview()
+    assert [entry.name for entry in latest.data_collections[0].backup_entries] == ["Backup 2"]
+
+def test_snapshot_is_reused_and_shares_unchanged_collections(filled_manager : CollectionManager):
+    first = filled_manager.snapshot()
+    assert filled_manager.snapshot() is first
+    filled_manager.edit_collection("", {"description": "Edited"})
+    second = filled_manager.snapshot()
+    assert second is not first
+    assert second.data_collections[0] is first.data_collections[0]
+    assert second.data_collections[2] is not first.data_collections[2]
+
+def test_snapshot_page_uses_manager_cursors(filled_manager : CollectionManager):
+    snapshot = filled_manager.snapshot()
+    collections, after = filled_manager.page(0, 2)
+    snapshot_collections, snapshot_after = snapshot.page(0, 2)
+    assert after == snapshot_after
+    assert [collection.name for collection in snapshot_collections] == [collection.name for collection in collections]
+    filled_manager.delete_collection("ECOLLECTION\"")
+    assert [collection.name for collection in snapshot.page(after)[0]] == [""]
+    assert snapshot.page(after, 1)[1] is None
+
+@pytest.mark.parametrize("name_key_mask", [(1 << 32) - 1, 0]) # 0 puts every name under the same key
+def test_snapshot_get_by_name(filled_manager : CollectionManager, monkeypatch : pytest.MonkeyPatch, name_key_mask : int):
+    monkeypatch.setattr("snapshot.NAME_KEY_MASK", name_key_mask)
+    filled_manager.get("Test Collection").add_backup("Backup", 100, "/backups/1")
+    first = filled_manager.snapshot()
+    filled_manager.edit_collection("Test Collection", {"name": "Renamed"})
+    filled_manager.delete_collection("")
+    filled_manager.add_collection("", "Added again", 0, 0, True)
+    latest = filled_manager.snapshot()
+
+    assert first.get("Test Collection").get_backups_json() == {"Backup": {"date": "1970-01-01 00:01:40", "location": "/backups/1"}}
+    assert first.get("").description == ""
+    assert latest.get("Renamed").get_backups_json() == filled_manager.get("Renamed").get_backups_json()
+    assert latest.get("").description == "Added again"
+    assert latest.get("ECOLLECTION\"") is first.get("ECOLLECTION\"")
+    for snapshot, missing in [(first, "Renamed"), (latest, "Test Collection")]:
+        with pytest.raises(CollectionNotFoundError):
+            snapshot.get(missing)
+
+def test_snapshot_get_does_not_wait_for_writers(filled_manager : CollectionManager):
+    filled_manager.snapshot()
+    locked, release = threading.Event(), threading.Event()
+    def writer():
+        with filled_manager.lock.write:
+            locked.set()
+            release.wait(5)
+    thread = threading.Thread(target=writer)
+    thread.start()
+    locked.wait(5)
+    try:
+        assert filled_manager.snapshot().get("Test Collection").name == "Test Collection"
+    finally:
+        release.set()
+        thread.join()
+
+def test_snapshot_of_past_generation():
+    manager = CollectionManager(generation_history=2)
+    manager.add_collection("A", "", 0, 0, True)
+    first = manager.snapshot()
+    manager.add_collection("B", "", 0, 0, True)
+    assert manager.snapshot(first.generation) is first
+    with pytest.raises(SnapshotNotFoundError):
+        manager.snapshot(manager.generation + 1)
+    assert len(manager.snapshot(manager.generation)) == 2 # Builds the snapshot of the current generation
+    manager.add_collection("C", "", 0, 0, True)
+    manager.snapshot(first.generation) # Recently used, so it's kept over the snapshot of the second generation
+    manager.snapshot()
+    assert manager.snapshot(first.generation) is first
+    with pytest.raises(SnapshotNotFoundError):
+        manager.snapshot(2)
+    with pytest.raises(ValueError):
+        CollectionManager(generation_history=0)
+
+def test_snapshots_during_writes_are_consistent():
+    """Snapshots taken while other threads mutate the manager must each hold one generation"""
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    manager = CollectionManager()
+    errors = []
+    writers_done = threading.Event()
+
+    def writer(number : int):
+        try:
+            for i in range(200):
+                name = f"Writer {number}-{i}"
+                manager.add_collection(name, "", 0, 0, True)
+                manager.add_backups([{"collection_name": name, "backup_name": f"{j}", "backup_date": j, "backup_location": "L"} for j in range(3)])
+                if i % 2:
+                    manager.delete_collection(name)
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            generation = 0
+            while not writers_done.is_set():
+                snapshot = manager.snapshot()
+                assert snapshot.generation >= generation
+                generation = snapshot.generation
+                for collection in snapshot:
+                    assert collection.backup_count == len(collection.backup_entries)
+                    assert collection.generation <= snapshot.generation
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        reader_threads = [threading.Thread(target=reader) for _ in range(3)]
+        writer_threads = [threading.Thread(target=writer, args=(number,)) for number in range(3)]
+        for thread in reader_threads + writer_threads:
+            thread.start()
+        for thread in writer_threads:
+            thread.join()
+        writers_done.set()
+        for thread in reader_threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(old_interval)
+
+    assert errors == []
+    assert manager.snapshot().json_overview() == manager.json_overview()
+
+def test_search_page_while_deleting():
+    """Paging through search results while other threads delete the matches must never fail a page"""
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    manager = CollectionManager()
+    errors = []
+    deleters_done = threading.Event()
+    deleters, per_deleter = 4, 200
+    for number in range(deleters):
+        for i in range(per_deleter):
+            manager.add_collection(f"Match {number}-{i}", "", 0, 0, True)
+
+    def deleter(number : int):
+        try:
+            for i in range(per_deleter):
+                manager.delete_collection(f"Match {number}-{i}")
+                manager.add_collection(f"Match {number}-{i} again", "", 0, 0, True)
+                manager.delete_collection(f"Match {number}-{i} again")
+        except Exception as e:
+            errors.append(e)
+
+    def searcher():
+        try:
+            while not deleters_done.is_set():
+                names, after = [], 0
+                while after is not None:
+                    page, after = manager.search_page("match", False, after, 7)
+                    names += [collection.name for collection in page]
+                assert all("Match" in name for name in names)
+                assert len(names) == len(set(names))
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        searcher_threads = [threading.Thread(target=searcher) for _ in range(4)]
+        deleter_threads = [threading.Thread(target=deleter, args=(number,)) for number in range(deleters)]
+        for thread in searcher_threads + deleter_threads:
+            thread.start()
+        for thread in deleter_threads:
+            thread.join()
+        deleters_done.set()
+        for thread in searcher_threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(old_interval)
+
+    assert errors == []
+    assert manager.search_page("match", False, 0, 7) == ([], None)
@@ -0,0 +1,96 @@
+import pytest
+from src.collection_manager import CollectionManager
+from src.columnar_collection import ColumnarDataCollection
+from custom_exceptions import BackupAlreadyExistsError, BackupNotFoundError
+from backup_entry import BackupEntry
+
+@pytest.fixture
+def collection():
+    manager = CollectionManager(ColumnarDataCollection)
+    collection = manager.add_collection("Columnar", "", 0, 0, True)
+    for name, date, location in [("A", 30, "/mnt/a.tar"), ("B", 10, "C:\\Backups\\b.zip"), ("C", 20, "/mnt/c.tar"), ("D", 10, "Shelf")]:
+        collection.add_backup(name, date, location)
+    return collection
+
+def test_manager_creates_columnar_collections(collection : ColumnarDataCollection):
+    assert isinstance(collection, ColumnarDataCollection)
+
+def test_get_backups_json(collection : ColumnarDataCollection):
+    assert collection.get_backups_json() == {
+        "A": {"date": "1970-01-01 00:00:30", "location": "/mnt/a.tar"},
+        "B": {"date": "1970-01-01 00:00:10", "location": "C:\\Backups\\b.zip"},
+        "C": {"date": "1970-01-01 00:00:20", "location": "/mnt/c.tar"},
+        "D": {"date": "1970-01-01 00:00:10", "location": "Shelf"}}
+    assert [(entry.name, entry.location, entry.date) for entry in collection.backup_entries] == \
+           [("A", "/mnt/a.tar", 30), ("B", "C:\\Backups\\b.zip", 10), ("C", "/mnt/c.tar", 20), ("D", "Shelf", 10)]
+
+def test_get_backup(collection : ColumnarDataCollection):
+    entry = collection.get_backup("C")
+    assert (entry.name, entry.location, entry.date) == ("C", "/mnt/c.tar", 20)
+    with pytest.raises(BackupNotFoundError):
+        collection.get_backup("E")
+
+def test_add_backup_raises_backup_already_exists_error(collection : ColumnarDataCollection):
+    with pytest.raises(BackupAlreadyExistsError):
+        collection.add_backup("B", 0, "")
+    assert collection.backup_count == 4
+
+def test_remove_backup(collection : ColumnarDataCollection):
+    collection.remove_backup(BackupEntry("A", "", 0))
+    assert list(collection.get_backups_json()) == ["B", "C", "D"]
+    assert (collection.last_backup_date, collection.last_backup_location, collection.backup_count) == (20, "/mnt/c.tar", 3)
+    with pytest.raises(BackupNotFoundError):
+        collection.remove_backup(BackupEntry("A", "", 0))
+    collection.add_backup("A", 40, "/mnt/new.tar")
+    assert collection.get_backup("A").location == "/mnt/new.tar"
+
+@pytest.mark.parametrize("since,until,limit,descending,correct", [
+    (None, None, None, False, ["B", "D", "C", "A"]),
+    (None, None, None, True, ["A", "C", "D", "B"]),
+    (10, 30, None, False, ["B", "D", "C"]),
+    (11, None, 1, True, ["A"]),
+    (31, None, None, False, [])
+])
+def test_get_backups_range(collection : ColumnarDataCollection, since, until, limit, descending, correct):
+    assert list(collection.get_backups_range(since, until, limit, descending)[0]) == correct
+
+def test_pages_survive_compaction():
+    collection = ColumnarDataCollection("Columnar", "", 0, 0, True)
+    for i in range(300):
+        collection.add_backup(f"Backup {i}", 1000 - i, f"/mnt/{i % 3}/{i}.tar")
+    page, after = collection.get_backups_page(0, 50)
+    date_page, date_after = collection.get_backups_range(limit=50)
+    for i in range(300):
+        if i % 3 != 2: # Removing most rows compacts the columns
+            collection.remove_backup(BackupEntry(f"Backup {i}", "", 0))
+    assert len(collection._live) < 300
+    page, after = collection.get_backups_page(after, 10)
+    assert list(page) == [f"Backup {i}" for i in range(50, 80, 3)]
+    date_page, date_after = collection.get_backups_range(limit=3, after=date_after)
+    assert list(date_page) == ["Backup 248", "Backup 245", "Backup 242"]
+    assert collection.get_backup("Backup 299").location == "/mnt/2/299.tar"
+    assert (collection.backup_count, collection.last_backup_date, collection.last_backup_location) == (100, 998, "/mnt/2/2.tar")
+
+def test_apply_operation_replays_into_columnar_collections():
+    manager = CollectionManager()
+    copy = CollectionManager(ColumnarDataCollection)
+    manager.add_listener(copy.apply_operation)
+    manager.add_collection("Collection", "", 0, 0, True)
+    manager.add_backups([{"collection_name": "Collection", "backup_name": f"Backup {i}", "backup_date": i, "backup_location": "/mnt/x"} for i in range(3)])
+    manager.get("Collection").remove_backup(manager.get("Collection").get_backup("Backup 1"))
+    assert copy.get("Collection").get_backups_json() == manager.get("Collection").get_backups_json()
+    assert copy.json_overview() == manager.json_overview()
+
+
+def test_snapshot_entries_are_unchanged_by_later_mutations():
+    manager = CollectionManager(ColumnarDataCollection)
+    collection = manager.add_collection("Columnar", "", 0, 0, True)
+    for i in range(100):
+        collection.add_backup(f"Backup {i}", i, f"/mnt/{i}.tar")
+    snapshot = manager.snapshot()
+    collection.add_backup("Late", 500, "/mnt/late.tar")
+    for i in range(90): # Compacts the columns
+        collection.remove_backup(collection.get_backup(f"Backup {i}"))
+    entries = snapshot.data_collections[0].backup_entries
+    assert [(entry.name, entry.date, entry.location) for entry in entries] == [(f"Backup {i}", i, f"/mnt/{i}.tar") for i in range(100)]
+    assert [entry.name for entry in manager.snapshot().data_collections[0].backup_entries] == [f"Backup {i}" for i in range(90, 100)] + ["Late"]
@@ -10,27 +10,27 @@ def empty_collection():
     return manager.add_collection(
         "Collection Name",
         "Collection Description",
-        "2008-06-01 01:50:23",
-        "2025-02-05 12:30:03",
+        1212285023,
+        1738758603,
         True)
 
 @pytest.mark.parametrize("name,description,creation_date,modification_date,updated", [
     (
         "Collection Name",
         "Collection Description",
-        "2008-06-01 01:50:23",
-        "2025-02-05 12:30:03",
+        1212285023,
+        1738758603,
         True
     ),
     (
         "Other Collection Name",
         "One of the descriptions",
-        "Fifteen minutes ago",
-        "Five minutes ago",
+        1738757703,
+        1738758303,
         False
     )
 ])
-def test_collection_values(name : str, description : str, creation_date : str, modification_date : str, updated : bool):
+def test_collection_values(name : str, description : str, creation_date : int, modification_date : int, updated : bool):
     collection = DataCollection(name, description, creation_date, modification_date, updated)
     
     expected_values = (
@@ -69,11 +69,11 @@ def test_add_backup_exists(empty_collection: DataCollection):
         pytest.fail("Expected a BackupEntry with name 'Backup Name' but no such BackupEntry exists")
 
 @pytest.mark.parametrize("backup_name, backup_date, backup_location,", [
-    ("Backup1", "The first day ever","/home/user/backup.bak"),
-     ("//4234sftr", "asdjnvmnfmngkfnh",""),
-     ("\"TestBackup\"", "D","C"),
+    ("Backup1", -302430530,"/home/user/backup.bak"),
+     ("//4234sftr", 0,""),
+     ("\"TestBackup\"", 1738758603,"C"),
 ])
-def  test_add_backup_values(empty_collection : DataCollection, backup_name : str, backup_date : str, backup_location : str):
+def  test_add_backup_values(empty_collection : DataCollection, backup_name : str, backup_date : int, backup_location : str):
     backup_entry = empty_collection.add_backup(
         backup_name, backup_date, backup_location
     )
@@ -85,22 +85,22 @@ def  test_add_backup_values(empty_collection : DataCollection, backup_name : str
 
 @pytest.mark.parametrize("name", ["Backupname", "Backupname2\"", ""])
 def test_add_backup_raises_backup_already_exists_error(empty_collection : DataCollection, name : str):
-    empty_collection.add_backup(name, "dasd", "g")
+    empty_collection.add_backup(name, 1, "g")
     with pytest.raises(BackupAlreadyExistsError):
-        empty_collection.add_backup(name, "bf", "asd")
+        empty_collection.add_backup(name, 2, "asd")
 
 def test_remove_backup(empty_collection : DataCollection):
-    backup_entry = empty_collection.add_backup("Backup Name", "Date", "Location")
+    backup_entry = empty_collection.add_backup("Backup Name", 3, "Location")
     empty_collection.remove_backup(backup_entry)
     assert backup_entry not in empty_collection.backup_entries
 
 def test_remove_backup_raises_backup_not_found_error(empty_collection : DataCollection):
-    backup_entry = BackupEntry("BackupName", "Date", "Location")
+    backup_entry = BackupEntry("BackupName", "Location", 3)
     with pytest.raises(BackupNotFoundError):
         empty_collection.remove_backup(backup_entry)
 
 def test_get_backup_returns_with_correct_name(empty_collection : DataCollection):
-    backup_entry = empty_collection.add_backup("BackupName", "Date", "Location")
+    backup_entry = empty_collection.add_backup("BackupName", 3, "Location")
     assert empty_collection.get_backup(backup_entry.name).name == backup_entry.name
 
 def test_get_backup_raises_backup_not_found_error(empty_collection : DataCollection):
@@ -108,12 +108,12 @@ def test_get_backup_raises_backup_not_found_error(empty_collection : DataCollect
         empty_collection.get_backup("Non Existing Backup Name")
 
 def test_brief_str_format(empty_collection : DataCollection):
-    expected = f"{empty_collection.name} | {empty_collection.modification_date} | Updated: {empty_collection.updated}"
+    expected = f"{empty_collection.name} | Never | Updated: {empty_collection.updated} | Backups: 0"
     assert empty_collection.brief_str() == expected
 
 def test_full_str_format(empty_collection : DataCollection):
     expected = [empty_collection.name, empty_collection.description, 
-                empty_collection.creation_date, empty_collection.modification_date, 
+                "2008-06-01 01:50:23", "2025-02-05 12:30:03", 
                 str(empty_collection.updated)]
     assert empty_collection.full_str() == expected
 
@@ -121,7 +121,87 @@ def test_full_json_return_value(empty_collection : DataCollection):
     expected = {
         "name": empty_collection.name,
         "description": empty_collection.description, 
-        "creation_date": empty_collection.creation_date, 
-        "modification_date": empty_collection.modification_date, 
-        "updated": empty_collection.updated}
+        "creation_date": "2008-06-01 01:50:23", 
+        "modification_date": "2025-02-05 12:30:03", 
+        "updated": empty_collection.updated,
+        "last_backup_date": None,
+        "last_backup_location": None,
+        "backup_count": 0}
     assert empty_collection.full_json() == expected
+
+def test_remove_backup_raises_for_entry_with_same_name(empty_collection : DataCollection):
+    empty_collection.add_backup("BackupName", 3, "Location")
+    other_entry = BackupEntry("BackupName", "Location", 3)
+    with pytest.raises(BackupNotFoundError):
+        empty_collection.remove_backup(other_entry)
+    assert empty_collection.get_backup("BackupName") is not other_entry
+
+def test_get_backups_json_keeps_insertion_order(empty_collection : DataCollection):
+    names = ["C", "A", "B", "D"]
+    for name in names:
+        empty_collection.add_backup(name, 3, "Location")
+    empty_collection.remove_backup(empty_collection.get_backup("A"))
+    empty_collection.add_backup("A", 3, "Location")
+    assert list(empty_collection.get_backups_json().keys()) == ["C", "B", "D", "A"]
+    assert [entry.name for entry in empty_collection.backup_entries] == ["C", "B", "D", "A"]
+
+def test_get_backups_page(empty_collection : DataCollection):
+    for name in ["A", "B", "C"]:
+        empty_collection.add_backup(name, 3, "Location")
+    page, after = empty_collection.get_backups_page(0, 2)
+    assert list(page) == ["A", "B"]
+    empty_collection.remove_backup(empty_collection.get_backup("C"))
+    empty_collection.add_backup("D", 3, "Location")
+    page, after = empty_collection.get_backups_page(after, 2)
+    assert page == {"D": {"date": "1970-01-01 00:00:03", "location": "Location"}}
+    assert after is None
+
+@pytest.mark.parametrize("since,until,limit,descending,correct", [
+    (None, None, None, False, ["B", "D", "C", "A"]),
+    (None, None, None, True, ["A", "C", "D", "B"]),
+    (10, 30, None, False, ["B", "D", "C"]),
+    (11, None, 1, True, ["A"]),
+    (31, None, None, False, [])
+])
+def test_get_backups_range(empty_collection : DataCollection, since, until, limit, descending, correct):
+    for name, date in [("A", 30), ("B", 10), ("C", 20), ("D", 10)]:
+        empty_collection.add_backup(name, date, "Location")
+    assert list(empty_collection.get_backups_range(since, until, limit, descending)[0]) == correct
+
+def test_get_backups_range_pages(empty_collection : DataCollection):
+    for name, date in [("A", 30), ("B", 10), ("C", 20), ("D", 10)]:
+        empty_collection.add_backup(name, date, "Location")
+    page, after = empty_collection.get_backups_range(limit=2, descending=True)
+    assert page == {"A": {"date": "1970-01-01 00:00:30", "location": "Location"}, "C": {"date": "1970-01-01 00:00:20", "location": "Location"}}
+    empty_collection.remove_backup(empty_collection.get_backup("C"))
+    page, after = empty_collection.get_backups_range(limit=2, descending=True, after=after)
+    assert (list(page), after) == (["D", "B"], None)
+
+def test_generation_increments_without_manager():
+    collection = DataCollection("Name", "", 0, 0, True)
+    backup_entry = collection.add_backup("Backup", 3, "Location")
+    collection.remove_backup(backup_entry)
+    assert collection.generation == 2
+
+def test_last_backup_date(empty_collection : DataCollection):
+    assert empty_collection.last_backup_date is None
+    for name, date in [("A", 20), ("B", 30), ("C", 10)]:
+        empty_collection.add_backup(name, date, "Location")
+    assert empty_collection.last_backup_date == 30
+    empty_collection.remove_backup(empty_collection.get_backup("C"))
+    assert empty_collection.last_backup_date == 30
+    empty_collection.remove_backup(empty_collection.get_backup("B"))
+    assert empty_collection.last_backup_date == 20
+    empty_collection.remove_backup(empty_collection.get_backup("A"))
+    assert empty_collection.last_backup_date is None
+
+def test_summary_fields(empty_collection : DataCollection):
+    assert (empty_collection.last_backup_location, empty_collection.backup_count) == (None, 0)
+    for name, date, location in [("A", 20, "First"), ("B", 30, "Second"), ("C", 30, "Third")]:
+        empty_collection.add_backup(name, date, location)
+    assert (empty_collection.last_backup_date, empty_collection.last_backup_location, empty_collection.backup_count) == (30, "Second", 3)
+    assert empty_collection.brief_str() == f"{empty_collection.name} | 1970-01-01 00:00:30 | Updated: {empty_collection.updated} | Backups: 3"
+    empty_collection.remove_backup(empty_collection.get_backup("B"))
+    assert (empty_collection.last_backup_date, empty_collection.last_backup_location, empty_collection.backup_count) == (30, "Third", 2)
+    empty_collection.remove_backup(empty_collection.get_backup("C"))
+    assert (empty_collection.last_backup_date, empty_collection.last_backup_location, empty_collection.backup_count) == (20, "First", 1)
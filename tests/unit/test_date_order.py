@@ -0,0 +1,48 @@
+import pytest
+from src.date_order import DateOrder
+
+@pytest.fixture
+def order():
+    order = DateOrder()
+    for item, date in [("a", 30), ("b", 10), ("c", 20), ("d", 10), ("e", 40)]:
+        order.add(item, date)
+    return order
+
+@pytest.mark.parametrize("since,until,limit,descending,correct", [
+    (None, None, None, False, ["b", "d", "c", "a", "e"]),
+    (None, None, None, True, ["e", "a", "c", "d", "b"]),
+    (10, 30, None, False, ["b", "d", "c"]),
+    (11, 40, None, True, ["a", "c"]),
+    (50, None, None, False, []),
+    (None, 10, None, False, []),
+    (None, None, 2, False, ["b", "d"]),
+    (None, None, 2, True, ["e", "a"])
+])
+def test_range(order : DateOrder, since : int | None, until : int | None, limit : int | None, descending : bool, correct : list[str]):
+    assert order.range(since, until, limit, descending)[0] == correct
+
+@pytest.mark.parametrize("descending,correct", [(False, ["b", "d", "c", "a", "e"]), (True, ["e", "a", "c", "d", "b"])])
+def test_range_pages_stay_correct_while_items_change(order : DateOrder, descending : bool, correct : list[str]):
+    items, after = order.range(limit=2, descending=descending)
+    while after is not None:
+        order.remove(items[-1]) # Removing the item of the cursor doesn't move the next page
+        order.add("f" + items[-1], 100 if descending else -1) # Added to the pages already read
+        page, after = order.range(limit=2, descending=descending, after=after)
+        items += page
+    assert items == correct
+
+def test_latest(order : DateOrder):
+    order.add("f", 40)
+    assert order.latest() == "e"
+    order.remove("e")
+    assert order.latest() == "f"
+    for item in ["a", "b", "c", "d", "f"]:
+        order.remove(item)
+    assert order.latest() is None
+    assert len(order) == 0
+
+def test_remove_raises_key_error(order : DateOrder):
+    order.remove("a")
+    with pytest.raises(KeyError):
+        order.remove("a")
+    assert "a" not in order and "b" in order
@@ -0,0 +1,67 @@
+import pytest
+from src.insertion_order import InsertionOrder
+
+@pytest.fixture
+def order():
+    order = InsertionOrder()
+    for item in "abcdefg":
+        order.add(item)
+    return order
+
+def collect_pages(order : InsertionOrder, limit : int) -> list[list[str]]:
+    pages = []
+    after = 0
+    while after is not None:
+        page, after = order.page(after, limit)
+        pages.append(page)
+    return pages
+
+def test_add_and_remove(order : InsertionOrder):
+    order.remove("c")
+    assert list(order) == ["a", "b", "d", "e", "f", "g"]
+    assert len(order) == 6
+    assert "c" not in order
+    assert order.number("d") == 4
+    with pytest.raises(KeyError):
+        order.remove("c")
+
+@pytest.mark.parametrize("limit,correct", [
+    (3, [["a", "b", "c"], ["d", "e", "f"], ["g"]]),
+    (7, [["a", "b", "c", "d", "e", "f", "g"]]),
+    (None, [["a", "b", "c", "d", "e", "f", "g"]])
+])
+def test_page(order : InsertionOrder, limit : int | None, correct):
+    assert collect_pages(order, limit) == correct
+
+def test_page_is_stable_while_items_change(order : InsertionOrder):
+    page, after = order.page(0, 3)
+    order.remove("a")
+    order.remove("d")
+    order.add("h")
+    order.add("a")
+    page, after = order.page(after, 3)
+    assert page == ["e", "f", "g"]
+    page, after = order.page(after, 3)
+    assert (page, after) == (["h", "a"], None)
+
+def test_page_skips_many_removed_items():
+    order = InsertionOrder()
+    for i in range(1000):
+        order.add(i)
+    for i in range(1, 999):
+        order.remove(i)
+    assert order.page(0, 1) == ([0], 1)
+    assert order.page(1, 1) == ([999], None)
+
+def test_page_of(order : InsertionOrder):
+    items = ["b", "d", "e", "g"]
+    assert order.page_of(items, 0, 2) == (["b", "d"], 4)
+    assert order.page_of(items, 4, 2) == (["e", "g"], None)
+    assert order.page_of(items, 3) == (["d", "e", "g"], None)
+
+def test_numbered(order : InsertionOrder):
+    order.remove("c")
+    order.remove("g")
+    assert list(order.numbered()) == [(1, "a"), (2, "b"), (4, "d"), (5, "e"), (6, "f")]
+    assert list(order.numbered(4)) == [(5, "e"), (6, "f")]
+    assert order.last_number == 7
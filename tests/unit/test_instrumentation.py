@@ -0,0 +1,47 @@
+import pytest
+from flask import Flask
+from flask_restx import Api, Resource, abort, fields
+from metrics import Metrics
+from api.instrumentation import instrumented, timed
+
+@pytest.fixture
+def instrumented_app():
+    metrics = Metrics()
+    app = Flask(__name__)
+    api = Api(app, validate=True, decorators=[instrumented(metrics)])
+    model = api.model("Input", {"name": fields.String(required=True)})
+
+    class Echo(Resource):
+        @api.expect(model)
+        @timed
+        def post(self):
+            if api.payload["name"] == "missing":
+                abort(400, errors={"CollectionNotFoundError": "Not found"})
+            return {"name": api.payload["name"]}
+
+    api.add_resource(Echo, "/Echo")
+    return app.test_client(), metrics
+
+def test_stages_of_successful_request(instrumented_app):
+    client, metrics = instrumented_app
+    assert client.post("/Echo", json={"name": "A"}).status_code == 200
+    assert metrics.requests == {("Echo", "POST", 200): 1}
+    assert metrics.errors == {}
+    for stage in ["validation", "manager", "marshalling", "total"]:
+        assert metrics.latencies[("Echo", "POST", stage)].cumulative_counts()[-1] == 1
+    stages = {stage: metrics.latencies[("Echo", "POST", stage)].sum for stage in ["validation", "manager", "marshalling"]}
+    assert sum(stages.values()) == pytest.approx(metrics.latencies[("Echo", "POST", "total")].sum)
+
+def test_error_types_of_abort(instrumented_app):
+    client, metrics = instrumented_app
+    assert client.post("/Echo", json={"name": "missing"}).status_code == 400
+    assert metrics.requests == {("Echo", "POST", 400): 1}
+    assert metrics.errors == {("Echo", "POST", "CollectionNotFoundError"): 1}
+    assert ("Echo", "POST", "manager") in metrics.latencies
+    assert ("Echo", "POST", "marshalling") not in metrics.latencies
+
+def test_failed_payload_validation(instrumented_app):
+    client, metrics = instrumented_app
+    assert client.post("/Echo", json={}).status_code == 400
+    assert metrics.errors == {("Echo", "POST", "BadRequest"): 1}
+    assert list(metrics.latencies) == [("Echo", "POST", "total")]
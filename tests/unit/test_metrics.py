@@ -0,0 +1,82 @@
+import pytest
+from metrics import BUCKETS, Histogram, Metrics, labels
+
+def test_histogram_buckets_are_inclusive():
+    histogram = Histogram()
+    for value in [0, BUCKETS[0], BUCKETS[0] * 1.5, BUCKETS[-1], BUCKETS[-1] + 1]:
+        histogram.observe(value)
+    cumulative = histogram.cumulative_counts()
+    assert len(cumulative) == len(BUCKETS) + 1
+    assert cumulative[0] == 2
+    assert cumulative[1] == 3
+    assert cumulative[-2] == 4
+    assert cumulative[-1] == 5
+    assert histogram.sum == pytest.approx(BUCKETS[0] * 2.5 + BUCKETS[-1] * 2 + 1)
+
+def test_record():
+    metrics = Metrics()
+    metrics.record("Info", "GET", 200, {"validation": 0.001, "manager": 0.002, "total": 0.004})
+    metrics.record("Info", "GET", 400, {"total": 0.001}, ["CollectionNotFoundError"])
+    metrics.record("Info", "GET", 400, {"total": 0.001}, ["CollectionNotFoundError"])
+    assert metrics.requests == {("Info", "GET", 200): 1, ("Info", "GET", 400): 2}
+    assert metrics.errors == {("Info", "GET", "CollectionNotFoundError"): 2}
+    assert metrics.latencies[("Info", "GET", "total")].cumulative_counts()[-1] == 3
+    assert metrics.latencies[("Info", "GET", "manager")].cumulative_counts()[-1] == 1
+    assert ("Info", "GET", "marshalling") not in metrics.latencies
+
+def test_record_unknown_stage():
+    metrics = Metrics()
+    with pytest.raises(ValueError):
+        metrics.record("Info", "GET", 200, {"parsing": 0.001})
+    assert metrics.requests == {}
+
+def test_render():
+    metrics = Metrics()
+    metrics.record("Info", "GET", 200, {"total": 0.003})
+    metrics.record("Backup", "POST", 400, {"total": 0.0001}, ["KeyError"])
+    lines = metrics.render().splitlines()
+    assert 'backuporganizer_requests_total{endpoint="Info",method="GET",status="200"} 1' in lines
+    assert 'backuporganizer_request_errors_total{endpoint="Backup",method="POST",type="KeyError"} 1' in lines
+    assert 'backuporganizer_request_duration_seconds_bucket{endpoint="Info",method="GET",stage="total",le="0.0025"} 0' in lines
+    assert 'backuporganizer_request_duration_seconds_bucket{endpoint="Info",method="GET",stage="total",le="0.005"} 1' in lines
+    assert 'backuporganizer_request_duration_seconds_bucket{endpoint="Info",method="GET",stage="total",le="+Inf"} 1' in lines
+    assert 'backuporganizer_request_duration_seconds_sum{endpoint="Info",method="GET",stage="total"} 0.003' in lines
+    assert 'backuporganizer_request_duration_seconds_count{endpoint="Info",method="GET",stage="total"} 1' in lines
+    assert "# TYPE backuporganizer_request_duration_seconds histogram" in lines
+
+def test_render_added_counter():
+    metrics = Metrics()
+    hits = [3]
+    metrics.add_counter("cache_hits_total", "Cache hits", lambda: hits[0])
+    hits[0] += 1
+    lines = metrics.render().splitlines()
+    assert lines[-3:] == ["# HELP backuporganizer_cache_hits_total Cache hits", "# TYPE backuporganizer_cache_hits_total counter",
+                          "backuporganizer_cache_hits_total 4"]
+
+def test_render_without_requests():
+    assert all(line.startswith("#") for line in Metrics().render().splitlines())
+
+def test_labels_are_escaped():
+    assert labels(type='A "quoted"\\name\n') == '{type="A \\"quoted\\"\\\\name\\n"}'
+
+def test_render_adds_up_workers(tmp_path, monkeypatch : pytest.MonkeyPatch):
+    metrics = Metrics(str(tmp_path), write_interval=None)
+    metrics.record("Info", "GET", 200, {"total": 0.003})
+    metrics.add_counter("cache_hits_total", "Cache hits", lambda: 2)
+    other_worker = Metrics(str(tmp_path), write_interval=None)
+    other_worker.record("Info", "GET", 200, {"total": 0.003})
+    other_worker.record("Info", "GET", 404, {"total": 20.0}, ["CollectionNotFoundError"])
+    other_worker.add_counter("cache_hits_total", "Cache hits", lambda: 3)
+    with monkeypatch.context() as patch:
+        patch.setattr("metrics.os.getpid", lambda: -1)
+        other_worker.write_state()
+    metrics.write_state() # Its own file is skipped, since its current state is read instead
+    metrics.record("Info", "GET", 200, {"total": 0.003})
+
+    lines = metrics.render().splitlines()
+    assert 'backuporganizer_requests_total{endpoint="Info",method="GET",status="200"} 3' in lines
+    assert 'backuporganizer_requests_total{endpoint="Info",method="GET",status="404"} 1' in lines
+    assert 'backuporganizer_request_errors_total{endpoint="Info",method="GET",type="CollectionNotFoundError"} 1' in lines
+    assert 'backuporganizer_request_duration_seconds_bucket{endpoint="Info",method="GET",stage="total",le="10.0"} 3' in lines
+    assert 'backuporganizer_request_duration_seconds_count{endpoint="Info",method="GET",stage="total"} 4' in lines
+    assert "backuporganizer_cache_hits_total 5" in lines
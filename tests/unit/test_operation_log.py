@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+import pytest
+from custom_exceptions import OperationLogCorruptedError
+from src.collection_manager import CollectionManager
+from src.operation_log import OperationLog
+
+def fill(manager : CollectionManager):
+    manager.add_collection("Collection1", "Description1", 1000, 2000, True)
+    manager.add_collection("Collection2", "Description2", 3000, 4000, False)
+    collection = manager.get("Collection1")
+    collection.add_backup("Backup1", 5000, "/home/user/backup1.bak")
+    collection.add_backup("Backup2", 6000, "/home/user/backup2.bak")
+    collection.remove_backup(collection.get_backup("Backup1"))
+    manager.edit_collection("Collection1", {"description": "New Description", "name": "Renamed"})
+    manager.delete_collection("Collection2")
+
+def state(manager : CollectionManager):
+    return [(collection.full_json(), collection.get_backups_json()) for collection in manager.data_collections]
+
+def reopen(directory, **kwargs) -> tuple[CollectionManager, OperationLog]:
+    manager = CollectionManager()
+    operation_log = OperationLog(directory, **kwargs)
+    operation_log.recover(manager)
+    return manager, operation_log
+
+def test_recover_replays_every_operation(tmp_path):
+    manager, operation_log = reopen(tmp_path)
+    fill(manager)
+    operation_log.close()
+
+    recovered, operation_log = reopen(tmp_path)
+    operation_log.close()
+    assert state(recovered) == state(manager)
+    assert recovered.get("Renamed").description == "New Description"
+
+def test_recover_from_snapshot(tmp_path):
+    manager, operation_log = reopen(tmp_path, snapshot_interval=3)
+    fill(manager)
+    operation_log.close()
+    assert os.path.exists(tmp_path / "snapshot.log")
+
+    recovered, operation_log = reopen(tmp_path, snapshot_interval=3)
+    recovered.add_collection("Collection3", "", 0, 0, True)
+    operation_log.close()
+    recovered_again, operation_log = reopen(tmp_path)
+    operation_log.close()
+    assert state(recovered_again) == state(recovered)
+
+def test_snapshot_truncates_log(tmp_path):
+    manager, operation_log = reopen(tmp_path)
+    fill(manager)
+    operation_log.snapshot()
+    assert os.path.getsize(tmp_path / "operations.log") == 0
+    operation_log.close()
+
+def test_records_included_in_snapshot_are_skipped(tmp_path):
+    manager, operation_log = reopen(tmp_path)
+    fill(manager)
+    operation_log.close()
+    log_content = (tmp_path / "operations.log").read_bytes()
+
+    _, operation_log = reopen(tmp_path)
+    operation_log.snapshot()
+    operation_log.close()
+    # Simulates a crash between writing the snapshot and truncating the log
+    (tmp_path / "operations.log").write_bytes(log_content)
+
+    recovered, operation_log = reopen(tmp_path)
+    operation_log.close()
+    assert state(recovered) == state(manager)
+
+def test_snapshot_is_written_outside_the_manager_lock(tmp_path, monkeypatch):
+    release = threading.Event()
+    original_write_snapshot = OperationLog._write_snapshot
+    def blocked_write_snapshot(self, snapshot, lsn):
+        release.wait(5)
+        original_write_snapshot(self, snapshot, lsn)
+    monkeypatch.setattr(OperationLog, "_write_snapshot", blocked_write_snapshot)
+    manager, operation_log = reopen(tmp_path, snapshot_interval=3)
+    fill(manager) # Crosses the interval, starting a snapshot that waits for `release`
+    assert os.path.exists(tmp_path / "operations.log.3")
+    # Reads and writes go on while the snapshot is written
+    manager.add_collection("Collection3", "", 0, 0, True)
+    assert [collection.name for collection in manager.data_collections] == ["Renamed", "Collection3"]
+    release.set()
+    operation_log.close()
+    assert not os.path.exists(tmp_path / "operations.log.3")
+
+    recovered, operation_log = reopen(tmp_path)
+    operation_log.close()
+    assert state(recovered) == state(manager)
+
+def test_recover_replays_rotated_log_of_unfinished_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(OperationLog, "_write_snapshot", lambda self, snapshot, lsn: setattr(self, "_snapshotting", False)) # Crashes before writing it
+    manager, operation_log = reopen(tmp_path, snapshot_interval=3)
+    fill(manager)
+    operation_log.close()
+    assert not os.path.exists(tmp_path / "snapshot.log")
+    monkeypatch.undo()
+
+    recovered, operation_log = reopen(tmp_path)
+    operation_log.close()
+    assert state(recovered) == state(manager)
+
+def test_torn_last_record_is_dropped(tmp_path):
+    manager, operation_log = reopen(tmp_path)
+    fill(manager)
+    operation_log.close()
+    with open(tmp_path / "operations.log", "ab") as file:
+        file.write(b'{"lsn": 100, "op": "add_coll')
+
+    recovered, operation_log = reopen(tmp_path)
+    recovered.add_collection("After Crash", "", 0, 0, True)
+    operation_log.close()
+    recovered_again, operation_log = reopen(tmp_path)
+    operation_log.close()
+    assert state(recovered_again) == state(recovered)
+
+def test_corrupted_record_raises(tmp_path):
+    manager, operation_log = reopen(tmp_path)
+    fill(manager)
+    operation_log.close()
+    content = (tmp_path / "operations.log").read_bytes()
+    (tmp_path / "operations.log").write_bytes(b"garbage\n" + content)
+
+    with pytest.raises(OperationLogCorruptedError):
+        reopen(tmp_path)
+
+def test_mutation_returns_once_fsynced_outside_the_manager_lock(tmp_path, monkeypatch):
+    fsyncs = []
+    original_fsync = os.fsync
+    def fsync(fd):
+        fsyncs.append(manager.lock._writer)
+        original_fsync(fd)
+    monkeypatch.setattr("src.operation_log.os.fsync", fsync)
+    manager, operation_log = reopen(tmp_path, fsync_batch_size=16, fsync_interval=0.01)
+    for i in range(4):
+        manager.add_collection(f"Collection{i}", "", 0, 0, True)
+        assert operation_log.durable_lsn == operation_log.lsn == i + 1
+    assert fsyncs == [None] * 4
+    operation_log.close()
+
+@pytest.mark.parametrize("fsync_batch_size", [1, 16])
+def test_group_commit_shares_fsyncs(tmp_path, monkeypatch, fsync_batch_size : int):
+    fsyncs = []
+    original_fsync = os.fsync
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        time.sleep(0.005) # Lets the other writers append their records meanwhile
+        original_fsync(fd)
+    monkeypatch.setattr("src.operation_log.os.fsync", slow_fsync)
+    manager, operation_log = reopen(tmp_path, fsync_batch_size=fsync_batch_size, fsync_interval=0.05)
+    appended = threading.local()
+    manager.add_listener(lambda operation, arguments: setattr(appended, "lsn", operation_log.lsn)) # Called after `record()`
+    durable = []
+    def writer(thread : int):
+        for i in range(8):
+            manager.add_collection(f"Collection{thread}-{i}", "", 0, 0, True)
+            durable.append(operation_log.durable_lsn >= appended.lsn)
+    threads = [threading.Thread(target=writer, args=(thread,)) for thread in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(durable) == 128 and all(durable)
+    assert operation_log.durable_lsn == 128
+    assert len(fsyncs) < 128
+    operation_log.close()
+
+def test_recover_converts_legacy_string_dates(tmp_path):
+    (tmp_path / "snapshot.log").write_text('{"lsn": 1}\n'
+        '{"collection": {"name": "Old", "description": "", "creation_date": "2025-06-05 23:49:00", "modification_date": "Today", "updated": true},'
+        ' "backup_entries": [["Backup1", "2025-06-05 23:49:00", "/home/user/backup1.bak"]]}\n')
+    (tmp_path / "operations.log").write_text(
+        '{"lsn": 2, "op": "add_backup", "args": {"collection_name": "Old", "backup_name": "Backup2", "backup_date": "1960", "backup_location": "L"}}\n'
+        '{"lsn": 3, "op": "edit_collection", "args": {"collection_name": "Old", "updated_json": {"modification_date": "2025-06-05"}}}\n')
+
+    recovered, operation_log = reopen(tmp_path)
+    operation_log.close()
+    collection = recovered.get("Old")
+    assert (collection.creation_date, collection.modification_date) == (1749167340, 1749081600)
+    assert [entry.date for entry in collection.backup_entries] == [1749167340, 0]
@@ -0,0 +1,62 @@
+import random
+import pytest
+from src.persistent_map import PersistentIntMap
+
+def test_update_leaves_old_version_unchanged():
+    first = PersistentIntMap().update([(1, "a"), (2, "b")])
+    second = first.update([(1, None), (3, "c"), (2, "B")])
+    assert list(first.items()) == [(1, "a"), (2, "b")]
+    assert list(second.items()) == [(2, "B"), (3, "c")]
+    assert (len(first), len(second)) == (2, 2)
+
+def test_get():
+    values = PersistentIntMap().update([(0, "zero"), (40, "forty"), (100_000, "big")])
+    assert values.get(0) == "zero"
+    assert values.get(40) == "forty"
+    assert values.get(100_000) == "big"
+    assert values.get(41) is None
+    assert values.get(10**12, "missing") == "missing"
+    assert values.get(-1, "missing") == "missing"
+
+def test_items_from_start():
+    values = PersistentIntMap().update((key, key) for key in range(0, 3000, 7))
+    assert list(values.items(2000)) == [(key, key) for key in range(2002, 3000, 7)]
+    assert list(values.values(2990)) == [2996]
+    assert list(values.items(5000)) == []
+
+def test_removing_everything_empties_the_map():
+    values = PersistentIntMap().update((key, key) for key in range(1, 2000))
+    empty = values.update((key, None) for key in range(1, 2000))
+    assert len(empty) == 0
+    assert list(empty.items()) == []
+    assert len(values) == 1999
+    assert empty.update([(5, "again")]).get(5) == "again"
+
+def test_removing_missing_keys():
+    values = PersistentIntMap().update([(1, "a")])
+    assert list(values.update([(2, None), (10**9, None)]).items()) == [(1, "a")]
+    assert len(PersistentIntMap().update([(1, None)])) == 0
+
+def test_negative_key_raises():
+    with pytest.raises(ValueError):
+        PersistentIntMap().update([(-1, "a")])
+
+def test_matches_dict_across_versions():
+    random.seed(7)
+    versions = [(PersistentIntMap(), {})]
+    for _ in range(200):
+        values, expected = versions[-1]
+        expected = dict(expected)
+        changes = []
+        for _ in range(random.randint(0, 50)):
+            key = random.randint(0, random.choice([50, 5000, 200_000]))
+            value = None if random.random() < 0.4 else random.random()
+            changes.append((key, value))
+            if value is None:
+                expected.pop(key, None)
+            else:
+                expected[key] = value
+        versions.append((values.update(changes), expected))
+    for values, expected in versions:
+        assert list(values.items()) == sorted(expected.items())
+        assert len(values) == len(expected)
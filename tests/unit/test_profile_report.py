@@ -0,0 +1,43 @@
+from collection_manager import CollectionManager
+from profile_report import GROUPS, format_function, hotspots, load, report
+from request_profiler import RequestProfiler
+
+def write_profiles(directory : str, amount : int) -> None:
+    profiler = RequestProfiler(directory)
+    manager = CollectionManager()
+    for i in range(amount):
+        with profiler.profile("Overview"):
+            manager.add_collection(f"Collection {i}", "", 0, 0, True)
+            manager.overview()
+    with profiler.profile("Info"):
+        manager.get("Collection 0")
+
+def test_load_merges_profiles(tmp_path):
+    write_profiles(str(tmp_path), 3)
+    merged = load(str(tmp_path))
+    assert list(merged) == ["Info", "Overview"]
+    stats, amount = merged["Overview"]
+    assert amount == 3
+    calls = {key[2]: values[1] for key, values in stats.stats.items()} # type: ignore
+    assert calls["add_collection"] == 3
+    assert list(load(str(tmp_path), ["Info"])) == ["Info"]
+
+def test_hotspots_of_group(tmp_path):
+    write_profiles(str(tmp_path), 2)
+    stats, _ = load(str(tmp_path))["Overview"]
+    rows = hotspots(stats, 100, "cumtime", "manager")
+    assert {"add_collection", "overview"} <= {key[2] for key, *_ in rows}
+    assert all(key[0].endswith(GROUPS["manager"]) for key, *_ in rows)
+    assert [row[3] for row in rows] == sorted((row[3] for row in rows), reverse=True)
+    assert len(hotspots(stats, 2)) == 2
+
+def test_report(tmp_path):
+    write_profiles(str(tmp_path), 2)
+    text = report(load(str(tmp_path)), 5)
+    assert "Overview: 2 profiles" in text
+    assert "  manager:" in text
+    assert "collection_manager.py" in text
+
+def test_format_function():
+    assert format_function(("/app/src/collection_manager.py", 12, "get")) == "src/collection_manager.py:12(get)"
+    assert format_function(("~", 0, "<built-in method builtins.len>")) == "<built-in method builtins.len>"
@@ -0,0 +1,21 @@
+import os
+from flask import Flask
+from flask_restx import Api, Resource
+from request_profiler import RequestProfiler
+from api.profiling import profiled
+
+def test_response_names_the_profile_without_its_path(tmp_path):
+    app = Flask(__name__)
+    api = Api(app, decorators=[profiled(RequestProfiler(str(tmp_path)))])
+
+    class Echo(Resource):
+        def get(self):
+            return {"name": "A"}
+
+    api.add_resource(Echo, "/Echo")
+    client = app.test_client()
+    assert "X-Profile-Id" not in client.get("/Echo").headers
+
+    profile_id = client.get("/Echo", headers={"X-Profile": "true"}).headers["X-Profile-Id"]
+    assert "/" not in profile_id and str(tmp_path) not in profile_id
+    assert os.listdir(tmp_path / "Echo") == [f"{profile_id}.prof"]
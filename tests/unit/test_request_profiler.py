@@ -0,0 +1,57 @@
+import os
+import pstats
+import pytest
+from request_profiler import RequestProfiler
+
+def busy_function():
+    return sum(range(1000))
+
+def test_profile_writes_stats(tmp_path):
+    profiler = RequestProfiler(str(tmp_path))
+    with profiler.profile("Overview") as path:
+        busy_function()
+    assert path is not None
+    assert os.path.dirname(path) == "Overview"
+    stats = pstats.Stats(str(tmp_path / path))
+    assert any(function == "busy_function" for _, _, function in stats.stats) # type: ignore
+
+def test_profile_is_written_on_exception(tmp_path):
+    profiler = RequestProfiler(str(tmp_path))
+    with pytest.raises(KeyError):
+        with profiler.profile("Info") as path:
+            raise KeyError("Not found")
+    assert os.path.isfile(tmp_path / path)
+
+def test_profiles_are_rotated(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), max_files=3)
+    paths = []
+    for _ in range(5):
+        with profiler.profile("Search") as path:
+            busy_function()
+        paths.append(path)
+    assert sorted(os.listdir(tmp_path / "Search")) == [os.path.basename(path) for path in paths[2:]]
+
+def test_one_profile_at_a_time(tmp_path):
+    profiler = RequestProfiler(str(tmp_path))
+    with profiler.profile("Overview") as outer:
+        with profiler.profile("Info") as inner:
+            busy_function()
+    assert outer is not None
+    assert inner is None
+    assert not os.path.exists(tmp_path / "Info")
+
+@pytest.mark.parametrize("sample_rate, requested, sample, expected", [
+    (0.0, False, 0.0, False),
+    (0.0, True, 0.5, True),
+    (0.1, False, 0.05, True),
+    (0.1, False, 0.1, False),
+    (1.0, False, 0.99, True)
+])
+def test_should_profile(tmp_path, sample_rate, requested, sample, expected):
+    profiler = RequestProfiler(str(tmp_path), sample_rate, sample=lambda: sample)
+    assert profiler.should_profile(requested) == expected
+
+@pytest.mark.parametrize("sample_rate, max_files", [(-0.1, 1), (1.5, 1), (0.5, 0)])
+def test_invalid_settings(tmp_path, sample_rate, max_files):
+    with pytest.raises(ValueError):
+        RequestProfiler(str(tmp_path), sample_rate, max_files)
@@ -0,0 +1,51 @@
+import pytest
+from src.response_cache import ResponseCache
+
+@pytest.fixture
+def cache():
+    return ResponseCache(max_bytes=10)
+
+def test_get_returns_cached_body(cache : ResponseCache):
+    assert cache.get("key", 1) is None
+    cache.put("key", 1, b"body")
+    assert cache.get("key", 1) == b"body"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_new_generation_invalidates_everything(cache : ResponseCache):
+    cache.put("A", 1, b"a")
+    cache.put("B", 1, b"b")
+    assert cache.get("A", 2) is None
+    assert len(cache) == 0
+    assert cache.size == 0
+    assert cache.invalidations == 1
+
+def test_put_from_older_generation_is_ignored(cache : ResponseCache):
+    cache.get("A", 2)
+    cache.put("A", 1, b"stale")
+    assert cache.get("A", 2) is None
+
+def test_get_with_older_generation_misses(cache : ResponseCache):
+    cache.put("A", 2, b"a")
+    assert cache.get("A", 1) is None
+    assert cache.get("A", 2) == b"a"
+
+def test_least_recently_used_is_evicted(cache : ResponseCache):
+    cache.put("A", 1, b"aaaa")
+    cache.put("B", 1, b"bbbb")
+    cache.get("A", 1)
+    cache.put("C", 1, b"cccc")
+    assert cache.get("B", 1) is None
+    assert cache.get("A", 1) == b"aaaa"
+    assert cache.get("C", 1) == b"cccc"
+    assert cache.evictions == 1
+    assert cache.size == 8
+
+def test_replacing_entry_updates_size(cache : ResponseCache):
+    cache.put("A", 1, b"aaaa")
+    cache.put("A", 1, b"aa")
+    assert cache.size == 2
+
+def test_body_larger_than_cap_is_not_cached(cache : ResponseCache):
+    cache.put("A", 1, b"a" * 11)
+    assert cache.get("A", 1) is None
+    assert cache.size == 0
@@ -0,0 +1,112 @@
+import threading
+import time
+import pytest
+from rwlock import ReadWriteLock
+
+def run_thread(target) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=5)
+    def reader():
+        with lock.read:
+            inside.wait() # Only passes if all three readers hold the lock at once
+    threads = [run_thread(reader) for _ in range(3)]
+    for thread in threads:
+        thread.join(5)
+    assert not inside.broken
+
+def test_writer_excludes_readers_and_writers():
+    lock = ReadWriteLock()
+    events = []
+    def hold(guard, name):
+        with guard:
+            events.append(name)
+    with lock.write:
+        reader = run_thread(lambda: hold(lock.read, "read"))
+        writer = run_thread(lambda: hold(lock.write, "write"))
+        time.sleep(0.05)
+        assert events == []
+    reader.join(5)
+    writer.join(5)
+    assert sorted(events) == ["read", "write"]
+
+def test_waiting_writer_blocks_new_readers():
+    lock = ReadWriteLock()
+    events = []
+    lock.acquire_read()
+    def writer():
+        with lock.write:
+            events.append("write")
+    def reader():
+        with lock.read:
+            events.append("read")
+    writer_thread = run_thread(writer)
+    time.sleep(0.05) # The writer is now waiting for the first reader
+    reader_thread = run_thread(reader)
+    time.sleep(0.05)
+    assert events == []
+    lock.release_read()
+    writer_thread.join(5)
+    reader_thread.join(5)
+    assert events == ["write", "read"]
+
+def test_reentrant():
+    lock = ReadWriteLock()
+    with lock.write:
+        with lock.write:
+            with lock.read:
+                pass
+    with lock.read:
+        with lock.read:
+            pass
+    # Fully released, so another thread can write
+    writer = run_thread(lambda: lock.write.__enter__())
+    writer.join(5)
+    assert not writer.is_alive()
+
+def test_read_reentry_doesnt_wait_for_writers():
+    lock = ReadWriteLock()
+    done = threading.Event()
+    def reader():
+        with lock.read:
+            time.sleep(0.1) # A writer starts waiting meanwhile
+            with lock.read:
+                done.set()
+    reader_thread = run_thread(reader)
+    time.sleep(0.02)
+    writer_thread = run_thread(lambda: lock.write.__enter__())
+    reader_thread.join(5)
+    writer_thread.join(5)
+    assert done.is_set()
+    assert not writer_thread.is_alive()
+
+def test_upgrade_raises():
+    lock = ReadWriteLock()
+    with lock.read:
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    lock.acquire_write() # The failed upgrade left nothing held
+    lock.release_write()
+
+def test_release_without_holding_raises():
+    lock = ReadWriteLock()
+    with pytest.raises(RuntimeError):
+        lock.release_read()
+    with pytest.raises(RuntimeError):
+        lock.release_write()
+
+def test_release_callback_runs_after_the_outermost_write():
+    lock = ReadWriteLock()
+    released = []
+    lock.add_release_callback(lambda: released.append(lock._writer))
+    with lock.write:
+        with lock.write:
+            pass
+        assert released == []
+    with lock.read:
+        pass
+    assert released == [None]
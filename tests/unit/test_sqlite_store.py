@@ -0,0 +1,303 @@
+import sqlite3
+import threading
+import pytest
+from custom_exceptions import (BackupAlreadyExistsError, BackupNotFoundError, CollectionAlreadyExistsError, SnapshotNotFoundError,
+                               CollectionNotFoundError, InvalidCollectionEditError)
+from src.sqlite_store import SqliteCollectionManager
+
+@pytest.fixture
+def empty_manager(tmp_path):
+    return SqliteCollectionManager(str(tmp_path / "test.db"))
+
+@pytest.fixture
+def filled_manager(empty_manager : SqliteCollectionManager):
+    empty_manager.add_collection("Test Collection", "Yet another test", 1000, 2000, False)
+    empty_manager.add_collection("ECOLLECTION\"", "-500", 3000, 4000, True)
+    empty_manager.add_collection("", "", 0, 0, True)
+    return empty_manager
+
+def test_add_collection_values(empty_manager : SqliteCollectionManager):
+    empty_manager.add_collection("Name", "Description", 1, 2, False)
+    collection = empty_manager.get("Name")
+    assert collection.full_json() == {"name": "Name", "description": "Description", "creation_date": "1970-01-01 00:00:01", "modification_date": "1970-01-01 00:00:02", "updated": False,
+                                      "last_backup_date": None, "last_backup_location": None, "backup_count": 0}
+
+@pytest.mark.parametrize("name", ["Test Collection", "ECOLLECTION\"", ""])
+def test_add_collection_raises_collection_already_exists_error(filled_manager : SqliteCollectionManager, name : str):
+    with pytest.raises(CollectionAlreadyExistsError):
+        filled_manager.add_collection(name, "B", 3, 4, True)
+
+def test_get_raises_collection_not_found_error(filled_manager : SqliteCollectionManager):
+    with pytest.raises(CollectionNotFoundError):
+        filled_manager.get("CollectionThatDoesntExist")
+
+def test_json_overview_keeps_insertion_order(filled_manager : SqliteCollectionManager):
+    filled_manager.edit_collection("Test Collection", {"name": "Renamed"})
+    assert list(filled_manager.json_overview().keys()) == ["Renamed", "ECOLLECTION\"", ""]
+    assert filled_manager.overview()[0] == "Renamed | Never | Updated: False | Backups: 0"
+
+@pytest.mark.parametrize("search,sensitive,correct_names", [
+    ("", True, ["Test Collection", "ECOLLECTION\"", ""]),
+    ("test", True, []),
+    ("test", False, ["Test Collection"]),
+    ("COLLECTION", True, ["ECOLLECTION\""]),
+    ("COLLECTION", False, ["Test Collection", "ECOLLECTION\""])
+])
+def test_search_returns_correct_names(filled_manager : SqliteCollectionManager, search : str, sensitive : bool, correct_names):
+    result = filled_manager.search(search, case_sensitive=sensitive)
+    assert [collection.name for collection in result] == correct_names
+
+@pytest.mark.parametrize("search,sensitive,correct_names", [
+    ("collection", False, ["Renamed Collection", "ECOLLECTION\""]),
+    ("Collection", True, ["Renamed Collection"]),
+    ("Test", True, []),
+    ("ION\"", True, ["ECOLLECTION\""])
+])
+def test_search_after_rename_and_delete(filled_manager : SqliteCollectionManager, search : str, sensitive : bool, correct_names):
+    filled_manager.edit_collection("Test Collection", {"name": "Renamed Collection"})
+    filled_manager.add_collection("Deleted Collection", "", 0, 0, True)
+    filled_manager.delete_collection("Deleted Collection")
+    result = filled_manager.search(search, case_sensitive=sensitive)
+    assert [collection.name for collection in result] == correct_names
+
+@pytest.mark.parametrize("search,sensitive,correct_names", [
+    ("ΚΟΣ", True, ["ΚΟΣΜΟΣ"]),
+    ("κοσ", False, ["ΚΟΣΜΟΣ"]),
+    ("strasse", False, [])
+])
+def test_search_names_lowercased_by_context(empty_manager : SqliteCollectionManager, search : str, sensitive : bool, correct_names):
+    empty_manager.add_collection("ΚΟΣΜΟΣ", "", 0, 0, True)
+    empty_manager.add_collection("Straße", "", 0, 0, True)
+    result = empty_manager.search(search, case_sensitive=sensitive)
+    assert [collection.name for collection in result] == correct_names
+
+def test_search_index_is_filled_for_existing_database(tmp_path):
+    path = str(tmp_path / "old.db")
+    SqliteCollectionManager(path).add_collection("Old Collection", "", 0, 0, True)
+    connection = sqlite3.connect(path)
+    connection.executescript("DROP TABLE collection_names; DROP TRIGGER collection_names_insert;")
+    connection.close()
+    assert [collection.name for collection in SqliteCollectionManager(path).search("old", False)] == ["Old Collection"]
+
+def test_text_dates_are_converted_for_existing_database(tmp_path):
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE collections (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, description TEXT NOT NULL,
+            creation_date TEXT NOT NULL, modification_date TEXT NOT NULL, updated INTEGER NOT NULL);
+        CREATE TABLE backup_entries (id INTEGER PRIMARY KEY AUTOINCREMENT, collection_id INTEGER NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+            name TEXT NOT NULL, date TEXT NOT NULL, location TEXT NOT NULL, UNIQUE (collection_id, name));
+        INSERT INTO collections (name, description, creation_date, modification_date, updated) VALUES ('Old', '', '2025-06-05 23:49:00', 'Today', 1);
+        INSERT INTO backup_entries (collection_id, name, date, location) VALUES (1, 'Backup', '2025-06-05', 'Location');""")
+    connection.close()
+
+    manager = SqliteCollectionManager(path)
+    collection = manager.get("Old")
+    assert (collection.creation_date, collection.modification_date) == (1749167340, 0)
+    assert [entry.date for entry in collection.backup_entries] == [1749081600]
+    assert (collection.last_backup_date, collection.last_backup_location, collection.backup_count) == (1749081600, "Location", 1)
+    manager.add_collection("New", "", 1, 2, True)
+    assert manager.get("New").full_json()["modification_date"] == "1970-01-01 00:00:02"
+    assert SqliteCollectionManager(path).get("Old").creation_date == 1749167340
+
+def test_generation_is_shared_between_managers(filled_manager : SqliteCollectionManager):
+    other_manager = SqliteCollectionManager(filled_manager.path)
+    assert other_manager.store_id == filled_manager.store_id
+    generation = other_manager.generation
+    unchanged_generation = other_manager.get("").generation
+    filled_manager.get("Test Collection").add_backup("Backup", 3, "Location")
+    assert other_manager.generation == generation + 1
+    assert other_manager.get("Test Collection").generation == generation + 1
+    assert other_manager.get("").generation == unchanged_generation
+
+def test_failed_mutation_keeps_generation(filled_manager : SqliteCollectionManager):
+    generation = filled_manager.generation
+    with pytest.raises(CollectionAlreadyExistsError):
+        filled_manager.add_collection("", "", 0, 0, True)
+    with pytest.raises(CollectionNotFoundError):
+        filled_manager.delete_collection("Missing")
+    assert filled_manager.generation == generation
+
+def test_add_collections_and_backups(filled_manager : SqliteCollectionManager):
+    operations = []
+    filled_manager.add_listener(lambda operation, arguments: operations.append(operation))
+    results = filled_manager.add_collections([
+        {"name": "New", "description": "", "creation_date": 0, "modification_date": 0, "updated": True},
+        {"name": "", "description": "", "creation_date": 0, "modification_date": 0, "updated": True}])
+    assert results[0] is None and isinstance(results[1], CollectionAlreadyExistsError)
+    results = filled_manager.add_backups([
+        {"collection_name": "New", "backup_name": "B", "backup_date": 4, "backup_location": "L"},
+        {"collection_name": "New", "backup_name": "B", "backup_date": 4, "backup_location": "L"},
+        {"collection_name": "Missing", "backup_name": "B", "backup_date": 4, "backup_location": "L"}])
+    assert results[0] is None
+    assert isinstance(results[1], BackupAlreadyExistsError)
+    assert isinstance(results[2], CollectionNotFoundError)
+    assert filled_manager.get("New").get_backups_json() == {"B": {"date": "1970-01-01 00:00:04", "location": "L"}}
+    assert filled_manager.get("New").generation == filled_manager.generation
+    assert operations == ["add_collections", "add_backups"]
+
+def test_edit_collections(filled_manager : SqliteCollectionManager):
+    filled_manager.edit_collections([
+        {"collection_name": "Test Collection", "updated_json": {"name": "Temporary"}},
+        {"collection_name": "", "updated_json": {"name": "Test Collection", "updated": False}},
+        {"collection_name": "Temporary", "updated_json": {"name": "", "description": "Swapped"}}])
+    assert [collection.name for collection in filled_manager.data_collections] == ["", "ECOLLECTION\"", "Test Collection"]
+    assert filled_manager.get("").description == "Swapped"
+    assert filled_manager.get("Test Collection").generation == filled_manager.generation
+
+def test_edit_collections_is_all_or_nothing(filled_manager : SqliteCollectionManager):
+    before = filled_manager.json_overview()
+    with pytest.raises(CollectionNotFoundError, match="Edit 1: "):
+        filled_manager.edit_collections([{"collection_name": "Test Collection", "updated_json": {"name": "New"}},
+                                         {"collection_name": "Missing", "updated_json": {"updated": True}}])
+    assert filled_manager.json_overview() == before
+
+def test_page(filled_manager : SqliteCollectionManager):
+    page, after = filled_manager.page(0, 2)
+    assert [collection.name for collection in page] == ["Test Collection", "ECOLLECTION\""]
+    filled_manager.delete_collection("")
+    filled_manager.add_collection("New", "", 0, 0, True)
+    page, after = filled_manager.page(after, 2)
+    assert ([collection.name for collection in page], after) == (["New"], None)
+
+    result = filled_manager.search("collection", case_sensitive=False)
+    page, after = filled_manager.page(0, 1, result)
+    page, after = filled_manager.page(after, 1, result)
+    assert ([collection.name for collection in page], after) == (["ECOLLECTION\""], None)
+
+def test_search_page_after_delete(filled_manager : SqliteCollectionManager):
+    page, after = filled_manager.search_page("collection", False, 0, 1)
+    assert [collection.name for collection in page] == ["Test Collection"]
+    filled_manager.delete_collection("Test Collection")
+    page, after = filled_manager.search_page("collection", False, after, 1)
+    assert ([collection.name for collection in page], after) == (["ECOLLECTION\""], None)
+
+def test_get_backups_page(filled_manager : SqliteCollectionManager):
+    collection = filled_manager.get("Test Collection")
+    for name in ["A", "B", "C"]:
+        collection.add_backup(name, 3, "Location")
+    page, after = collection.get_backups_page(0, 2)
+    assert list(page) == ["A", "B"]
+    page, after = collection.get_backups_page(after, 2)
+    assert (list(page), after) == (["C"], None)
+
+@pytest.mark.parametrize("since,until,limit,descending,correct", [
+    (None, None, None, False, ["B", "D", "C", "A"]),
+    (None, None, None, True, ["A", "C", "D", "B"]),
+    (10, 30, None, False, ["B", "D", "C"]),
+    (11, None, 1, True, ["A"]),
+    (31, None, None, False, [])
+])
+def test_get_backups_range(filled_manager : SqliteCollectionManager, since, until, limit, descending, correct):
+    collection = filled_manager.get("Test Collection")
+    for name, date in [("A", 30), ("B", 10), ("C", 20), ("D", 10)]:
+        collection.add_backup(name, date, "Location")
+    assert list(collection.get_backups_range(since, until, limit, descending)[0]) == correct
+
+def test_get_backups_range_pages(filled_manager : SqliteCollectionManager):
+    collection = filled_manager.get("Test Collection")
+    for name, date in [("A", 30), ("B", 10), ("C", 20), ("D", 10)]:
+        collection.add_backup(name, date, "Location")
+    page, after = collection.get_backups_range(limit=2, descending=True)
+    assert page == {"A": {"date": "1970-01-01 00:00:30", "location": "Location"}, "C": {"date": "1970-01-01 00:00:20", "location": "Location"}}
+    collection.remove_backup(collection.get_backup("C"))
+    page, after = collection.get_backups_range(limit=2, descending=True, after=after)
+    assert (list(page), after) == (["D", "B"], None)
+
+@pytest.mark.parametrize("key", ["creation_date", "modification_date"])
+def test_bool_dates_are_rejected(filled_manager : SqliteCollectionManager, key : str):
+    with pytest.raises(InvalidCollectionEditError):
+        filled_manager.edit_collection("Test Collection", {key: True})
+    with pytest.raises(InvalidCollectionEditError):
+        filled_manager.edit_collections([{"collection_name": "Test Collection", "updated_json": {key: False}}])
+    assert type(filled_manager.get("Test Collection").full_json()[key]) is str
+
+def test_edit_collection_is_all_or_nothing(filled_manager : SqliteCollectionManager):
+    with pytest.raises(InvalidCollectionEditError):
+        filled_manager.edit_collection("Test Collection", {"description": "Changed", "updated": "Not a bool"})
+    with pytest.raises(CollectionAlreadyExistsError):
+        filled_manager.edit_collection("Test Collection", {"description": "Changed", "name": ""})
+    assert filled_manager.get("Test Collection").description == "Yet another test"
+
+def test_delete_collection_removes_backups(filled_manager : SqliteCollectionManager):
+    filled_manager.get("Test Collection").add_backup("Backup", 3, "Location")
+    filled_manager.delete_collection("Test Collection")
+    with pytest.raises(CollectionNotFoundError):
+        filled_manager.delete_collection("Test Collection")
+    collection = filled_manager.add_collection("Test Collection", "", 0, 0, True)
+    assert collection.get_backups_json() == {}
+
+def test_backups(filled_manager : SqliteCollectionManager):
+    collection = filled_manager.get("Test Collection")
+    collection.add_backup("Backup1", 5, "Location1")
+    collection.add_backup("Backup2", 6, "Location2")
+    with pytest.raises(BackupAlreadyExistsError):
+        collection.add_backup("Backup1", 3, "Location")
+    collection.remove_backup(collection.get_backup("Backup1"))
+    with pytest.raises(BackupNotFoundError):
+        collection.get_backup("Backup1")
+    backup_entry = collection.get_backup("Backup2")
+    collection.remove_backup(backup_entry)
+    with pytest.raises(BackupNotFoundError):
+        collection.remove_backup(backup_entry)
+    collection.add_backup("Backup3", 7, "Location3")
+    assert filled_manager.get("Test Collection").get_backups_json() == {"Backup3": {"date": "1970-01-01 00:00:07", "location": "Location3"}}
+
+def test_add_backup_to_deleted_collection_raises(filled_manager : SqliteCollectionManager):
+    collection = filled_manager.get("Test Collection")
+    filled_manager.delete_collection("Test Collection")
+    with pytest.raises(CollectionNotFoundError):
+        collection.add_backup("Backup", 3, "Location")
+
+def test_data_is_shared_between_managers_and_threads(tmp_path):
+    path = str(tmp_path / "shared.db")
+    SqliteCollectionManager(path).add_collection("Shared", "", 0, 0, True)
+
+    def add_backups(thread_number : int):
+        collection = SqliteCollectionManager(path).get("Shared")
+        for i in range(20):
+            collection.add_backup(f"Backup {thread_number}-{i}", 0, "")
+
+    threads = [threading.Thread(target=add_backups, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(SqliteCollectionManager(path).get("Shared").backup_entries) == 80
+
+def test_stale(filled_manager : SqliteCollectionManager):
+    collection = filled_manager.get("Test Collection")
+    collection.add_backup("Old", 100, "Location")
+    assert collection.last_backup_date == 100
+    filled_manager.add_backups([{"collection_name": "", "backup_name": "New", "backup_date": 300, "backup_location": "L"},
+                                {"collection_name": "", "backup_name": "Old", "backup_date": 50, "backup_location": "L"}])
+    assert [collection.name for collection in filled_manager.stale(200)] == ["ECOLLECTION\"", "Test Collection"]
+    assert [collection.name for collection in filled_manager.stale(1000, limit=2)] == ["ECOLLECTION\"", "Test Collection"]
+
+    collection = filled_manager.get("")
+    collection.remove_backup(collection.get_backup("New"))
+    assert collection.last_backup_date == 50
+    assert [(collection.name, collection.last_backup_date) for collection in filled_manager.stale(200)] == \
+           [("ECOLLECTION\"", None), ("", 50), ("Test Collection", 100)]
+
+def test_summary_fields_are_stored(filled_manager : SqliteCollectionManager):
+    collection = filled_manager.get("")
+    collection.add_backup("A", 20, "First")
+    filled_manager.add_backups([{"collection_name": "", "backup_name": "B", "backup_date": 30, "backup_location": "Second"},
+                                {"collection_name": "", "backup_name": "C", "backup_date": 30, "backup_location": "Third"}])
+    collection = SqliteCollectionManager(filled_manager.path).get("")
+    assert (collection.last_backup_date, collection.last_backup_location, collection.backup_count) == (30, "Second", 3)
+    collection.remove_backup(collection.get_backup("B"))
+    assert (collection.last_backup_date, collection.last_backup_location, collection.backup_count) == (30, "Third", 2)
+    collection = SqliteCollectionManager(filled_manager.path).get("")
+    assert (collection.last_backup_date, collection.last_backup_location, collection.backup_count) == (30, "Third", 2)
+    assert filled_manager.overview()[2] == " | 1970-01-01 00:00:30 | Updated: True | Backups: 2"
+
+
+def test_snapshot_only_accepts_the_current_generation(filled_manager : SqliteCollectionManager):
+    generation = filled_manager.generation
+    assert filled_manager.snapshot() is filled_manager
+    assert filled_manager.snapshot(generation) is filled_manager
+    filled_manager.add_collection("New", "", 0, 0, True)
+    with pytest.raises(SnapshotNotFoundError):
+        filled_manager.snapshot(generation)
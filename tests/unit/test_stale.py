@@ -0,0 +1,32 @@
+import pytest
+from flask import Flask
+from flask_restx import Api
+from collection_manager import CollectionManager
+from api.stale import Stale, MAX_DAYS
+
+@pytest.fixture
+def client():
+    manager = CollectionManager()
+    manager.add_collection("Never Backed Up", "", 0, 0, True)
+    manager.add_collection("Backed Up", "", 0, 0, True).add_backup("Backup", 1749167340, "/backups")
+    app = Flask(__name__)
+    api = Api(app)
+    api.add_resource(Stale, "/Stale", resource_class_kwargs={"collection_manager": manager, "response_cache": None})
+    return app.test_client()
+
+def test_stale(client):
+    response = client.get("/Stale", query_string={"days": "7"})
+    assert response.status_code == 200
+    assert response.json["stale"] == {"Never Backed Up": None, "Backed Up": "2025-06-05 23:49:00"}
+
+def test_max_days_reaches_back_to_year_one(client):
+    response = client.get("/Stale", query_string={"days": str(MAX_DAYS)})
+    assert response.status_code == 200
+    assert response.json["cutoff"] == "0001-01-01 00:00:00"
+    assert response.json["stale"] == {"Never Backed Up": None}
+
+@pytest.mark.parametrize("days", ["-1", str(MAX_DAYS + 1), "nan", "seven"])
+def test_invalid_days(client, days : str):
+    response = client.get("/Stale", query_string={"days": days})
+    assert response.status_code == 400
+    assert "InvalidParameter" in response.json["errors"]
@@ -0,0 +1,37 @@
+import pytest
+from src.staleness_index import StalenessIndex
+
+@pytest.fixture
+def index():
+    index = StalenessIndex()
+    for item, timestamp in [("a", 30), ("b", None), ("c", 10), ("d", 20), ("e", None), ("f", 10)]:
+        index.update(item, timestamp)
+    return index
+
+@pytest.mark.parametrize("before,limit,correct", [
+    (10, None, ["b", "e"]),
+    (11, None, ["b", "e", "c", "f"]),
+    (100, None, ["b", "e", "c", "f", "d", "a"]),
+    (100, 1, ["b"]),
+    (100, 3, ["b", "e", "c"])
+])
+def test_stale(index : StalenessIndex, before : int, limit : int | None, correct : list[str]):
+    assert index.stale(before, limit) == correct
+
+def test_update_moves_item(index : StalenessIndex):
+    index.update("b", 5)
+    index.update("a", None)
+    index.update("c", 40)
+    index.update("d", 20) # Unchanged
+    assert index.stale(100) == ["e", "a", "b", "f", "d", "c"]
+    assert len(index) == 6
+
+def test_remove(index : StalenessIndex):
+    index.remove("b")
+    index.remove("c")
+    assert index.stale(100) == ["e", "f", "d", "a"]
+    assert "c" not in index
+    with pytest.raises(KeyError):
+        index.remove("c")
+    index.update("c", 10) # Added again at the end of the items with the same timestamp
+    assert index.stale(11) == ["e", "f", "c"]
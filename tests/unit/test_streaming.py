@@ -0,0 +1,43 @@
+import gzip
+import json
+import pytest
+from collection_manager import CollectionManager
+from api.streaming import buffered_chunks, gzip_chunks, iterate_pages, json_chunks, ndjson_chunks
+
+@pytest.mark.parametrize("pages", [
+    [],
+    [[]],
+    [[("A", {"x": 1})]],
+    [[("A", {"x": 1}), ("B\"", {"x": "\n"})], [("C", {})]]
+])
+def test_json_chunks_is_valid_json(pages):
+    head = {"errors": {}, "message": "Message"}
+    document = json.loads("".join(json_chunks(head, "overview", pages)))
+    assert document == {**head, "overview": {name: value for page in pages for name, value in page}}
+
+def test_ndjson_chunks():
+    pages = [[{"name": "A"}, {"name": "B"}], [{"name": "C\n"}]]
+    chunks = list(ndjson_chunks(pages))
+    assert len(chunks) == 2
+    assert [json.loads(line) for line in "".join(chunks).splitlines()] == [{"name": "A"}, {"name": "B"}, {"name": "C\n"}]
+
+def test_iterate_pages_survives_mutation(monkeypatch : pytest.MonkeyPatch):
+    monkeypatch.setattr("api.streaming.STREAM_PAGE_SIZE", 2)
+    manager = CollectionManager()
+    for name in "ABCDE":
+        manager.add_collection(name, "", "", "", True)
+    names = []
+    for page in iterate_pages(manager):
+        names += [collection.name for collection in page]
+        if names == ["A", "B"]:
+            manager.delete_collection("C")
+            manager.add_collection("F", "", "", "", True)
+    assert names == ["A", "B", "D", "E", "F"]
+
+def test_buffered_chunks():
+    chunks = list(buffered_chunks([b"a", b"bb", b"ccc", b"d"], size=3))
+    assert chunks == [b"abb", b"ccc", b"d"]
+
+def test_gzip_chunks_is_a_gzip_file():
+    data = [b"line %d\n" % i for i in range(1000)]
+    assert gzip.decompress(b"".join(gzip_chunks(data))) == b"".join(data)
@@ -0,0 +1,46 @@
+import pytest
+from src.trigram_index import TrigramIndex, trigrams
+
+@pytest.fixture
+def index():
+    index = TrigramIndex()
+    index.add(1, "Photos Backup")
+    index.add(2, "photo library")
+    index.add(3, "Server")
+    return index
+
+def test_trigrams():
+    assert trigrams("abcd") == {"abc", "bcd"}
+    assert trigrams("ab") == set()
+
+@pytest.mark.parametrize("search,correct", [
+    ("photo", [1, 2]),
+    ("PHOTO", [1, 2]),
+    ("backup", [1]),
+    ("ph", [1, 2]),
+    ("r", [2, 3]),
+    ("", [1, 2, 3]),
+    ("photo server", []),
+    ("otohp", [])
+])
+def test_search(index : TrigramIndex, search : str, correct : list[int]):
+    assert sorted(index.search(search)) == correct
+
+def test_search_verifies_trigram_order():
+    index = TrigramIndex()
+    index.add(1, "abcXbcd")
+    assert index.search("abcd") == []
+    assert index.search("bcXb") == [1]
+
+def test_search_is_casefolded():
+    index = TrigramIndex()
+    index.add(1, "ΚΟΣΜΟΣ")
+    assert index.search("ΚΟΣ") == [1] # Would miss with str.lower(), which ends "κος" with a final sigma
+
+def test_remove(index : TrigramIndex):
+    index.remove(1)
+    assert index.search("photo") == [2]
+    assert "bac" not in index.postings
+    assert len(index) == 2
+    with pytest.raises(KeyError):
+        index.remove(1)
@@ -1,19 +1,68 @@
-from datetime import datetime
-from src.utility import get_current_datestring
-
-class MockDatetime:
-    #I'm really not sure what this decorator does. Something about
-    #being a reference to create a new class. When I look at
-    #datetime.datetime.now() function, it uses it, so i use it here too
-    #to make the function structure the same as the one I'm overriding.
-    @classmethod 
-    def now(cls, tz=None):
-        return datetime(2025,6,5,23,49,00)
-
-def test_utility_get_current_datestring(monkeypatch):
-    expected = "2025-06-05 23:49:00"
-    
-    monkeypatch.setattr("src.utility.datetime", MockDatetime)
-    output = get_current_datestring()
-
-    assert expected == output
+import pytest
+from custom_exceptions import InvalidCursorError, InvalidDateError
+from src.utility import (get_current_timestamp, parse_timestamp, format_timestamp, parse_dates, legacy_timestamp,
+                         encode_cursor, decode_cursor, encode_date_cursor, decode_date_cursor)
+
+def test_utility_get_current_timestamp(monkeypatch):
+    monkeypatch.setattr("src.utility.time.time", lambda: 1749167340.75)
+    assert get_current_timestamp() == 1749167340
+
+@pytest.mark.parametrize("datestring, expected", [
+    ("2025-06-05 23:49:00", 1749167340),
+    ("2025-06-05T23:49:00", 1749167340),
+    ("2025-06-05T23:49:00Z", 1749167340),
+    ("2025-06-06T01:49:00+02:00", 1749167340),
+    ("2025-06-05 23:49:00.999", 1749167340),
+    ("2025-06-05", 1749081600),
+    ("1960-06-01 15:31:10", -302430530)
+])
+def test_parse_timestamp(datestring : str, expected : int):
+    assert parse_timestamp(datestring) == expected
+
+@pytest.mark.parametrize("datestring", ["", "Today", "13:58", "2080 1 January", "2025-13-01",
+                                        "0001-01-01T00:00:00+05:00", "9999-12-31T23:59:59-00:01"])
+def test_parse_timestamp_raises_invalid_date_error(datestring : str):
+    with pytest.raises(InvalidDateError):
+        parse_timestamp(datestring)
+
+@pytest.mark.parametrize("datestring", ["2025-06-05 23:49:00", "1960-06-01 15:31:10", "0005-01-01 00:00:00", "9999-12-31 23:59:59",
+                                        "0001-01-01 00:00:00"])
+def test_format_timestamp_round_trip(datestring : str):
+    assert format_timestamp(parse_timestamp(datestring)) == datestring
+
+def test_parse_dates():
+    json = {"name": "Name", "creation_date": "2025-06-05 23:49:00", "backup_date": "2025-06-05"}
+    assert parse_dates(json) == {"name": "Name", "creation_date": 1749167340, "backup_date": 1749081600}
+    assert json["creation_date"] == "2025-06-05 23:49:00"
+
+def test_parse_dates_rejects_date_before_year_one_utc():
+    # Would be added as a collection that every later List fails to render
+    with pytest.raises(InvalidDateError):
+        parse_dates({"name": "Name", "creation_date": "0001-01-01T00:00:00+05:00"})
+
+@pytest.mark.parametrize("value", ["Today", 1749167340, None])
+def test_parse_dates_raises_invalid_date_error(value : object):
+    with pytest.raises(InvalidDateError):
+        parse_dates({"modification_date": value})
+
+@pytest.mark.parametrize("date, expected", [(1749167340, 1749167340), ("2025-06-05 23:49:00", 1749167340), ("Today", 0)])
+def test_legacy_timestamp(date : int | str, expected : int):
+    assert legacy_timestamp(date) == expected
+
+@pytest.mark.parametrize("position", [0, 1, 123, 2**62])
+def test_cursor_round_trip(position : int):
+    assert decode_cursor(encode_cursor(position)) == position
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", encode_cursor(1) + "!", "LTE"])
+def test_decode_cursor_raises_invalid_cursor_error(cursor : str):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+@pytest.mark.parametrize("key", [(0, 1), (1749167340, 123), (-302430530, 2**62)])
+def test_date_cursor_round_trip(key : tuple[int, int]):
+    assert decode_date_cursor(encode_date_cursor(key)) == key
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", encode_cursor(123), "MS4yLjM", "MS54"])
+def test_decode_date_cursor_raises_invalid_cursor_error(cursor : str):
+    with pytest.raises(InvalidCursorError):
+        decode_date_cursor(cursor)